@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Compare log size and write volume with the blob store off and on.
+
+Tool outputs are drawn from a small pool of large texts (the same test
+failure, the same file read), as in a real session, and written through
+observe_post(). Reported: bytes in observations.jsonl, bytes in blobs/,
+and the time to write all observations.
+
+Usage:
+    python benchmarks/bench_blob_store.py [--observations N] [--distinct D]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.config import BLOB_STORE_ENV, get_blobs_dir, get_observations_file
+from instincts.observation_log import ObservationHandles
+from instincts.observer import observe_post
+
+
+def _tree_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file()) if path.exists() else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--observations", type=int, default=5000)
+    parser.add_argument("--distinct", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    outputs = [
+        f"FAILED tests/test_{i}.py::test_case - AssertionError\n" * rng.randrange(30, 120)
+        for i in range(args.distinct)
+    ]
+    outputs.extend(["ok"] * args.distinct)
+
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        for enabled in ("0", "1"):
+            os.environ[BLOB_STORE_ENV] = enabled
+            project = Path(tmp) / f"project-{enabled}"
+            (project / ".git").mkdir(parents=True)
+            handles = ObservationHandles()
+            rng = random.Random(1)
+            start = time.perf_counter()
+            for i in range(args.observations):
+                hook_data = {
+                    "tool_name": "Bash",
+                    "tool_output": rng.choice(outputs),
+                    "session_id": f"s{i % 20}",
+                }
+                observe_post(hook_data, project, handles)
+            elapsed = time.perf_counter() - start
+            handles.close_all()
+
+            log_kib = _tree_size(get_observations_file(project).parent) / 1024
+            blobs_kib = _tree_size(get_blobs_dir(project)) / 1024
+            label = "blob store" if enabled == "1" else "inline"
+            print(
+                f"{label:<11} log {log_kib - blobs_kib:9.1f} KiB  blobs {blobs_kib:8.1f} KiB  "
+                f"{elapsed * 1000:8.1f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
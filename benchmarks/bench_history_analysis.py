@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Time whole-history analysis of a segmented log: inline vs process pool.
+
+A synthetic log is written through the observer and rolled over into closed
+segments, then detect_history_patterns() runs with one worker and with each
+requested worker count. Speedup needs as many free cores as workers.
+
+Usage:
+    python benchmarks/bench_history_analysis.py [--segments N] [--per-segment M]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.history import detect_history_patterns
+from instincts.segments import append_lock, roll_over
+
+TOOLS = ("Read", "Edit", "Write", "Bash", "Grep", "Glob", "Task")
+
+
+def _write_log(observations_file: Path, segments: int, per_segment: int) -> None:
+    rng = random.Random(0)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    second = 0
+    for _ in range(segments):
+        with observations_file.open("a") as f:
+            for _ in range(per_segment):
+                second += 1
+                obs = {
+                    "event": rng.choice(("tool_start", "tool_complete")),
+                    "tool": rng.choice(TOOLS),
+                    "input": json.dumps({"file_path": f"/app/{rng.randrange(50)}.py"}),
+                    "output": rng.choice(("ok", "ok", "ok", "Error: failed")),
+                    "session": f"s{rng.randrange(40)}",
+                    "timestamp": (start + timedelta(seconds=second)).isoformat(),
+                }
+                f.write(json.dumps(obs) + "\n")
+        with append_lock(observations_file):
+            roll_over(observations_file)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=16)
+    parser.add_argument("--per-segment", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="*", default=[os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        observations_file = Path(tmp) / "observations.jsonl"
+        _write_log(observations_file, args.segments, args.per_segment)
+        print(
+            f"{args.segments} segments x {args.per_segment} observations, "
+            f"{os.cpu_count()} CPUs"
+        )
+
+        baseline = 0.0
+        for workers in [1, *args.workers]:
+            start = time.perf_counter()
+            patterns = detect_history_patterns(observations_file, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"workers={workers:<3} {elapsed * 1000:9.1f} ms  "
+                f"x{baseline / elapsed:4.2f}  {len(patterns)} patterns"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
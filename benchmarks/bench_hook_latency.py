@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Compare hook latency with and without the observer daemon.
+
+Each iteration starts a fresh interpreter, exactly like a Claude Code hook:
+- in-process: imports instincts.observer and calls observe_pre directly
+- daemon:     runs instincts.hook_client, which forwards to a running daemon
+
+Usage:
+    python benchmarks/bench_hook_latency.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+IN_PROCESS_SNIPPET = """
+import json, sys
+from pathlib import Path
+from instincts.observer import observe_pre
+observe_pre(json.loads(sys.stdin.read()), Path.cwd())
+"""
+
+
+def _time_runs(cmd: list[str], payload: bytes, cwd: Path, env: dict[str, str], runs: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, input=payload, cwd=cwd, env=env, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<12} median {statistics.median(timings):6.1f} ms   p95 {p95:6.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        project = Path(tmp) / "project"
+        (project / ".git").mkdir(parents=True)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = str(REPO_ROOT)
+        env["INSTINCT_DAEMON_SOCKET"] = str(Path(tmp) / "observer.sock")
+        payload = json.dumps(
+            {"tool_name": "Read", "tool_input": {"file_path": "a.py"}, "session_id": "bench"}
+        ).encode()
+
+        in_process = _time_runs(
+            [sys.executable, "-c", IN_PROCESS_SNIPPET], payload, project, env, args.runs
+        )
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "instincts.daemon", "serve", "--idle-timeout", "60"],
+            env=env,
+        )
+        try:
+            while not Path(env["INSTINCT_DAEMON_SOCKET"]).exists():
+                time.sleep(0.01)
+            client = _time_runs(
+                [sys.executable, "-m", "instincts.hook_client", "pre"],
+                payload,
+                project,
+                env,
+                args.runs,
+            )
+        finally:
+            subprocess.run(
+                [sys.executable, "-m", "instincts.daemon", "stop"],
+                env=env,
+                capture_output=True,
+                check=False,
+            )
+            daemon.wait(timeout=10)
+
+    _report("in-process", in_process)
+    _report("daemon", client)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare loading instinct metadata by parsing every file and from the index.
+
+Writes N instinct files with bodies of realistic length to a learned/
+directory, then times a full load (read and parse every file), a current
+index load (one small read plus a stat per file), a rebuild without an
+index (frontmatter of every file read, bodies skipped), and a refresh
+after one file was replaced (one file read, the other entries reused).
+
+Usage:
+    python benchmarks/bench_instinct_index.py [--instincts N] [--body-lines L] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.instinct_files import (
+    load_existing_instincts,
+    load_instinct_entries,
+    write_instinct_file,
+)
+from instincts.instinct_index import get_instinct_index_path
+from instincts.models import Instinct
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instincts", type=int, default=500)
+    parser.add_argument("--body-lines", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    body = "\n".join(f"- Observed step {i}: run the tests after editing" for i in range(args.body_lines))
+
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        learned = Path(tmp) / "learned"
+        for i in range(args.instincts):
+            instinct = Instinct(
+                id=f"instinct-{i}",
+                trigger=f"when working on area {i}",
+                confidence=0.5,
+                domain="workflow",
+                source="pattern-detection",
+                evidence_count=3,
+                created_at=now,
+                updated_at=now,
+                content=f"# Instinct {i}\n\n{body}",
+            )
+            write_instinct_file(instinct, learned)
+
+        full = _best_of(args.repeat, lambda: load_existing_instincts(learned))
+        indexed = _best_of(args.repeat, lambda: load_instinct_entries(learned))
+
+        def rebuild() -> None:
+            get_instinct_index_path(learned).unlink()
+            load_instinct_entries(learned)
+
+        rebuilt = _best_of(args.repeat, rebuild)
+
+        def refresh() -> None:
+            # Replace one file from outside the agent, leaving the index stale
+            path = learned / "instinct-0.md"
+            replacement = learned.with_name("replacement.md")
+            replacement.write_text(path.read_text())
+            os.replace(replacement, path)
+            load_instinct_entries(learned)
+
+        refreshed = _best_of(args.repeat, refresh)
+
+    print(f"instincts={args.instincts} body_lines={args.body_lines}")
+    print(f"  parse every file:      {full * 1000:8.2f} ms")
+    print(f"  current index:         {indexed * 1000:8.2f} ms")
+    print(f"  rebuild without index: {rebuilt * 1000:8.2f} ms")
+    print(f"  refresh after 1 write: {refreshed * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare keyword scans on large tool outputs: per-keyword vs precompiled.
+
+For error detection, error-type extraction and correction detection, the
+previous per-keyword implementations (one lowercasing or one regex per
+keyword) are timed against the matchers in instincts.matchers on synthetic
+outputs with no match (the common case, a full scan) and an early match.
+
+Usage:
+    python benchmarks/bench_matchers.py [--mib N] [--runs R]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.batch import CORRECTION_KEYWORDS, _has_correction_keywords
+from instincts.enrichment import ERROR_KEYWORDS, extract_error_type, has_error_keywords
+
+WORDS = ("collected", "passed", "running", "module", "build", "tests", "ok", "note", "known")
+
+
+def legacy_has_error_keywords(text: str) -> bool:
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in ERROR_KEYWORDS)
+
+
+def legacy_extract_error_type(error_output: str) -> str:
+    for keyword in ERROR_KEYWORDS:
+        if keyword.lower() not in error_output.lower():
+            continue
+        match = re.search(r"(\w+Error|\w+Exception)", error_output)
+        return match.group(1) if match else keyword
+    return "unknown"
+
+
+def legacy_has_correction_keywords(text: str) -> bool:
+    text_lower = text.lower()
+    for keyword in CORRECTION_KEYWORDS:
+        if re.search(rf"\b{re.escape(keyword)}\b", text_lower):
+            return True
+    return False
+
+
+def _best_ms(func: Callable[[str], object], text: str, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mib", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    clean = " ".join(rng.choice(WORDS) for _ in range(args.mib * 1024 * 1024 // 7))
+    texts = {
+        "no match": clean,
+        "late error": clean + " Error: boom",
+        "early error": "Traceback: ValueError: bad\n" + clean,
+    }
+    size_mib = len(clean) / (1024 * 1024)
+    cases = (
+        ("has_error_keywords", legacy_has_error_keywords, has_error_keywords),
+        ("extract_error_type", legacy_extract_error_type, extract_error_type),
+        ("correction keywords", legacy_has_correction_keywords, _has_correction_keywords),
+    )
+
+    print(f"{size_mib:.1f} MiB outputs, MB/s (higher is better)")
+    for name, legacy, current in cases:
+        for label, text in texts.items():
+            assert legacy(text) == current(text)
+            before = _best_ms(legacy, text, args.runs)
+            after = _best_ms(current, text, args.runs)
+            print(
+                f"{name:<20} {label:<12} per-keyword {size_mib / before * 1000:9.1f}  "
+                f"matcher {size_mib / after * 1000:9.1f}  x{before / after:5.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
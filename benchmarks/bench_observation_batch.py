@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compare pattern detection over held observation dicts vs streamed columns.
+
+A synthetic log is written once; each path then runs in a fresh interpreter
+so its peak RSS (ru_maxrss) is measured on its own:
+- dicts:  load_observations() holds every dict, then DetectionPipeline
+- batch:  detect_all_patterns() streams the log into the pipeline's
+  ObservationBatch, so the dicts are never all held at once
+- the same two for the workflow and preference detectors only, the second
+  with the loader projected onto the fields those detectors read
+
+Usage:
+    python benchmarks/bench_observation_batch.py [--observations N]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from instincts.enrichment import describe_input, describe_output
+
+TOOLS = ("Read", "Edit", "Write", "Bash", "Grep", "Glob", "Task")
+
+RUN_SNIPPET = """
+import json, resource, sys, time
+from pathlib import Path
+from instincts.patterns import DetectionPipeline, detect_all_patterns, load_observations
+
+mode, path = sys.argv[1], Path(sys.argv[2])
+subset = ["repeated_workflows", "tool_preferences"]
+start = time.perf_counter()
+if mode == "dicts":
+    patterns = DetectionPipeline(load_observations(path)).detect_all()
+elif mode == "batch":
+    patterns = detect_all_patterns(path)
+elif mode == "dicts-subset":
+    patterns = DetectionPipeline(load_observations(path)).detect_all(subset)
+else:
+    patterns = detect_all_patterns(path, detectors=subset)
+elapsed = time.perf_counter() - start
+peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"ms": elapsed * 1000, "rss_mib": peak_kib / 1024, "patterns": len(patterns)}))
+"""
+
+
+def _write_log(path: Path, count: int) -> None:
+    """Write observations as the hook does: enriched keys, large fields last."""
+    rng = random.Random(0)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with path.open("w") as f:
+        for i in range(count):
+            tool = rng.choice(TOOLS)
+            obs = {
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "session": f"session-{rng.randrange(200):04d}",
+                "tool": tool,
+            }
+            if rng.random() < 0.5:
+                tool_input = {"file_path": f"/app/{rng.randrange(500)}.py", "content": "x" * rng.randrange(400)}
+                obs["event"] = "tool_start"
+                obs.update(describe_input(tool, tool_input))
+                obs["input"] = json.dumps(tool_input)
+            else:
+                output = rng.choice(("ok ", "Error: failed ")) * rng.randrange(1, 60)
+                obs["event"] = "tool_complete"
+                obs.update(describe_output(output, len(output)))
+                obs["output"] = output
+            f.write(json.dumps(obs) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--observations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        log = Path(tmp) / "observations.jsonl"
+        _write_log(log, args.observations)
+        size_mib = log.stat().st_size / (1024 * 1024)
+        print(f"{args.observations} observations, {size_mib:.1f} MiB log")
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = str(REPO_ROOT)
+        for label in ("dicts", "batch", "dicts-subset", "projected-subset"):
+            output = subprocess.run(
+                [sys.executable, "-c", RUN_SNIPPET, label, str(log)],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{label:<16} {result['ms']:9.1f} ms  peak RSS {result['rss_mib']:7.1f} MiB  "
+                f"{result['patterns']} patterns"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Measure downstream cost of per-occurrence vs aggregated patterns.
+
+Builds a busy observation window with many repeated corrections and error
+resolutions, then times the stages every detected pattern flows through in
+analyze_observations: merge_patterns against LLM patterns, conversion to
+instincts with ID lookup, and instinct file writes.
+
+Usage:
+    python benchmarks/bench_pattern_aggregation.py [--sessions N]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.agent import _pattern_to_instinct
+from instincts.instinct_files import write_instinct_file
+from instincts.models import Evidence, Pattern, PatternType
+from instincts.pattern_merger import merge_patterns
+from instincts.patterns import DetectionPipeline
+
+ERRORS = ("ImportError", "TypeError", "KeyError", "ValueError", "AttributeError")
+FILES = tuple(f"/app/module_{i}.py" for i in range(20))
+
+
+def make_observations(sessions: int) -> list[dict]:
+    rng = random.Random(0)
+    observations = []
+    for s in range(sessions):
+        for step in range(20):
+            ts = f"2026-02-09T{s % 24:02d}:{step:02d}:00+00:00"
+            path = rng.choice(FILES)
+            observations += [
+                {"event": "tool_start", "tool": "Write", "input": json.dumps({"file_path": path}), "session": f"s{s}", "timestamp": ts},
+                {"event": "tool_start", "tool": "Edit", "input": json.dumps({"file_path": path}), "session": f"s{s}", "timestamp": ts},
+                {"event": "tool_complete", "tool": "Bash", "output": f"{rng.choice(ERRORS)}: failed", "session": f"s{s}", "timestamp": ts},
+                {"event": "tool_complete", "tool": "Bash", "output": "ok", "session": f"s{s}", "timestamp": ts},
+            ]
+    return observations
+
+
+def make_llm_patterns(count: int) -> list[Pattern]:
+    return [
+        Pattern(
+            pattern_type=PatternType.ERROR_RESOLUTION,
+            trigger=f"when fixing llm-reported issue number {i}",
+            description="LLM pattern",
+            evidence=(
+                Evidence(
+                    timestamp=datetime.now(timezone.utc), session_id="llm", description="llm"
+                ),
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def downstream(patterns: list[Pattern], llm_patterns: list[Pattern]) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    merged = merge_patterns(patterns, llm_patterns)
+    merge_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    seen: set[str] = set()
+    to_write = []
+    for pattern in merged:
+        instinct = _pattern_to_instinct(pattern)
+        if instinct.id not in seen:
+            seen.add(instinct.id)
+            to_write.append(instinct)
+    convert_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for instinct in to_write:
+            write_instinct_file(instinct, Path(tmp))
+        write_ms = (time.perf_counter() - start) * 1000
+    return merge_ms, convert_ms, write_ms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--llm-patterns", type=int, default=20)
+    args = parser.parse_args()
+
+    pipeline = DetectionPipeline(make_observations(args.sessions))
+    # Per-occurrence patterns as the detectors produced them before aggregation
+    raw = pipeline._run_user_corrections()[0] + pipeline._run_error_resolutions()[0]
+    aggregated = pipeline.detect_user_corrections() + pipeline.detect_error_resolutions()
+    llm_patterns = make_llm_patterns(args.llm_patterns)
+
+    for label, patterns in (("per-occurrence", raw), ("aggregated", aggregated)):
+        merge_ms, convert_ms, write_ms = downstream(patterns, llm_patterns)
+        print(
+            f"{label:<15} {len(patterns):6d} patterns   merge {merge_ms:8.1f} ms   "
+            f"convert {convert_ms:7.1f} ms   write {write_ms:6.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
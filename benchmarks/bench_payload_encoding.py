@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Compare json.dumps()+slice with encode_bounded() for growing hook payloads.
+
+Each payload is a Write tool input whose content grows from 1 KB to the
+requested size; both encoders keep MAX_CONTENT_LENGTH characters. The
+bounded encoder escapes only the kept prefix, so what remains of its cost
+is hashing the raw content.
+
+Usage:
+    python benchmarks/bench_payload_encoding.py [--max-mib N] [--runs R]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.observer import MAX_CONTENT_LENGTH
+from instincts.payload import encode_bounded
+
+
+def _best_ms(func, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-mib", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    size = 1024
+    while size <= args.max_mib * 1024 * 1024:
+        payload = {"file_path": "/app/data.txt", "content": 'row "quoted"\t\n' * (size // 14)}
+        dumped = _best_ms(lambda payload=payload: json.dumps(payload)[:MAX_CONTENT_LENGTH], args.runs)
+        bounded = _best_ms(lambda payload=payload: encode_bounded(payload, MAX_CONTENT_LENGTH), args.runs)
+        print(f"{size / 1024:>9.0f} KiB  json.dumps {dumped:8.2f} ms  encode_bounded {bounded:8.2f} ms")
+        size *= 4
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare repeated-workflow mining: subsequence enumeration vs suffix automaton.
+
+The legacy implementation enumerated every contiguous subsequence of length
+>= 3 per session (O(L^2) tuples) and then pruned contained sequences
+pairwise. It is reproduced here for comparison only.
+
+Usage:
+    python benchmarks/bench_workflow_mining.py [--sessions N] [--length L]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from instincts.sequences import find_maximal_repeats
+
+TOOLS = ("Read", "Edit", "Write", "Bash", "Grep", "Glob", "Task")
+
+
+def legacy_repeats(session_sequences: dict[str, list[str]]) -> list[tuple[str, ...]]:
+    occurrences: dict[tuple[str, ...], set[str]] = defaultdict(set)
+    for session_id, tools in session_sequences.items():
+        for length in range(3, len(tools) + 1):
+            for start in range(len(tools) - length + 1):
+                occurrences[tuple(tools[start : start + length])].add(session_id)
+
+    candidates = sorted(
+        (seq for seq, sessions in occurrences.items() if len(sessions) >= 2),
+        key=len,
+        reverse=True,
+    )
+    kept: list[tuple[str, ...]] = []
+    for seq in candidates:
+        if not any(
+            len(seq) < len(other)
+            and any(
+                other[i : i + len(seq)] == seq for i in range(len(other) - len(seq) + 1)
+            )
+            for other in kept
+        ):
+            kept.append(seq)
+    return kept
+
+
+def automaton_repeats(session_sequences: dict[str, list[str]]) -> list[tuple[str, ...]]:
+    return [r.sequence for r in find_maximal_repeats(session_sequences, 2, 3)]
+
+
+def _measure(
+    fn: Callable[[dict[str, list[str]]], list[tuple[str, ...]]],
+    sessions: dict[str, list[str]],
+) -> tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(sessions)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / (1024 * 1024), len(result)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--length", type=int, default=300, help="tools per session")
+    parser.add_argument("--long-length", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    motif = [rng.choice(TOOLS) for _ in range(8)]
+
+    def make_sessions(length: int) -> dict[str, list[str]]:
+        sessions = {}
+        for i in range(args.sessions):
+            tools = [rng.choice(TOOLS) for _ in range(length)]
+            tools[length // 2 : length // 2 + len(motif)] = motif
+            sessions[f"s{i}"] = tools
+        return sessions
+
+    sessions = make_sessions(args.length)
+    for label, fn in (("enumeration", legacy_repeats), ("automaton", automaton_repeats)):
+        ms, mb, count = _measure(fn, sessions)
+        print(
+            f"L={args.length:<5} {label:<12} {ms:9.1f} ms  peak {mb:8.1f} MiB  "
+            f"{count} repeats"
+        )
+
+    # Enumeration is impractical at this length; only the automaton is timed
+    sessions = make_sessions(args.long_length)
+    ms, mb, count = _measure(automaton_repeats, sessions)
+    print(
+        f"L={args.long_length:<5} {'automaton':<12} {ms:9.1f} ms  peak {mb:8.1f} MiB  "
+        f"{count} repeats"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,31 +5,73 @@ This module provides the Observer Agent that:
 - Creates/updates instinct files in personal/ directory
 - Applies confidence decay to existing instincts
 - Generates analysis summaries
+
+Run as `python -m instincts.agent --project-root PATH` it is the background
+worker spawned by auto-learning: it takes the auto-learn lease, analyzes new
+observations, folds the confidence ledger, applies decay, records the run
+and compacts closed log segments, within a time and memory budget.
 """
 
+import argparse
 import logging
-import os
 import re
-import tempfile
-from dataclasses import dataclass, field
+import resource
+import signal
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from instincts.auto_learn import (
+    acquire_lock,
+    count_observations,
+    lease_heartbeat,
+    load_state,
+    release_lock,
+    save_state,
+)
+from instincts.blobs import BlobStore
+from instincts.checkpoint import AnalysisCheckpoint, load_checkpoint, save_checkpoint
 from instincts.confidence import (
-    apply_decay_to_instinct,
+    CONFIRM_DELTA,
     calculate_initial_confidence,
     check_dormant_status,
+    decay_anchor,
+    effective_confidence,
 )
+from instincts.confidence_ledger import LedgerEntry, append_entries, fold_ledger
 from instincts.config import (
+    AUTO_LEARN_MAX_MEMORY_MB,
+    AUTO_LEARN_MAX_SECONDS,
     MAX_OBSERVATIONS_FOR_ANALYSIS,
-    get_learned_dir,
+    get_analysis_checkpoint_file,
+    get_blobs_dir,
+    get_confidence_ledger_file,
     get_observations_file,
 )
+from instincts.history import detect_history_patterns
 from instincts.llm_patterns import detect_patterns_with_llm, is_llm_available
 from instincts.models import Instinct, Pattern
 from instincts.pattern_merger import merge_patterns
-from instincts.patterns import detect_all_patterns, load_recent_observations
+from instincts.patterns import (
+    DetectionPipeline,
+    ObservationSlice,
+    required_fields,
+    resolve_blob_fields,
+)
+from instincts.segments import compact_segments
+from instincts.storage import (
+    FileInstinctStore,
+    FileObservationStore,
+    InstinctStore,
+    ObservationStore,
+    open_instinct_store,
+    open_observation_store,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -72,10 +114,19 @@ def _generate_instinct_id(pattern: Pattern) -> str:
     return "-".join(words)
 
 
+def _latest_evidence_time(pattern: Pattern) -> datetime | None:
+    """Get the most recent evidence timestamp of a pattern (naive treated as UTC)."""
+    timestamps = [
+        e.timestamp if e.timestamp.tzinfo else e.timestamp.replace(tzinfo=timezone.utc)
+        for e in pattern.evidence
+    ]
+    return max(timestamps, default=None)
+
+
 def _pattern_to_instinct(pattern: Pattern) -> Instinct:
     """Convert a Pattern to an Instinct."""
     now = datetime.now(timezone.utc)
-    evidence_count = len(pattern.evidence)
+    evidence_count = pattern.occurrences
 
     return Instinct(
         id=_generate_instinct_id(pattern),
@@ -88,6 +139,19 @@ def _pattern_to_instinct(pattern: Pattern) -> Instinct:
         updated_at=now,
         content=_generate_instinct_content(pattern),
         status="active",
+        last_observed=_latest_evidence_time(pattern),
+    )
+
+
+def _confirmation_entry(instinct_id: str, pattern: Pattern) -> LedgerEntry:
+    """Build the ledger entry of a re-detected pattern's new evidence."""
+    sessions = sorted({evidence.session_id for evidence in pattern.evidence})
+    return LedgerEntry(
+        instinct_id=instinct_id,
+        delta=CONFIRM_DELTA,
+        evidence=f"{pattern.pattern_type.value}:{','.join(sessions)}",
+        timestamp=_latest_evidence_time(pattern) or datetime.now(timezone.utc),
+        evidence_count=pattern.occurrences,
     )
 
 
@@ -107,259 +171,35 @@ def _generate_instinct_content(pattern: Pattern) -> str:
     for evidence in pattern.evidence[:MAX_EVIDENCE_DISPLAY]:
         lines.append(f"- {evidence.description} (session: {evidence.session_id})")
 
-    if len(pattern.evidence) > MAX_EVIDENCE_DISPLAY:
-        remaining = len(pattern.evidence) - MAX_EVIDENCE_DISPLAY
+    displayed = min(len(pattern.evidence), MAX_EVIDENCE_DISPLAY)
+    if pattern.occurrences > displayed:
+        remaining = pattern.occurrences - displayed
         lines.append(f"- ... and {remaining} more observations")
 
     return "\n".join(lines)
 
 
-def _escape_yaml_string(value: str) -> str:
-    """Escape a string for safe YAML double-quoted string.
-
-    Prevents YAML injection attacks by escaping special characters
-    that could break out of the quoted string context.
-
-    Args:
-        value: The raw string value.
-
-    Returns:
-        Escaped string safe for YAML double-quoted context.
-    """
-    # Order matters: escape backslashes first to avoid double-escaping
-    escaped = value.replace("\\", "\\\\")
-    escaped = escaped.replace('"', '\\"')
-    escaped = escaped.replace("\n", "\\n")
-    escaped = escaped.replace("\r", "\\r")
-    return escaped
-
-
-def _sanitize_instinct_id(instinct_id: str) -> str:
-    """Sanitize an instinct ID to prevent path traversal attacks.
-
-    Args:
-        instinct_id: The raw instinct ID.
-
-    Returns:
-        A safe filename-compatible string.
-    """
-    from instincts.utils import sanitize_id
-
-    result = sanitize_id(instinct_id, allow_dots=False)
-    # Preserve backward-compatible default for empty instinct IDs
-    return result if result != "unnamed" else "unnamed-instinct"
-
-
-def _atomic_write_text(file_path: Path, content: str) -> None:
-    """Write file atomically using temp file + rename.
-
-    This prevents file corruption if the process crashes mid-write.
-
-    Args:
-        file_path: Path to the file to write.
-        content: Content to write.
-
-    Raises:
-        OSError: If write or rename fails.
-    """
-    directory = file_path.parent
-    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
-    try:
-        with os.fdopen(fd, "w") as f:
-            f.write(content)
-        os.rename(temp_path, file_path)
-    except Exception:
-        # Clean up temp file on failure
-        try:
-            os.unlink(temp_path)
-        except OSError:
-            pass
-        raise
-
-
-def _write_instinct_file(instinct: Instinct, directory: Path) -> Path:
-    """Write an instinct to a markdown file.
-
-    Args:
-        instinct: The instinct to write.
-        directory: Directory to write the file to.
-
-    Returns:
-        Path to the created file.
-
-    Raises:
-        ValueError: If the resulting path would be outside the directory.
-    """
-    # Ensure directory exists with secure permissions
-    directory.mkdir(parents=True, exist_ok=True, mode=0o700)
-
-    # Sanitize the instinct ID to prevent path traversal
-    safe_id = _sanitize_instinct_id(instinct.id)
-
-    # Generate filename
-    filename = f"{safe_id}.md"
-    file_path = directory / filename
-
-    # Check for symlink attack - refuse to overwrite symlinks
-    # This must be checked before resolve() which follows symlinks
-    if file_path.is_symlink():
-        raise ValueError(f"Refusing to write to symlink: {file_path}")
-
-    # Verify the file path is within the directory (defense in depth)
-    resolved_path = file_path.resolve()
-    resolved_dir = directory.resolve()
-    if not resolved_path.is_relative_to(resolved_dir):
-        raise ValueError(f"Path traversal detected: {instinct.id}")
-
-    # Generate file content with YAML frontmatter
-    # Escape all string fields to prevent YAML injection
-    safe_id = _escape_yaml_string(instinct.id)
-    safe_trigger = _escape_yaml_string(instinct.trigger)
-    safe_domain = _escape_yaml_string(instinct.domain)
-    safe_source = _escape_yaml_string(instinct.source)
-    safe_status = _escape_yaml_string(instinct.status)
-
-    content = f"""---
-id: "{safe_id}"
-trigger: "{safe_trigger}"
-confidence: {instinct.confidence}
-domain: "{safe_domain}"
-source: "{safe_source}"
-evidence_count: {instinct.evidence_count}
-created_at: "{instinct.created_at.isoformat()}"
-updated_at: "{instinct.updated_at.isoformat()}"
-status: "{safe_status}"
----
-
-{instinct.content}
-"""
-
-    # Use atomic write to prevent corruption on crash
-    _atomic_write_text(file_path, content)
-    return file_path
-
-
-def _load_existing_instincts(directory: Path) -> list[Instinct]:
-    """Load existing instincts from a directory.
-
-    Args:
-        directory: Directory containing instinct files.
-
-    Returns:
-        List of Instinct objects.
-    """
-    instincts: list[Instinct] = []
-
-    if not directory.exists():
-        return instincts
-
-    for file_path in directory.glob("*.md"):
-        # Skip symlinks for defense in depth
-        if file_path.is_symlink():
-            logger.warning("Skipping symlink: %s", file_path)
-            continue
-        try:
-            content = file_path.read_text()
-            instinct = _parse_instinct_file(content, str(file_path))
-            if instinct:
-                instincts.append(instinct)
-        except (OSError, IOError) as e:
-            # File read error - log and skip
-            logger.warning("Failed to read instinct file %s: %s", file_path, e)
-            continue
-        except (ValueError, UnicodeDecodeError) as e:
-            # Parsing error - log and skip
-            logger.warning("Failed to parse instinct file %s: %s", file_path, e)
-            continue
-
-    return instincts
-
-
-def _parse_frontmatter(frontmatter: str) -> dict[str, Any]:
-    """Parse YAML-like frontmatter into a dictionary."""
-    data: dict[str, Any] = {}
-    for line in frontmatter.strip().split("\n"):
-        if ":" not in line:
-            continue
-        key, value = line.split(":", 1)
-        key = key.strip()
-        value = value.strip().strip('"').strip("'")
-        data[key] = value
-    return data
-
-
-def _parse_timestamp(value: str, default_factory: Any = None) -> datetime:
-    """Parse a timestamp string, returning a default if parsing fails."""
-    try:
-        return datetime.fromisoformat(value)
-    except (ValueError, TypeError):
-        return default_factory() if default_factory else datetime.now(timezone.utc)
-
-
-def _parse_float(value: Any, default: float) -> float:
-    """Parse a value as float, returning default if parsing fails."""
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return default
-
-
-def _parse_int(value: Any, default: int) -> int:
-    """Parse a value as int, returning default if parsing fails."""
-    try:
-        return int(value)
-    except (ValueError, TypeError):
-        return default
-
-
-def _parse_instinct_file(content: str, source_file: str) -> Instinct | None:
-    """Parse a markdown instinct file.
-
-    Args:
-        content: File content with YAML frontmatter.
-        source_file: Path to the source file.
-
-    Returns:
-        Instinct object or None if parsing fails.
-    """
-    if not content.strip():
-        return None
-
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return None
-
-    data = _parse_frontmatter(parts[1])
-    if "id" not in data:
-        return None
-
-    markdown_content = parts[2].strip()
-    default_confidence = 0.5
-    default_evidence_count = 1
-
-    return Instinct(
-        id=data.get("id", ""),
-        trigger=data.get("trigger", ""),
-        confidence=_parse_float(data.get("confidence"), default_confidence),
-        domain=data.get("domain", "general"),
-        source=data.get("source", "unknown"),
-        evidence_count=_parse_int(data.get("evidence_count"), default_evidence_count),
-        created_at=_parse_timestamp(
-            data.get("created_at", ""), lambda: datetime.now(timezone.utc)
-        ),
-        updated_at=_parse_timestamp(
-            data.get("updated_at", ""), lambda: datetime.now(timezone.utc)
-        ),
-        content=markdown_content,
-        source_file=source_file,
-        status=data.get("status", "active"),
+def _save_checkpoint(
+    project_root: Path, observation_slice: ObservationSlice, pipeline: DetectionPipeline
+) -> None:
+    """Persist where incremental analysis stopped."""
+    checkpoint = AnalysisCheckpoint(
+        inode=observation_slice.inode,
+        offset=observation_slice.offset,
+        carry_over=pipeline.carry_over(),
     )
+    checkpoint_file = get_analysis_checkpoint_file(project_root)
+    checkpoint_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    save_checkpoint(checkpoint_file, checkpoint)
 
 
 def analyze_observations(
     project_root: Path,
     dry_run: bool = False,
     skip_llm: bool = False,
+    incremental: bool = False,
+    history: bool = False,
+    max_workers: int | None = None,
 ) -> AnalysisResult:
     """Analyze observations and create/update instincts.
 
@@ -368,22 +208,73 @@ def analyze_observations(
     - LLM-based detection (runs when ANTHROPIC_API_KEY is set and skip_llm=False)
     - Results are merged using pattern_merger
 
+    In incremental mode only observations appended since the checkpoint in
+    the auto-learn state are analyzed (continuing from a closed segment if
+    the log was rolled over since; the latest window on the first run or
+    when the checkpoint is lost), detector state is carried across the
+    checkpoint, and patterns re-detected in a resumed slice are appended to
+    the confidence ledger as confirmations of the existing instinct (see
+    instincts.confidence_ledger). Other runs leave existing instincts
+    unchanged. The new checkpoint is saved unless dry_run is set.
+
+    In history mode the algorithm detectors run over the whole log, every
+    closed segment included, fanned out over max_workers processes; the LLM
+    still sees only the latest window.
+
     Args:
         project_root: Project root for project-scoped storage.
         dry_run: If True, don't write any files.
         skip_llm: If True, skip LLM analysis even when API key is available.
+        incremental: If True, resume from the saved checkpoint.
+        history: If True, detect algorithm patterns over the whole log.
+        max_workers: Worker processes for history mode (default: CPU count).
 
     Returns:
         AnalysisResult with summary of analysis.
+
+    Raises:
+        ValueError: If both incremental and history are set.
     """
+    if incremental and history:
+        raise ValueError("incremental and history analysis are mutually exclusive")
+
+    observation_store = open_observation_store(project_root)
+    try:
+        instinct_store = open_instinct_store(project_root)
+        try:
+            return _analyze(
+                project_root,
+                observation_store,
+                instinct_store,
+                dry_run=dry_run,
+                skip_llm=skip_llm,
+                incremental=incremental,
+                history=history,
+                max_workers=max_workers,
+            )
+        finally:
+            instinct_store.close()
+    finally:
+        observation_store.close()
+
+
+def _analyze(
+    project_root: Path,
+    observation_store: ObservationStore,
+    instinct_store: InstinctStore,
+    dry_run: bool,
+    skip_llm: bool,
+    incremental: bool,
+    history: bool,
+    max_workers: int | None,
+) -> AnalysisResult:
+    """Run analyze_observations against open stores."""
     warnings: list[str] = []
     detection_sources: list[str] = ["algorithm"]
 
-    instincts_dir = get_learned_dir(project_root)
-    observations_file = get_observations_file(project_root)
-
-    # Load existing instincts once - reused for LLM context and duplicate checking
-    existing_instincts = _load_existing_instincts(instincts_dir)
+    # Load existing instinct metadata once - reused for LLM context and
+    # duplicate checking; bodies are not read
+    existing_instincts = instinct_store.load_instincts()
     existing_ids = {inst.id for inst in existing_instincts}
 
     # Check for too many instinct files (EC-4)
@@ -393,12 +284,35 @@ def analyze_observations(
             "this may impact performance"
         )
 
-    # Load recent observations for analysis (AC-R2.3)
-    observations = load_recent_observations(
-        observations_file, limit=MAX_OBSERVATIONS_FOR_ANALYSIS
-    )
+    use_llm = is_llm_available() and not skip_llm
+    # The LLM sees whole observations; the detectors only the fields they read
+    fields = None if use_llm else required_fields()
+
+    observation_slice: ObservationSlice | None = None
+    carry_over = None
+    if incremental:
+        checkpoint = load_checkpoint(get_analysis_checkpoint_file(project_root))
+        observation_slice = observation_store.observations_since(
+            checkpoint, limit=MAX_OBSERVATIONS_FOR_ANALYSIS, fields=fields
+        )
+        observations = observation_slice.observations if observation_slice else []
+        if observation_slice and observation_slice.resumed and checkpoint:
+            carry_over = checkpoint.carry_over
+    else:
+        # Load recent observations for analysis (AC-R2.3)
+        observations = observation_store.recent_observations(
+            MAX_OBSERVATIONS_FOR_ANALYSIS, fields=fields
+        )
+    # Read back the blob-stored text the detectors need (error outputs)
+    blob_store = BlobStore(get_blobs_dir(project_root))
+    observations = list(resolve_blob_fields(observations, blob_store, fields))
+
+    # Grouped and sorted once for all detectors
+    pipeline = DetectionPipeline(observations, carry_over)
 
     if not observations:
+        if observation_slice and not dry_run:
+            _save_checkpoint(project_root, observation_slice, pipeline)
         return AnalysisResult(
             patterns_detected=0,
             instincts_created=0,
@@ -408,12 +322,24 @@ def analyze_observations(
             detection_sources=tuple(detection_sources),
         )
 
-    # Algorithm-based pattern detection (always runs)
-    algorithm_patterns = detect_all_patterns(observations_file)
+    if history and isinstance(observation_store, FileObservationStore):
+        algorithm_patterns = detect_history_patterns(
+            observation_store.observations_file, max_workers
+        )
+    elif history:
+        # Other backends stream their whole history through one pipeline
+        history_fields = required_fields()
+        history_observations = resolve_blob_fields(
+            observation_store.iter_observations(history_fields), blob_store, history_fields
+        )
+        algorithm_patterns = DetectionPipeline(history_observations).detect_all()
+    else:
+        # Algorithm-based pattern detection (always runs) over the same window
+        # the LLM sees
+        algorithm_patterns = pipeline.detect_all()
 
     # LLM-based pattern detection (AC-R2.1, AC-R2.2)
     llm_patterns: list[Pattern] = []
-    use_llm = is_llm_available() and not skip_llm
 
     if use_llm:
         detection_sources.append("llm")
@@ -430,33 +356,36 @@ def analyze_observations(
     else:
         patterns = algorithm_patterns
 
-    if not patterns:
-        return AnalysisResult(
-            patterns_detected=0,
-            instincts_created=0,
-            instincts_updated=0,
-            warnings=tuple(warnings),
-            patterns=(),
-            detection_sources=tuple(detection_sources),
-        )
-
     instincts_created = 0
     instincts_updated = 0
 
     if not dry_run:
+        confirmations: list[LedgerEntry] = []
+        # Only evidence appended since a checkpoint is new; a window read on
+        # the first run or after a rollover or gap may hold analyzed lines
+        confirm = observation_slice is not None and observation_slice.resumed
+
         for pattern in patterns:
             instinct = _pattern_to_instinct(pattern)
 
             # Check if instinct with similar ID already exists
             if instinct.id in existing_ids:
-                # Update existing instinct
-                instincts_updated += 1
+                if confirm:
+                    # The new evidence confirms the instinct; the ledger is
+                    # folded in later
+                    confirmations.append(_confirmation_entry(instinct.id, pattern))
+                    instincts_updated += 1
             else:
                 # Create new instinct
-                _write_instinct_file(instinct, instincts_dir)
+                instinct_store.write_instinct(instinct)
                 instincts_created += 1
                 existing_ids.add(instinct.id)
 
+        append_entries(get_confidence_ledger_file(project_root), confirmations)
+
+        if observation_slice:
+            _save_checkpoint(project_root, observation_slice, pipeline)
+
     return AnalysisResult(
         patterns_detected=len(patterns),
         instincts_created=instincts_created,
@@ -474,24 +403,47 @@ def apply_confidence_decay(directory: Path) -> list[Instinct]:
         directory: Directory containing instinct files.
 
     Returns:
-        List of instincts with updated confidence.
+        List of instincts with their effective confidence (see decay_instincts).
     """
-    instincts = _load_existing_instincts(directory)
-    decayed_instincts: list[Instinct] = []
+    return decay_instincts(FileInstinctStore(directory))
 
-    for instinct in instincts:
-        decayed = apply_decay_to_instinct(instinct)
 
-        # Check if should be marked dormant
-        new_status = check_dormant_status(decayed.confidence)
-        if new_status != decayed.status:
-            decayed = decayed.with_status(new_status)
+def decay_instincts(store: InstinctStore, as_of: datetime | None = None) -> list[Instinct]:
+    """Apply confidence decay to every instinct in a store.
 
-        decayed_instincts.append(decayed)
+    Decay is not written back: the stored confidence stays the value at the
+    instinct's decay anchor and effective_confidence() decays it when read.
+    Only instincts whose effective confidence crossed the dormant threshold
+    are read in full and rewritten with their new status; their anchor is
+    pinned in last_observed so the rewrite does not restart the decay.
 
-        # Write updated instinct if confidence changed
-        if decayed.confidence != instinct.confidence and instinct.source_file:
-            _write_instinct_file(decayed, directory)
+    Args:
+        store: Instinct store to decay.
+        as_of: Time to evaluate at (defaults to now).
+
+    Returns:
+        List of instincts with their effective confidence and status (with
+        their bodies only if they were rewritten).
+    """
+    if as_of is None:
+        as_of = datetime.now(timezone.utc)
+    decayed_instincts: list[Instinct] = []
+
+    for instinct in store.load_instincts():
+        confidence = effective_confidence(instinct, as_of)
+        status = check_dormant_status(confidence)
+
+        # Rewrite only on a status transition
+        if status != instinct.status:
+            full = store.get_instinct(instinct.id)
+            if full is None:
+                continue
+            instinct = replace(
+                full, status=status, last_observed=decay_anchor(full), updated_at=as_of
+            )
+            store.write_instinct(instinct)
+
+        decayed_instincts.append(replace(instinct, confidence=confidence, status=status))
 
     return decayed_instincts
 
@@ -531,3 +483,170 @@ def format_analysis_summary(result: AnalysisResult) -> str:
     lines.append("")
 
     return "\n".join(lines)
+
+
+class AnalysisTimeoutError(Exception):
+    """Raised when a background analysis pass exceeds its wall-clock budget.
+
+    Deliberately not a TimeoutError: that is an OSError, which file-handling
+    code in the analysis path catches and logs.
+    """
+
+
+@contextmanager
+def _time_budget(seconds: float) -> Iterator[None]:
+    """Raise AnalysisTimeoutError in the main thread once seconds have elapsed.
+
+    Only enforced in the main thread (signals cannot be delivered elsewhere);
+    a non-positive budget disables it.
+    """
+    if seconds <= 0 or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_timeout(signum: int, frame: Any) -> None:
+        raise AnalysisTimeoutError(f"Background analysis exceeded {seconds:g}s budget")
+
+    previous = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@contextmanager
+def _memory_budget(megabytes: int) -> Iterator[None]:
+    """Cap the process address space so a runaway run fails with MemoryError.
+
+    A non-positive budget disables it. The previous limit is restored on exit.
+    """
+    if megabytes <= 0:
+        yield
+        return
+
+    previous = resource.getrlimit(resource.RLIMIT_AS)
+    limit = megabytes * 1024 * 1024
+    if previous[1] != resource.RLIM_INFINITY:
+        limit = min(limit, previous[1])
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, previous[1]))
+    except (ValueError, OSError) as e:
+        logger.warning("Failed to set memory budget: %s", e)
+        yield
+        return
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, previous)
+
+
+def run_background_analysis(
+    project_root: Path,
+    skip_llm: bool = False,
+    max_seconds: float = AUTO_LEARN_MAX_SECONDS,
+    max_memory_mb: int = AUTO_LEARN_MAX_MEMORY_MB,
+    history: bool = False,
+    max_workers: int | None = None,
+) -> int:
+    """Run one background learning pass under the auto-learn lease.
+
+    Takes the lease (returning immediately if another worker holds it),
+    analyzes new observations incrementally, folds the confidence ledger if
+    it is due, applies confidence decay, records the run in the auto-learn
+    state, then compresses and applies retention to closed log segments.
+    The lease is renewed while the pass runs and always released afterwards.
+
+    Args:
+        project_root: Project root for project-scoped storage.
+        skip_llm: If True, skip LLM analysis even when API key is available.
+        max_seconds: Wall-clock budget; non-positive disables it.
+        max_memory_mb: Address-space budget; non-positive disables it.
+        history: If True, analyze the whole log instead of new observations
+            (see analyze_observations).
+        max_workers: Worker processes for history mode.
+
+    Returns:
+        Process exit code: 0 on success or when another worker holds the
+        lease, 1 if the pass failed, ran out of budget or lost the lease.
+    """
+    if not acquire_lock(project_root):
+        logger.debug("Auto-learn already running for %s", project_root)
+        return 0
+
+    try:
+        with lease_heartbeat(project_root) as lease_lost:
+            with _memory_budget(max_memory_mb), _time_budget(max_seconds):
+                analyze_observations(
+                    project_root,
+                    skip_llm=skip_llm,
+                    incremental=not history,
+                    history=history,
+                    max_workers=max_workers,
+                )
+                instinct_store = open_instinct_store(project_root)
+                try:
+                    fold_ledger(get_confidence_ledger_file(project_root), instinct_store)
+                    decay_instincts(instinct_store)
+                finally:
+                    instinct_store.close()
+
+                if lease_lost.is_set():
+                    logger.warning("Auto-learn lease lost; not recording this run")
+                    return 1
+
+                state = load_state(project_root)
+                save_state(
+                    project_root,
+                    replace(
+                        state,
+                        last_analysis_time=datetime.now(timezone.utc),
+                        observation_count_at_analysis=count_observations(project_root),
+                    ),
+                )
+                # Last, so running out of budget here still leaves the run recorded
+                compact_segments(get_observations_file(project_root))
+            return 0
+    except (AnalysisTimeoutError, MemoryError, OSError, ValueError) as e:
+        logger.warning("Background analysis failed: %s", e)
+        return 1
+    finally:
+        release_lock(project_root)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the background worker.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:]).
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m instincts.agent",
+        description="Run one background instinct-learning pass",
+    )
+    parser.add_argument("--project-root", type=Path, default=Path.cwd())
+    parser.add_argument("--skip-llm", action="store_true")
+    parser.add_argument("--max-seconds", type=float, default=AUTO_LEARN_MAX_SECONDS)
+    parser.add_argument("--max-memory-mb", type=int, default=AUTO_LEARN_MAX_MEMORY_MB)
+    parser.add_argument(
+        "--history", action="store_true", help="analyze every closed log segment"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    return run_background_analysis(
+        args.project_root.resolve(),
+        skip_llm=args.skip_llm,
+        max_seconds=args.max_seconds,
+        max_memory_mb=args.max_memory_mb,
+        history=args.history,
+        max_workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
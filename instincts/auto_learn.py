@@ -4,25 +4,30 @@ This module provides automatic learning trigger logic:
 - Threshold checking (50 observations)
 - Cooldown mechanism (5 minutes)
 - Background subprocess spawn
-- Lock file to prevent concurrent runs
+- Lease-based lock file to prevent concurrent runs
 """
 
+import fcntl
 import json
 import logging
 import os
-import subprocess
 import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 from instincts.config import (
     AUTO_LEARN_COOLDOWN_SECONDS,
+    AUTO_LEARN_HEARTBEAT_SECONDS,
+    AUTO_LEARN_LEASE_SECONDS,
     AUTO_LEARN_LOCK_FILE,
     AUTO_LEARN_OBSERVATION_THRESHOLD,
     AUTO_LEARN_STATE_FILE,
-    get_observations_file,
     get_project_instincts_dir,
 )
 
@@ -75,7 +80,7 @@ def load_state(project_root: Path) -> AutoLearnState:
             last_analysis_time=last_time,
             observation_count_at_analysis=data.get("observation_count_at_analysis", 0),
         )
-    except (json.JSONDecodeError, ValueError, KeyError) as e:
+    except (json.JSONDecodeError, ValueError, KeyError, TypeError, AttributeError) as e:
         logger.warning("Failed to load auto-learn state: %s", e)
         return AutoLearnState(last_analysis_time=None, observation_count_at_analysis=0)
 
@@ -95,44 +100,64 @@ def save_state(project_root: Path, state: AutoLearnState) -> None:
         "last_analysis_time": state.last_analysis_time.isoformat() if state.last_analysis_time else None,
         "observation_count_at_analysis": state.observation_count_at_analysis,
     }
-    state_file.write_text(json.dumps(data, indent=2))
+
+    # Atomic replace: a worker stopped by its time budget must not leave a torn file
+    fd, temp_path = tempfile.mkstemp(dir=instincts_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(data, indent=2))
+        os.replace(temp_path, state_file)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
 
 
 def count_observations(project_root: Path) -> int:
-    """Count observations in the project's observations file.
+    """Count observations in the project's observation store.
+
+    For the file backend this covers every segment of the log.
 
     Args:
         project_root: Path to the project root.
 
     Returns:
-        Number of observations, or 0 if file doesn't exist.
+        Number of observations, or 0 if the log doesn't exist.
     """
-    obs_file = get_observations_file(project_root)
-
-    if not obs_file.exists():
-        return 0
+    # Imported here: the hooks count with their shared counter instead
+    from instincts.storage import open_observation_store
 
     try:
-        with obs_file.open() as f:
-            return sum(1 for _ in f)
+        store = open_observation_store(project_root)
+        try:
+            return store.count_observations()
+        finally:
+            store.close()
     except OSError as e:
         logger.warning("Failed to count observations: %s", e)
         return 0
 
 
-def should_trigger_learning(project_root: Path) -> bool:
+def should_trigger_learning(project_root: Path, observation_count: int | None = None) -> bool:
     """Check if auto-learning should be triggered.
 
     Args:
         project_root: Path to the project root.
+        observation_count: Observations already counted by the caller (the
+            hooks' shared counter), so the store is not opened to count them.
 
     Returns:
         True if learning should be triggered.
     """
-    try:
-        obs_count = count_observations(project_root)
-    except OSError:
-        return False
+    if observation_count is not None:
+        obs_count = observation_count
+    else:
+        try:
+            obs_count = count_observations(project_root)
+        except OSError:
+            return False
 
     # Check threshold
     if obs_count < AUTO_LEARN_OBSERVATION_THRESHOLD:
@@ -148,50 +173,198 @@ def should_trigger_learning(project_root: Path) -> bool:
     return True
 
 
+@contextmanager
+def _locked_lock_file(project_root: Path) -> Iterator[int]:
+    """Open the lock file and hold an exclusive flock on it.
+
+    If the file was released (unlinked) between open and flock, it is
+    reopened, so the caller always holds the flock of the file currently at
+    the lock path. Lease reads and writes happen only under this flock.
+
+    Yields:
+        File descriptor of the locked lock file.
+
+    Raises:
+        OSError: If the lock file cannot be opened (e.g. it is a symlink).
+    """
+    lock_file = _get_lock_file_path(project_root)
+    while True:
+        fd = os.open(lock_file, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.path.samestat(os.fstat(fd), os.stat(lock_file)):
+                    break
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+
+def _read_lease(fd: int) -> dict[str, Any] | None:
+    """Read the lease from a locked lock file (None if free or unreadable)."""
+    try:
+        lease = json.loads(os.pread(fd, 4096, 0) or b"null")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return lease if isinstance(lease, dict) else None
+
+
+def _write_lease(fd: int, acquired_at: str, now: datetime) -> None:
+    """Write a lease owned by this process, valid for AUTO_LEARN_LEASE_SECONDS."""
+    lease = {
+        "pid": os.getpid(),
+        "timestamp": acquired_at,
+        "heartbeat": now.isoformat(),
+        "expires_at": (now + timedelta(seconds=AUTO_LEARN_LEASE_SECONDS)).isoformat(),
+    }
+    data = json.dumps(lease).encode()
+    os.ftruncate(fd, 0)
+    os.pwrite(fd, data, 0)
+
+
+def _lease_expired(lease: dict[str, Any], now: datetime) -> bool:
+    """Check whether a lease has expired.
+
+    Locks written before leases existed only have a "timestamp"; they expire
+    AUTO_LEARN_LEASE_SECONDS after it. An unparseable lease counts as
+    expired so a corrupt lock file cannot wedge the project.
+    """
+    try:
+        if "expires_at" in lease:
+            expires_at = datetime.fromisoformat(lease["expires_at"])
+        else:
+            expires_at = datetime.fromisoformat(lease["timestamp"]) + timedelta(
+                seconds=AUTO_LEARN_LEASE_SECONDS
+            )
+        return now >= expires_at
+    except (KeyError, TypeError, ValueError):
+        return True
+
+
 def acquire_lock(project_root: Path) -> bool:
-    """Try to acquire the auto-learn lock.
+    """Try to acquire the auto-learn lease.
+
+    The lock file holds a lease (pid, heartbeat, expiry). A lease that was
+    not renewed before it expired belongs to a worker that died or hung,
+    and is taken over.
 
     Args:
         project_root: Path to the project root.
 
     Returns:
-        True if lock was acquired, False if already locked.
+        True if the lease was acquired, False if another process holds it.
     """
     instincts_dir = get_project_instincts_dir(project_root)
     instincts_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
 
-    lock_file = _get_lock_file_path(project_root)
-
-    # Check if lock already exists
-    if lock_file.exists():
+    try:
+        with _locked_lock_file(project_root) as fd:
+            now = datetime.now(timezone.utc)
+            lease = _read_lease(fd)
+            if lease is not None and not _lease_expired(lease, now):
+                return False
+            if lease is not None:
+                logger.warning(
+                    "Taking over stale auto-learn lock from pid %s", lease.get("pid")
+                )
+            _write_lease(fd, now.isoformat(), now)
+            return True
+    except OSError as e:
+        logger.warning("Failed to acquire auto-learn lock: %s", e)
         return False
 
+
+def renew_lock(project_root: Path) -> bool:
+    """Extend the auto-learn lease held by this process.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        True if renewed, False if the lease is no longer ours.
+    """
     try:
-        # Try to create lock file exclusively
-        lock_data = {
-            "pid": os.getpid(),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-        with lock_file.open("x") as f:
-            f.write(json.dumps(lock_data))
-        return True
-    except FileExistsError:
+        with _locked_lock_file(project_root) as fd:
+            lease = _read_lease(fd)
+            if lease is None or lease.get("pid") != os.getpid():
+                return False
+            _write_lease(
+                fd,
+                str(lease.get("timestamp", "")),
+                datetime.now(timezone.utc),
+            )
+            return True
+    except OSError as e:
+        logger.warning("Failed to renew auto-learn lock: %s", e)
         return False
 
 
 def release_lock(project_root: Path) -> None:
-    """Release the auto-learn lock.
+    """Release the auto-learn lease.
+
+    The lock file is removed only if the lease is free or held by this
+    process, so a worker whose lease was taken over cannot release the new
+    holder's lock.
 
     Args:
         project_root: Path to the project root.
     """
     lock_file = _get_lock_file_path(project_root)
+    if not lock_file.exists():
+        return
     try:
-        lock_file.unlink(missing_ok=True)
+        with _locked_lock_file(project_root) as fd:
+            lease = _read_lease(fd)
+            if lease is not None and lease.get("pid") != os.getpid():
+                return
+            lock_file.unlink(missing_ok=True)
     except OSError as e:
         logger.warning("Failed to release lock: %s", e)
 
 
+@contextmanager
+def lease_heartbeat(
+    project_root: Path, interval: float = AUTO_LEARN_HEARTBEAT_SECONDS
+) -> Iterator[threading.Event]:
+    """Renew the auto-learn lease from a background thread while work runs.
+
+    If a renewal fails (the lease expired and was taken over), the yielded
+    event is set and renewals stop.
+
+    Args:
+        project_root: Path to the project root.
+        interval: Seconds between renewals.
+
+    Yields:
+        Event that is set once the lease has been lost.
+    """
+    stopped = threading.Event()
+    lost = threading.Event()
+
+    def renew() -> None:
+        while not stopped.wait(interval):
+            if not renew_lock(project_root):
+                logger.warning("Lost auto-learn lease for %s", project_root)
+                lost.set()
+                return
+
+    thread = threading.Thread(target=renew, name="auto-learn-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield lost
+    finally:
+        stopped.set()
+        thread.join()
+
+
 def trigger_background_analysis(project_root: Path) -> None:
     """Trigger background pattern analysis.
 
@@ -200,6 +373,9 @@ def trigger_background_analysis(project_root: Path) -> None:
     Args:
         project_root: Path to the project root.
     """
+    # Imported here: only one of many hook calls spawns the worker
+    import subprocess
+
     try:
         # Build the command to run agent analysis
         cmd = [
@@ -0,0 +1,235 @@
+"""Columnar in-memory observations for Instinct-Based Learning.
+
+Observation dicts repeat every key, carry input/output strings of up to
+5,000 characters and hold timestamps as strings. ObservationBatch keeps one
+row per observation in typed `array` columns instead:
+- event kinds, tool names and session IDs as small integer codes
+- timestamps as epoch microseconds
+- the facts the detectors read from the large text fields (file path of a
+  Write/Edit, error keywords in tool output, correction keywords in a user
+  message), taken from the enriched keys or extracted once while the batch
+  is built
+
+Tool output text is only needed to describe a resolved error, so it is kept
+for error rows only; all other text is dropped after extraction.
+DetectionPipeline and the history summaries run the detectors over these
+columns.
+"""
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from instincts.enrichment import extract_file_path, has_error_keywords
+from instincts.matchers import KeywordMatcher
+
+# Correction keywords to detect user corrections
+CORRECTION_KEYWORDS: tuple[str, ...] = ("no", "instead", "actually", "don't", "dont")
+
+# Word boundaries avoid false positives ("no" in "note")
+_CORRECTION_MATCHER = KeywordMatcher(CORRECTION_KEYWORDS, whole_words=True)
+
+# Event kinds by code; unknown events get code 0
+EVENT_NAMES: tuple[str, ...] = ("", "tool_start", "tool_complete", "user_message")
+EVENT_START: int = 1
+EVENT_COMPLETE: int = 2
+EVENT_MESSAGE: int = 3
+
+# Row flags
+FLAG_ERROR: int = 1  # tool_complete whose output has error keywords
+FLAG_CORRECTION: int = 2  # user_message with correction keywords
+
+# Timestamp of rows without a parseable timestamp (sorts first, like "")
+MISSING_TIMESTAMP: int = -(2**63)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES) if name}
+
+
+def _observation_file_path(obs: dict[str, Any]) -> str | None:
+    """Get the file path of a tool_start, parsing the input of legacy lines."""
+    if "file_path" in obs:
+        file_path = obs["file_path"]
+        return file_path if isinstance(file_path, str) else None
+    input_str = obs.get("input", "")
+    return extract_file_path(input_str) if isinstance(input_str, str) else None
+
+
+def _is_error_observation(obs: dict[str, Any]) -> bool:
+    """Check whether a tool_complete failed, scanning the output of legacy lines."""
+    if "is_error" in obs:
+        return bool(obs["is_error"])
+    return has_error_keywords(str(obs.get("output", "")))
+
+
+def _observation_error_type(obs: dict[str, Any]) -> str | None:
+    """Get the error type recorded at write time, if any."""
+    error_type = obs.get("error_type")
+    return error_type if isinstance(error_type, str) else None
+
+
+def _has_correction_keywords(text: str) -> bool:
+    """Check if text contains correction keywords (at word boundaries)."""
+    return _CORRECTION_MATCHER.search(text)
+
+
+def _epoch_micros(value: Any) -> int:
+    """Convert an ISO timestamp to epoch microseconds (naive means UTC)."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return MISSING_TIMESTAMP
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(microseconds=1)
+
+
+class _Interner:
+    """Assign small integer codes to strings in first-seen order."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+@dataclass(frozen=True)
+class ObservationBatch:
+    """Observations stored column by column.
+
+    Row i of every column describes the i-th observation, in input order.
+
+    Attributes:
+        events: Event code per row (index into EVENT_NAMES).
+        tools: Tool code per row (index into tool_names; "" if none).
+        sessions: Session code per row (index into session_ids).
+        timestamps: Epoch microseconds per row, or MISSING_TIMESTAMP.
+        file_paths: File path code of Write/Edit starts, else -1.
+        flags: FLAG_ERROR / FLAG_CORRECTION bits per row.
+        tool_names: Interned tool names.
+        session_ids: Interned session IDs, in order of first appearance.
+        path_names: Interned file paths.
+        error_outputs: Tool output of rows flagged FLAG_ERROR.
+        error_types: Error type recorded at write time, for rows that have it.
+    """
+
+    events: "array[int]" = field(default_factory=lambda: array("b"))
+    tools: "array[int]" = field(default_factory=lambda: array("i"))
+    sessions: "array[int]" = field(default_factory=lambda: array("i"))
+    timestamps: "array[int]" = field(default_factory=lambda: array("q"))
+    file_paths: "array[int]" = field(default_factory=lambda: array("i"))
+    flags: "array[int]" = field(default_factory=lambda: array("b"))
+    tool_names: list[str] = field(default_factory=list)
+    session_ids: list[str] = field(default_factory=list)
+    path_names: list[str] = field(default_factory=list)
+    error_outputs: dict[int, str] = field(default_factory=dict)
+    error_types: dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_observations(cls, observations: Iterable[dict[str, Any]]) -> "ObservationBatch":
+        """Build a batch, consuming the observations once.
+
+        Args:
+            observations: Observation dictionaries, e.g. a streaming reader.
+
+        Returns:
+            ObservationBatch holding the observations' columns.
+        """
+        batch = cls()
+        tools = _Interner()
+        sessions = _Interner()
+        paths = _Interner()
+        tools.code("")
+
+        for obs in observations:
+            row = len(batch.events)
+            event = _EVENT_CODES.get(obs.get("event", ""), 0)
+            tool = obs.get("tool", "")
+            file_path = -1
+            flags = 0
+
+            if event == EVENT_START and tool in ("Write", "Edit"):
+                path = _observation_file_path(obs)
+                if path:
+                    file_path = paths.code(path)
+            elif event == EVENT_COMPLETE and _is_error_observation(obs):
+                flags = FLAG_ERROR
+                batch.error_outputs[row] = str(obs.get("output", ""))
+                error_type = _observation_error_type(obs)
+                if error_type is not None:
+                    batch.error_types[row] = error_type
+            elif event == EVENT_MESSAGE and _has_correction_keywords(
+                obs.get("content", "")
+            ):
+                flags = FLAG_CORRECTION
+
+            batch.events.append(event)
+            batch.tools.append(tools.code(tool) if isinstance(tool, str) else 0)
+            batch.sessions.append(sessions.code(obs.get("session", "unknown")))
+            batch.timestamps.append(_epoch_micros(obs.get("timestamp")))
+            batch.file_paths.append(file_path)
+            batch.flags.append(flags)
+
+        batch.tool_names.extend(tools.values)
+        batch.session_ids.extend(sessions.values)
+        batch.path_names.extend(paths.values)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def tool_name(self, row: int) -> str:
+        """Tool of one row as reported in patterns ("unknown" if none)."""
+        return self.tool_names[self.tools[row]] or "unknown"
+
+    def timestamp(self, row: int) -> str | None:
+        """ISO timestamp of one row, or None if it had none."""
+        timestamp = self.timestamps[row]
+        if timestamp == MISSING_TIMESTAMP:
+            return None
+        return (_EPOCH + timedelta(microseconds=timestamp)).isoformat()
+
+    def observation(self, row: int) -> dict[str, Any]:
+        """Rebuild a light observation dict for one row (without large text).
+
+        Args:
+            row: Row index.
+
+        Returns:
+            Dict with event, tool, session, is_error for failed completions
+            and (if known) timestamp.
+        """
+        obs: dict[str, Any] = {
+            "event": EVENT_NAMES[self.events[row]],
+            "tool": self.tool_names[self.tools[row]],
+            "session": self.session_ids[self.sessions[row]],
+        }
+        if self.flags[row] & FLAG_ERROR:
+            obs["is_error"] = True
+        timestamp = self.timestamp(row)
+        if timestamp is not None:
+            obs["timestamp"] = timestamp
+        return obs
+
+    def session_rows(self) -> "dict[str, array[int]]":
+        """Rows of each session, sorted by timestamp.
+
+        Returns:
+            Mapping of session ID to row indexes, sessions in order of
+            first appearance.
+        """
+        grouped = [array("i") for _ in self.session_ids]
+        for row, session in enumerate(self.sessions):
+            grouped[session].append(row)
+        return {
+            session_id: array("i", sorted(rows, key=self.timestamps.__getitem__))
+            for session_id, rows in zip(self.session_ids, grouped, strict=True)
+        }
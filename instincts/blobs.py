@@ -0,0 +1,138 @@
+"""Content-addressed blob store for large observation fields.
+
+Sessions often repeat the same large tool output (the same test failure,
+the same file read) and each copy used to be written inline into
+observations.jsonl. With $INSTINCT_BLOB_STORE set, the observer writes an
+input or output of at least BLOB_MIN_LENGTH characters once, to
+blobs/<sha256[:2]>/<sha256[2:]>, and the observation stores the hash under
+"input_ref"/"output_ref" instead of the text (the length is already in
+"input_length"/"output_length").
+
+Blobs are written once and never modified, so readers need no locking.
+BlobStore.get() memoizes what it reads, so a repeated error output is read
+from disk once per analysis run.
+
+This module is imported on the hook path, so it only uses hashlib, os and re.
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from instincts.config import BLOB_MIN_LENGTH, BLOB_STORE_ENV, BLOBS_DIR_NAME
+
+# Large observation fields that may be moved to the blob store
+BLOB_FIELDS: tuple[str, ...] = ("input", "output")
+
+# Suffix of the observation key holding a blob field's reference
+BLOB_REF_SUFFIX: str = "_ref"
+
+_REF_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def blob_store_enabled() -> bool:
+    """Whether the observer should write large fields to the blob store."""
+    return os.environ.get(BLOB_STORE_ENV, "") not in ("", "0")
+
+
+def should_store_blob(text: str) -> bool:
+    """Whether a field is large enough to be stored as a blob."""
+    return len(text) >= BLOB_MIN_LENGTH
+
+
+def blob_ref(text: str) -> str:
+    """Get the content reference (SHA-256 hex digest) of a blob's text."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def log_blobs_dir(observations_file: Path) -> Path:
+    """Get the blob store directory of an observation log.
+
+    Args:
+        observations_file: Path to the active observations.jsonl file.
+
+    Returns:
+        Path to the blobs/ directory next to the log.
+    """
+    return observations_file.parent / BLOBS_DIR_NAME
+
+
+class BlobStore:
+    """Write-once blobs keyed by the SHA-256 of their text.
+
+    Example:
+        store = BlobStore(get_blobs_dir(project_root))
+        ref = store.put(output)
+        assert store.get(ref) == output
+    """
+
+    def __init__(self, blobs_dir: Path) -> None:
+        """Open a blob store; the directory is created by the first put().
+
+        Args:
+            blobs_dir: Directory holding the blobs.
+        """
+        self.blobs_dir = blobs_dir
+        self._cache: dict[str, str | None] = {}
+
+    def path(self, ref: str) -> Path:
+        """Get the file path of a blob, fanned out by the first two hex digits.
+
+        Raises:
+            ValueError: If ref is not a SHA-256 hex digest.
+        """
+        if not _REF_PATTERN.fullmatch(ref):
+            raise ValueError(f"Invalid blob reference: {ref!r}")
+        return self.blobs_dir / ref[:2] / ref[2:]
+
+    def put(self, text: str) -> str:
+        """Store text unless a blob with the same content already exists.
+
+        The blob is written to a temporary file and renamed into place, so
+        readers never see a partial blob.
+
+        Args:
+            text: Content to store.
+
+        Returns:
+            The blob's reference.
+
+        Raises:
+            OSError: If the blob cannot be written.
+        """
+        ref = blob_ref(text)
+        path = self.path(ref)
+        if path.exists():
+            return ref
+
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", errors="surrogatepass") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return ref
+
+    def get(self, ref: str) -> str | None:
+        """Read a blob's text, memoized for the lifetime of the store.
+
+        Args:
+            ref: Blob reference from an observation.
+
+        Returns:
+            The blob's text, or None if the reference is invalid or the blob
+            is missing or unreadable.
+        """
+        if ref in self._cache:
+            return self._cache[ref]
+        try:
+            text: str | None = self.path(ref).read_text(encoding="utf-8", errors="surrogatepass")
+        except (OSError, ValueError):
+            text = None
+        self._cache[ref] = text
+        return text
@@ -0,0 +1,147 @@
+"""Incremental analysis checkpoints for Instinct-Based Learning.
+
+A checkpoint records how far into the observations log analysis has run
+(file inode and byte offset) plus the detector state still open for each
+session at that point, so the next run only reads newly appended lines.
+It is stored in its own file, written only by the analysis worker, so the
+auto-learn state read by the hooks stays small.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SessionCarryOver:
+    """Detector state left open at the end of a session's analyzed slice.
+
+    Attributes:
+        open_writes: File paths written but not yet edited in the session.
+        error_output: Output of the last error not yet followed by a success.
+        recent: Event and tool of the last few observations, for the
+            correction-keyword lookback.
+        last_timestamp: Timestamp of the session's latest observation.
+    """
+
+    open_writes: tuple[str, ...] = ()
+    error_output: str | None = None
+    recent: tuple[dict[str, Any], ...] = ()
+    last_timestamp: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "open_writes": list(self.open_writes),
+            "error_output": self.error_output,
+            "recent": list(self.recent),
+            "last_timestamp": self.last_timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SessionCarryOver":
+        """Create from a dictionary produced by to_dict.
+
+        Raises:
+            TypeError, ValueError: If the data is malformed.
+        """
+        error_output = data.get("error_output")
+        return cls(
+            open_writes=tuple(str(path) for path in data.get("open_writes", [])),
+            error_output=str(error_output) if error_output is not None else None,
+            recent=tuple(dict(obs) for obs in data.get("recent", [])),
+            last_timestamp=str(data.get("last_timestamp", "")),
+        )
+
+
+EMPTY_CARRY_OVER = SessionCarryOver()
+
+
+@dataclass(frozen=True)
+class AnalysisCheckpoint:
+    """Position in the observations log up to which analysis has run.
+
+    Attributes:
+        inode: Inode of the observations file the offset refers to.
+        offset: Byte offset just past the last analyzed line.
+        carry_over: Open detector state per session at that offset.
+    """
+
+    inode: int
+    offset: int
+    carry_over: Mapping[str, SessionCarryOver]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "inode": self.inode,
+            "offset": self.offset,
+            "carry_over": {
+                session_id: carried.to_dict()
+                for session_id, carried in self.carry_over.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AnalysisCheckpoint":
+        """Create from a dictionary produced by to_dict.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is malformed.
+        """
+        return cls(
+            inode=int(data["inode"]),
+            offset=int(data["offset"]),
+            carry_over={
+                str(session_id): SessionCarryOver.from_dict(carried)
+                for session_id, carried in data.get("carry_over", {}).items()
+            },
+        )
+
+
+def load_checkpoint(checkpoint_file: Path) -> AnalysisCheckpoint | None:
+    """Load a checkpoint saved by save_checkpoint.
+
+    Args:
+        checkpoint_file: Path to the checkpoint file.
+
+    Returns:
+        The checkpoint, or None if there is none or it is malformed.
+    """
+    try:
+        return AnalysisCheckpoint.from_dict(json.loads(checkpoint_file.read_text()))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.warning("Failed to load analysis checkpoint: %s", e)
+        return None
+
+
+def save_checkpoint(checkpoint_file: Path, checkpoint: AnalysisCheckpoint) -> None:
+    """Save a checkpoint, replacing the previous one atomically.
+
+    Args:
+        checkpoint_file: Path to the checkpoint file; its directory must exist.
+        checkpoint: Checkpoint to save.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=checkpoint_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(checkpoint.to_dict()))
+        os.replace(temp_path, checkpoint_file)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
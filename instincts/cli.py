@@ -9,7 +9,17 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from instincts.config import get_learned_dir, get_observations_file
+from instincts.confidence import decayed_confidence
+from instincts.config import get_learned_dir, get_observations_file, get_storage_db_file
+from instincts.frontmatter import parse_instinct_sections as parse_instinct_file
+from instincts.instinct_files import load_indexed_files
+from instincts.segments import read_log_index
+from instincts.storage import (
+    STORAGE_SQLITE,
+    open_instinct_store,
+    open_observation_store,
+    storage_backend,
+)
 from instincts.utils import normalize_trigger
 
 if TYPE_CHECKING:
@@ -18,123 +28,182 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-def _parse_frontmatter_line(line: str, current: dict[str, Any]) -> None:
-    """Parse a single YAML-like frontmatter line into the current dict.
+def load_all_instincts(
+    project_root: Path,
+    with_content: bool = True,
+    as_of: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Load all instincts from project learned directory.
+
+    Without content, the metadata of unchanged files comes from the
+    instinct index the agent also loads, and only new or modified files are
+    read; the index is rewritten when files changed, the only write of a
+    listing. Confidence is the effective confidence, decayed from the
+    stored value to as_of.
 
     Args:
-        line: A line from YAML frontmatter section.
-        current: Dictionary to update with parsed key-value pair.
+        project_root: Project root for project-scoped loading.
+        with_content: Whether to read each instinct's body into "content";
+            use _read_instinct_content() for the bodies you need otherwise.
+        as_of: Time to evaluate confidence at (defaults to now).
+
+    Returns:
+        List of instinct dictionaries with _source_file and _section
+        (position of the instinct in its file) fields added, and the stored
+        confidence as base_confidence where decay applies.
     """
-    if ":" not in line:
-        return
+    if storage_backend() == STORAGE_SQLITE:
+        instincts = _load_stored_instincts(project_root, with_content)
+    else:
+        instincts = _load_instinct_files(project_root, with_content)
 
-    key, value = line.split(":", 1)
-    key = key.strip()
-    value = value.strip().strip('"').strip("'")
+    _apply_effective_confidence(instincts, as_of or datetime.now(timezone.utc))
+    return instincts
 
-    if key == "confidence":
-        try:
-            current[key] = float(value)
-        except ValueError:
-            current[key] = value
+
+def _load_instinct_files(project_root: Path, with_content: bool) -> list[dict[str, Any]]:
+    """Load all instincts from the files in the learned directory.
+
+    Args:
+        project_root: Project root for project-scoped loading.
+        with_content: Whether to read each instinct's body.
+
+    Returns:
+        List of instinct dictionaries with their stored confidence.
+    """
+    instincts: list[dict[str, Any]] = []
+    instincts_dir = get_learned_dir(project_root)
+
+    if not instincts_dir.exists():
+        return instincts
+
+    loaded: list[tuple[Path, list[dict[str, Any]]]]
+    if with_content:
+        # Load both .yaml and .md files (AC-7.3)
+        files: list[Path] = []
+        for pattern in ("*.yaml", "*.md"):
+            for file in instincts_dir.glob(pattern):
+                # Skip symlinks for defense in depth
+                if file.is_symlink():
+                    logger.warning("Skipping symlink: %s", file)
+                    continue
+                files.append(file)
+        loaded = [(file, _parse_file_sections(file)) for file in files]
     else:
-        current[key] = value
+        # The instinct index lists the same files, skipping symlinks too
+        loaded = [
+            (instincts_dir / record.name, [dict(section) for section in record.sections])
+            for record in load_indexed_files(instincts_dir, complete=True)
+        ]
+
+    for file, parsed in loaded:
+        for section, inst in enumerate(parsed):
+            inst["_source_file"] = str(file)
+            inst["_section"] = section
+        instincts.extend(parsed)
+
+    return instincts
 
 
-def _finalize_instinct(
-    current: dict[str, Any], content_lines: list[str], instincts: list[dict[str, Any]]
-) -> None:
-    """Finalize current instinct and add to list if valid.
+def _apply_effective_confidence(instincts: list[dict[str, Any]], as_of: datetime) -> None:
+    """Replace stored confidences with their effective value at as_of.
+
+    Decay runs from last_observed, or updated_at (see decay_anchor);
+    instincts with neither, like most hand-written ones, do not decay.
 
     Args:
-        current: Dictionary with parsed frontmatter fields.
-        content_lines: Lines of markdown content after frontmatter.
-        instincts: List to append the finalized instinct to.
+        instincts: Instinct dictionaries to update in place.
+        as_of: Time to evaluate at.
     """
-    if not current:
-        return
-
-    current["content"] = "\n".join(content_lines).strip()
-    instincts.append(current)
+    for inst in instincts:
+        confidence = inst.get("confidence")
+        anchor_text = inst.get("last_observed") or inst.get("updated_at")
+        if not isinstance(confidence, float) or not isinstance(anchor_text, str):
+            continue
+        try:
+            anchor = datetime.fromisoformat(anchor_text)
+        except ValueError:
+            continue
+        if anchor.tzinfo is None:
+            anchor = anchor.replace(tzinfo=timezone.utc)
+        inst["base_confidence"] = confidence
+        inst["confidence"] = decayed_confidence(confidence, anchor, as_of)
 
 
-def parse_instinct_file(content: str) -> list[dict[str, Any]]:
-    """Parse YAML-like instinct file format.
+def _parse_file_sections(file: Path) -> list[dict[str, Any]]:
+    """Read and parse an instinct file, logging and skipping errors.
 
     Args:
-        content: File content with YAML frontmatter sections.
+        file: Instinct file to parse.
 
     Returns:
-        List of instinct dictionaries with id, trigger, confidence, etc.
+        The file's instinct dictionaries (empty if it can't be read).
     """
-    if not content.strip():
-        return []
+    try:
+        return parse_instinct_file(file.read_text())
+    except (OSError, IOError) as e:
+        # File read error - log and skip
+        logger.warning("Failed to read instinct file %s: %s", file, e)
+    except (ValueError, UnicodeDecodeError) as e:
+        # Parsing error - log and skip
+        logger.warning("Failed to parse instinct file %s: %s", file, e)
+    return []
 
-    instincts: list[dict[str, Any]] = []
-    current: dict[str, Any] = {}
-    in_frontmatter = False
-    content_lines: list[str] = []
-
-    for line in content.split("\n"):
-        if line.strip() == "---":
-            _finalize_instinct(current, content_lines, instincts)
-            current = {}
-            content_lines = []
-            in_frontmatter = not in_frontmatter
-        elif in_frontmatter:
-            _parse_frontmatter_line(line, current)
-        else:
-            content_lines.append(line)
 
-    # Handle last instinct or remaining content
-    if current and current.get("id"):
-        current["content"] = "\n".join(content_lines).strip()
-        instincts.append(current)
-    elif instincts and content_lines:
-        instincts[-1]["content"] = "\n".join(content_lines).strip()
+def _read_instinct_content(inst_dict: dict[str, Any]) -> str:
+    """Get the body of an instinct loaded without content.
 
-    return [i for i in instincts if i.get("id")]
+    Args:
+        inst_dict: Instinct dictionary from load_all_instincts().
 
+    Returns:
+        The instinct's body, or "" if its file no longer has it.
+    """
+    if "content" in inst_dict or "_source_file" not in inst_dict:
+        return str(inst_dict.get("content", ""))
+    sections = _parse_file_sections(Path(inst_dict["_source_file"]))
+    section = inst_dict.get("_section", 0)
+    if section < len(sections) and sections[section].get("id") == inst_dict.get("id"):
+        return str(sections[section].get("content", ""))
+    return ""
 
-def load_all_instincts(
-    project_root: Path,
-) -> list[dict[str, Any]]:
-    """Load all instincts from project learned directory.
+
+def _load_stored_instincts(project_root: Path, with_content: bool) -> list[dict[str, Any]]:
+    """Load all instincts from a database storage backend as dictionaries.
 
     Args:
         project_root: Project root for project-scoped loading.
+        with_content: Whether to read each instinct's body.
 
     Returns:
-        List of instinct dictionaries with _source_file field added.
+        List of instinct dictionaries (empty if the store can't be read).
     """
-    instincts: list[dict[str, Any]] = []
-
-    instincts_dir = get_learned_dir(project_root)
-
-    if not instincts_dir.exists():
-        return instincts
-
-    # Load both .yaml and .md files (AC-7.3)
-    for pattern in ("*.yaml", "*.md"):
-        for file in instincts_dir.glob(pattern):
-            # Skip symlinks for defense in depth
-            if file.is_symlink():
-                logger.warning("Skipping symlink: %s", file)
-                continue
-            try:
-                content = file.read_text()
-                parsed = parse_instinct_file(content)
-                for inst in parsed:
-                    inst["_source_file"] = str(file)
-                instincts.extend(parsed)
-            except (OSError, IOError) as e:
-                # File read error - log and skip
-                logger.warning("Failed to read instinct file %s: %s", file, e)
-            except (ValueError, UnicodeDecodeError) as e:
-                # Parsing error - log and skip
-                logger.warning("Failed to parse instinct file %s: %s", file, e)
+    try:
+        store = open_instinct_store(project_root)
+        try:
+            stored = store.load_instincts(with_content=with_content)
+        finally:
+            store.close()
+    except OSError as e:
+        logger.warning("Failed to load stored instincts: %s", e)
+        return []
 
-    return instincts
+    return [
+        {
+            "id": inst.id,
+            "trigger": inst.trigger,
+            "confidence": inst.confidence,
+            "domain": inst.domain,
+            "source": inst.source,
+            "evidence_count": inst.evidence_count,
+            "status": inst.status,
+            "created_at": inst.created_at.isoformat(),
+            "updated_at": inst.updated_at.isoformat(),
+            **({"last_observed": inst.last_observed.isoformat()} if inst.last_observed else {}),
+            **({"content": inst.content} if with_content else {}),
+        }
+        for inst in stored
+    ]
 
 
 def _format_confidence_bar(confidence: float) -> str:
@@ -150,6 +219,22 @@ def _format_confidence_bar(confidence: float) -> str:
     return "\u2588" * filled + "\u2591" * (10 - filled)
 
 
+def _print_stored_observation_count(project_root: Path) -> None:
+    """Print the observation count of a database storage backend."""
+    try:
+        store = open_observation_store(project_root)
+        try:
+            obs_count = store.count_observations()
+        finally:
+            store.close()
+    except OSError as e:
+        logger.warning("Failed to count stored observations: %s", e)
+        return
+    print("-" * 60)
+    print(f"  Observations: {obs_count} events logged")
+    print(f"  Database: {get_storage_db_file(project_root)}")
+
+
 def cmd_status(project_root: Path) -> int:
     """Show status of all instincts.
 
@@ -159,7 +244,7 @@ def cmd_status(project_root: Path) -> int:
     Returns:
         Exit code (0 for success).
     """
-    instincts = load_all_instincts(project_root)
+    instincts = load_all_instincts(project_root, with_content=False)
     instincts_dir = get_learned_dir(project_root)
 
     if not instincts:
@@ -197,10 +282,11 @@ def cmd_status(project_root: Path) -> int:
 
     # Observations stats
     observations_file = get_observations_file(project_root)
-    if observations_file.exists():
+    if storage_backend() == STORAGE_SQLITE:
+        _print_stored_observation_count(project_root)
+    elif observations_file.exists():
         try:
-            with observations_file.open() as f:
-                obs_count = sum(1 for _ in f)
+            obs_count = read_log_index(observations_file).line_count
             print("-" * 60)
             print(f"  Observations: {obs_count} events logged")
             print(f"  File: {observations_file}")
@@ -284,7 +370,7 @@ def _convert_dict_to_instinct(inst_dict: dict[str, Any]) -> "Instinct":
         evidence_count=int(inst_dict.get("evidence_count", 1)),
         created_at=now,
         updated_at=now,
-        content=inst_dict.get("content", ""),
+        content=_read_instinct_content(inst_dict),
     )
 
 
@@ -424,7 +510,7 @@ def cmd_evolve(
     Returns:
         Exit code (0 for success, 1 for error).
     """
-    instincts = load_all_instincts(project_root=project_root)
+    instincts = load_all_instincts(project_root=project_root, with_content=False)
 
     if len(instincts) < MIN_INSTINCTS_FOR_ANALYSIS:
         print("Need at least 3 instincts to analyze patterns.")
@@ -3,7 +3,8 @@
 This module provides functions for:
 - Calculating initial confidence based on evidence count
 - Adjusting confidence for confirming/contradicting observations
-- Calculating and applying confidence decay over time
+- Calculating confidence decay over time, and the effective confidence
+  of an instinct at a point in time
 - Determining dormant status based on confidence threshold
 """
 
@@ -90,6 +91,70 @@ def calculate_decay(last_observed: datetime, current_time: datetime) -> float:
     return weeks_elapsed * DECAY_PER_WEEK
 
 
+def decay_anchor(instinct: Instinct) -> datetime:
+    """Get the time an instinct's stored confidence is valid at.
+
+    Decay runs from the last confirming observation, or from the last
+    update for instincts that never recorded one.
+
+    Args:
+        instinct: The instinct.
+
+    Returns:
+        last_observed if set, otherwise updated_at.
+    """
+    return instinct.last_observed or instinct.updated_at
+
+
+def decayed_confidence(confidence: float, anchor: datetime, as_of: datetime) -> float:
+    """Calculate a confidence after decaying from its anchor time.
+
+    Args:
+        confidence: Confidence at the anchor time.
+        anchor: Time the confidence was valid at.
+        as_of: Time to decay to.
+
+    Returns:
+        The decayed confidence, clamped to [MIN_CONFIDENCE, MAX_CONFIDENCE]
+        (the confidence itself if no decay is due yet).
+    """
+    decay = calculate_decay(anchor, as_of)
+    if decay == 0.0:
+        return confidence
+    return adjust_confidence(confidence, -decay)
+
+
+def effective_confidence(instinct: Instinct, as_of: datetime | None = None) -> float:
+    """Calculate an instinct's confidence at a point in time.
+
+    The stored confidence is the value at decay_anchor(); decay is applied
+    in closed form when reading, so it never has to be written back.
+
+    Args:
+        instinct: The instinct, with its stored confidence.
+        as_of: Time to evaluate at (defaults to now).
+
+    Returns:
+        The effective confidence.
+    """
+    if as_of is None:
+        as_of = datetime.now(timezone.utc)
+    return decayed_confidence(instinct.confidence, decay_anchor(instinct), as_of)
+
+
+def effective_status(instinct: Instinct, as_of: datetime | None = None) -> InstinctStatus:
+    """Get the status an instinct's effective confidence implies.
+
+    Args:
+        instinct: The instinct, with its stored confidence.
+        as_of: Time to evaluate at (defaults to now).
+
+    Returns:
+        "dormant" or "active" (see check_dormant_status).
+    """
+    return check_dormant_status(effective_confidence(instinct, as_of))
+
+
 def apply_decay_to_instinct(
     instinct: Instinct, current_time: datetime | None = None
 ) -> Instinct:
@@ -102,18 +167,11 @@ def apply_decay_to_instinct(
     Returns:
         A new Instinct with decayed confidence.
     """
-    if current_time is None:
-        current_time = datetime.now(timezone.utc)
-
-    # Use last_observed if available, otherwise use updated_at
-    last_observed = instinct.last_observed or instinct.updated_at
+    new_confidence = effective_confidence(instinct, current_time)
 
-    decay = calculate_decay(last_observed, current_time)
-
-    if decay == 0.0:
+    if new_confidence == instinct.confidence:
         return instinct
 
-    new_confidence = adjust_confidence(instinct.confidence, -decay)
     return instinct.with_confidence(new_confidence)
 
 
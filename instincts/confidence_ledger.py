@@ -0,0 +1,437 @@
+"""Append-only confidence ledger for Instinct-Based Learning.
+
+Analysis used to rewrite an instinct file every time one of its patterns was
+detected again. Instead, each piece of confirming or contradicting evidence
+is appended to docs/instincts/confidence-ledger.jsonl as one line (instinct
+ID, confidence delta, evidence reference, timestamp and evidence count
+added), and the background worker periodically folds the pending entries
+into the instincts.
+
+A fold is one batched pass under the ledger lock:
+1. The ledger is renamed to .confidence-ledger.folding.jsonl, so the
+   entries being folded are fixed.
+2. The new confidence, evidence count, decay anchor and status of every
+   affected instinct are computed and written to a journal
+   (.confidence-ledger.journal.json) atomically. This is the commit point.
+3. The journaled values are written to the instincts, each at most once.
+4. The folding file and then the journal are removed.
+
+Journaled values are absolute, so applying a journal twice is harmless: a
+fold interrupted after step 2 is finished by the next one, and a fold
+interrupted before it starts over from the folding file. Entries are never
+applied twice.
+
+Confirmations move the decay anchor forward like any new observation (the
+decay up to it is folded in first); contradictions lower the confidence at
+its current anchor, which lowers the effective confidence by the same amount.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from instincts.confidence import (
+    CONFIRM_DELTA,
+    CONTRADICT_DELTA,
+    adjust_confidence,
+    decay_anchor,
+    decayed_confidence,
+    effective_status,
+)
+from instincts.config import (
+    LEDGER_FOLD_MAX_AGE_SECONDS,
+    LEDGER_FOLD_MIN_ENTRIES,
+    get_confidence_ledger_file,
+)
+from instincts.models import Instinct
+
+if TYPE_CHECKING:
+    from instincts.storage import InstinctStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    """One confidence update waiting to be folded into an instinct.
+
+    Attributes:
+        instinct_id: ID of the instinct the evidence is about.
+        delta: Confidence change (CONFIRM_DELTA or CONTRADICT_DELTA).
+        evidence: Reference to the evidence (e.g. pattern type and sessions).
+        timestamp: When the evidence was observed.
+        evidence_count: Observations to add to the instinct's evidence count.
+        recorded_at: When the entry was appended (set by append_entries;
+            entries written without it fall back to timestamp).
+    """
+
+    instinct_id: str
+    delta: float
+    evidence: str
+    timestamp: datetime
+    evidence_count: int = 0
+    recorded_at: datetime | None = None
+
+    @property
+    def confirms(self) -> bool:
+        """Whether the entry supports the instinct."""
+        return self.delta >= 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "instinct_id": self.instinct_id,
+            "delta": self.delta,
+            "evidence": self.evidence,
+            "timestamp": self.timestamp.isoformat(),
+            "evidence_count": self.evidence_count,
+            "recorded_at": self.recorded_at.isoformat() if self.recorded_at else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LedgerEntry":
+        """Create from a dictionary produced by to_dict.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is malformed.
+        """
+        recorded_at = data.get("recorded_at")
+        return cls(
+            instinct_id=str(data["instinct_id"]),
+            delta=float(data["delta"]),
+            evidence=str(data.get("evidence", "")),
+            timestamp=_parse_utc(data["timestamp"]),
+            evidence_count=int(data.get("evidence_count", 0)),
+            recorded_at=_parse_utc(recorded_at) if recorded_at else None,
+        )
+
+
+def _parse_utc(value: str) -> datetime:
+    """Parse an ISO timestamp, treating naive values as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def get_ledger_lock_path(ledger_file: Path) -> Path:
+    """Get the lock file guarding a ledger."""
+    return ledger_file.with_name(f".{ledger_file.stem}.lock")
+
+
+def get_folding_path(ledger_file: Path) -> Path:
+    """Get where a ledger's entries are kept while they are folded."""
+    return ledger_file.with_name(f".{ledger_file.stem}.folding.jsonl")
+
+
+def get_journal_path(ledger_file: Path) -> Path:
+    """Get the journal of a ledger's fold in progress."""
+    return ledger_file.with_name(f".{ledger_file.stem}.journal.json")
+
+
+@contextmanager
+def ledger_lock(ledger_file: Path) -> Iterator[None]:
+    """Hold the exclusive lock of a ledger.
+
+    Args:
+        ledger_file: Path to the ledger; its directory must exist.
+
+    Raises:
+        OSError: If the lock file cannot be opened (e.g. it is a symlink).
+    """
+    fd = os.open(get_ledger_lock_path(ledger_file), os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def append_entries(ledger_file: Path, entries: Iterable[LedgerEntry]) -> int:
+    """Append entries to a ledger in one write, stamping their recorded_at.
+
+    Args:
+        ledger_file: Path to the ledger; its directory is created if needed.
+        entries: Entries to append.
+
+    Returns:
+        Number of entries appended.
+
+    Raises:
+        OSError: If the ledger cannot be written.
+    """
+    recorded_at = datetime.now(timezone.utc)
+    lines = [
+        json.dumps(replace(entry, recorded_at=recorded_at).to_dict()) + "\n" for entry in entries
+    ]
+    if not lines:
+        return 0
+    ledger_file.parent.mkdir(parents=True, exist_ok=True)
+    with ledger_lock(ledger_file), open(ledger_file, "a", encoding="utf-8") as f:
+        f.write("".join(lines))
+    return len(lines)
+
+
+def read_entries(ledger_file: Path) -> list[LedgerEntry]:
+    """Read a ledger's entries, skipping malformed lines.
+
+    Args:
+        ledger_file: Path to the ledger (or its folding file).
+
+    Returns:
+        The entries in the order they were appended; empty if the file
+        does not exist.
+
+    Raises:
+        OSError: If the file exists but cannot be read.
+    """
+    try:
+        lines = ledger_file.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    entries: list[LedgerEntry] = []
+    for line in lines:
+        try:
+            entries.append(LedgerEntry.from_dict(json.loads(line)))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            continue
+    return entries
+
+
+def record_confirmation(
+    project_root: Path,
+    instinct_id: str,
+    evidence: str,
+    timestamp: datetime | None = None,
+    evidence_count: int = 1,
+) -> None:
+    """Record evidence supporting an instinct (+CONFIRM_DELTA when folded).
+
+    Args:
+        project_root: Project root for project-scoped storage.
+        instinct_id: ID of the confirmed instinct.
+        evidence: Reference to the evidence.
+        timestamp: When the evidence was observed (defaults to now).
+        evidence_count: Observations to add to the evidence count.
+
+    Raises:
+        OSError: If the ledger cannot be written.
+    """
+    entry = LedgerEntry(
+        instinct_id=instinct_id,
+        delta=CONFIRM_DELTA,
+        evidence=evidence,
+        timestamp=timestamp or datetime.now(timezone.utc),
+        evidence_count=evidence_count,
+    )
+    append_entries(get_confidence_ledger_file(project_root), [entry])
+
+
+def record_contradiction(
+    project_root: Path, instinct_id: str, evidence: str, timestamp: datetime | None = None
+) -> None:
+    """Record evidence against an instinct (CONTRADICT_DELTA when folded).
+
+    Args:
+        project_root: Project root for project-scoped storage.
+        instinct_id: ID of the contradicted instinct.
+        evidence: Reference to the evidence.
+        timestamp: When the evidence was observed (defaults to now).
+
+    Raises:
+        OSError: If the ledger cannot be written.
+    """
+    entry = LedgerEntry(
+        instinct_id=instinct_id,
+        delta=CONTRADICT_DELTA,
+        evidence=evidence,
+        timestamp=timestamp or datetime.now(timezone.utc),
+    )
+    append_entries(get_confidence_ledger_file(project_root), [entry])
+
+
+def apply_entries(instinct: Instinct, entries: Iterable[LedgerEntry]) -> Instinct:
+    """Apply ledger entries to an instinct, oldest evidence first.
+
+    Args:
+        instinct: The instinct as stored.
+        entries: Entries about this instinct.
+
+    Returns:
+        The instinct with its new confidence, evidence count and decay
+        anchor (pinned in last_observed); updated_at and status unchanged.
+    """
+    confidence = instinct.confidence
+    evidence_count = instinct.evidence_count
+    anchor = decay_anchor(instinct)
+    for entry in sorted(entries, key=lambda e: e.timestamp):
+        if entry.confirms and entry.timestamp > anchor:
+            confidence = decayed_confidence(confidence, anchor, entry.timestamp)
+            anchor = entry.timestamp
+        confidence = adjust_confidence(confidence, entry.delta)
+        evidence_count += entry.evidence_count
+    return replace(
+        instinct, confidence=confidence, evidence_count=evidence_count, last_observed=anchor
+    )
+
+
+def _fold_due(entries: list[LedgerEntry], as_of: datetime) -> bool:
+    """Whether enough entries are pending, or the first appended has waited long enough.
+
+    Entries are aged by when they were appended: evidence found by a late
+    analysis can be old already and should still wait for a batch.
+    """
+    if len(entries) >= LEDGER_FOLD_MIN_ENTRIES:
+        return True
+    oldest = min(entry.recorded_at or entry.timestamp for entry in entries)
+    return (as_of - oldest).total_seconds() >= LEDGER_FOLD_MAX_AGE_SECONDS
+
+
+def _write_journal(journal_file: Path, instincts: list[Instinct]) -> None:
+    """Write the fold's new instinct values atomically."""
+    records = [
+        {
+            "id": inst.id,
+            "confidence": inst.confidence,
+            "evidence_count": inst.evidence_count,
+            "last_observed": inst.last_observed.isoformat() if inst.last_observed else None,
+            "updated_at": inst.updated_at.isoformat(),
+            "status": inst.status,
+        }
+        for inst in instincts
+    ]
+    fd, temp_path = tempfile.mkstemp(dir=journal_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"instincts": records}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, journal_file)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _apply_journal(journal_file: Path, store: "InstinctStore") -> list[Instinct]:
+    """Write a journal's values to the instincts they belong to.
+
+    Raises:
+        OSError: If the journal or an instinct cannot be read or written.
+        ValueError: If the journal is malformed.
+    """
+    try:
+        with open(journal_file, encoding="utf-8") as f:
+            records = json.load(f)["instincts"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed confidence ledger journal {journal_file}: {e}") from e
+
+    written: list[Instinct] = []
+    for record in records:
+        instinct = store.get_instinct(record["id"])
+        if instinct is None:
+            continue
+        last_observed = record["last_observed"]
+        instinct = replace(
+            instinct,
+            confidence=float(record["confidence"]),
+            evidence_count=int(record["evidence_count"]),
+            last_observed=datetime.fromisoformat(last_observed) if last_observed else None,
+            updated_at=datetime.fromisoformat(record["updated_at"]),
+            status=record["status"],
+        )
+        store.write_instinct(instinct)
+        written.append(instinct)
+    return written
+
+
+def _finish_fold(ledger_file: Path, store: "InstinctStore") -> list[Instinct]:
+    """Apply the journal of an interrupted fold, if any, and clean up after it."""
+    journal_file = get_journal_path(ledger_file)
+    if not journal_file.exists():
+        return []
+    written = _apply_journal(journal_file, store)
+    get_folding_path(ledger_file).unlink(missing_ok=True)
+    journal_file.unlink()
+    return written
+
+
+def fold_ledger(
+    ledger_file: Path,
+    store: "InstinctStore",
+    as_of: datetime | None = None,
+    force: bool = False,
+) -> list[Instinct]:
+    """Fold pending ledger entries into the instincts of a store.
+
+    Each affected instinct is read and written once, however many entries
+    it has. Entries about instincts that no longer exist are dropped. A
+    fold interrupted earlier is finished first.
+
+    Args:
+        ledger_file: Path to the ledger.
+        store: Instinct store the entries apply to.
+        as_of: Time of the fold (defaults to now); the new updated_at and
+            the time the status is evaluated at.
+        force: Fold even if fewer than LEDGER_FOLD_MIN_ENTRIES entries are
+            pending and none is older than LEDGER_FOLD_MAX_AGE_SECONDS.
+
+    Returns:
+        The instincts written, with their bodies.
+
+    Raises:
+        OSError: If the ledger or an instinct cannot be read or written.
+        ValueError: If the journal of an interrupted fold is malformed.
+    """
+    if as_of is None:
+        as_of = datetime.now(timezone.utc)
+    folding_file = get_folding_path(ledger_file)
+    journal_file = get_journal_path(ledger_file)
+    if not ledger_file.parent.is_dir():
+        return []
+
+    with ledger_lock(ledger_file):
+        written = _finish_fold(ledger_file, store)
+
+        # Entries left by a fold interrupted before its journal go first;
+        # newer ones wait for the next fold
+        entries = read_entries(folding_file)
+        if not entries:
+            entries = read_entries(ledger_file)
+            if not entries or (not force and not _fold_due(entries, as_of)):
+                return written
+            os.replace(ledger_file, folding_file)
+
+        by_id: dict[str, list[LedgerEntry]] = {}
+        for entry in entries:
+            by_id.setdefault(entry.instinct_id, []).append(entry)
+
+        updated: list[Instinct] = []
+        for instinct_id, instinct_entries in by_id.items():
+            instinct = store.get_instinct(instinct_id)
+            if instinct is None:
+                logger.warning(
+                    "Dropping %d confidence updates for unknown instinct %s",
+                    len(instinct_entries),
+                    instinct_id,
+                )
+                continue
+            instinct = replace(apply_entries(instinct, instinct_entries), updated_at=as_of)
+            updated.append(replace(instinct, status=effective_status(instinct, as_of)))
+
+        _write_journal(journal_file, updated)
+        folded = _finish_fold(ledger_file, store)
+
+    logger.debug("Folded %d confidence updates into %d instincts", len(entries), len(folded))
+    return written + folded
+
@@ -14,6 +14,25 @@ ANALYSIS_TRIGGER_CHECK_INTERVAL: int = 10  # Check trigger every N observations
 # Analysis scope (shared by algorithm and LLM)
 MAX_OBSERVATIONS_FOR_ANALYSIS: int = 1000  # Analyze latest 1000 observations
 
+# Large observation fields; written last in each line so projected loads can
+# stop decoding before them
+LARGE_OBSERVATION_FIELDS: tuple[str, ...] = ("input", "output", "content")
+
+# Content-addressed blob store for large tool input/output (opt-in)
+BLOB_STORE_ENV: str = "INSTINCT_BLOB_STORE"  # Set to 1 to enable
+BLOB_MIN_LENGTH: int = 1024  # Shorter fields are kept inline
+BLOBS_DIR_NAME: str = "blobs"  # Directory next to observations.jsonl
+
+# Storage backend for observations and instincts
+STORAGE_BACKEND_ENV: str = "INSTINCT_STORAGE"  # "file" (default) or "sqlite"
+STORAGE_DB_NAME: str = "instincts.db"  # SQLite database next to observations.jsonl
+STORAGE_BUSY_TIMEOUT_SECONDS: float = 10.0  # How long a writer waits for the database lock
+
+# Confidence ledger, folded into instincts by the background worker
+CONFIDENCE_LEDGER_NAME: str = "confidence-ledger.jsonl"  # Next to observations.jsonl
+LEDGER_FOLD_MIN_ENTRIES: int = 50  # Fold once this many updates are pending
+LEDGER_FOLD_MAX_AGE_SECONDS: float = 24 * 60 * 60.0  # Or once the oldest has waited a day
+
 # LLM settings for dual-approach analysis
 DEFAULT_LLM_MODEL: str = "claude-3-haiku-20240307"
 ANTHROPIC_API_KEY_ENV: str = "ANTHROPIC_API_KEY"
@@ -23,6 +42,18 @@ AUTO_LEARN_OBSERVATION_THRESHOLD: int = 50  # Minimum observations before auto-l
 AUTO_LEARN_COOLDOWN_SECONDS: int = 300  # Cooldown between auto-learning runs (5 minutes)
 AUTO_LEARN_LOCK_FILE: str = ".auto_learn.lock"  # Lock file to prevent concurrent runs
 AUTO_LEARN_STATE_FILE: str = ".auto_learn_state.json"  # Tracks last analysis state
+ANALYSIS_CHECKPOINT_FILE: str = ".analysis_checkpoint.json"  # Where incremental analysis stopped
+OBSERVATION_COUNTER_FILE: str = ".observation_counter"  # Shared cross-process counter
+
+# Background analysis worker (python -m instincts.agent)
+AUTO_LEARN_LEASE_SECONDS: float = 120.0  # Lock lease expires unless renewed
+AUTO_LEARN_HEARTBEAT_SECONDS: float = 30.0  # How often a running worker renews its lease
+AUTO_LEARN_MAX_SECONDS: float = 300.0  # Wall-clock budget for one background run
+AUTO_LEARN_MAX_MEMORY_MB: int = 1024  # Address-space budget for one background run
+
+# Observer daemon settings (opt-in, see instincts.daemon)
+DAEMON_IDLE_TIMEOUT_SECONDS: float = 1800.0  # Shut down after 30 minutes without hooks
+DAEMON_POLL_INTERVAL_SECONDS: float = 1.0  # How often the accept loop checks idle time
 
 # CLAUDE.md integration
 LEARNED_PATTERNS_SECTION: str = "## Learned Patterns"
@@ -100,6 +131,54 @@ def get_observations_file(project_root: Path) -> Path:
     return get_project_instincts_dir(project_root) / "observations.jsonl"
 
 
+def get_blobs_dir(project_root: Path) -> Path:
+    """Get the blob store directory for a project.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        Path to <project>/docs/instincts/blobs/
+    """
+    return get_project_instincts_dir(project_root) / BLOBS_DIR_NAME
+
+
+def get_storage_db_file(project_root: Path) -> Path:
+    """Get the SQLite storage database path for a project.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        Path to <project>/docs/instincts/instincts.db
+    """
+    return get_project_instincts_dir(project_root) / STORAGE_DB_NAME
+
+
+def get_analysis_checkpoint_file(project_root: Path) -> Path:
+    """Get the incremental analysis checkpoint path for a project.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        Path to <project>/docs/instincts/.analysis_checkpoint.json
+    """
+    return get_project_instincts_dir(project_root) / ANALYSIS_CHECKPOINT_FILE
+
+
+def get_confidence_ledger_file(project_root: Path) -> Path:
+    """Get the confidence ledger path for a project.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        Path to <project>/docs/instincts/confidence-ledger.jsonl
+    """
+    return get_project_instincts_dir(project_root) / CONFIDENCE_LEDGER_NAME
+
+
 def get_archive_dir(project_root: Path) -> Path:
     """Get the archive directory for a project.
 
@@ -143,6 +222,18 @@ def get_evolved_output_dir(
         return Path.home() / ".claude" / dir_name
 
 
+def get_observation_counter_file(project_root: Path) -> Path:
+    """Get the shared observation counter file path for a project.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        Path to <project>/docs/instincts/.observation_counter
+    """
+    return get_project_instincts_dir(project_root) / OBSERVATION_COUNTER_FILE
+
+
 def get_analysis_pending_file(project_root: Path) -> Path:
     """Get the analysis pending marker file path for a project.
 
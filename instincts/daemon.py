@@ -0,0 +1,312 @@
+"""Persistent observer daemon for Instinct-Based Learning.
+
+Without the daemon, every PreToolUse/PostToolUse hook starts a fresh Python
+interpreter and imports instincts.observer just to append one line. The daemon
+is an opt-in, long-lived process that listens on a per-user Unix socket, keeps
+the observations files of each project open, and processes hook payloads sent
+by the lightweight client in instincts.hook_client. It shuts itself down after
+DAEMON_IDLE_TIMEOUT_SECONDS without requests.
+
+Usage:
+    python -m instincts.daemon start [--idle-timeout SECONDS]
+    python -m instincts.daemon serve [--idle-timeout SECONDS]   # foreground
+    python -m instincts.daemon stop
+    python -m instincts.daemon status
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from instincts.config import (
+    DAEMON_IDLE_TIMEOUT_SECONDS,
+    DAEMON_POLL_INTERVAL_SECONDS,
+    detect_project_root,
+)
+from instincts.hook_client import (
+    CLIENT_TIMEOUT_SECONDS,
+    HOOK_EVENTS,
+    encode_request,
+    get_socket_path,
+)
+from instincts.observation_log import ObservationHandles
+from instincts.observer import observe_post, observe_pre
+
+logger = logging.getLogger(__name__)
+
+# Control command asking the daemon to exit
+SHUTDOWN_EVENT: str = "shutdown"
+
+# Upper bound on a single request (header + payload) read from a client
+MAX_REQUEST_BYTES: int = 32 * 1024 * 1024
+
+# Seconds a connected client may take to send its request
+CONNECTION_TIMEOUT_SECONDS: float = 2.0
+
+
+class ObserverDaemon:
+    """Unix socket server that records hook observations in-process.
+
+    Requests are handled one at a time on the accept thread. Each request is
+    small and appending is fast, so serial handling avoids sharing flock'd
+    handles between threads.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        idle_timeout: float = DAEMON_IDLE_TIMEOUT_SECONDS,
+        poll_interval: float = DAEMON_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self._handles = ObservationHandles()
+        self._project_roots: dict[str, Path] = {}
+        self._running = False
+
+    def serve(self) -> None:
+        """Bind the socket and process requests until idle or shut down."""
+        server = _bind_socket(self.socket_path)
+        server.settimeout(self.poll_interval)
+        self._running = True
+        last_activity = time.monotonic()
+
+        try:
+            while self._running:
+                try:
+                    conn, _ = server.accept()
+                except TimeoutError:
+                    if time.monotonic() - last_activity >= self.idle_timeout:
+                        logger.info("Observer daemon idle, shutting down")
+                        break
+                    continue
+
+                last_activity = time.monotonic()
+                with conn:
+                    self._handle_connection(conn)
+        finally:
+            server.close()
+            self._handles.close_all()
+            _unlink_socket(self.socket_path)
+
+    def _handle_connection(self, conn: socket.socket) -> None:
+        """Read one request from a client connection and dispatch it."""
+        conn.settimeout(CONNECTION_TIMEOUT_SECONDS)
+        try:
+            data = _read_request(conn)
+        except OSError as e:
+            logger.warning("Failed to read hook request: %s", e)
+            return
+        if not data:
+            # Liveness probe (is_daemon_running) - nothing to do
+            return
+
+        header_line, _, payload = data.partition(b"\n")
+        try:
+            header = json.loads(header_line)
+        except json.JSONDecodeError:
+            logger.warning("Discarding malformed hook request header")
+            return
+
+        self.handle_request(header.get("event", ""), header.get("cwd", ""), payload)
+
+    def handle_request(self, event: str, cwd: str, payload: bytes) -> None:
+        """Process a decoded request.
+
+        Errors are logged and swallowed so a bad payload never stops the daemon.
+
+        Args:
+            event: Hook event ("pre" or "post") or SHUTDOWN_EVENT.
+            cwd: Working directory of the hook process.
+            payload: Raw hook payload (JSON bytes).
+        """
+        if event == SHUTDOWN_EVENT:
+            self._running = False
+            return
+        if event not in HOOK_EVENTS or not cwd:
+            logger.warning("Discarding hook request with event %r", event)
+            return
+
+        try:
+            hook_data: Any = json.loads(payload or b"{}")
+        except json.JSONDecodeError:
+            logger.warning("Discarding hook request with invalid JSON payload")
+            return
+        if not isinstance(hook_data, dict):
+            return
+
+        project_root = self._resolve_project_root(cwd)
+        try:
+            if event == "pre":
+                observe_pre(hook_data, project_root, self._handles)
+            else:
+                observe_post(hook_data, project_root, self._handles)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to record observation for %s: %s", project_root, e)
+
+    def _resolve_project_root(self, cwd: str) -> Path:
+        """Detect (and cache) the project root for a working directory."""
+        project_root = self._project_roots.get(cwd)
+        if project_root is None:
+            project_root = detect_project_root(Path(cwd))
+            self._project_roots[cwd] = project_root
+        return project_root
+
+
+def _read_request(conn: socket.socket) -> bytes:
+    """Read a full request until the client closes its end."""
+    chunks: list[bytes] = []
+    total = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > MAX_REQUEST_BYTES:
+            raise OSError(f"Request exceeds {MAX_REQUEST_BYTES} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _bind_socket(socket_path: str) -> socket.socket:
+    """Create the listening socket, replacing a stale socket file.
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the path.
+    """
+    socket_dir = os.path.dirname(socket_path)
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+
+    if os.path.exists(socket_path):
+        if is_daemon_running(socket_path):
+            raise RuntimeError(f"Observer daemon already running on {socket_path}")
+        _unlink_socket(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    return server
+
+
+def _unlink_socket(socket_path: str) -> None:
+    """Remove the socket file if present."""
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+
+
+def is_daemon_running(socket_path: str | None = None) -> bool:
+    """Check whether a daemon is accepting connections.
+
+    Args:
+        socket_path: Optional socket path (defaults to the per-user path).
+
+    Returns:
+        True if a connection to the socket succeeds.
+    """
+    path = socket_path or get_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def stop_daemon(socket_path: str | None = None) -> bool:
+    """Ask a running daemon to shut down.
+
+    Args:
+        socket_path: Optional socket path (defaults to the per-user path).
+
+    Returns:
+        True if the shutdown request was delivered.
+    """
+    path = socket_path or get_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+    try:
+        sock.connect(path)
+        sock.sendall(encode_request(SHUTDOWN_EVENT, "", b""))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def start_daemon(idle_timeout: float = DAEMON_IDLE_TIMEOUT_SECONDS) -> None:
+    """Start the daemon as a detached background process.
+
+    Args:
+        idle_timeout: Seconds without requests before the daemon exits.
+    """
+    cmd = [
+        sys.executable,
+        "-m",
+        "instincts.daemon",
+        "serve",
+        "--idle-timeout",
+        str(idle_timeout),
+    ]
+    subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Instinct observer daemon")
+    parser.add_argument("command", choices=("start", "serve", "stop", "status"))
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DAEMON_IDLE_TIMEOUT_SECONDS,
+        help="Seconds without hook requests before shutting down",
+    )
+    args = parser.parse_args(argv)
+    socket_path = get_socket_path()
+
+    if args.command == "status":
+        running = is_daemon_running(socket_path)
+        print(f"Observer daemon {'running' if running else 'not running'} ({socket_path})")
+        return 0 if running else 1
+
+    if args.command == "stop":
+        if not stop_daemon(socket_path):
+            print("Observer daemon is not running.")
+            return 1
+        print("Observer daemon stopped.")
+        return 0
+
+    if is_daemon_running(socket_path):
+        print(f"Observer daemon already running ({socket_path})")
+        return 0
+
+    if args.command == "start":
+        start_daemon(args.idle_timeout)
+        print(f"Observer daemon starting ({socket_path})")
+        return 0
+
+    ObserverDaemon(socket_path, idle_timeout=args.idle_timeout).serve()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
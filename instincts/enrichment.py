@@ -0,0 +1,128 @@
+"""Write-time enrichment of observations for Instinct-Based Learning.
+
+Detectors need only a few facts from the large input/output fields: the
+file a Write/Edit touched, whether a tool failed and with what error. The
+observer extracts these once, when the hook fires, and stores them in
+dedicated observation keys, so analysis does not re-parse the input JSON
+or re-scan the output on every run. The same extraction is used by the
+detectors as a fallback for observations written before enrichment.
+
+This module is imported on the hook path, so it only uses json and the
+precompiled matchers of instincts.matchers.
+"""
+
+import json
+from typing import Any
+
+from instincts.matchers import KeywordMatcher, WordSuffixMatcher
+
+# Error keywords to detect errors in tool output
+ERROR_KEYWORDS: tuple[str, ...] = ("error", "failed", "exception", "failure", "traceback")
+
+# Maximum length of the command head stored for Bash observations
+COMMAND_HEAD_LENGTH: int = 200
+
+# Suffixes of specific error type names (e.g. ImportError), in priority order
+ERROR_TYPE_SUFFIXES: tuple[str, ...] = ("Error", "Exception")
+
+_ERROR_KEYWORD_MATCHER = KeywordMatcher(ERROR_KEYWORDS)
+_ERROR_TYPE_MATCHER = WordSuffixMatcher(ERROR_TYPE_SUFFIXES)
+
+
+def extract_file_path(tool_input: Any) -> str | None:
+    """Extract the file_path parameter from tool input.
+
+    Args:
+        tool_input: Tool input as a dict (hook data) or a JSON string (log).
+
+    Returns:
+        The file path, or None if the input has none.
+    """
+    data = tool_input
+    if isinstance(tool_input, str):
+        try:
+            data = json.loads(tool_input)
+        except json.JSONDecodeError:
+            return None
+    if not isinstance(data, dict):
+        return None
+    file_path = data.get("file_path")
+    return file_path if isinstance(file_path, str) else None
+
+
+def extract_command_head(tool_input: Any) -> str | None:
+    """Extract the first line of a Bash command, capped at COMMAND_HEAD_LENGTH.
+
+    Args:
+        tool_input: Tool input as a dict (hook data).
+
+    Returns:
+        The command head, or None if the input has no command.
+    """
+    if not isinstance(tool_input, dict):
+        return None
+    command = tool_input.get("command")
+    if not isinstance(command, str):
+        return None
+    lines = command.strip().splitlines()
+    return lines[0][:COMMAND_HEAD_LENGTH] if lines else ""
+
+
+def has_error_keywords(text: str) -> bool:
+    """Check if text contains error keywords."""
+    return _ERROR_KEYWORD_MATCHER.search(text)
+
+
+def extract_error_type(error_output: str) -> str:
+    """Extract the error type from error output text.
+
+    Looks for patterns like 'ImportError', 'TypeError', 'SyntaxException', etc.
+    Falls back to the first matching error keyword if no specific type found.
+    """
+    return _error_type(error_output, _ERROR_KEYWORD_MATCHER.first(error_output)) or "unknown"
+
+
+def _error_type(output: str, keyword: str | None) -> str | None:
+    """Get the error type of output whose first error keyword is known."""
+    if keyword is None:
+        return None
+    # Try to extract specific error type (e.g., ImportError)
+    return _ERROR_TYPE_MATCHER.search(output) or keyword
+
+
+def describe_input(tool_name: Any, tool_input: Any) -> dict[str, Any]:
+    """Build the enriched keys of a tool_start observation.
+
+    "file_path" is always present (None if the tool has no path), marking
+    the observation as enriched.
+
+    Args:
+        tool_name: Name of the tool.
+        tool_input: Tool input from the hook.
+
+    Returns:
+        Dict with "file_path", plus "command" for Bash.
+    """
+    fields: dict[str, Any] = {"file_path": extract_file_path(tool_input)}
+    if tool_name == "Bash":
+        fields["command"] = extract_command_head(tool_input)
+    return fields
+
+
+def describe_output(output: str, output_length: int) -> dict[str, Any]:
+    """Build the enriched keys of a tool_complete observation.
+
+    Args:
+        output: Tool output as stored (after truncation).
+        output_length: Length of the output before truncation.
+
+    Returns:
+        Dict with "is_error", "error_type" (None unless an error) and
+        "output_length".
+    """
+    keyword = _ERROR_KEYWORD_MATCHER.first(output)
+    return {
+        "is_error": keyword is not None,
+        "error_type": _error_type(output, keyword),
+        "output_length": output_length,
+    }
@@ -0,0 +1,319 @@
+"""Instinct frontmatter parsing, shared by the agent and the CLI.
+
+Instinct files are Markdown with a YAML-like frontmatter block between
+"---" lines. Two layouts exist:
+- Agent-written files: one frontmatter block, the rest of the file is the
+  instinct body (parse_instinct). read_instinct_header() reads only up to
+  the end of the block, leaving the body to be loaded on first access.
+- Hand-written collections (.yaml, or .md with several blocks): each block
+  starts a new instinct whose body runs to the next block
+  (parse_instinct_sections).
+
+Both use the same key/value line parser and the same section metadata
+(section_metadata()). The metadata of learned/ is cached for both the
+agent and the CLI by the instinct index (instincts.instinct_index).
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from instincts.models import Instinct
+
+# Defaults for missing or malformed frontmatter values
+DEFAULT_CONFIDENCE: float = 0.5
+DEFAULT_EVIDENCE_COUNT: int = 1
+
+FRONTMATTER_DELIMITER = "---"
+
+# Chunk size and limit of frontmatter-only reads; agent-written frontmatter
+# is well under 1KB
+FRONTMATTER_READ_SIZE: int = 4096
+MAX_FRONTMATTER_BYTES: int = 64 * 1024
+
+
+def parse_frontmatter(frontmatter: str) -> dict[str, str]:
+    """Parse YAML-like "key: value" lines, unquoting the values.
+
+    Args:
+        frontmatter: Text between two "---" lines.
+
+    Returns:
+        Dictionary of the keys and their string values.
+    """
+    data: dict[str, str] = {}
+    for line in frontmatter.split("\n"):
+        if ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        data[key.strip()] = value.strip().strip('"').strip("'")
+    return data
+
+
+def split_frontmatter(content: str) -> tuple[str, str] | None:
+    """Split a document at its first frontmatter block.
+
+    Args:
+        content: File content.
+
+    Returns:
+        (frontmatter, body) with the body stripped, or None if the content
+        has no closed "---" block.
+    """
+    lines = content.split("\n")
+    try:
+        start = next(i for i, line in enumerate(lines) if line.strip() == FRONTMATTER_DELIMITER)
+        end = next(
+            i for i in range(start + 1, len(lines)) if lines[i].strip() == FRONTMATTER_DELIMITER
+        )
+    except StopIteration:
+        return None
+    return "\n".join(lines[start + 1 : end]), "\n".join(lines[end + 1 :]).strip()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp string, returning the current time if parsing fails."""
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return datetime.now(timezone.utc)
+
+
+def _parse_float(value: Any, default: float) -> float:
+    """Parse a value as float, returning default if parsing fails."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _parse_int(value: Any, default: int) -> int:
+    """Parse a value as int, returning default if parsing fails."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def section_metadata(frontmatter: str) -> dict[str, Any]:
+    """Parse a frontmatter block, with confidence as a float when it parses.
+
+    Args:
+        frontmatter: Text between two "---" lines.
+
+    Returns:
+        The block's keys and values, as listed by the CLI.
+    """
+    metadata: dict[str, Any] = parse_frontmatter(frontmatter)
+    if "confidence" in metadata:
+        try:
+            metadata["confidence"] = float(metadata["confidence"])
+        except ValueError:
+            pass
+    return metadata
+
+
+def build_instinct(
+    data: Mapping[str, Any], body: str, source_file: str
+) -> Instinct | None:
+    """Build an Instinct from section metadata, filling in defaults.
+
+    Args:
+        data: Metadata of a frontmatter block (see section_metadata()).
+        body: The instinct's Markdown body.
+        source_file: Path to the source file.
+
+    Returns:
+        Instinct object, or None if the metadata has no id.
+    """
+    if "id" not in data:
+        return None
+
+    return Instinct(
+        id=data["id"],
+        trigger=data.get("trigger", ""),
+        confidence=_parse_float(data.get("confidence"), DEFAULT_CONFIDENCE),
+        domain=data.get("domain", "general"),
+        source=data.get("source", "unknown"),
+        evidence_count=_parse_int(data.get("evidence_count"), DEFAULT_EVIDENCE_COUNT),
+        created_at=_parse_timestamp(data.get("created_at", "")),
+        updated_at=_parse_timestamp(data.get("updated_at", "")),
+        content=body,
+        source_file=source_file,
+        status=data.get("status", "active"),
+        last_observed=(
+            _parse_timestamp(data["last_observed"]) if data.get("last_observed") else None
+        ),
+    )
+
+
+def parse_instinct(content: str, source_file: str) -> Instinct | None:
+    """Parse an agent-written instinct file.
+
+    Args:
+        content: File content with YAML frontmatter.
+        source_file: Path to the source file.
+
+    Returns:
+        Instinct object or None if parsing fails.
+    """
+    if not content.strip():
+        return None
+
+    document = split_frontmatter(content)
+    if document is None:
+        return None
+    frontmatter, body = document
+    return build_instinct(section_metadata(frontmatter), body, source_file)
+
+
+@dataclass(frozen=True)
+class InstinctHeader:
+    """An instinct file read up to the end of its frontmatter.
+
+    Attributes:
+        metadata: The frontmatter block (see section_metadata()).
+        instinct: The instinct's metadata; its content is empty.
+        file_path: The instinct file.
+        body_offset: Byte offset of the body in the file.
+    """
+
+    metadata: dict[str, Any]
+    instinct: Instinct
+    file_path: Path
+    body_offset: int
+
+    @cached_property
+    def body(self) -> str:
+        """The Markdown body, read from the file on first access.
+
+        Raises:
+            OSError: If the file cannot be read.
+            UnicodeDecodeError: If the body is not valid UTF-8.
+        """
+        with self.file_path.open("rb") as f:
+            f.seek(self.body_offset)
+            return f.read().decode().strip()
+
+    def load(self) -> Instinct:
+        """Get the full instinct, reading the body if it has not been read."""
+        return replace(self.instinct, content=self.body)
+
+
+def _find_frontmatter(head: bytes, at_eof: bool) -> tuple[int, int, int] | None:
+    """Locate the first frontmatter block in the start of a file.
+
+    Args:
+        head: Bytes read from the start of the file.
+        at_eof: Whether head is the whole file (its last line is complete).
+
+    Returns:
+        Byte offsets (frontmatter start, frontmatter end, body start), or
+        None if head does not contain a closed block.
+    """
+    start: int | None = None
+    pos = 0
+    while pos < len(head):
+        newline = head.find(b"\n", pos)
+        if newline == -1:
+            if not at_eof:
+                return None
+            line_end = next_pos = len(head)
+        else:
+            line_end, next_pos = newline, newline + 1
+        if head[pos:line_end].strip() == FRONTMATTER_DELIMITER.encode():
+            if start is not None:
+                return start, pos, next_pos
+            start = next_pos
+        pos = next_pos
+    return None
+
+
+def read_instinct_header(file_path: Path) -> InstinctHeader | None:
+    """Read an agent-written instinct file up to the end of its frontmatter.
+
+    The file is read in FRONTMATTER_READ_SIZE chunks until the closing
+    "---" line, and at most MAX_FRONTMATTER_BYTES: the body is only read
+    when InstinctHeader.body is accessed.
+
+    Args:
+        file_path: Instinct file to read.
+
+    Returns:
+        The header, or None if the file has no id or no closed frontmatter
+        block within MAX_FRONTMATTER_BYTES.
+
+    Raises:
+        OSError: If the file cannot be read.
+        UnicodeDecodeError: If the frontmatter is not valid UTF-8.
+    """
+    head = b""
+    with file_path.open("rb") as f:
+        while True:
+            chunk = f.read(FRONTMATTER_READ_SIZE)
+            head += chunk
+            bounds = _find_frontmatter(head, at_eof=not chunk)
+            if bounds is not None or not chunk or len(head) >= MAX_FRONTMATTER_BYTES:
+                break
+    if bounds is None:
+        return None
+    start, end, body_offset = bounds
+    metadata = section_metadata(head[start:end].decode())
+    instinct = build_instinct(metadata, "", str(file_path))
+    if instinct is None:
+        return None
+    return InstinctHeader(
+        metadata=metadata, instinct=instinct, file_path=file_path, body_offset=body_offset
+    )
+
+
+def parse_instinct_sections(content: str) -> list[dict[str, Any]]:
+    """Parse a file of one or more frontmatter sections.
+
+    Args:
+        content: File content with YAML frontmatter sections.
+
+    Returns:
+        List of instinct dictionaries with id, trigger, confidence, etc.,
+        and the section body as "content".
+    """
+    if not content.strip():
+        return []
+
+    instincts: list[dict[str, Any]] = []
+    frontmatter_lines: list[str] = []
+    content_lines: list[str] = []
+    current: dict[str, Any] = {}
+    in_frontmatter = False
+
+    for line in content.split("\n"):
+        if line.strip() == FRONTMATTER_DELIMITER:
+            if in_frontmatter:
+                current = section_metadata("\n".join(frontmatter_lines))
+            elif current:
+                current["content"] = "\n".join(content_lines).strip()
+                instincts.append(current)
+                current = {}
+            frontmatter_lines = []
+            content_lines = []
+            in_frontmatter = not in_frontmatter
+        elif in_frontmatter:
+            frontmatter_lines.append(line)
+        else:
+            content_lines.append(line)
+
+    # Handle an unclosed block, the last instinct or remaining content
+    if in_frontmatter:
+        current = section_metadata("\n".join(frontmatter_lines))
+        content_lines = []
+    if current and current.get("id"):
+        current["content"] = "\n".join(content_lines).strip()
+        instincts.append(current)
+    elif instincts and content_lines:
+        instincts[-1]["content"] = "\n".join(content_lines).strip()
+
+    return [i for i in instincts if i.get("id")]
+
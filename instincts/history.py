@@ -0,0 +1,90 @@
+"""Whole-history pattern analysis for Instinct-Based Learning.
+
+Regular analysis only looks at the latest window of observations. History
+analysis covers the whole log: each closed segment (and the active file) is
+summarized independently, in a process pool when more than one worker is
+allowed, and the summaries are merged in log order into the same patterns
+DetectionPipeline.detect_all() would find over the concatenated log.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from instincts.blobs import BlobStore, log_blobs_dir
+from instincts.models import Pattern
+from instincts.patterns import (
+    SegmentSummary,
+    iter_segment_observations,
+    merge_summaries,
+    required_fields,
+    resolve_blob_fields,
+    summarize_observations,
+)
+from instincts.segments import segment_paths
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_segment(path: Path, blobs_dir: Path | None = None) -> SegmentSummary:
+    """Summarize one segment of the observation log.
+
+    Top-level so it can be sent to pool workers. An unreadable or truncated
+    segment is logged and summarized as empty, like the streaming readers
+    skip it.
+
+    Args:
+        path: Path to a closed segment or the active log.
+        blobs_dir: Blob store of the log, for fields the observer stored as
+            blobs; such fields stay unresolved if None.
+
+    Returns:
+        SegmentSummary of the segment's observations.
+    """
+    # Only what the detectors read is decoded
+    fields = required_fields()
+    try:
+        observations = iter_segment_observations(path, fields)
+        if blobs_dir is not None:
+            observations = resolve_blob_fields(observations, BlobStore(blobs_dir), fields)
+        return summarize_observations(observations)
+    except (OSError, EOFError) as e:
+        logger.warning("Failed to read %s: %s", path, e)
+        return summarize_observations(())
+
+
+def detect_history_patterns(
+    observations_file: Path, max_workers: int | None = None
+) -> list[Pattern]:
+    """Detect patterns over every segment of the observation log.
+
+    Args:
+        observations_file: Path to the active observations.jsonl file.
+        max_workers: Worker processes; defaults to the CPU count. With one
+            worker (or one segment) everything runs in this process.
+
+    Returns:
+        Combined list of detected patterns from all detectors.
+    """
+    paths = [*segment_paths(observations_file), observations_file]
+    blobs_dir = log_blobs_dir(observations_file)
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+
+    if workers <= 1:
+        return merge_summaries(summarize_segment(path, blobs_dir) for path in paths)
+
+    # spawn: the caller may hold locks or threads (lease heartbeat) that fork would copy
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        # map() yields in submission order, so segments merge oldest first
+        patterns = merge_summaries(executor.map(summarize_segment, paths, repeat(blobs_dir)))
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return patterns
@@ -0,0 +1,140 @@
+"""Lightweight hook client for the observer daemon.
+
+Hook processes are started once per tool call, so this module deliberately
+imports only a few standard library modules. It forwards the raw hook payload
+to the observer daemon (see instincts.daemon) over a per-user Unix socket and
+exits immediately. When the daemon is not running, it falls back to processing
+the hook in-process via instincts.observer.
+
+Usage (from a PreToolUse/PostToolUse hook, payload on stdin):
+    python -m instincts.hook_client pre
+    python -m instincts.hook_client post
+"""
+
+import json
+import os
+import socket
+import sys
+
+# Environment variable overriding the daemon socket path
+DAEMON_SOCKET_ENV: str = "INSTINCT_DAEMON_SOCKET"
+
+# Socket file name inside the per-user runtime directory
+DAEMON_SOCKET_NAME: str = "observer.sock"
+
+# Seconds to wait when connecting/sending to the daemon before falling back
+CLIENT_TIMEOUT_SECONDS: float = 0.5
+
+# Hook events accepted by the daemon
+HOOK_EVENTS: tuple[str, ...] = ("pre", "post")
+
+
+def get_socket_path() -> str:
+    """Get the per-user observer daemon socket path.
+
+    Uses $INSTINCT_DAEMON_SOCKET if set, otherwise a private directory under
+    $XDG_RUNTIME_DIR (or /tmp) named after the current user ID.
+
+    Returns:
+        Absolute path to the Unix socket.
+    """
+    override = os.environ.get(DAEMON_SOCKET_ENV)
+    if override:
+        return override
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(
+        runtime_dir, f"claude-instinct-{os.getuid()}", DAEMON_SOCKET_NAME
+    )
+
+
+def encode_request(event: str, cwd: str, payload: bytes) -> bytes:
+    """Encode a hook request for the daemon.
+
+    The wire format is a one-line JSON header followed by the raw payload.
+
+    Args:
+        event: Hook event ("pre" or "post"), or a control command.
+        cwd: Working directory of the hook process.
+        payload: Raw hook payload (JSON bytes from stdin).
+
+    Returns:
+        Bytes to send over the socket.
+    """
+    header = json.dumps({"event": event, "cwd": cwd})
+    return header.encode() + b"\n" + payload
+
+
+def forward_to_daemon(
+    event: str, payload: bytes, cwd: str, socket_path: str | None = None
+) -> bool:
+    """Send a hook request to the daemon without waiting for a reply.
+
+    Args:
+        event: Hook event ("pre" or "post").
+        payload: Raw hook payload.
+        cwd: Working directory of the hook process.
+        socket_path: Optional socket path (defaults to get_socket_path()).
+
+    Returns:
+        True if the request was handed to the daemon, False otherwise.
+    """
+    path = socket_path or get_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+    try:
+        sock.connect(path)
+        sock.sendall(encode_request(event, cwd, payload))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _observe_in_process(event: str, payload: bytes, cwd: str) -> None:
+    """Process the hook in this process (daemon unavailable)."""
+    from pathlib import Path
+
+    from instincts.config import detect_project_root
+    from instincts.observer import observe_post, observe_pre
+
+    try:
+        hook_data = json.loads(payload or b"{}")
+    except json.JSONDecodeError:
+        return
+    if not isinstance(hook_data, dict):
+        return
+
+    project_root = detect_project_root(Path(cwd))
+    if event == "pre":
+        observe_pre(hook_data, project_root)
+    else:
+        observe_post(hook_data, project_root)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for hook scripts.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:]).
+
+    Returns:
+        Exit code. Always 0 for valid events so hooks never block Claude Code.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1 or args[0] not in HOOK_EVENTS:
+        print("usage: python -m instincts.hook_client {pre|post}", file=sys.stderr)
+        return 2
+
+    event = args[0]
+    payload = sys.stdin.buffer.read()
+    cwd = os.getcwd()
+
+    if not forward_to_daemon(event, payload, cwd):
+        _observe_in_process(event, payload, cwd)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
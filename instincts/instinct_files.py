@@ -0,0 +1,349 @@
+"""Instinct files of a learned/ directory for Instinct-Based Learning.
+
+Each instinct is one Markdown file named after its sanitized ID, with YAML
+frontmatter followed by its body. This module writes those files (atomically,
+keeping the metadata index of instincts.instinct_index current) and reads
+them back, either in full or as index entries without bodies. The file
+storage backend, the agent and the CLI's listings all build on it.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from instincts.frontmatter import (
+    parse_instinct,
+    parse_instinct_sections,
+    read_instinct_header,
+)
+from instincts.instinct_index import (
+    INSTINCT_FILE_SUFFIXES,
+    IndexedFile,
+    InstinctIndexEntry,
+    entries_of,
+    indexed_file,
+    instinct_index_lock,
+    read_instinct_index,
+    save_instinct_index,
+)
+from instincts.models import Instinct
+from instincts.utils import sanitize_id
+
+logger = logging.getLogger(__name__)
+
+
+def escape_yaml_string(value: str) -> str:
+    """Escape a string for safe YAML double-quoted string.
+
+    Prevents YAML injection attacks by escaping special characters
+    that could break out of the quoted string context.
+
+    Args:
+        value: The raw string value.
+
+    Returns:
+        Escaped string safe for YAML double-quoted context.
+    """
+    # Order matters: escape backslashes first to avoid double-escaping
+    escaped = value.replace("\\", "\\\\")
+    escaped = escaped.replace('"', '\\"')
+    escaped = escaped.replace("\n", "\\n")
+    escaped = escaped.replace("\r", "\\r")
+    return escaped
+
+
+def sanitize_instinct_id(instinct_id: str) -> str:
+    """Sanitize an instinct ID to prevent path traversal attacks.
+
+    Args:
+        instinct_id: The raw instinct ID.
+
+    Returns:
+        A safe filename-compatible string.
+    """
+    result = sanitize_id(instinct_id, allow_dots=False)
+    # Preserve backward-compatible default for empty instinct IDs
+    return result if result != "unnamed" else "unnamed-instinct"
+
+
+def atomic_write_text(file_path: Path, content: str) -> None:
+    """Write file atomically using temp file + rename.
+
+    This prevents file corruption if the process crashes mid-write.
+
+    Args:
+        file_path: Path to the file to write.
+        content: Content to write.
+
+    Raises:
+        OSError: If write or rename fails.
+    """
+    directory = file_path.parent
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.rename(temp_path, file_path)
+    except Exception:
+        # Clean up temp file on failure
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_instinct_file(instinct: Instinct, directory: Path) -> Path:
+    """Write an instinct to a markdown file.
+
+    Args:
+        instinct: The instinct to write.
+        directory: Directory to write the file to.
+
+    Returns:
+        Path to the created file.
+
+    Raises:
+        ValueError: If the resulting path would be outside the directory.
+    """
+    # Ensure directory exists with secure permissions
+    directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+    # Sanitize the instinct ID to prevent path traversal
+    safe_id = sanitize_instinct_id(instinct.id)
+
+    # Generate filename
+    filename = f"{safe_id}.md"
+    file_path = directory / filename
+
+    # Check for symlink attack - refuse to overwrite symlinks
+    # This must be checked before resolve() which follows symlinks
+    if file_path.is_symlink():
+        raise ValueError(f"Refusing to write to symlink: {file_path}")
+
+    # Verify the file path is within the directory (defense in depth)
+    resolved_path = file_path.resolve()
+    resolved_dir = directory.resolve()
+    if not resolved_path.is_relative_to(resolved_dir):
+        raise ValueError(f"Path traversal detected: {instinct.id}")
+
+    # Generate file content with YAML frontmatter
+    # Escape all string fields to prevent YAML injection
+    safe_id = escape_yaml_string(instinct.id)
+    safe_trigger = escape_yaml_string(instinct.trigger)
+    safe_domain = escape_yaml_string(instinct.domain)
+    safe_source = escape_yaml_string(instinct.source)
+    safe_status = escape_yaml_string(instinct.status)
+    last_observed_line = (
+        f'last_observed: "{instinct.last_observed.isoformat()}"\n'
+        if instinct.last_observed
+        else ""
+    )
+
+    content = f"""---
+id: "{safe_id}"
+trigger: "{safe_trigger}"
+confidence: {instinct.confidence}
+domain: "{safe_domain}"
+source: "{safe_source}"
+evidence_count: {instinct.evidence_count}
+created_at: "{instinct.created_at.isoformat()}"
+updated_at: "{instinct.updated_at.isoformat()}"
+{last_observed_line}status: "{safe_status}"
+---
+
+{instinct.content}
+"""
+
+    with instinct_index_lock(directory):
+        # Checked before the write, which changes the directory mtime; a
+        # directory without instinct files starts with an empty index
+        index = read_instinct_index(directory)
+        files: list[IndexedFile] | None = None
+        if index is not None and index.is_current(directory):
+            files = list(index.files)
+        elif not any(_list_instinct_files(directory)):
+            files = []
+        # Use atomic write to prevent corruption on crash
+        atomic_write_text(file_path, content)
+        if files is not None:
+            # The content is at hand, so the record is complete
+            written = indexed_file(
+                file_path.name, file_path.stat(), parse_instinct_sections(content), True
+            )
+            files = [file for file in files if file.name != file_path.name]
+            save_instinct_index(directory, [*files, written])
+    return file_path
+
+
+def load_existing_instincts(directory: Path) -> list[Instinct]:
+    """Load existing instincts from a directory.
+
+    Args:
+        directory: Directory containing instinct files.
+
+    Returns:
+        List of Instinct objects.
+    """
+    instincts: list[Instinct] = []
+
+    if not directory.exists():
+        return instincts
+
+    for file_path in directory.glob("*.md"):
+        # Skip symlinks for defense in depth
+        if file_path.is_symlink():
+            logger.warning("Skipping symlink: %s", file_path)
+            continue
+        try:
+            content = file_path.read_text()
+            instinct = parse_instinct(content, str(file_path))
+            if instinct:
+                instincts.append(instinct)
+        except OSError as e:
+            # File read error - log and skip
+            logger.warning("Failed to read instinct file %s: %s", file_path, e)
+            continue
+        except (ValueError, UnicodeDecodeError) as e:
+            # Parsing error - log and skip
+            logger.warning("Failed to parse instinct file %s: %s", file_path, e)
+            continue
+
+    return instincts
+
+
+def _list_instinct_files(directory: Path) -> list[os.DirEntry[str]]:
+    """List a directory's instinct files, sorted by name."""
+    with os.scandir(directory) as it:
+        return sorted(
+            (e for e in it if e.name.endswith(INSTINCT_FILE_SUFFIXES)),
+            key=lambda e: e.name,
+        )
+
+
+def _read_indexed_file(
+    dir_entry: os.DirEntry[str], complete: bool
+) -> IndexedFile | None:
+    """Read the record of one instinct file, or None if it cannot be read.
+
+    Only the first frontmatter block is read unless complete is set.
+    """
+    file_path = Path(dir_entry.path)
+    try:
+        # Stat before reading: a file changed in between is re-read next time
+        stat = dir_entry.stat(follow_symlinks=False)
+        if complete:
+            return indexed_file(
+                dir_entry.name, stat, parse_instinct_sections(file_path.read_text()), True
+            )
+        header = read_instinct_header(file_path)
+        sections = [header.metadata] if header else []
+        return indexed_file(dir_entry.name, stat, sections, False)
+    except OSError as e:
+        logger.warning("Failed to read instinct file %s: %s", file_path, e)
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.warning("Failed to parse instinct file %s: %s", file_path, e)
+    return None
+
+
+def refresh_instinct_index(directory: Path, complete: bool = False) -> list[IndexedFile]:
+    """Rebuild a stale instinct index from the directory listing.
+
+    Files that match their previous record's stat (and, if complete is
+    set, have a complete record) are not read again. Of the others only the
+    first frontmatter block is read, or the whole file if complete is set.
+
+    Args:
+        directory: Existing directory containing instinct files.
+        complete: Whether every section of each file is needed.
+
+    Returns:
+        Records of every readable instinct file.
+    """
+    with instinct_index_lock(directory):
+        previous = read_instinct_index(directory)
+        # Another process may have refreshed it while we waited for the lock
+        if previous and previous.is_current(directory, complete):
+            return list(previous.files)
+
+        known = {file.name: file for file in previous.files} if previous else {}
+        files: list[IndexedFile] = []
+        for dir_entry in _list_instinct_files(directory):
+            # Skip symlinks for defense in depth
+            if dir_entry.is_symlink():
+                logger.warning("Skipping symlink: %s", dir_entry.path)
+                continue
+            try:
+                record = known.get(dir_entry.name)
+                if not (
+                    record
+                    and record.describes(dir_entry.stat(follow_symlinks=False))
+                    and (record.complete or not complete)
+                ):
+                    record = _read_indexed_file(dir_entry, complete)
+            except OSError as e:
+                logger.warning("Failed to read instinct file %s: %s", dir_entry.path, e)
+                continue
+            if record is not None:
+                files.append(record)
+
+        save_instinct_index(directory, files)
+        return files
+
+
+def load_indexed_files(directory: Path, complete: bool = False) -> list[IndexedFile]:
+    """Load the cached frontmatter of every instinct file in a directory.
+
+    A current index is one small read plus a stat per file; a stale one is
+    refreshed first.
+
+    Args:
+        directory: Directory containing instinct files.
+        complete: Whether every section of each file is needed (the CLI's
+            listings), rather than only the first block (the agent).
+
+    Returns:
+        Records of the instinct files, sorted by name.
+    """
+    if not directory.is_dir():
+        return []
+    index = read_instinct_index(directory)
+    if index is not None and index.is_current(directory, complete):
+        return list(index.files)
+    return refresh_instinct_index(directory, complete)
+
+
+def load_instinct_entries(directory: Path) -> list[InstinctIndexEntry]:
+    """Load the metadata of every instinct in a directory, without bodies.
+
+    A current index is one small read plus a stat per file; a stale one is
+    refreshed first, reading only the frontmatter of changed files.
+
+    Args:
+        directory: Directory containing instinct files.
+
+    Returns:
+        Index entries of the Markdown instinct files.
+    """
+    return entries_of(load_indexed_files(directory))
+
+
+def read_instinct(directory: Path, entry: InstinctIndexEntry) -> Instinct | None:
+    """Read and parse the full instinct file behind an index entry.
+
+    Args:
+        directory: Directory containing instinct files.
+        entry: Index entry of the file.
+
+    Returns:
+        The instinct with its body, or None if the file cannot be read or parsed.
+    """
+    file_path = directory / entry.file
+    try:
+        return parse_instinct(file_path.read_text(), str(file_path))
+    except OSError as e:
+        logger.warning("Failed to read instinct file %s: %s", file_path, e)
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.warning("Failed to parse instinct file %s: %s", file_path, e)
+    return None
@@ -0,0 +1,367 @@
+"""Derived metadata index for a learned/ instinct directory.
+
+Loading instinct metadata used to mean reading and parsing every instinct
+file on every analysis run or CLI listing. This module keeps a JSON sidecar
+next to the directory (learned/ -> .learned.index.json, outside it so
+writing the index does not change the directory) with the frontmatter of
+every instinct file plus the file's mtime, size, inode and ctime. It is the
+one metadata cache of learned/, shared by the agent and the CLI.
+
+The index is only trusted while the directory's mtime equals the one it
+recorded and every record matches its file's stat. Creating, renaming or
+deleting a file (including the atomic rename every instinct write ends
+with) changes the directory mtime; an in-place edit changes the file's
+mtime or size, or at least its ctime. A stale index is refreshed from the
+directory listing, re-reading only the files that differ from their record.
+
+The agent only needs the first frontmatter block of a file, so records it
+refreshes hold just that block (read_instinct_header()). The CLI lists
+every section of hand-written collections; it completes a record by
+parsing the whole file once, and the complete record serves both.
+
+All index writes happen under an exclusive lock, so records are never
+saved with a directory mtime newer than the files they describe.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from instincts.frontmatter import build_instinct
+from instincts.models import Instinct, InstinctStatus
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the record layout changes; indexes of other versions are rebuilt
+INSTINCT_INDEX_VERSION: int = 3
+
+# File name suffixes of instinct files (.yaml collections are listed by the CLI)
+INSTINCT_FILE_SUFFIXES: tuple[str, ...] = (".md", ".yaml")
+
+
+@dataclass(frozen=True)
+class InstinctIndexEntry:
+    """Metadata of the instinct an agent-written file holds.
+
+    Attributes:
+        id: Instinct ID.
+        trigger: Trigger condition.
+        domain: Instinct domain.
+        confidence: Confidence score.
+        status: Instinct status (active/dormant).
+        evidence_count: Number of supporting observations.
+        source: Where the instinct came from.
+        created_at: Creation time.
+        updated_at: Last update time.
+        last_observed: When the pattern was last observed, if recorded.
+        file: File name within the directory.
+    """
+
+    id: str
+    trigger: str
+    domain: str
+    confidence: float
+    status: InstinctStatus
+    evidence_count: int
+    source: str
+    created_at: datetime
+    updated_at: datetime
+    last_observed: datetime | None
+    file: str
+
+    def to_instinct(self, directory: Path, content: str = "") -> Instinct:
+        """Build an Instinct from the entry.
+
+        Args:
+            directory: Directory holding the instinct file.
+            content: Markdown body, if it has been read.
+
+        Returns:
+            Instinct with source_file set to the entry's file.
+        """
+        return Instinct(
+            id=self.id,
+            trigger=self.trigger,
+            confidence=self.confidence,
+            domain=self.domain,
+            source=self.source,
+            evidence_count=self.evidence_count,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            content=content,
+            source_file=str(directory / self.file),
+            status=self.status,
+            last_observed=self.last_observed,
+        )
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    """Frontmatter of one instinct file and the stat it was read at.
+
+    Attributes:
+        name: File name within the directory.
+        mtime_ns: File mtime when the record was written.
+        size: File size in bytes when the record was written.
+        inode: File inode when the record was written.
+        ctime_ns: File ctime when the record was written.
+        sections: Metadata of the file's frontmatter blocks that have an
+            id, without bodies (see frontmatter.section_metadata()).
+        complete: Whether sections covers the whole file, or only its
+            first block.
+    """
+
+    name: str
+    mtime_ns: int
+    size: int
+    inode: int
+    ctime_ns: int
+    sections: tuple[dict[str, Any], ...]
+    complete: bool
+
+    def describes(self, stat: os.stat_result) -> bool:
+        """Whether the record was written for this version of its file.
+
+        A file rewritten within the mtime granularity at the same size still
+        changes its ctime, and one replaced by a rename changes its inode.
+        """
+        return (self.mtime_ns, self.size, self.inode, self.ctime_ns) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+            stat.st_ino,
+            stat.st_ctime_ns,
+        )
+
+    def entry(self) -> InstinctIndexEntry | None:
+        """Get the agent's entry: the first block of a Markdown file, if any."""
+        if not self.name.endswith(".md") or not self.sections:
+            return None
+        instinct = build_instinct(self.sections[0], "", self.name)
+        if instinct is None:
+            return None
+        return InstinctIndexEntry(
+            id=instinct.id,
+            trigger=instinct.trigger,
+            domain=instinct.domain,
+            confidence=instinct.confidence,
+            status=instinct.status,
+            evidence_count=instinct.evidence_count,
+            source=instinct.source,
+            created_at=instinct.created_at,
+            updated_at=instinct.updated_at,
+            last_observed=instinct.last_observed,
+            file=self.name,
+        )
+
+
+def indexed_file(
+    name: str, stat: os.stat_result, sections: list[dict[str, Any]], complete: bool
+) -> IndexedFile:
+    """Build the record of an instinct file.
+
+    Args:
+        name: File name within the directory.
+        stat: The file's stat, taken before it was read.
+        sections: Metadata of its frontmatter blocks, without bodies.
+        complete: Whether sections covers the whole file.
+
+    Returns:
+        The record.
+    """
+    return IndexedFile(
+        name=name,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        inode=stat.st_ino,
+        ctime_ns=stat.st_ctime_ns,
+        sections=tuple(
+            {key: value for key, value in section.items() if key != "content"}
+            for section in sections
+        ),
+        complete=complete,
+    )
+
+
+def entries_of(files: list[IndexedFile]) -> list[InstinctIndexEntry]:
+    """Get the agent's entries of indexed files (Markdown files with an id)."""
+    return [entry for entry in (file.entry() for file in files) if entry is not None]
+
+
+@dataclass(frozen=True)
+class InstinctIndex:
+    """Index of an instinct directory.
+
+    Attributes:
+        directory_mtime_ns: Directory mtime when the index was written.
+        files: One record per instinct file.
+    """
+
+    directory_mtime_ns: int
+    files: tuple[IndexedFile, ...]
+
+    def is_current(self, directory: Path, complete: bool = False) -> bool:
+        """Whether neither the directory nor an indexed file has changed.
+
+        Costs one stat of the directory and of each indexed file.
+
+        Args:
+            directory: Directory containing instinct files.
+            complete: Also require every record to be complete.
+        """
+        if complete and not all(file.complete for file in self.files):
+            return False
+        try:
+            if directory.stat().st_mtime_ns != self.directory_mtime_ns:
+                return False
+            return all(
+                file.describes(os.stat(directory / file.name, follow_symlinks=False))
+                for file in self.files
+            )
+        except OSError:
+            return False
+
+
+def get_instinct_index_path(directory: Path) -> Path:
+    """Get the index path of an instinct directory.
+
+    Args:
+        directory: Directory containing instinct files.
+
+    Returns:
+        Path to the hidden sidecar next to the directory
+        (e.g. learned/ -> .learned.index.json).
+    """
+    return directory.with_name(f".{directory.name}.index.json")
+
+
+def get_instinct_index_lock_path(directory: Path) -> Path:
+    """Get the lock file guarding an instinct directory's index."""
+    return directory.with_name(f".{directory.name}.index.lock")
+
+
+@contextmanager
+def instinct_index_lock(directory: Path) -> Iterator[None]:
+    """Hold the exclusive index lock of an instinct directory.
+
+    Args:
+        directory: Directory containing instinct files; its parent must exist.
+
+    Raises:
+        OSError: If the lock file cannot be opened (e.g. it is a symlink).
+    """
+    fd = os.open(
+        get_instinct_index_lock_path(directory), os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600
+    )
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _file_to_dict(file: IndexedFile) -> dict[str, Any]:
+    """Serialize a record."""
+    return {
+        "name": file.name,
+        "mtime_ns": file.mtime_ns,
+        "size": file.size,
+        "inode": file.inode,
+        "ctime_ns": file.ctime_ns,
+        "sections": list(file.sections),
+        "complete": file.complete,
+    }
+
+
+def _file_from_dict(data: dict[str, Any]) -> IndexedFile:
+    """Deserialize a record.
+
+    Raises:
+        KeyError, TypeError, ValueError: If the record is malformed.
+    """
+    sections = data["sections"]
+    if not isinstance(sections, list) or not all(isinstance(s, dict) for s in sections):
+        raise TypeError("sections must be a list of objects")
+    return IndexedFile(
+        name=str(data["name"]),
+        mtime_ns=int(data["mtime_ns"]),
+        size=int(data["size"]),
+        inode=int(data["inode"]),
+        ctime_ns=int(data["ctime_ns"]),
+        sections=tuple(sections),
+        complete=bool(data["complete"]),
+    )
+
+
+def read_instinct_index(directory: Path) -> InstinctIndex | None:
+    """Read an index whether or not it is current.
+
+    Args:
+        directory: Directory containing instinct files.
+
+    Returns:
+        The index, or None if it is missing, corrupt or of another version.
+    """
+    try:
+        data = json.loads(get_instinct_index_path(directory).read_text())
+        if data["version"] != INSTINCT_INDEX_VERSION:
+            return None
+        return InstinctIndex(
+            directory_mtime_ns=int(data["directory_mtime_ns"]),
+            files=tuple(_file_from_dict(file) for file in data["files"]),
+        )
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def load_instinct_index(directory: Path) -> list[InstinctIndexEntry] | None:
+    """Load the agent's entries from an index if it is current.
+
+    Args:
+        directory: Directory containing instinct files.
+
+    Returns:
+        The entries, or None if the index is missing, corrupt or was written
+        before the directory or one of its files last changed.
+    """
+    index = read_instinct_index(directory)
+    if index is None or not index.is_current(directory):
+        return None
+    return entries_of(list(index.files))
+
+
+def save_instinct_index(directory: Path, files: list[IndexedFile]) -> None:
+    """Write the index atomically, recording the current directory mtime.
+
+    Must be called under instinct_index_lock(), after the directory changes
+    the records describe. Failures are logged and ignored: the index is
+    derived data and is rebuilt on the next load.
+
+    Args:
+        directory: Directory containing instinct files.
+        files: Records of every instinct file in the directory.
+    """
+    index_path = get_instinct_index_path(directory)
+    try:
+        data = {
+            "version": INSTINCT_INDEX_VERSION,
+            "directory_mtime_ns": directory.stat().st_mtime_ns,
+            "files": [_file_to_dict(file) for file in files],
+        }
+        fd, temp_path = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(data))
+            os.replace(temp_path, index_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logger.warning("Failed to write instinct index %s: %s", index_path, e)
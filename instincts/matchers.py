@@ -0,0 +1,141 @@
+"""Precompiled keyword matchers for Instinct-Based Learning.
+
+Error detection, error-type extraction and correction detection all look
+for a fixed set of words in text that can be as long as a full tool output.
+The matchers here are built once per keyword set and scan each text once:
+- KeywordMatcher lowercases the text once. Substring keywords are then
+  found with str containment (a C-level scan per keyword, much faster than
+  a regex alternation over the text); whole-word keywords with a single
+  combined alternation regex.
+- WordSuffixMatcher finds the first word ending in one of a few suffixes
+  (e.g. "ImportError"): str.find locates the first suffix, and a regex that
+  only starts at word starts runs from that word on.
+
+This module is imported on the hook path, so it only uses re.
+"""
+
+import re
+from collections.abc import Iterable
+
+# Characters searched back from a suffix for the start of its word (doubled
+# until a word boundary is inside)
+_WORD_START_WINDOW: int = 64
+
+_WORD_CHAR = re.compile(r"\w")
+_NON_WORD_CHAR = re.compile(r"\W")
+
+
+class KeywordMatcher:
+    """Case-insensitive matcher for a fixed, ordered set of keywords.
+
+    Example:
+        matcher = KeywordMatcher(("error", "failed"))
+        matcher.first("Build FAILED with 1 error")  # "error"
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = False) -> None:
+        """Compile a matcher.
+
+        Args:
+            keywords: Lowercase keywords, in priority order for first().
+            whole_words: Match keywords only at word boundaries.
+        """
+        self.keywords = tuple(keywords)
+        self.whole_words = whole_words
+        self._pattern: re.Pattern[str] | None = None
+        self._word_patterns: tuple[re.Pattern[str], ...] = ()
+        if whole_words:
+            alternation = "|".join(re.escape(keyword) for keyword in self.keywords)
+            self._pattern = re.compile(rf"\b(?:{alternation})\b")
+            self._word_patterns = tuple(
+                re.compile(rf"\b{re.escape(keyword)}\b") for keyword in self.keywords
+            )
+
+    def search(self, text: str) -> bool:
+        """Check whether text contains any keyword."""
+        lowered = text.lower()
+        if self._pattern is not None:
+            return self._pattern.search(lowered) is not None
+        return any(keyword in lowered for keyword in self.keywords)
+
+    def first(self, text: str) -> str | None:
+        """Get the highest-priority keyword that text contains.
+
+        Args:
+            text: Text to scan.
+
+        Returns:
+            The first keyword (in priority order, not text order) found, or
+            None if there is none.
+        """
+        lowered = text.lower()
+        if self._pattern is not None:
+            # Whole-word matches can overlap, so each keyword is checked on
+            # its own, but only once the combined scan found any
+            if self._pattern.search(lowered) is None:
+                return None
+            return next(
+                (
+                    keyword
+                    for keyword, pattern in zip(self.keywords, self._word_patterns)
+                    if pattern.search(lowered)
+                ),
+                None,
+            )
+        return next((keyword for keyword in self.keywords if keyword in lowered), None)
+
+
+class WordSuffixMatcher:
+    """Find the first word made of word characters followed by a suffix.
+
+    Matches like the regex (\\w+S1|\\w+S2|...): a word needs at least one
+    character before its suffix, and earlier suffixes win within a word.
+
+    Example:
+        WordSuffixMatcher(("Error", "Exception")).search("raise ValueError(")  # "ValueError"
+    """
+
+    def __init__(self, suffixes: Iterable[str]) -> None:
+        """Compile a matcher.
+
+        Args:
+            suffixes: Case-sensitive suffixes, in priority order.
+        """
+        self.suffixes = tuple(suffixes)
+        alternation = "|".join(rf"\w+{re.escape(suffix)}" for suffix in self.suffixes)
+        # A match can only start where a word starts: if none starts at the
+        # beginning of a word, none starts inside it either
+        self._pattern = re.compile(rf"(?<!\w)(?:{alternation})")
+
+    def _first_suffix(self, text: str) -> int | None:
+        """Position of the first suffix preceded by a word character."""
+        first: int | None = None
+        for suffix in self.suffixes:
+            # Only look for occurrences starting before the best one so far
+            end = len(text) if first is None else first + len(suffix) - 1
+            position = text.find(suffix, 1, end)
+            while position != -1:
+                if _WORD_CHAR.match(text, position - 1):
+                    first = position
+                    break
+                position = text.find(suffix, position + 1, end)
+        return first
+
+    def search(self, text: str) -> str | None:
+        """Get the first matching word in text, or None.
+
+        The regex only runs from the start of the word holding the first
+        suffix occurrence, found with str.find; no word before it can match.
+        """
+        position = self._first_suffix(text)
+        if position is None:
+            return None
+        # Back up to a window that holds a non-word character, so the regex
+        # starts at or before the beginning of the word
+        window = _WORD_START_WINDOW
+        start = max(position - window, 0)
+        while start and not _NON_WORD_CHAR.search(text, start, position):
+            window *= 2
+            start = max(position - window, 0)
+        match = self._pattern.search(text, start)
+        return match.group() if match else None
@@ -71,6 +71,19 @@ class Pattern:
     domain: str = "general"
     metadata: tuple[tuple[str, Any], ...] = field(default_factory=tuple)
 
+    @property
+    def occurrences(self) -> int:
+        """Number of observations supporting this pattern.
+
+        Aggregated patterns keep only a capped sample of evidence and record
+        the full count in the "occurrences" metadata; otherwise this is the
+        number of evidence entries.
+        """
+        for key, value in self.metadata:
+            if key == "occurrences" and isinstance(value, int):
+                return value
+        return len(self.evidence)
+
 
 @dataclass(frozen=True)
 class Instinct:
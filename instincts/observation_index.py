@@ -0,0 +1,259 @@
+"""Sidecar metadata index for observation logs.
+
+Counting observations used to mean reading the whole observations file, and
+that happens on the hook hot path (trigger checks). This module keeps a tiny
+JSON sidecar next to the log with its line count, byte size and first/last
+timestamps. The sidecar is updated by the observer while it holds the append
+lock, and rebuilt from the log whenever its recorded byte size disagrees with
+the file on disk (legacy logs, archival, crashes between the two writes).
+"""
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+# Block size used when scanning a log to rebuild its index
+INDEX_REBUILD_BLOCK_SIZE: int = 1024 * 1024
+
+# Maximum bytes read backwards to find the last line during a rebuild
+MAX_LAST_LINE_BYTES: int = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ObservationIndex:
+    """Metadata for one observations file.
+
+    Attributes:
+        line_count: Number of lines (observations) in the file.
+        byte_size: File size in bytes when the index was written.
+        first_timestamp: Timestamp of the first observation, if any.
+        last_timestamp: Timestamp of the last observation, if any.
+    """
+
+    line_count: int
+    byte_size: int
+    first_timestamp: str | None = None
+    last_timestamp: str | None = None
+
+
+EMPTY_INDEX = ObservationIndex(line_count=0, byte_size=0)
+
+
+def get_index_path(observations_file: Path) -> Path:
+    """Get the sidecar index path for an observations file.
+
+    Args:
+        observations_file: Path to the observations JSONL file.
+
+    Returns:
+        Path to the hidden sidecar next to the file
+        (e.g. observations.jsonl -> .observations.index.json).
+    """
+    return observations_file.with_name(f".{observations_file.stem}.index.json")
+
+
+def _timestamp_of(line: bytes) -> str | None:
+    """Extract the timestamp field from a raw JSONL line."""
+    try:
+        data = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    timestamp = data.get("timestamp")
+    return timestamp if isinstance(timestamp, str) else None
+
+
+def _load_index(index_path: Path) -> ObservationIndex | None:
+    """Load a sidecar index, returning None if missing or corrupt."""
+    try:
+        data = json.loads(index_path.read_text())
+        return ObservationIndex(
+            line_count=int(data["line_count"]),
+            byte_size=int(data["byte_size"]),
+            first_timestamp=data.get("first_timestamp"),
+            last_timestamp=data.get("last_timestamp"),
+        )
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_index(index_path: Path, index: ObservationIndex) -> None:
+    """Write the sidecar atomically; failures are logged and ignored."""
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(asdict(index), f)
+        os.replace(temp_path, index_path)
+    except OSError as e:
+        logger.warning("Failed to write observation index %s: %s", index_path, e)
+
+
+def _scan(f: IO[bytes], byte_size: int) -> ObservationIndex:
+    """Build an index by scanning an open log file."""
+    f.seek(0)
+    first_line = f.readline()
+    first_timestamp = _timestamp_of(first_line) if first_line else None
+
+    f.seek(0)
+    line_count = 0
+    last_byte = b""
+    while True:
+        block = f.read(INDEX_REBUILD_BLOCK_SIZE)
+        if not block:
+            break
+        line_count += block.count(b"\n")
+        last_byte = block[-1:]
+    # A final line without a trailing newline still counts as a line
+    if last_byte and last_byte != b"\n":
+        line_count += 1
+
+    return ObservationIndex(
+        line_count=line_count,
+        byte_size=byte_size,
+        first_timestamp=first_timestamp,
+        last_timestamp=_last_timestamp(f, byte_size),
+    )
+
+
+def _last_timestamp(f: IO[bytes], byte_size: int) -> str | None:
+    """Read the timestamp of the last complete line of a log."""
+    start = max(0, byte_size - MAX_LAST_LINE_BYTES)
+    f.seek(start)
+    tail = f.read(byte_size - start).rstrip(b"\n")
+    if not tail:
+        return None
+    return _timestamp_of(tail.rsplit(b"\n", 1)[-1])
+
+
+def rebuild_index(observations_file: Path) -> ObservationIndex:
+    """Rebuild the sidecar index by scanning the log under its lock.
+
+    Args:
+        observations_file: Path to the observations JSONL file.
+
+    Returns:
+        The freshly computed index (EMPTY_INDEX if the file doesn't exist).
+
+    Raises:
+        OSError: If the log exists but cannot be read.
+    """
+    try:
+        f = observations_file.open("rb")
+    except FileNotFoundError:
+        return EMPTY_INDEX
+
+    with f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            index = _scan(f, os.fstat(f.fileno()).st_size)
+            _save_index(get_index_path(observations_file), index)
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    return index
+
+
+def scan_index(log_file: Path) -> ObservationIndex:
+    """Compute the index of a log by scanning it, without writing a sidecar.
+
+    Used for closed segments, which are never appended to.
+
+    Args:
+        log_file: Path to a JSONL log.
+
+    Returns:
+        The computed index (EMPTY_INDEX if the file doesn't exist).
+
+    Raises:
+        OSError: If the log exists but cannot be read.
+    """
+    try:
+        f = log_file.open("rb")
+    except FileNotFoundError:
+        return EMPTY_INDEX
+
+    with f:
+        return _scan(f, os.fstat(f.fileno()).st_size)
+
+
+def read_index(observations_file: Path) -> ObservationIndex:
+    """Read the index for a log, rebuilding it if it is stale.
+
+    The sidecar is trusted only when its byte size matches the file on disk,
+    so a missing, corrupt or outdated sidecar heals itself on first read.
+
+    Args:
+        observations_file: Path to the observations JSONL file.
+
+    Returns:
+        ObservationIndex for the file (EMPTY_INDEX if it doesn't exist).
+
+    Raises:
+        OSError: If the log exists but cannot be read for a rebuild.
+    """
+    try:
+        byte_size = observations_file.stat().st_size
+    except FileNotFoundError:
+        return EMPTY_INDEX
+
+    index = _load_index(get_index_path(observations_file))
+    if index is not None and index.byte_size == byte_size:
+        return index
+    return rebuild_index(observations_file)
+
+
+def update_index_after_append(
+    observations_file: Path,
+    f: IO[Any],
+    size_before: int,
+    timestamp: str | None,
+) -> None:
+    """Update the sidecar after one line was appended.
+
+    Must be called while the caller still holds the exclusive append lock on
+    ``f`` so the read-modify-write of the sidecar is serialized.
+
+    Args:
+        observations_file: Path to the observations JSONL file.
+        f: The locked, flushed handle the line was written to.
+        size_before: File size before the append.
+        timestamp: Timestamp of the appended observation.
+    """
+    index_path = get_index_path(observations_file)
+    size_after = os.fstat(f.fileno()).st_size
+    index = _load_index(index_path)
+
+    if index is None or index.byte_size != size_before:
+        # Out of sync - rescan once while we already hold the lock
+        with observations_file.open("rb") as reader:
+            _save_index(index_path, _scan(reader, size_after))
+        return
+
+    _save_index(
+        index_path,
+        ObservationIndex(
+            line_count=index.line_count + 1,
+            byte_size=size_after,
+            first_timestamp=index.first_timestamp if index.line_count else timestamp,
+            last_timestamp=timestamp,
+        ),
+    )
+
+
+def reset_index(observations_file: Path) -> None:
+    """Remove the sidecar (e.g. after the log was archived).
+
+    Args:
+        observations_file: Path to the observations JSONL file.
+    """
+    try:
+        get_index_path(observations_file).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Failed to reset observation index: %s", e)
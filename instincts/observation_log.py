@@ -0,0 +1,127 @@
+"""Append path of the observations.jsonl log for Instinct-Based Learning.
+
+Observations are appended one JSON line at a time under the log's append
+lock, which also covers the sidecar index update and, once the log reached
+MAX_FILE_SIZE_MB, closing it as a segment. The observer and the file
+storage backend both write through this module.
+"""
+
+import fcntl
+import json
+import os
+from pathlib import Path
+from typing import Any, TextIO
+
+from instincts.config import LARGE_OBSERVATION_FIELDS
+from instincts.observation_index import update_index_after_append
+from instincts.segments import append_lock, roll_over
+
+# Maximum active log size before it is closed as a segment (in MB)
+MAX_FILE_SIZE_MB: int = 10
+
+
+class ObservationHandles:
+    """Cache of open append handles for observations files.
+
+    Used by the long-lived observer daemon so each project's observations
+    file is opened once instead of on every hook call. A cached handle is
+    reopened when the file on disk has been replaced (e.g. rolled over).
+    """
+
+    def __init__(self) -> None:
+        self._handles: dict[Path, TextIO] = {}
+
+    def get(self, observations_file: Path) -> TextIO:
+        """Return an open append handle for the given observations file.
+
+        Args:
+            observations_file: Path to the observations JSONL file.
+
+        Returns:
+            A text handle opened in append mode.
+        """
+        handle = self._handles.get(observations_file)
+        if handle is not None and not _is_same_file(handle, observations_file):
+            handle.close()
+            handle = None
+        if handle is None:
+            handle = observations_file.open("a")
+            self._handles[observations_file] = handle
+        return handle
+
+    def close_all(self) -> None:
+        """Close every cached handle."""
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+
+def large_fields_last(observation: dict[str, Any]) -> dict[str, Any]:
+    """Order an observation so LARGE_OBSERVATION_FIELDS come after all others."""
+    keys = list(observation)
+    large = [key for key in keys if key in LARGE_OBSERVATION_FIELDS]
+    if keys[len(keys) - len(large) :] == large:
+        return observation
+    ordered = {key: observation[key] for key in keys if key not in LARGE_OBSERVATION_FIELDS}
+    ordered.update((key, observation[key]) for key in large)
+    return ordered
+
+
+def _is_same_file(handle: TextIO, path: Path) -> bool:
+    """Check whether an open handle still refers to the file at path."""
+    try:
+        return os.path.samestat(os.fstat(handle.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+def _write_with_lock(
+    f: TextIO, line: str, observations_file: Path, timestamp: str | None
+) -> int:
+    """Write a line while holding an exclusive flock, updating the sidecar index.
+
+    Returns:
+        File size after the write.
+    """
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        size_before = os.fstat(f.fileno()).st_size
+        f.write(line)
+        f.flush()
+        update_index_after_append(observations_file, f, size_before, timestamp)
+        return size_before + len(line.encode())
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def append_observation(
+    observation: dict[str, Any],
+    observations_file: Path,
+    handles: ObservationHandles | None = None,
+) -> None:
+    """Append an observation to a file with exclusive file locking.
+
+    Uses the log's append lock to prevent race conditions when multiple
+    Claude Code sessions write to the same file simultaneously. The sidecar
+    index (line count, size, first/last timestamp) is updated under the same
+    lock, and a log that reached MAX_FILE_SIZE_MB is closed as a segment
+    before the lock is released, so the size is never checked separately.
+
+    Args:
+        observation: The observation data to write.
+        observations_file: Path to the observations JSONL file.
+        handles: Optional handle cache; when given, the file is not reopened.
+    """
+    line = json.dumps(large_fields_last(observation)) + "\n"
+    timestamp = observation.get("timestamp")
+    with append_lock(observations_file):
+        if handles is not None:
+            size = _write_with_lock(
+                handles.get(observations_file), line, observations_file, timestamp
+            )
+        else:
+            with observations_file.open("a") as f:
+                size = _write_with_lock(f, line, observations_file, timestamp)
+
+        if size >= MAX_FILE_SIZE_MB * 1024 * 1024:
+            roll_over(observations_file)
@@ -7,10 +7,9 @@ writing observations to a JSONL file.
 import fcntl
 import json
 import os
-import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from instincts.auto_learn import should_trigger_learning, trigger_background_analysis
 from instincts.config import (
@@ -19,123 +18,135 @@ from instincts.config import (
     ANALYSIS_TRIGGER_COUNT,
     ANALYSIS_TRIGGER_HOURS,
     get_analysis_pending_file,
-    get_archive_dir,
+    get_blobs_dir,
+    get_observation_counter_file,
     get_observations_file,
-    get_project_instincts_dir,
 )
 
-# Maximum file size before archiving (in MB)
-MAX_FILE_SIZE_MB: int = 10
+# The other instincts modules are imported by the functions using them:
+# every tool call starts a hook process that imports this module
+if TYPE_CHECKING:
+    from instincts.observation_log import ObservationHandles
 
 # Maximum length for input/output strings
 MAX_CONTENT_LENGTH: int = 5000
 
-# Thread-local storage for observation counter (CR-001: thread safety)
+# Width of the zero-padded value stored in the shared counter file
+COUNTER_WIDTH: int = 20
 
-_observation_storage = threading.local()
 
+def _read_counter(fd: int) -> int:
+    """Read the counter value from an open counter file descriptor."""
+    raw = os.pread(fd, COUNTER_WIDTH, 0)
+    try:
+        return int(raw) if raw.strip() else 0
+    except ValueError:
+        # Corrupt counter - start over rather than failing the hook
+        return 0
 
-def get_observation_counter() -> int:
-    """Get the current observation counter value (thread-safe).
 
-    Returns:
-        Current counter value for this thread.
-    """
-    return getattr(_observation_storage, "counter", 0)
+def get_observation_counter(project_root: Path) -> int:
+    """Get the shared observation counter for a project.
 
-
-def increment_observation_counter() -> int:
-    """Increment the observation counter (thread-safe).
+    Args:
+        project_root: Path to the project root.
 
     Returns:
-        New counter value after increment.
+        Current counter value, or 0 if the counter file doesn't exist.
     """
-    current = get_observation_counter()
-    new_value = current + 1
-    _observation_storage.counter = new_value
-    return new_value
-
-
-def reset_observation_counter() -> None:
-    """Reset the observation counter to zero (thread-safe)."""
-    _observation_storage.counter = 0
-
+    try:
+        fd = os.open(get_observation_counter_file(project_root), os.O_RDONLY | os.O_NOFOLLOW)
+    except OSError:
+        return 0
+    try:
+        return _read_counter(fd)
+    finally:
+        os.close(fd)
 
-def _truncate(value: Any, max_length: int = MAX_CONTENT_LENGTH) -> str:
-    """Truncate a value to max_length characters."""
-    if isinstance(value, dict):
-        text = json.dumps(value)
-    else:
-        text = str(value)
-    return text[:max_length]
 
+def increment_observation_counter(project_root: Path) -> int:
+    """Atomically increment the shared per-project observation counter.
 
-def _get_file_size_mb(path: Path) -> float:
-    """Get file size in megabytes."""
-    if not path.exists():
-        return 0.0
-    return path.stat().st_size / (1024 * 1024)
+    Each hook invocation is a separate process, so the counter lives in a
+    small flock'd file that all concurrent Claude Code sessions share.
 
+    Args:
+        project_root: Path to the project root.
 
-def _archive_if_needed(observations_file: Path, archive_dir: Path) -> None:
-    """Archive observations file if it exceeds MAX_FILE_SIZE_MB.
+    Returns:
+        New counter value after increment.
 
-    Uses unique timestamp + PID for archive filename to prevent race conditions
-    when multiple processes attempt to archive simultaneously.
+    Raises:
+        OSError: If the counter file cannot be opened (e.g. it is a symlink).
     """
-    if _get_file_size_mb(observations_file) >= MAX_FILE_SIZE_MB:
-        archive_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
-        # Include PID in filename to prevent race condition with concurrent archives
-        archive_path = archive_dir / f"observations-{timestamp}-{os.getpid()}.jsonl"
+    counter_file = get_observation_counter_file(project_root)
+    fd = os.open(counter_file, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
         try:
-            observations_file.rename(archive_path)
-        except FileNotFoundError:
-            # Another process already archived the file - this is fine
-            pass
+            new_value = _read_counter(fd) + 1
+            os.pwrite(fd, str(new_value).zfill(COUNTER_WIDTH).encode(), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+    return new_value
 
 
-def _append_observation_with_lock(
-    observation: dict[str, Any], observations_file: Path
+def _write_observation_to_project(
+    observation: dict[str, Any],
+    project_root: Path,
+    handles: "ObservationHandles | None" = None,
 ) -> None:
-    """Append an observation to a file with exclusive file locking.
+    """Write an observation to the project's observation store.
 
-    Uses fcntl.LOCK_EX to prevent race conditions when multiple Claude Code
-    sessions write to the same file simultaneously.
+    The file backend appends to observations.jsonl under its append lock;
+    the SQLite backend inserts a row. Both are safe with multiple Claude
+    Code sessions writing simultaneously.
 
     Args:
         observation: The observation data to write.
-        observations_file: Path to the observations JSONL file.
+        project_root: Path to the project root.
+        handles: Optional handle cache shared across calls (daemon mode).
     """
-    with observations_file.open("a") as f:
-        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-        try:
-            f.write(json.dumps(observation) + "\n")
-            f.flush()
-        finally:
-            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    from instincts.observation_log import large_fields_last
+    from instincts.storage import open_observation_store
 
+    store = open_observation_store(project_root, handles)
+    try:
+        # Large fields last in every backend, so projected reads can skip them
+        store.append_observation(large_fields_last(observation))
+    finally:
+        store.close()
 
-def _write_observation_to_project(
-    observation: dict[str, Any], project_root: Path
+
+def _set_large_field(
+    observation: dict[str, Any], name: str, text: str, project_root: Path
 ) -> None:
-    """Write an observation to the project's observations file.
+    """Set a large field inline, or as a blob reference when the store is enabled.
 
-    Uses file locking to prevent race conditions when multiple Claude Code
-    sessions write to the same file simultaneously.
+    A blob that cannot be written is kept inline instead.
 
     Args:
-        observation: The observation data to write.
-        project_root: Path to the project root.
+        observation: Observation being built.
+        name: Field name ("input" or "output").
+        text: Field text, already cut to MAX_CONTENT_LENGTH.
+        project_root: Project root for project-scoped storage.
     """
-    instincts_dir = get_project_instincts_dir(project_root)
-    instincts_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
-
-    observations_file = get_observations_file(project_root)
-    archive_dir = get_archive_dir(project_root)
-
-    _archive_if_needed(observations_file, archive_dir)
-    _append_observation_with_lock(observation, observations_file)
+    from instincts.blobs import (
+        BLOB_REF_SUFFIX,
+        BlobStore,
+        blob_store_enabled,
+        should_store_blob,
+    )
+
+    if should_store_blob(text) and blob_store_enabled():
+        try:
+            observation[name + BLOB_REF_SUFFIX] = BlobStore(get_blobs_dir(project_root)).put(text)
+            return
+        except OSError:
+            pass
+    observation[name] = text
 
 
 def _extract_field(data: dict[str, Any], primary: str, fallback: str) -> Any:
@@ -143,10 +154,17 @@ def _extract_field(data: dict[str, Any], primary: str, fallback: str) -> Any:
     return data.get(primary, data.get(fallback, ""))
 
 
-def observe_pre(hook_data: dict[str, Any], project_root: Path) -> None:
+def observe_pre(
+    hook_data: dict[str, Any],
+    project_root: Path,
+    handles: "ObservationHandles | None" = None,
+) -> None:
     """Process PreToolUse hook.
 
-    Extracts tool information and writes a tool_start event.
+    Extracts tool information and writes a tool_start event, with the file
+    path (and Bash command head) extracted once for the detectors. The input
+    is kept up to MAX_CONTENT_LENGTH characters, with the full input's
+    length and digest recorded alongside.
 
     Args:
         hook_data: Hook data from Claude Code containing:
@@ -155,26 +173,41 @@ def observe_pre(hook_data: dict[str, Any], project_root: Path) -> None:
             - tool_input or input: Input parameters
             - session_id: Session identifier
         project_root: Project root for project-scoped storage.
+        handles: Optional handle cache shared across calls (daemon mode).
     """
+    from instincts.enrichment import describe_input
+    from instincts.payload import encode_bounded
+
     tool_name = _extract_field(hook_data, "tool_name", "tool")
     tool_input = _extract_field(hook_data, "tool_input", "input")
     session_id = hook_data.get("session_id", "unknown")
+    tool_input_text = encode_bounded(tool_input, MAX_CONTENT_LENGTH)
 
     observation = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "event": "tool_start",
         "tool": tool_name,
         "session": session_id,
-        "input": _truncate(tool_input),
+        **describe_input(tool_name, tool_input),
+        "input_length": tool_input_text.size,
+        "input_digest": tool_input_text.digest,
     }
+    _set_large_field(observation, "input", tool_input_text.text, project_root)
 
-    _write_observation_to_project(observation, project_root)
+    _write_observation_to_project(observation, project_root, handles)
 
 
-def observe_post(hook_data: dict[str, Any], project_root: Path) -> None:
+def observe_post(
+    hook_data: dict[str, Any],
+    project_root: Path,
+    handles: "ObservationHandles | None" = None,
+) -> None:
     """Process PostToolUse hook.
 
-    Extracts tool output and writes a tool_complete event.
+    Extracts tool output and writes a tool_complete event, with the error
+    flag, error type and full output length extracted once for the detectors.
+    The output is kept up to MAX_CONTENT_LENGTH characters, with the full
+    output's digest recorded alongside.
 
     Args:
         hook_data: Hook data from Claude Code containing:
@@ -183,71 +216,79 @@ def observe_post(hook_data: dict[str, Any], project_root: Path) -> None:
             - tool_output or output: Output from the tool
             - session_id: Session identifier
         project_root: Project root for project-scoped storage.
+        handles: Optional handle cache shared across calls (daemon mode).
     """
+    from instincts.enrichment import describe_output
+    from instincts.payload import encode_bounded
+
     tool_name = _extract_field(hook_data, "tool_name", "tool")
     tool_output = _extract_field(hook_data, "tool_output", "output")
     session_id = hook_data.get("session_id", "unknown")
 
+    output = encode_bounded(tool_output, MAX_CONTENT_LENGTH)
+
     observation = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "event": "tool_complete",
         "tool": tool_name,
         "session": session_id,
-        "output": _truncate(tool_output),
+        **describe_output(output.text, output.size),
+        "output_digest": output.digest,
     }
+    _set_large_field(observation, "output", output.text, project_root)
 
-    _write_observation_to_project(observation, project_root)
+    _write_observation_to_project(observation, project_root, handles)
 
-    # Check auto-learning trigger for project-scoped storage
-    counter = increment_observation_counter()
-    if counter >= ANALYSIS_TRIGGER_CHECK_INTERVAL:
-        reset_observation_counter()
-        if should_trigger_learning(project_root):
-            trigger_background_analysis(project_root)
+    # Check auto-learning trigger for project-scoped storage.
+    # The counter is shared by all sessions, so exactly one of every
+    # ANALYSIS_TRIGGER_CHECK_INTERVAL observations performs the check, and
+    # it is the observation count the check compares to its threshold.
+    try:
+        counter = increment_observation_counter(project_root)
+    except OSError:
+        return
+    if counter % ANALYSIS_TRIGGER_CHECK_INTERVAL == 0 and should_trigger_learning(
+        project_root, observation_count=counter
+    ):
+        trigger_background_analysis(project_root)
 
 
 def count_observations(file_path: Path) -> int:
-    """Count the number of observations in a file.
+    """Count the number of observations in a log, across all its segments.
+
+    Reads the sidecar index and segment manifest, so this is O(1) unless the
+    index is stale.
 
     Args:
         file_path: Path to the observations file.
 
     Returns:
-        Number of lines in the file, or 0 if file doesn't exist.
+        Number of lines in the log, or 0 if it doesn't exist.
     """
-    if not file_path.exists():
-        return 0
+    from instincts.segments import read_log_index
 
     try:
-        with file_path.open() as f:
-            return sum(1 for _ in f)
+        return read_log_index(file_path).line_count
     except OSError:
         return 0
 
 
 def get_oldest_observation_timestamp(file_path: Path) -> datetime | None:
-    """Get the timestamp of the oldest observation in the file.
+    """Get the timestamp of the oldest observation in a log, across all its segments.
 
     Args:
         file_path: Path to the observations file.
 
     Returns:
-        Datetime of the oldest observation, or None if file doesn't exist or is empty.
+        Datetime of the oldest observation, or None if the log doesn't exist or is empty.
     """
-    if not file_path.exists():
-        return None
+    from instincts.segments import read_log_index
 
     try:
-        with file_path.open() as f:
-            first_line = f.readline().strip()
-            if not first_line:
-                return None
-
-            data = json.loads(first_line)
-            timestamp_str = data.get("timestamp")
-            if timestamp_str:
-                return datetime.fromisoformat(timestamp_str)
-    except (OSError, json.JSONDecodeError, ValueError):
+        timestamp_str = read_log_index(file_path).first_timestamp
+        if timestamp_str:
+            return datetime.fromisoformat(timestamp_str)
+    except (OSError, ValueError):
         pass
 
     return None
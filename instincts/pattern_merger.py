@@ -8,6 +8,7 @@ from dataclasses import replace
 from difflib import SequenceMatcher
 
 from instincts.models import Pattern, PatternSource
+from instincts.patterns import remove_subsumed_workflows
 from instincts.utils import normalize_trigger as _normalize_trigger_base
 
 # Confidence boost when both approaches detect the same pattern
@@ -114,6 +115,10 @@ def _merge_matching_patterns(algo_pattern: Pattern, llm_pattern: Pattern) -> Pat
     # Combine evidence from both patterns
     combined_evidence = algo_pattern.evidence + llm_pattern.evidence
     merged = replace(merged, evidence=combined_evidence)
+    if "occurrences" in dict(algo_pattern.metadata):
+        merged = _add_metadata(
+            merged, "occurrences", algo_pattern.occurrences + llm_pattern.occurrences
+        )
 
     return merged
 
@@ -139,7 +144,8 @@ def merge_patterns(
 
     Patterns detected by both approaches get a confidence boost.
     LLM-only patterns get a confidence multiplier (slight penalty).
-    Algorithm-only patterns are kept as-is.
+    Algorithm-only patterns are kept as-is. Workflows contained in a longer
+    workflow from either approach are dropped.
 
     Args:
         algorithm_patterns: Patterns from algorithm-based detection.
@@ -183,4 +189,4 @@ def merge_patterns(
             marked = _mark_llm_only_pattern(llm_pattern)
             merged_patterns.append(marked)
 
-    return merged_patterns
+    return remove_subsumed_workflows(merged_patterns)
@@ -8,19 +8,39 @@ This module provides functions to detect different types of patterns:
 """
 
 import json
-import re
-from collections import defaultdict
+import os
+from array import array
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-
+from typing import IO, Any
+
+from instincts.batch import (
+    EVENT_COMPLETE,
+    EVENT_MESSAGE,
+    EVENT_NAMES,
+    EVENT_START,
+    FLAG_CORRECTION,
+    FLAG_ERROR,
+    ObservationBatch,
+    _is_error_observation,
+)
+from instincts.blobs import BLOB_FIELDS, BLOB_REF_SUFFIX, BlobStore, log_blobs_dir
+from instincts.checkpoint import EMPTY_CARRY_OVER, AnalysisCheckpoint, SessionCarryOver
+from instincts.config import LARGE_OBSERVATION_FIELDS
+from instincts.enrichment import extract_error_type
 from instincts.models import Evidence, Pattern, PatternType
-
-# Correction keywords to detect user corrections
-CORRECTION_KEYWORDS: tuple[str, ...] = ("no", "instead", "actually", "don't", "dont")
-
-# Error keywords to detect errors in tool output
-ERROR_KEYWORDS: tuple[str, ...] = ("error", "failed", "exception", "failure", "traceback")
+from instincts.segments import (
+    CODEC_NONE,
+    get_segment_dir,
+    load_manifest,
+    open_segment,
+    segment_codec,
+    segment_paths,
+)
+from instincts.sequences import find_contained_sequences, find_maximal_repeats
 
 # Minimum sequence length for workflow detection
 MIN_WORKFLOW_SEQUENCE_LENGTH: int = 3
@@ -35,12 +55,169 @@ MIN_TOOL_USES_FOR_PREFERENCE: int = 3
 MAX_OBSERVATIONS_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
 MAX_OBSERVATIONS_LINES: int = 100000
 
+# Block size for reading observations backwards from the end of the file
+TAIL_READ_BLOCK_SIZE: int = 64 * 1024
+
+# How many observations back a correction keyword looks for a tool completion
+CORRECTION_LOOKBACK_LIMIT: int = 5
+
+# Maximum sessions whose open detector state is kept in a checkpoint
+MAX_CARRY_OVER_SESSIONS: int = 50
+
+# Maximum evidence entries kept on an aggregated pattern (occurrences are counted)
+MAX_EVIDENCE_PER_PATTERN: int = 10
+
+# Metadata fields that, with type and trigger, identify the same pattern
+AGGREGATION_KEY_FIELDS: tuple[str, ...] = ("file_path", "tool", "error_type")
+
+
+# Observation fields each detector reads (input/output only on lines whose
+# enriched keys do not already answer for them, see _LARGE_FIELD_SUBSTITUTES)
+DETECTOR_FIELDS: dict[str, frozenset[str]] = {
+    "user_corrections": frozenset(
+        {"event", "tool", "session", "timestamp", "file_path", "input", "content"}
+    ),
+    "error_resolutions": frozenset(
+        {"event", "tool", "session", "timestamp", "is_error", "error_type", "output"}
+    ),
+    "repeated_workflows": frozenset({"event", "tool", "session", "timestamp"}),
+    "tool_preferences": frozenset({"event", "tool", "session", "timestamp"}),
+}
+
+
+@dataclass(frozen=True)
+class ObservationSlice:
+    """Observations read from a log together with where reading stopped.
+
+    Attributes:
+        observations: Decoded observations, oldest first.
+        inode: Inode of the file that was read.
+        offset: Byte offset just past the last complete line read.
+        resumed: True if reading continued from a checkpoint, False if the
+            latest window was read instead.
+    """
+
+    observations: list[dict[str, Any]]
+    inode: int
+    offset: int
+    resumed: bool
+
+
+def required_fields(detectors: Iterable[str] | None = None) -> frozenset[str]:
+    """Get the observation fields read by a set of detectors.
+
+    Args:
+        detectors: Detector names (keys of DETECTOR_FIELDS); all if None.
+
+    Returns:
+        Union of the fields the detectors read.
+
+    Raises:
+        ValueError: If a detector name is unknown.
+    """
+    fields: frozenset[str] = frozenset()
+    for name in enabled_detectors(detectors):
+        fields |= DETECTOR_FIELDS[name]
+    return fields
+
+
+def enabled_detectors(detectors: Iterable[str] | None = None) -> frozenset[str]:
+    """Validate a selection of detectors.
+
+    Args:
+        detectors: Detector names (keys of DETECTOR_FIELDS); all if None.
+
+    Returns:
+        The selected detector names.
+
+    Raises:
+        ValueError: If a detector name is unknown.
+    """
+    if detectors is None:
+        return frozenset(DETECTOR_FIELDS)
+    names = frozenset(detectors)
+    unknown = names - DETECTOR_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown detector: {', '.join(sorted(unknown))}")
+    return names
+
+
+def _field_marker(name: str) -> bytes:
+    """Bytes that precede a field's value when it is not the first key."""
+    return f", {json.dumps(name)}: ".encode()
+
+
+def _input_superseded(obs: dict[str, Any]) -> bool:
+    """Whether the input is not needed: the file path was recorded."""
+    return "file_path" in obs
+
+
+def _output_superseded(obs: dict[str, Any]) -> bool:
+    """Whether the output is not needed: it was recorded as not an error."""
+    return obs.get("is_error") is False
 
-def load_observations(file_path: Path) -> list[dict[str, Any]]:
+
+# Large fields that are not needed on a line whose enriched key (the second
+# element) says everything the detectors read from them
+_LARGE_FIELD_SUBSTITUTES: dict[str, tuple[Callable[[dict[str, Any]], bool], str]] = {
+    "input": (_input_superseded, "file_path"),
+    "output": (_output_superseded, "is_error"),
+}
+
+
+class FieldProjection:
+    """Decode only the leading fields of an observation line.
+
+    The observer writes LARGE_OBSERVATION_FIELDS last, so when a projection
+    does not need the line's last field it is cut off and the short prefix
+    decoded instead. A projected large field is also cut when the prefix
+    holds its enriched substitute (e.g. file_path for input). Only a
+    top-level string ending the object is cut: an escaped string cannot
+    contain `, "`, so the last `, "` before a closing `"}` starts the last
+    top-level key. Any other line is decoded in full.
+    """
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        wanted = frozenset(fields)
+        self._markers: list[tuple[bytes, Callable[[dict[str, Any]], bool] | None]] = []
+        for name in LARGE_OBSERVATION_FIELDS:
+            if name not in wanted:
+                self._markers.append((_field_marker(name), None))
+                continue
+            superseded, key = _LARGE_FIELD_SUBSTITUTES.get(name, (None, ""))
+            if superseded is not None and key in wanted:
+                self._markers.append((_field_marker(name), superseded))
+
+    @classmethod
+    def of(cls, fields: Iterable[str] | None) -> "FieldProjection | None":
+        """Get the projection of fields, or None to decode lines in full."""
+        return cls(fields) if fields is not None else None
+
+    def decode(self, line: bytes) -> Any:
+        """Decode a line, skipping an unneeded trailing large field.
+
+        Raises:
+            json.JSONDecodeError, UnicodeDecodeError: If the line is invalid.
+        """
+        if self._markers and line.endswith(b'"}'):
+            cut = line.rfind(b', "')
+            for marker, superseded in self._markers:
+                if line.startswith(marker, cut):
+                    prefix = json.loads(line[:cut] + b"}")
+                    if superseded is None or superseded(prefix):
+                        return prefix
+                    break
+        return json.loads(line)
+
+
+def load_observations(
+    file_path: Path, fields: Iterable[str] | None = None
+) -> list[dict[str, Any]]:
     """Load observations from a JSONL file.
 
     Args:
         file_path: Path to the observations.jsonl file.
+        fields: Fields the caller reads (see iter_observations); all if None.
 
     Returns:
         List of observation dictionaries.
@@ -48,8 +225,34 @@ def load_observations(file_path: Path) -> list[dict[str, Any]]:
     Raises:
         ValueError: If file exceeds size limit.
     """
+    return list(iter_observations(file_path, fields))
+
+
+def iter_observations(
+    file_path: Path, fields: Iterable[str] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream observations from a JSONL file, with load_observations' limits.
+
+    With a field projection, large fields outside it (input, output,
+    content) are not decoded where the line layout allows, nor are
+    projected ones whose enriched substitute (file_path for input,
+    is_error false for output) is projected and present. Reading stops quietly if
+    the file cannot be read.
+
+    Args:
+        file_path: Path to the observations.jsonl file.
+        fields: Fields the caller reads, e.g. required_fields(); all if None.
+
+    Yields:
+        Observation dictionaries.
+
+    Raises:
+        ValueError: If file exceeds size limit.
+    """
+    projection = FieldProjection.of(fields)
+
     if not file_path.exists():
-        return []
+        return
 
     # Security check: verify file size before reading
     try:
@@ -60,13 +263,12 @@ def load_observations(file_path: Path) -> list[dict[str, Any]]:
                 f"({file_size} > {MAX_OBSERVATIONS_FILE_SIZE} bytes)"
             )
     except OSError:
-        return []
+        return
 
-    observations: list[dict[str, Any]] = []
     line_count = 0
 
     try:
-        with file_path.open() as f:
+        with file_path.open("rb") as f:
             for line in f:
                 line_count += 1
 
@@ -78,80 +280,362 @@ def load_observations(file_path: Path) -> list[dict[str, Any]]:
                 if not line:
                     continue
                 try:
-                    obs = json.loads(line)
-                    observations.append(obs)
-                except json.JSONDecodeError:
+                    obs = projection.decode(line) if projection else json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
                     # Skip invalid JSON lines (EC-1)
                     continue
+                yield obs
     except OSError:
-        return []
+        return
 
-    return observations
+
+def resolve_blob_fields(
+    observations: Iterable[dict[str, Any]],
+    store: BlobStore,
+    fields: Iterable[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Fill in the blob-stored fields the detectors read, one observation at a time.
+
+    A field the observer moved to the blob store (see instincts.blobs) is
+    read back only if the caller reads it and its enriched substitute does
+    not already answer for it (see _LARGE_FIELD_SUBSTITUTES), so in practice
+    only error outputs are read. A missing blob leaves the field absent.
+
+    Args:
+        observations: Observation dictionaries; updated in place.
+        store: Blob store of the log the observations come from.
+        fields: Fields the caller reads (see iter_observations); all if None.
+
+    Yields:
+        The same observation dictionaries.
+    """
+    wanted = frozenset(fields) if fields is not None else None
+    for obs in observations:
+        for name in BLOB_FIELDS:
+            ref = obs.get(name + BLOB_REF_SUFFIX)
+            if not isinstance(ref, str) or name in obs:
+                continue
+            if wanted is not None and name not in wanted:
+                continue
+            superseded, _ = _LARGE_FIELD_SUBSTITUTES[name]
+            if superseded(obs):
+                continue
+            text = store.get(ref)
+            if text is not None:
+                obs[name] = text
+        yield obs
+
+
+def _iter_lines_reversed(f: IO[bytes], end: int | None = None) -> Iterator[bytes]:
+    """Yield the lines of a binary file from last to first.
+
+    Reads the file backwards in TAIL_READ_BLOCK_SIZE blocks, so only as much
+    of the file is read as the caller consumes. The first line yielded is
+    whatever follows the final newline (empty if the file ends with one).
+
+    Args:
+        f: File opened in binary mode.
+        end: Byte offset to treat as the end of the file (default: real end).
+    """
+    position = f.seek(0, os.SEEK_END) if end is None else end
+    remainder = b""
+    while position > 0:
+        read_size = min(TAIL_READ_BLOCK_SIZE, position)
+        position -= read_size
+        f.seek(position)
+        lines = (f.read(read_size) + remainder).split(b"\n")
+        # lines[0] may be the tail of a line that starts in an earlier block
+        remainder = lines[0]
+        yield from reversed(lines[1:])
+    yield remainder
+
+
+def _collect_reversed(
+    lines: Iterable[bytes],
+    limit: int,
+    observations: list[dict[str, Any]],
+    projection: FieldProjection | None = None,
+) -> None:
+    """Decode lines (newest first) onto observations until it holds limit items."""
+    for raw_line in lines:
+        if len(observations) >= limit:
+            return
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            observations.append(projection.decode(line) if projection else json.loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Skip invalid JSON lines (EC-1), including a torn final write
+            continue
+
+
+def _collect_from_segments(
+    file_path: Path,
+    limit: int,
+    observations: list[dict[str, Any]],
+    projection: FieldProjection | None = None,
+) -> None:
+    """Continue a newest-first window into the closed segments of a log."""
+    for segment_path in reversed(segment_paths(file_path)):
+        needed = limit - len(observations)
+        if needed <= 0:
+            return
+        try:
+            if segment_codec(segment_path) == CODEC_NONE:
+                with segment_path.open("rb") as f:
+                    _collect_reversed(_iter_lines_reversed(f), limit, observations, projection)
+                continue
+            # Compressed streams can't be read backwards: keep the last lines
+            with open_segment(segment_path) as f:
+                tail = deque((line for line in f if line.strip()), maxlen=needed)
+            _collect_reversed(reversed(tail), limit, observations, projection)
+        except (OSError, EOFError):
+            # A segment removed or unreadable - the window just ends earlier
+            continue
+
+
+def iter_segment_observations(
+    path: Path, fields: Iterable[str] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream the observations of one log file or segment, in file order.
+
+    Compressed segments are decompressed lazily. Invalid lines are skipped
+    (EC-1); a missing file yields nothing.
+
+    Args:
+        path: Path to the active log or a closed segment.
+        fields: Fields the caller reads (see iter_observations); all if None.
+
+    Yields:
+        Observation dictionaries.
+
+    Raises:
+        OSError: If the file exists but cannot be read.
+        EOFError: If a compressed segment is truncated.
+    """
+    projection = FieldProjection.of(fields)
+    try:
+        f = open_segment(path)
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            yield from _decode_lines([line], projection)
+
+
+def iter_log_observations(
+    file_path: Path, fields: Iterable[str] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream every observation of a log, oldest first, across all segments.
+
+    Closed segments are decompressed and decoded lazily, one line at a time,
+    so memory use does not grow with the history length. Invalid lines are
+    skipped (EC-1); an unreadable segment is skipped as a whole.
+
+    Args:
+        file_path: Path to the active observations.jsonl file.
+        fields: Fields the caller reads (see iter_observations); all if None.
+
+    Yields:
+        Observation dictionaries in log order.
+    """
+    for path in [*segment_paths(file_path), file_path]:
+        try:
+            yield from iter_segment_observations(path, fields)
+        except (OSError, EOFError):
+            continue
 
 
 def load_recent_observations(
-    file_path: Path, limit: int = 1000
+    file_path: Path, limit: int = 1000, fields: Iterable[str] | None = None
 ) -> list[dict[str, Any]]:
     """Load the most recent observations up to limit.
 
     This function is used for dual-approach analysis where both algorithm
     and LLM analyze the same latest N observations (AC-R2.3).
 
+    The file is read backwards from the end, so the cost is proportional to
+    the window rather than the whole file. When the active file holds fewer
+    than `limit` observations (it was just rolled over), the window continues
+    into the newest closed segments. A partially written final line (no
+    trailing newline, invalid JSON) is skipped like any invalid line.
+
     Args:
         file_path: Path to the observations.jsonl file.
         limit: Maximum number of observations to return (default: 1000).
+        fields: Fields the caller reads (see iter_observations); all if None.
 
     Returns:
         List of the most recent observation dictionaries, up to `limit` items.
     """
-    all_observations = load_observations(file_path)
+    if limit <= 0:
+        return []
 
-    if len(all_observations) <= limit:
-        return all_observations
+    projection = FieldProjection.of(fields)
+    observations: list[dict[str, Any]] = []
+    try:
+        with file_path.open("rb") as f:
+            _collect_reversed(_iter_lines_reversed(f), limit, observations, projection)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return []
 
-    return all_observations[-limit:]
+    _collect_from_segments(file_path, limit, observations, projection)
+    observations.reverse()
+    return observations
 
 
-def _extract_file_path(input_str: str) -> str | None:
-    """Extract file_path from tool input string."""
-    try:
-        if isinstance(input_str, str):
-            data = json.loads(input_str)
-            file_path = data.get("file_path")
-            if isinstance(file_path, str):
-                return file_path
-    except (json.JSONDecodeError, TypeError):
-        pass
-    return None
+def _decode_lines(
+    lines: list[bytes], projection: FieldProjection | None = None
+) -> list[dict[str, Any]]:
+    """Decode JSONL lines, skipping blank and invalid ones (EC-1)."""
+    observations: list[dict[str, Any]] = []
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            observations.append(projection.decode(line) if projection else json.loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return observations
 
 
-def _has_error_keywords(text: str) -> bool:
-    """Check if text contains error keywords."""
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in ERROR_KEYWORDS)
+def _at_line_start(f: IO[bytes], offset: int, size: int) -> bool:
+    """Check whether an offset is within a file and right after a newline."""
+    if offset == 0:
+        return True
+    if offset > size:
+        return False
+    f.seek(offset - 1)
+    return f.read(1) == b"\n"
 
 
-def _has_correction_keywords(text: str) -> bool:
-    """Check if text contains correction keywords."""
-    text_lower = text.lower()
-    # Check for word boundaries to avoid false positives
-    for keyword in CORRECTION_KEYWORDS:
-        # Match keyword at word boundaries
-        pattern = rf"\b{re.escape(keyword)}\b"
-        if re.search(pattern, text_lower):
-            return True
-    return False
+def _read_segments_since(
+    file_path: Path, checkpoint: AnalysisCheckpoint, active_inode: int, budget: int
+) -> bytes | None:
+    """Read a closed segment from a checkpoint on, plus every later segment.
 
+    Args:
+        file_path: Path to the active observations.jsonl file.
+        checkpoint: Checkpoint taken while the segment was the active log.
+        active_inode: Inode of the active file being read, where reading stops.
+        budget: Maximum number of bytes to read.
 
-def _group_by_session(
-    observations: list[dict[str, Any]],
-) -> dict[str, list[dict[str, Any]]]:
-    """Group observations by session ID."""
-    by_session: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for obs in observations:
-        session = obs.get("session", "unknown")
-        by_session[session].append(obs)
-    return by_session
+    Returns:
+        The (decompressed) bytes after the checkpoint, or None if no segment
+        matches the checkpoint or more than `budget` bytes follow it.
+    """
+    manifest = load_manifest(file_path)
+    start = manifest.find_inode(checkpoint.inode)
+    if start is None:
+        return None
+
+    segment_dir = get_segment_dir(file_path)
+    chunks: list[bytes] = []
+    for position, segment in enumerate(manifest.segments[start:]):
+        if segment.codec == CODEC_NONE and segment.inode == active_inode:
+            # Rolled over after the active file was opened: it is read there
+            break
+        try:
+            with open_segment(segment_dir / segment.name, segment.codec) as f:
+                if position == 0:
+                    f.seek(checkpoint.offset)
+                data = f.read(budget + 1)
+        except (OSError, EOFError):
+            # A segment removed or unreadable - its lines are lost either way
+            continue
+        if len(data) > budget:
+            return None
+        budget -= len(data)
+        if data and not data.endswith(b"\n"):
+            data += b"\n"
+        chunks.append(data)
+    return b"".join(chunks)
+
+
+def load_observations_since(
+    file_path: Path,
+    checkpoint: AnalysisCheckpoint | None,
+    limit: int = 1000,
+    fields: Iterable[str] | None = None,
+) -> ObservationSlice | None:
+    """Load the observations appended after a checkpoint.
+
+    Only complete (newline-terminated) lines of the active file are read, so
+    a line still being written is picked up by the next call. A checkpoint
+    into a file that has since been rolled over resumes in its closed
+    segment (found by inode in the manifest) and continues through later
+    segments and the active file. If there is no checkpoint, it refers to an
+    unknown file, a truncated file, or a gap larger than
+    MAX_OBSERVATIONS_FILE_SIZE, the latest `limit` observations are read
+    instead (continuing into closed segments when the active file is short)
+    and `resumed` is False.
+
+    Args:
+        file_path: Path to the observations.jsonl file.
+        checkpoint: Where the previous analysis stopped, if any.
+        limit: Window size used when the checkpoint cannot be resumed.
+        fields: Fields the caller reads (see iter_observations); all if None.
+
+    Returns:
+        ObservationSlice ending at the last complete line, or None if the
+        file doesn't exist or can't be read.
+    """
+    projection = FieldProjection.of(fields)
+    try:
+        with file_path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+
+            resume_from: int | None = None
+            earlier = b""
+            # A compressed segment's old inode can be reused by the active
+            # file, so the offset must also fit it to resume there
+            if (
+                checkpoint is not None
+                and checkpoint.inode == stat.st_ino
+                and _at_line_start(f, checkpoint.offset, size)
+            ):
+                if size - checkpoint.offset <= MAX_OBSERVATIONS_FILE_SIZE:
+                    resume_from = checkpoint.offset
+            elif checkpoint is not None and size <= MAX_OBSERVATIONS_FILE_SIZE:
+                segment_data = _read_segments_since(
+                    file_path, checkpoint, stat.st_ino, MAX_OBSERVATIONS_FILE_SIZE - size
+                )
+                if segment_data is not None:
+                    resume_from, earlier = 0, segment_data
+
+            if resume_from is not None:
+                f.seek(resume_from)
+                data = f.read(size - resume_from)
+                complete = data.rfind(b"\n") + 1
+                return ObservationSlice(
+                    observations=_decode_lines(
+                        (earlier + data[:complete]).split(b"\n"), projection
+                    ),
+                    inode=stat.st_ino,
+                    offset=resume_from + complete,
+                    resumed=True,
+                )
+
+            lines = _iter_lines_reversed(f, end=size)
+            # The first line yielded is the unterminated tail, if any
+            complete = size - len(next(lines))
+            observations: list[dict[str, Any]] = []
+            _collect_reversed(lines, limit, observations, projection)
+            _collect_from_segments(file_path, limit, observations, projection)
+            observations.reverse()
+            return ObservationSlice(
+                observations=observations,
+                inode=stat.st_ino,
+                offset=complete,
+                resumed=False,
+            )
+    except OSError:
+        return None
 
 
 def _create_write_edit_pattern(
@@ -196,61 +680,41 @@ def _create_correction_keyword_pattern(
     )
 
 
-def _find_recent_tool_completion(
-    session_obs: list[dict[str, Any]], current_index: int, lookback_limit: int = 5
-) -> dict[str, Any] | None:
-    """Find the most recent tool completion before current index."""
-    for j in range(current_index - 1, max(current_index - lookback_limit, -1), -1):
-        prev_obs = session_obs[j]
-        if prev_obs.get("event") == "tool_complete":
-            return prev_obs
-    return None
-
-
-def _process_write_operation(
-    obs: dict[str, Any], recent_writes: dict[str, dict[str, Any]]
-) -> None:
-    """Track a Write operation for later Edit detection."""
-    file_path = _extract_file_path(obs.get("input", ""))
-    if file_path:
-        recent_writes[file_path] = obs
-
-
-def _process_edit_operation(
-    obs: dict[str, Any],
-    session_id: str,
-    recent_writes: dict[str, dict[str, Any]],
-    patterns: list[Pattern],
-) -> None:
-    """Check if Edit follows a recent Write on the same file."""
-    file_path = _extract_file_path(obs.get("input", ""))
-    if not file_path:
-        return
-    if file_path not in recent_writes:
-        return
+def _lookback_tool(
+    batch: ObservationBatch,
+    rows: "array[int]",
+    index: int,
+    earlier: tuple[dict[str, Any], ...] = (),
+) -> str | None:
+    """Get the tool of the most recent completion before rows[index].
 
-    patterns.append(_create_write_edit_pattern(obs, session_id, file_path))
-    del recent_writes[file_path]
-
-
-def _process_user_message(
-    obs: dict[str, Any],
-    session_id: str,
-    session_obs: list[dict[str, Any]],
-    current_index: int,
-    patterns: list[Pattern],
-) -> None:
-    """Check if user message contains correction keywords after tool execution."""
-    content = obs.get("content", "")
-    if not _has_correction_keywords(content):
-        return
+    The lookback spans CORRECTION_LOOKBACK_LIMIT - 1 observations and, near
+    the start of the rows, continues into `earlier` (carried-over context).
+    """
+    window = CORRECTION_LOOKBACK_LIMIT - 1
+    for j in range(index - 1, max(index - window, 0) - 1, -1):
+        if batch.events[rows[j]] == EVENT_COMPLETE:
+            return batch.tool_name(rows[j])
+    remaining = window - index
+    if remaining > 0:
+        for obs in reversed(earlier[-remaining:]):
+            if obs.get("event") == "tool_complete":
+                return str(obs.get("tool", "unknown"))
+    return None
 
-    recent_tool = _find_recent_tool_completion(session_obs, current_index)
-    if not recent_tool:
-        return
 
-    tool_name = recent_tool.get("tool", "unknown")
-    patterns.append(_create_correction_keyword_pattern(obs, session_id, tool_name))
+def _recent_context(
+    batch: ObservationBatch,
+    rows: "array[int]",
+    earlier: tuple[dict[str, Any], ...] = (),
+) -> tuple[dict[str, Any], ...]:
+    """Event and tool of the last rows, as the next lookback sees them."""
+    window = CORRECTION_LOOKBACK_LIMIT - 1
+    recent = tuple(
+        {"event": EVENT_NAMES[batch.events[row]], "tool": batch.tool_name(row)}
+        for row in rows[-window:]
+    )
+    return (*earlier, *recent)[-window:]
 
 
 def detect_user_corrections(observations: list[dict[str, Any]]) -> list[Pattern]:
@@ -260,57 +724,76 @@ def detect_user_corrections(observations: list[dict[str, Any]]) -> list[Pattern]
     - Write tool followed by Edit tool on the same file
     - Tool execution followed by user message with correction keywords
 
+    Repeated occurrences (same file or tool) are aggregated into one pattern.
+
     Args:
         observations: List of observation dictionaries.
 
     Returns:
         List of detected Pattern objects.
     """
-    patterns: list[Pattern] = []
-    by_session = _group_by_session(observations)
-
-    for session_id, session_obs in by_session.items():
-        session_obs.sort(key=lambda x: x.get("timestamp", ""))
-        recent_writes: dict[str, dict[str, Any]] = {}
-
-        for i, obs in enumerate(session_obs):
-            event = obs.get("event", "")
-            tool = obs.get("tool", "")
+    return DetectionPipeline(observations).detect_user_corrections()
 
-            if tool == "Write" and event == "tool_start":
-                _process_write_operation(obs, recent_writes)
-            elif tool == "Edit" and event == "tool_start":
-                _process_edit_operation(obs, session_id, recent_writes, patterns)
-            elif event == "user_message":
-                _process_user_message(obs, session_id, session_obs, i, patterns)
 
-    return patterns
-
-
-def _extract_error_type(error_output: str) -> str:
-    """Extract the error type from error output text.
+def _detect_user_corrections(
+    batch: ObservationBatch,
+    session_rows: Mapping[str, "array[int]"],
+    carry_over: Mapping[str, SessionCarryOver],
+) -> tuple[list[Pattern], dict[str, tuple[str, ...]]]:
+    """Detect user corrections in the batch's timestamp-sorted sessions.
 
-    Looks for patterns like 'ImportError', 'TypeError', 'SyntaxException', etc.
-    Falls back to the first matching error keyword if no specific type found.
+    Returns:
+        Tuple of (patterns, file paths still awaiting an Edit per session).
     """
-    for keyword in ERROR_KEYWORDS:
-        if keyword.lower() not in error_output.lower():
-            continue
-
-        # Try to extract specific error type (e.g., ImportError)
-        match = re.search(r"(\w+Error|\w+Exception)", error_output)
-        if match:
-            return match.group(1)
-        return keyword
-
-    return "unknown"
+    patterns: list[Pattern] = []
+    open_writes: dict[str, tuple[str, ...]] = {}
+
+    for session_id, rows in session_rows.items():
+        carried = carry_over.get(session_id, EMPTY_CARRY_OVER)
+        recent_writes = set(carried.open_writes)
+
+        for i, row in enumerate(rows):
+            event = batch.events[row]
+
+            # Only Write/Edit starts with a file path have a path code
+            if event == EVENT_START and batch.file_paths[row] >= 0:
+                file_path = batch.path_names[batch.file_paths[row]]
+                if batch.tool_names[batch.tools[row]] == "Write":
+                    recent_writes.add(file_path)
+                elif file_path in recent_writes:
+                    patterns.append(
+                        _create_write_edit_pattern(
+                            batch.observation(row), session_id, file_path
+                        )
+                    )
+                    recent_writes.discard(file_path)
+            elif event == EVENT_MESSAGE and batch.flags[row] & FLAG_CORRECTION:
+                # Carried context lets the lookback see across the checkpoint
+                tool = _lookback_tool(batch, rows, i, carried.recent)
+                if tool is not None:
+                    patterns.append(
+                        _create_correction_keyword_pattern(
+                            batch.observation(row), session_id, tool
+                        )
+                    )
+
+        open_writes[session_id] = tuple(sorted(recent_writes))
+
+    return patterns, open_writes
 
 
 def _create_error_resolution_pattern(
-    obs: dict[str, Any], session_id: str, error_output: str
+    obs: dict[str, Any],
+    session_id: str,
+    error_output: str,
+    error_type: str | None = None,
 ) -> Pattern:
-    """Create a pattern for an error that was resolved."""
-    error_type = _extract_error_type(error_output)
+    """Create a pattern for an error that was resolved.
+
+    The error type is extracted from the output unless it was recorded.
+    """
+    if error_type is None:
+        error_type = extract_error_type(error_output)
     max_error_output_length = 200
 
     evidence = Evidence(
@@ -336,7 +819,8 @@ def _create_error_resolution_pattern(
 def detect_error_resolutions(observations: list[dict[str, Any]]) -> list[Pattern]:
     """Detect error resolution patterns.
 
-    Detects Bash tool errors followed by successful execution.
+    Detects Bash tool errors followed by successful execution. Repeated
+    resolutions of the same error type are aggregated into one pattern.
 
     Args:
         observations: List of observation dictionaries.
@@ -344,23 +828,67 @@ def detect_error_resolutions(observations: list[dict[str, Any]]) -> list[Pattern
     Returns:
         List of detected Pattern objects.
     """
-    patterns: list[Pattern] = []
-    by_session = _group_by_session(observations)
+    return DetectionPipeline(observations).detect_error_resolutions()
+
+
+def _aggregate_patterns(patterns: list[Pattern]) -> list[Pattern]:
+    """Fold occurrences of the same pattern into a single Pattern.
+
+    Patterns are keyed by type, trigger and AGGREGATION_KEY_FIELDS metadata.
+    Each aggregate keeps the first occurrence's description and metadata,
+    the last MAX_EVIDENCE_PER_PATTERN evidence entries, and the total count
+    as "occurrences" metadata. Order of first occurrence is preserved.
+    """
+    groups: dict[tuple[Any, ...], list[Pattern]] = {}
+    for pattern in patterns:
+        metadata = dict(pattern.metadata)
+        key = (
+            pattern.pattern_type,
+            pattern.trigger,
+            *(metadata.get(field) for field in AGGREGATION_KEY_FIELDS),
+        )
+        groups.setdefault(key, []).append(pattern)
+
+    aggregated: list[Pattern] = []
+    for group in groups.values():
+        first = group[0]
+        evidence = tuple(e for pattern in group for e in pattern.evidence)
+        metadata = {**dict(first.metadata), "occurrences": sum(p.occurrences for p in group)}
+        aggregated.append(
+            replace(
+                first,
+                evidence=evidence[-MAX_EVIDENCE_PER_PATTERN:],
+                metadata=tuple(metadata.items()),
+            )
+        )
+    return aggregated
+
 
-    for session_id, session_obs in by_session.items():
-        session_obs.sort(key=lambda x: x.get("timestamp", ""))
-        recent_error: dict[str, Any] | None = None
+def _detect_error_resolutions(
+    batch: ObservationBatch,
+    session_rows: Mapping[str, "array[int]"],
+    carry_over: Mapping[str, SessionCarryOver],
+) -> tuple[list[Pattern], dict[str, str | None]]:
+    """Detect error resolutions in the batch's timestamp-sorted sessions.
+
+    Returns:
+        Tuple of (patterns, unresolved error output per session).
+    """
+    patterns: list[Pattern] = []
+    open_errors: dict[str, str | None] = {}
 
-        for obs in session_obs:
-            event = obs.get("event", "")
-            output = str(obs.get("output", ""))
+    for session_id, rows in session_rows.items():
+        recent_error = carry_over.get(session_id, EMPTY_CARRY_OVER).error_output
+        recent_error_type: str | None = None
 
-            if event != "tool_complete":
+        for row in rows:
+            if batch.events[row] != EVENT_COMPLETE:
                 continue
 
             # Track errors for later resolution detection
-            if _has_error_keywords(output):
-                recent_error = obs
+            if batch.flags[row] & FLAG_ERROR:
+                recent_error = batch.error_outputs[row]
+                recent_error_type = batch.error_types.get(row)
                 continue
 
             # Skip if no recent error to resolve
@@ -368,67 +896,41 @@ def detect_error_resolutions(observations: list[dict[str, Any]]) -> list[Pattern
                 continue
 
             # Success after error - create pattern
-            error_output = str(recent_error.get("output", ""))
             patterns.append(
-                _create_error_resolution_pattern(obs, session_id, error_output)
+                _create_error_resolution_pattern(
+                    batch.observation(row), session_id, recent_error, recent_error_type
+                )
             )
             recent_error = None
 
-    return patterns
+        open_errors[session_id] = recent_error
 
+    return patterns, open_errors
 
-def _is_contiguous_subsequence(shorter: tuple[str, ...], longer: tuple[str, ...]) -> bool:
-    """Check if shorter is a contiguous subsequence of longer."""
-    for i in range(len(longer) - len(shorter) + 1):
-        if longer[i : i + len(shorter)] == shorter:
-            return True
-    return False
 
-
-def _get_metadata_value(
-    metadata: tuple[tuple[str, Any], ...], key: str, default: Any = None
-) -> Any:
-    """Extract a value from tuple-based metadata by key."""
-    for k, v in metadata:
-        if k == key:
-            return v
-    return default
+def _session_tools(batch: ObservationBatch, rows: "array[int]") -> list[str]:
+    """Get the tools started in a session, in order."""
+    return [
+        batch.tool_names[batch.tools[row]]
+        for row in rows
+        if batch.events[row] == EVENT_START and batch.tools[row]
+    ]
 
 
 def _extract_tool_sequences(
-    by_session: dict[str, list[dict[str, Any]]]
+    batch: ObservationBatch, session_rows: Mapping[str, "array[int]"]
 ) -> dict[str, list[str]]:
-    """Extract tool sequences from grouped session observations."""
+    """Extract tool sequences from the batch's timestamp-sorted sessions."""
     session_sequences: dict[str, list[str]] = {}
 
-    for session_id, session_obs in by_session.items():
-        session_obs.sort(key=lambda x: x.get("timestamp", ""))
-        tools = [
-            obs.get("tool", "")
-            for obs in session_obs
-            if obs.get("event") == "tool_start" and obs.get("tool")
-        ]
+    for session_id, rows in session_rows.items():
+        tools = _session_tools(batch, rows)
         if len(tools) >= MIN_WORKFLOW_SEQUENCE_LENGTH:
             session_sequences[session_id] = tools
 
     return session_sequences
 
 
-def _find_sequence_occurrences(
-    session_sequences: dict[str, list[str]]
-) -> dict[tuple[str, ...], list[str]]:
-    """Find all subsequences and which sessions they appear in."""
-    sequence_occurrences: dict[tuple[str, ...], list[str]] = defaultdict(list)
-
-    for session_id, tools in session_sequences.items():
-        for length in range(MIN_WORKFLOW_SEQUENCE_LENGTH, len(tools) + 1):
-            for start in range(len(tools) - length + 1):
-                seq = tuple(tools[start : start + length])
-                sequence_occurrences[seq].append(session_id)
-
-    return sequence_occurrences
-
-
 def _create_workflow_pattern(seq: tuple[str, ...], sessions: list[str]) -> Pattern:
     """Create a repeated workflow pattern from a sequence and sessions."""
     evidence_list = [
@@ -454,40 +956,48 @@ def _create_workflow_pattern(seq: tuple[str, ...], sessions: list[str]) -> Patte
     )
 
 
-def _remove_subset_patterns(patterns: list[Pattern]) -> list[Pattern]:
-    """Remove patterns that are subsets of longer patterns."""
-    if not patterns:
-        return patterns
+def remove_subsumed_workflows(patterns: list[Pattern]) -> list[Pattern]:
+    """Remove workflow patterns contained in a longer workflow pattern.
 
-    # Sort by sequence length (longest first)
-    patterns.sort(
-        key=lambda p: len(_get_metadata_value(p.metadata, "sequence", [])),
-        reverse=True,
-    )
-
-    unique_patterns: list[Pattern] = []
-    seen_sequences: set[tuple[str, ...]] = set()
+    A single detection run only reports maximal repeats, but workflows from
+    different sources can still contain one another; merge_patterns() calls
+    this on the combined algorithm and LLM candidates. Containment is
+    decided for all candidates at once with an Aho-Corasick scan, so this
+    stays near-linear with thousands of candidates. Workflows without a
+    recorded sequence and other pattern types pass through unchanged.
 
-    for pattern in patterns:
-        seq = tuple(_get_metadata_value(pattern.metadata, "sequence", []))
+    Args:
+        patterns: Patterns of any type.
 
-        is_subset = any(
-            len(seq) < len(seen_seq)
-            and _is_contiguous_subsequence(seq, seen_seq)
-            for seen_seq in seen_sequences
+    Returns:
+        Patterns in their original order, minus subsumed workflows.
+    """
+    workflow_positions = [
+        i
+        for i, pattern in enumerate(patterns)
+        if pattern.pattern_type == PatternType.REPEATED_WORKFLOW
+        and dict(pattern.metadata).get("sequence")
+    ]
+    sequences = [
+        tuple(dict(patterns[i].metadata).get("sequence", ()))
+        for i in workflow_positions
+    ]
+    subsumed = {
+        position
+        for position, contained in zip(
+            workflow_positions, find_contained_sequences(sequences), strict=True
         )
-
-        if not is_subset:
-            unique_patterns.append(pattern)
-            seen_sequences.add(seq)
-
-    return unique_patterns
+        if contained
+    }
+    return [pattern for i, pattern in enumerate(patterns) if i not in subsumed]
 
 
 def detect_repeated_workflows(observations: list[dict[str, Any]]) -> list[Pattern]:
     """Detect repeated workflow patterns.
 
-    Detects same sequence of 3+ tools appearing in 2+ sessions.
+    Detects same sequence of 3+ tools appearing in 2+ sessions. Only maximal
+    sequences are reported; a sequence contained in a longer repeated one is
+    folded into it.
 
     Args:
         observations: List of observation dictionaries.
@@ -495,22 +1005,25 @@ def detect_repeated_workflows(observations: list[dict[str, Any]]) -> list[Patter
     Returns:
         List of detected Pattern objects.
     """
-    by_session = _group_by_session(observations)
-    session_sequences = _extract_tool_sequences(by_session)
-    sequence_occurrences = _find_sequence_occurrences(session_sequences)
+    return DetectionPipeline(observations).detect_repeated_workflows()
 
-    # Create patterns for sequences appearing in 2+ sessions
-    patterns: list[Pattern] = []
-    for seq, sessions in sequence_occurrences.items():
-        unique_sessions = list(set(sessions))
-        if len(unique_sessions) >= MIN_SESSIONS_FOR_PATTERN:
-            patterns.append(_create_workflow_pattern(seq, unique_sessions))
 
-    return _remove_subset_patterns(patterns)
+def _workflows_from_sequences(session_sequences: dict[str, list[str]]) -> list[Pattern]:
+    """Detect repeated workflows in per-session tool sequences."""
+    # Maximal repeats only: sequences contained in a longer repeat are not reported
+    repeats = find_maximal_repeats(
+        session_sequences,
+        min_sessions=MIN_SESSIONS_FOR_PATTERN,
+        min_length=MIN_WORKFLOW_SEQUENCE_LENGTH,
+    )
+    return [
+        _create_workflow_pattern(repeat.sequence, list(repeat.sessions))
+        for repeat in repeats
+    ]
 
 
 def _count_tool_usage(
-    by_session: dict[str, list[dict[str, Any]]]
+    batch: ObservationBatch, session_rows: Mapping[str, "array[int]"]
 ) -> tuple[dict[str, set[str]], dict[str, int]]:
     """Count tool usage per session and total counts.
 
@@ -520,13 +1033,8 @@ def _count_tool_usage(
     tool_sessions: dict[str, set[str]] = defaultdict(set)
     tool_counts: dict[str, int] = defaultdict(int)
 
-    for session_id, session_obs in by_session.items():
-        for obs in session_obs:
-            if obs.get("event") != "tool_start":
-                continue
-            tool = obs.get("tool", "")
-            if not tool:
-                continue
+    for session_id, rows in session_rows.items():
+        for tool in _session_tools(batch, rows):
             tool_sessions[tool].add(session_id)
             tool_counts[tool] += 1
 
@@ -572,9 +1080,13 @@ def detect_tool_preferences(observations: list[dict[str, Any]]) -> list[Pattern]
     Returns:
         List of detected Pattern objects.
     """
-    by_session = _group_by_session(observations)
-    tool_sessions, tool_counts = _count_tool_usage(by_session)
+    return DetectionPipeline(observations).detect_tool_preferences()
+
 
+def _tool_preferences_from_counts(
+    tool_sessions: Mapping[str, set[str]], tool_counts: Mapping[str, int]
+) -> list[Pattern]:
+    """Detect tool preferences from per-tool session sets and use counts."""
     patterns: list[Pattern] = []
     for tool, sessions in tool_sessions.items():
         if len(sessions) < MIN_SESSIONS_FOR_PATTERN:
@@ -589,26 +1101,394 @@ def detect_tool_preferences(observations: list[dict[str, Any]]) -> list[Pattern]
     return patterns
 
 
-def detect_all_patterns(file_path: Path) -> list[Pattern]:
-    """Run all pattern detection algorithms.
+class DetectionPipeline:
+    """Run every detector over one shared columnar view of the observations.
+
+    The observations are packed into an ObservationBatch and its rows are
+    grouped by session and sorted by timestamp once, in the constructor;
+    every detector then reads those columns instead of regrouping and
+    resorting observation dicts itself. Only the batch is kept, so a
+    streamed input is never held as dicts.
+
+    For incremental analysis, pass the carry-over from the previous
+    checkpoint: sequential detectors (Write->Edit, error->success,
+    correction lookback) then continue sessions that span the checkpoint,
+    and carry_over() returns the state to store with the next checkpoint.
+
+    Example:
+        patterns = DetectionPipeline(observations).detect_all()
+    """
+
+    def __init__(
+        self,
+        observations: Iterable[dict[str, Any]],
+        carry_over: Mapping[str, SessionCarryOver] | None = None,
+    ) -> None:
+        """Build the columnar, session-partitioned, timestamp-sorted view.
+
+        Args:
+            observations: Observation dictionaries; any iterable (e.g. the
+                stream from iter_log_observations) is consumed once.
+            carry_over: Open detector state per session from a checkpoint.
+        """
+        self._batch = ObservationBatch.from_observations(observations)
+        self._session_rows = self._batch.session_rows()
+        self._carry_over: Mapping[str, SessionCarryOver] = carry_over or {}
+        self._corrections: tuple[list[Pattern], dict[str, tuple[str, ...]]] | None = None
+        self._resolutions: tuple[list[Pattern], dict[str, str | None]] | None = None
+
+    @property
+    def batch(self) -> ObservationBatch:
+        """The observations, column by column."""
+        return self._batch
+
+    @property
+    def session_rows(self) -> "dict[str, array[int]]":
+        """Batch rows grouped by session ID, sorted by timestamp."""
+        return self._session_rows
+
+    def _run_user_corrections(self) -> tuple[list[Pattern], dict[str, tuple[str, ...]]]:
+        if self._corrections is None:
+            self._corrections = _detect_user_corrections(
+                self._batch, self._session_rows, self._carry_over
+            )
+        return self._corrections
+
+    def _run_error_resolutions(self) -> tuple[list[Pattern], dict[str, str | None]]:
+        if self._resolutions is None:
+            self._resolutions = _detect_error_resolutions(
+                self._batch, self._session_rows, self._carry_over
+            )
+        return self._resolutions
+
+    def detect_user_corrections(self) -> list[Pattern]:
+        """Detect user correction patterns (see detect_user_corrections)."""
+        return _aggregate_patterns(self._run_user_corrections()[0])
+
+    def detect_error_resolutions(self) -> list[Pattern]:
+        """Detect error resolution patterns (see detect_error_resolutions)."""
+        return _aggregate_patterns(self._run_error_resolutions()[0])
+
+    def detect_repeated_workflows(self) -> list[Pattern]:
+        """Detect repeated workflow patterns (see detect_repeated_workflows)."""
+        return _workflows_from_sequences(
+            _extract_tool_sequences(self._batch, self._session_rows)
+        )
+
+    def detect_tool_preferences(self) -> list[Pattern]:
+        """Detect tool preference patterns (see detect_tool_preferences)."""
+        return _tool_preferences_from_counts(
+            *_count_tool_usage(self._batch, self._session_rows)
+        )
+
+    def detect_all(self, detectors: Iterable[str] | None = None) -> list[Pattern]:
+        """Run all detectors over the shared view.
+
+        Args:
+            detectors: Detector names (keys of DETECTOR_FIELDS); all if None.
+
+        Returns:
+            Combined list of detected patterns from all detectors.
+
+        Raises:
+            ValueError: If a detector name is unknown.
+        """
+        enabled = enabled_detectors(detectors)
+        runs = {
+            "user_corrections": self.detect_user_corrections,
+            "error_resolutions": self.detect_error_resolutions,
+            "repeated_workflows": self.detect_repeated_workflows,
+            "tool_preferences": self.detect_tool_preferences,
+        }
+        patterns: list[Pattern] = []
+        for name, run in runs.items():
+            if name in enabled:
+                patterns.extend(run())
+        return patterns
+
+    def carry_over(self) -> dict[str, SessionCarryOver]:
+        """Open detector state per session after these observations.
+
+        Sessions not present in this view keep their previous state. Only
+        the MAX_CARRY_OVER_SESSIONS most recently active sessions are kept.
+
+        Returns:
+            Mapping of session ID to SessionCarryOver.
+        """
+        _, open_writes = self._run_user_corrections()
+        _, open_errors = self._run_error_resolutions()
+
+        merged = dict(self._carry_over)
+        for session_id, rows in self._session_rows.items():
+            previous = merged.get(session_id, EMPTY_CARRY_OVER)
+            merged[session_id] = SessionCarryOver(
+                open_writes=open_writes[session_id],
+                error_output=open_errors[session_id],
+                recent=_recent_context(self._batch, rows, previous.recent),
+                last_timestamp=self._batch.timestamp(rows[-1]) or previous.last_timestamp,
+            )
+
+        latest = sorted(
+            merged, key=lambda session_id: merged[session_id].last_timestamp, reverse=True
+        )[:MAX_CARRY_OVER_SESSIONS]
+        return {session_id: merged[session_id] for session_id in latest}
+
+
+@dataclass(frozen=True)
+class SessionBoundary:
+    """How one session's part of a segment depends on the state before it.
+
+    Sequential detectors (Write->Edit, error->success, correction lookback)
+    are run per segment as if each session started there. The boundary
+    records exactly what an earlier segment's open state could change, so
+    merge_summaries() can stitch the segments back together.
+
+    Attributes:
+        first_complete: The session's first tool completion, if any; it
+            resolves an error carried in unless it is an error itself.
+        first_touch: For each file written or edited, the Edit observation
+            if the first touch was an Edit (it matches a carried-in Write),
+            or None if it was a Write.
+        lookback_messages: Correction messages near the segment start whose
+            lookback found no tool completion inside the segment, with
+            their position.
+        carry_out: Open state after the segment, assuming none carried in.
+    """
+
+    first_complete: dict[str, Any] | None
+    first_touch: Mapping[str, dict[str, Any] | None]
+    lookback_messages: tuple[tuple[int, dict[str, Any]], ...]
+    carry_out: SessionCarryOver
+
+
+@dataclass(frozen=True)
+class SegmentSummary:
+    """Mergeable detection results for one segment of the observation log.
+
+    Attributes:
+        corrections: Aggregated user corrections found inside the segment.
+        resolutions: Aggregated error resolutions found inside the segment.
+        tool_sequences: Tools started per session, in order.
+        tool_sessions: Sessions that used each tool.
+        tool_counts: Uses of each tool.
+        boundaries: Per-session state needed to stitch segments together.
+    """
+
+    corrections: tuple[Pattern, ...]
+    resolutions: tuple[Pattern, ...]
+    tool_sequences: Mapping[str, list[str]]
+    tool_sessions: Mapping[str, set[str]]
+    tool_counts: Mapping[str, int]
+    boundaries: Mapping[str, SessionBoundary]
+
+
+def _session_boundary(
+    batch: ObservationBatch,
+    rows: "array[int]",
+    open_writes: tuple[str, ...],
+    open_error: str | None,
+) -> SessionBoundary:
+    """Record what carried-in state could change in one session's rows."""
+    first_complete = next(
+        (batch.observation(row) for row in rows if batch.events[row] == EVENT_COMPLETE),
+        None,
+    )
+
+    first_touch: dict[str, dict[str, Any] | None] = {}
+    for row in rows:
+        if batch.events[row] != EVENT_START or batch.file_paths[row] < 0:
+            continue
+        file_path = batch.path_names[batch.file_paths[row]]
+        if file_path not in first_touch:
+            is_edit = batch.tool_names[batch.tools[row]] == "Edit"
+            first_touch[file_path] = batch.observation(row) if is_edit else None
+
+    lookback_messages = tuple(
+        (i, batch.observation(row))
+        for i, row in enumerate(rows[: CORRECTION_LOOKBACK_LIMIT - 1])
+        if batch.flags[row] & FLAG_CORRECTION and _lookback_tool(batch, rows, i) is None
+    )
+
+    return SessionBoundary(
+        first_complete=first_complete,
+        first_touch=first_touch,
+        lookback_messages=lookback_messages,
+        carry_out=SessionCarryOver(
+            open_writes=open_writes,
+            error_output=open_error,
+            recent=_recent_context(batch, rows),
+            last_timestamp=batch.timestamp(rows[-1]) or "",
+        ),
+    )
+
+
+def summarize_observations(observations: Iterable[dict[str, Any]]) -> SegmentSummary:
+    """Summarize one segment of the observation log for merge_summaries().
 
     Args:
-        file_path: Path to the observations.jsonl file.
+        observations: The segment's observations; consumed once.
+
+    Returns:
+        SegmentSummary whose merge with the other segments' summaries gives
+        the same patterns as detecting over all of them at once.
+    """
+    batch = ObservationBatch.from_observations(observations)
+    session_rows = batch.session_rows()
+    corrections, open_writes = _detect_user_corrections(batch, session_rows, {})
+    resolutions, open_errors = _detect_error_resolutions(batch, session_rows, {})
+    tool_sessions, tool_counts = _count_tool_usage(batch, session_rows)
+    return SegmentSummary(
+        corrections=tuple(_aggregate_patterns(corrections)),
+        resolutions=tuple(_aggregate_patterns(resolutions)),
+        tool_sequences={
+            session_id: _session_tools(batch, rows)
+            for session_id, rows in session_rows.items()
+        },
+        tool_sessions=dict(tool_sessions),
+        tool_counts=dict(tool_counts),
+        boundaries={
+            session_id: _session_boundary(
+                batch, rows, open_writes[session_id], open_errors[session_id]
+            )
+            for session_id, rows in session_rows.items()
+        },
+    )
+
+
+def _stitch_session(
+    session_id: str,
+    carried: SessionCarryOver,
+    boundary: SessionBoundary,
+    corrections: list[Pattern],
+    resolutions: list[Pattern],
+) -> SessionCarryOver:
+    """Add the patterns a session's carried-in state completes in a segment.
+
+    Returns:
+        The session's open state after the segment.
+    """
+    for file_path in carried.open_writes:
+        edit = boundary.first_touch.get(file_path)
+        if edit is not None:
+            corrections.append(_create_write_edit_pattern(edit, session_id, file_path))
+
+    first = boundary.first_complete
+    if (
+        carried.error_output is not None
+        and first is not None
+        and not _is_error_observation(first)
+    ):
+        resolutions.append(
+            _create_error_resolution_pattern(first, session_id, carried.error_output)
+        )
+
+    # The lookback spans CORRECTION_LOOKBACK_LIMIT - 1 earlier observations
+    window = CORRECTION_LOOKBACK_LIMIT - 1
+    for index, message in boundary.lookback_messages:
+        earlier = carried.recent[-(window - index) :]
+        tool = next(
+            (
+                obs.get("tool", "unknown")
+                for obs in reversed(earlier)
+                if obs.get("event") == "tool_complete"
+            ),
+            None,
+        )
+        if tool is not None:
+            corrections.append(
+                _create_correction_keyword_pattern(message, session_id, tool)
+            )
+
+    out = boundary.carry_out
+    return SessionCarryOver(
+        open_writes=tuple(
+            sorted(
+                {*out.open_writes}
+                | {f for f in carried.open_writes if f not in boundary.first_touch}
+            )
+        ),
+        error_output=out.error_output if first is not None else carried.error_output,
+        recent=(*carried.recent, *out.recent)[-window:],
+        last_timestamp=out.last_timestamp or carried.last_timestamp,
+    )
+
+
+def merge_summaries(summaries: Iterable[SegmentSummary]) -> list[Pattern]:
+    """Reduce per-segment summaries, in log order, into detected patterns.
+
+    Sessions spanning segments are stitched with each segment's
+    SessionBoundary, so the result matches DetectionPipeline.detect_all()
+    over the concatenated observations.
+
+    Args:
+        summaries: One summary per segment, oldest segment first.
 
     Returns:
         Combined list of detected patterns from all detectors.
     """
-    observations = load_observations(file_path)
+    carried: dict[str, SessionCarryOver] = {}
+    corrections: list[Pattern] = []
+    resolutions: list[Pattern] = []
+    tool_sequences: dict[str, list[str]] = {}
+    tool_sessions: dict[str, set[str]] = defaultdict(set)
+    tool_counts: dict[str, int] = defaultdict(int)
 
-    if not observations:
-        return []
+    for summary in summaries:
+        for session_id, boundary in summary.boundaries.items():
+            carried[session_id] = _stitch_session(
+                session_id,
+                carried.get(session_id, EMPTY_CARRY_OVER),
+                boundary,
+                corrections,
+                resolutions,
+            )
+        corrections.extend(summary.corrections)
+        resolutions.extend(summary.resolutions)
+
+        for session_id, tools in summary.tool_sequences.items():
+            tool_sequences.setdefault(session_id, []).extend(tools)
+        for tool, sessions in summary.tool_sessions.items():
+            tool_sessions[tool] |= sessions
+        for tool, count in summary.tool_counts.items():
+            tool_counts[tool] += count
 
     patterns: list[Pattern] = []
+    patterns.extend(_aggregate_patterns(corrections))
+    patterns.extend(_aggregate_patterns(resolutions))
+    patterns.extend(
+        _workflows_from_sequences(
+            {
+                session_id: tools
+                for session_id, tools in tool_sequences.items()
+                if len(tools) >= MIN_WORKFLOW_SEQUENCE_LENGTH
+            }
+        )
+    )
+    patterns.extend(_tool_preferences_from_counts(tool_sessions, tool_counts))
+    return patterns
 
-    # Run all detectors
-    patterns.extend(detect_user_corrections(observations))
-    patterns.extend(detect_error_resolutions(observations))
-    patterns.extend(detect_repeated_workflows(observations))
-    patterns.extend(detect_tool_preferences(observations))
 
-    return patterns
+def detect_all_patterns(
+    file_path: Path, detectors: Iterable[str] | None = None
+) -> list[Pattern]:
+    """Run all pattern detection algorithms.
+
+    Only the fields the enabled detectors read are decoded (or read from
+    the blob store).
+
+    Args:
+        file_path: Path to the observations.jsonl file.
+        detectors: Detector names (keys of DETECTOR_FIELDS); all if None.
+
+    Returns:
+        Combined list of detected patterns from all detectors.
+
+    Raises:
+        ValueError: If a detector name is unknown.
+    """
+    fields = required_fields(detectors)
+    # Streamed into columns, so the observation dicts are never all held at once
+    observations = resolve_blob_fields(
+        iter_observations(file_path, fields), BlobStore(log_blobs_dir(file_path)), fields
+    )
+    return DetectionPipeline(observations).detect_all(detectors)
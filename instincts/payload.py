@@ -0,0 +1,170 @@
+"""Bounded encoding of hook payloads for Instinct-Based Learning.
+
+The observer keeps at most MAX_CONTENT_LENGTH characters of a tool's input
+or output. Rendering the whole payload with json.dumps() and slicing it
+makes a hook that receives a multi-megabyte Write or Bash output pay for
+serializing (and escaping) all of it. encode_bounded() walks the payload
+instead and only JSON-encodes the part that fits in the limit; the rest is
+measured and hashed as raw text, which costs one pass of C-level hashing
+and no copies of the encoded payload.
+
+This module is imported on the hook path, so it only uses the standard
+library's hashlib, json and math.
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass
+from json.encoder import encode_basestring_ascii
+from typing import Any
+
+# Size in bytes of the payload content hash (hex string is twice as long)
+PAYLOAD_DIGEST_SIZE: int = 16
+
+
+@dataclass(frozen=True)
+class BoundedText:
+    """A payload rendered as text and cut to a limit.
+
+    Attributes:
+        text: The first `limit` characters of the rendering (json.dumps()
+            for dicts, str() otherwise).
+        size: Length of the whole payload's content. For text payloads this
+            is len(str(value)); for dicts, strings are counted without JSON
+            escaping, so it can be smaller than len(json.dumps(value)).
+        digest: BLAKE2b hex digest of the whole payload's content, with
+            strings hashed as raw UTF-8 (see size).
+    """
+
+    text: str
+    size: int
+    digest: str
+
+    @property
+    def truncated(self) -> bool:
+        """Whether text holds less than the whole payload."""
+        return self.size > len(self.text)
+
+
+class _BoundedWriter:
+    """Collect rendered text up to a limit while measuring and hashing it all."""
+
+    def __init__(self, limit: int) -> None:
+        self.parts: list[str] = []
+        self.room = max(limit, 0)
+        self.size = 0
+        self.hasher = hashlib.blake2b(digest_size=PAYLOAD_DIGEST_SIZE)
+
+    def _keep(self, text: str) -> None:
+        kept = text[: self.room]
+        self.parts.append(kept)
+        self.room -= len(kept)
+
+    def token(self, text: str) -> None:
+        """Write an ASCII token: punctuation, a number or a literal."""
+        self.size += len(text)
+        self.hasher.update(text.encode("ascii"))
+        if self.room:
+            self._keep(text)
+
+    def string(self, value: str) -> None:
+        """Write a JSON string, escaping only the characters that are kept."""
+        self.size += len(value) + 2
+        self.hasher.update(b'"')
+        self.hasher.update(value.encode("utf-8", "surrogatepass"))
+        self.hasher.update(b'"')
+        if self.room:
+            # Escaping maps each character independently, so the escaped
+            # prefix of value[:room] is the prefix of the full escaped string
+            # and always holds at least `room` characters.
+            self._keep(encode_basestring_ascii(value[: self.room]))
+
+
+def _float_token(value: float) -> str:
+    """Render a float the way json.dumps() does."""
+    if math.isnan(value):
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _key_text(key: Any) -> str:
+    """Convert a dict key to a string the way json.dumps() does."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _float_token(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _write_json(value: Any, writer: _BoundedWriter) -> None:
+    """Walk a JSON-compatible value, writing it with json.dumps() separators."""
+    if isinstance(value, str):
+        writer.string(value)
+    elif value is None:
+        writer.token("null")
+    elif value is True:
+        writer.token("true")
+    elif value is False:
+        writer.token("false")
+    elif isinstance(value, int):
+        writer.token(int.__repr__(value))
+    elif isinstance(value, float):
+        writer.token(_float_token(value))
+    elif isinstance(value, dict):
+        writer.token("{")
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                writer.token(", ")
+            writer.string(_key_text(key))
+            writer.token(": ")
+            _write_json(item, writer)
+        writer.token("}")
+    elif isinstance(value, (list, tuple)):
+        writer.token("[")
+        for i, item in enumerate(value):
+            if i:
+                writer.token(", ")
+            _write_json(item, writer)
+        writer.token("]")
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_bounded(value: Any, limit: int) -> BoundedText:
+    """Render a tool input/output value as text, keeping at most limit characters.
+
+    text equals json.dumps(value)[:limit] for dicts and str(value)[:limit]
+    otherwise, but only the kept characters are JSON-encoded.
+
+    Args:
+        value: Tool input or output from the hook.
+        limit: Maximum number of characters to keep.
+
+    Returns:
+        BoundedText with the kept text and the whole payload's size and digest.
+
+    Raises:
+        TypeError: If a dict holds a value json.dumps() cannot serialize.
+    """
+    if not isinstance(value, dict):
+        text = str(value)
+        digest = hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=PAYLOAD_DIGEST_SIZE
+        ).hexdigest()
+        return BoundedText(text=text[: max(limit, 0)], size=len(text), digest=digest)
+
+    writer = _BoundedWriter(limit)
+    _write_json(value, writer)
+    return BoundedText(text="".join(writer.parts), size=writer.size, digest=writer.hasher.hexdigest())
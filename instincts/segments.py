@@ -0,0 +1,799 @@
+"""Segmented observation log for Instinct-Based Learning.
+
+The observer appends to the active log (observations.jsonl). Once the active
+log grows past the rollover size it is closed: renamed into the segment
+directory (observations.archive/) as the next numbered segment, and its line
+range, size and time bounds are recorded in a small manifest there. Readers
+combine the manifest with the active log's sidecar index, so counts and time
+bounds cover the whole history without opening closed segments, and windowed
+readers continue into closed segments when the active log is too short.
+
+Appends and rollover serialize on a stable lock file next to the log, not on
+the log itself: a writer that locked a log which was then renamed away would
+otherwise append to a closed segment.
+
+Closed segments are compacted by the background worker, never on the hook
+path: each is compressed (gzip while recent, lzma once cold, recorded per
+segment in the manifest) and the oldest are deleted once they exceed the
+retention age or total size. Readers stream compressed segments through
+open_segment().
+"""
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from io import BufferedIOBase
+from pathlib import Path
+from typing import BinaryIO
+
+from instincts.observation_index import (
+    ObservationIndex,
+    read_index,
+    reset_index,
+    scan_index,
+)
+
+logger = logging.getLogger(__name__)
+
+# Manifest file inside the segment directory
+MANIFEST_FILE: str = "manifest.json"
+
+# Closed segment file names: segment-000001.jsonl, segment-000002.jsonl, ...
+SEGMENT_PREFIX: str = "segment-"
+SEGMENT_SUFFIX: str = ".jsonl"
+
+# Archives written before segments existed (observations-<timestamp>-<pid>.jsonl)
+LEGACY_ARCHIVE_PREFIX: str = "observations-"
+
+# Segment codecs and their file name suffixes (appended after .jsonl)
+CODEC_NONE: str = "none"
+CODEC_GZIP: str = "gzip"
+CODEC_LZMA: str = "lzma"
+CODEC_SUFFIXES: dict[str, str] = {CODEC_NONE: "", CODEC_GZIP: ".gz", CODEC_LZMA: ".xz"}
+
+# Segments whose last observation is older than this are stored with lzma
+# (smaller, slower to read); newer ones with gzip (fast to read back)
+SEGMENT_LZMA_AFTER_DAYS: int = 30
+
+# Retention: the oldest segments are deleted beyond either limit
+SEGMENT_RETENTION_DAYS: int = 365
+SEGMENT_RETENTION_MAX_BYTES: int = 200 * 1024 * 1024  # 200MB on disk
+
+# Block size for copying segment data through a compressor
+COMPRESS_BLOCK_SIZE: int = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One closed segment of the observation log.
+
+    Attributes:
+        name: File name inside the segment directory.
+        start_line: Log line number of the segment's first observation.
+        line_count: Number of observations in this segment.
+        byte_size: Size of the segment file on disk in bytes.
+        first_timestamp: Timestamp of the first observation, if any.
+        last_timestamp: Timestamp of the last observation, if any.
+        codec: Compression of the file (one of CODEC_SUFFIXES).
+        inode: Inode the file had as the active log, so incremental readers
+            can find the segment their checkpoint refers to (kept when the
+            segment is compressed; None if unknown).
+    """
+
+    name: str
+    start_line: int
+    line_count: int
+    byte_size: int
+    first_timestamp: str | None = None
+    last_timestamp: str | None = None
+    codec: str = CODEC_NONE
+    inode: int | None = None
+
+
+@dataclass(frozen=True)
+class SegmentManifest:
+    """Closed segments of an observation log, oldest first.
+
+    Attributes:
+        segments: The closed segments in log order.
+        base_line: Start line of the first segment; non-zero once older
+            segments were deleted by retention.
+    """
+
+    segments: tuple[Segment, ...] = ()
+    base_line: int = 0
+
+    @property
+    def next_line(self) -> int:
+        """Start line of the next segment to be closed."""
+        if not self.segments:
+            return self.base_line
+        last = self.segments[-1]
+        return last.start_line + last.line_count
+
+    @property
+    def line_count(self) -> int:
+        """Number of observations in all closed segments."""
+        return sum(segment.line_count for segment in self.segments)
+
+    @property
+    def byte_size(self) -> int:
+        """Combined size of all closed segments in bytes."""
+        return sum(segment.byte_size for segment in self.segments)
+
+    def with_segment(
+        self,
+        name: str,
+        index: ObservationIndex,
+        codec: str = CODEC_NONE,
+        inode: int | None = None,
+    ) -> "SegmentManifest":
+        """Return a manifest with one more segment appended.
+
+        Args:
+            name: File name of the new segment.
+            index: Index of the log that became the segment.
+            codec: Compression of the segment file.
+            inode: Inode the segment had as the active log, if known.
+
+        Returns:
+            New manifest; this one is unchanged.
+        """
+        segment = Segment(
+            name=name,
+            start_line=self.next_line,
+            line_count=index.line_count,
+            byte_size=index.byte_size,
+            first_timestamp=index.first_timestamp,
+            last_timestamp=index.last_timestamp,
+            codec=codec,
+            inode=inode,
+        )
+        return replace(self, segments=(*self.segments, segment))
+
+    def find_inode(self, inode: int) -> int | None:
+        """Get the position of the segment that had an inode as the active log.
+
+        Args:
+            inode: Inode of a former active log (e.g. from a checkpoint).
+
+        Returns:
+            Index into segments (the newest one, as compressed segments free
+            their inode for reuse), or None if no segment recorded that inode.
+        """
+        for position in reversed(range(len(self.segments))):
+            if self.segments[position].inode == inode:
+                return position
+        return None
+
+
+EMPTY_MANIFEST = SegmentManifest()
+
+
+def get_segment_dir(observations_file: Path) -> Path:
+    """Get the directory holding the closed segments of a log.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        Path to the sibling segment directory
+        (e.g. observations.jsonl -> observations.archive/).
+    """
+    return observations_file.with_name(f"{observations_file.stem}.archive")
+
+
+def get_lock_path(observations_file: Path) -> Path:
+    """Get the stable lock file guarding appends and rollover of a log.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        Path to the hidden lock file next to the log
+        (e.g. observations.jsonl -> .observations.lock).
+    """
+    return observations_file.with_name(f".{observations_file.stem}.lock")
+
+
+@contextmanager
+def append_lock(observations_file: Path) -> Iterator[None]:
+    """Hold the exclusive append/rollover lock of a log.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Raises:
+        OSError: If the lock file cannot be opened (e.g. it is a symlink).
+    """
+    fd = os.open(
+        get_lock_path(observations_file), os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600
+    )
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _codec_of(name: str) -> str | None:
+    """Get the codec of a segment file name (None if it is not a segment)."""
+    if not name.startswith((SEGMENT_PREFIX, LEGACY_ARCHIVE_PREFIX)):
+        return None
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if name.endswith(SEGMENT_SUFFIX + suffix):
+            return codec
+    return None
+
+
+def segment_codec(path: Path) -> str:
+    """Get the codec of a segment file from its name.
+
+    Args:
+        path: Path to a segment file.
+
+    Returns:
+        One of CODEC_SUFFIXES (CODEC_NONE for unrecognized names).
+    """
+    return _codec_of(path.name) or CODEC_NONE
+
+
+def _base_name(name: str) -> str:
+    """Strip the codec suffix from a segment file name."""
+    return name[: name.rindex(SEGMENT_SUFFIX) + len(SEGMENT_SUFFIX)]
+
+
+def _segment_sort_key(name: str) -> tuple[int, str]:
+    """Order legacy archives (timestamped names) before numbered segments."""
+    return (0 if name.startswith(LEGACY_ARCHIVE_PREFIX) else 1, name)
+
+
+# Later compaction stages win when a crash left two copies of one segment
+_CODEC_PRIORITY: dict[str, int] = {CODEC_NONE: 0, CODEC_GZIP: 1, CODEC_LZMA: 2}
+
+
+def _scan_segment_files(segment_dir: Path) -> tuple[list[str], list[str]]:
+    """List segment files on disk, oldest first.
+
+    Returns:
+        Tuple of (segment names, names shadowed by a more compacted copy of
+        the same segment).
+    """
+    try:
+        names = [
+            entry.name
+            for entry in os.scandir(segment_dir)
+            if entry.is_file(follow_symlinks=False) and _codec_of(entry.name) is not None
+        ]
+    except FileNotFoundError:
+        return [], []
+
+    chosen: dict[str, str] = {}
+    shadowed: list[str] = []
+    for name in sorted(names, key=lambda n: _CODEC_PRIORITY[_codec_of(n) or CODEC_NONE]):
+        base = _base_name(name)
+        if base in chosen:
+            shadowed.append(chosen[base])
+        chosen[base] = name
+    return sorted(chosen.values(), key=_segment_sort_key), shadowed
+
+
+def _list_segment_files(segment_dir: Path) -> list[str]:
+    """List segment file names on disk, oldest first."""
+    return _scan_segment_files(segment_dir)[0]
+
+
+def _parse_manifest(data: object) -> SegmentManifest:
+    """Build a manifest from decoded JSON.
+
+    Raises:
+        KeyError, TypeError, ValueError: If the data is malformed.
+    """
+    if not isinstance(data, dict):
+        raise TypeError("manifest must be an object")
+    segments = tuple(
+        Segment(
+            name=str(entry["name"]),
+            start_line=int(entry["start_line"]),
+            line_count=int(entry["line_count"]),
+            byte_size=int(entry["byte_size"]),
+            first_timestamp=entry.get("first_timestamp"),
+            last_timestamp=entry.get("last_timestamp"),
+            codec=str(entry.get("codec", CODEC_NONE)),
+            inode=int(entry["inode"]) if entry.get("inode") is not None else None,
+        )
+        for entry in data["segments"]
+    )
+    if any(segment.codec not in CODEC_SUFFIXES for segment in segments):
+        raise ValueError("unknown segment codec")
+    return SegmentManifest(segments=segments, base_line=int(data.get("base_line", 0)))
+
+
+def _load_manifest_file(manifest_path: Path) -> SegmentManifest | None:
+    """Load a manifest, returning None if missing or corrupt."""
+    try:
+        return _parse_manifest(json.loads(manifest_path.read_text()))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        logger.warning("Ignoring corrupt segment manifest %s: %s", manifest_path, e)
+        return None
+
+
+def _save_manifest(segment_dir: Path, manifest: SegmentManifest) -> None:
+    """Write the manifest atomically.
+
+    Raises:
+        OSError: If the manifest cannot be written.
+    """
+    data = {
+        "base_line": manifest.base_line,
+        "segments": [asdict(segment) for segment in manifest.segments],
+    }
+    fd, temp_path = tempfile.mkstemp(dir=segment_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, segment_dir / MANIFEST_FILE)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _scan_compressed(path: Path, codec: str) -> ObservationIndex:
+    """Compute the index of a compressed segment by streaming it."""
+    line_count = 0
+    first_line = last_line = b""
+    with open_segment(path, codec) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if not line_count:
+                first_line = line
+            last_line = line
+            line_count += 1
+
+    def timestamp_of(line: bytes) -> str | None:
+        try:
+            timestamp = json.loads(line).get("timestamp")
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return None
+        return timestamp if isinstance(timestamp, str) else None
+
+    return ObservationIndex(
+        line_count=line_count,
+        byte_size=path.stat().st_size,
+        first_timestamp=timestamp_of(first_line) if line_count else None,
+        last_timestamp=timestamp_of(last_line) if line_count else None,
+    )
+
+
+def _rebuild_manifest(segment_dir: Path, base_line: int = 0) -> SegmentManifest:
+    """Recreate the manifest by scanning the segment files on disk.
+
+    Adopts archives written before segments existed and removes copies
+    shadowed by a more compacted version of the same segment. Must be called
+    with the append lock held.
+    """
+    names, shadowed = _scan_segment_files(segment_dir)
+    for name in shadowed:
+        (segment_dir / name).unlink(missing_ok=True)
+
+    manifest = SegmentManifest(base_line=base_line)
+    for name in names:
+        codec = _codec_of(name) or CODEC_NONE
+        path = segment_dir / name
+        try:
+            index = scan_index(path) if codec == CODEC_NONE else _scan_compressed(path, codec)
+            # Renaming keeps the inode; a compressed copy has a new one
+            inode = path.stat().st_ino if codec == CODEC_NONE else None
+        except (OSError, EOFError) as e:
+            logger.warning("Skipping unreadable segment %s: %s", name, e)
+            continue
+        manifest = manifest.with_segment(name, index, codec, inode)
+    if manifest.segments:
+        _save_manifest(segment_dir, manifest)
+    return manifest
+
+
+def load_manifest(observations_file: Path) -> SegmentManifest:
+    """Load the segment manifest of a log.
+
+    A missing or corrupt manifest is rebuilt from the segment files (under
+    the append lock) when any exist, which also adopts pre-segment archives.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        The manifest (EMPTY_MANIFEST if the log has no closed segments).
+    """
+    segment_dir = get_segment_dir(observations_file)
+    manifest = _load_manifest_file(segment_dir / MANIFEST_FILE)
+    if manifest is not None:
+        return manifest
+    if not _list_segment_files(segment_dir):
+        return EMPTY_MANIFEST
+
+    try:
+        with append_lock(observations_file):
+            # Another process may have rebuilt it while we waited
+            return load_manifest_locked(observations_file)
+    except OSError as e:
+        logger.warning("Failed to rebuild segment manifest: %s", e)
+        return EMPTY_MANIFEST
+
+
+def load_manifest_locked(observations_file: Path) -> SegmentManifest:
+    """Load the segment manifest while already holding the append lock.
+
+    Unlike load_manifest(), the manifest is also rebuilt when it disagrees
+    with the segment files on disk (a crash between a rename and the
+    manifest write, or archives from before segments existed).
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        The manifest, consistent with the segment directory.
+
+    Raises:
+        OSError: If a rebuilt manifest cannot be written.
+    """
+    segment_dir = get_segment_dir(observations_file)
+    manifest = _load_manifest_file(segment_dir / MANIFEST_FILE) or EMPTY_MANIFEST
+    names, shadowed = _scan_segment_files(segment_dir)
+    if shadowed or [segment.name for segment in manifest.segments] != names:
+        return _rebuild_manifest(segment_dir, manifest.base_line)
+    return manifest
+
+
+def segment_paths(observations_file: Path) -> list[Path]:
+    """Get the paths of the closed segments of a log, oldest first.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        Segment file paths in log order.
+    """
+    segment_dir = get_segment_dir(observations_file)
+    return [segment_dir / segment.name for segment in load_manifest(observations_file).segments]
+
+
+def _next_segment_number(manifest: SegmentManifest) -> int:
+    """Number for the next segment file, after the highest one in use."""
+    numbers = [
+        int(digits)
+        for segment in manifest.segments
+        if segment.name.startswith(SEGMENT_PREFIX)
+        and (digits := segment.name[len(SEGMENT_PREFIX) :].split(".", 1)[0]).isdigit()
+    ]
+    return max(numbers, default=0) + 1
+
+
+def roll_over(observations_file: Path) -> Segment | None:
+    """Close the active log and record it as the next segment.
+
+    Must be called with the append lock held, after the sidecar index of the
+    active log was brought up to date.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        The new segment, or None if the active log was empty or missing.
+
+    Raises:
+        OSError: If the log cannot be moved or the manifest written.
+    """
+    index = read_index(observations_file)
+    if index.line_count == 0:
+        return None
+
+    segment_dir = get_segment_dir(observations_file)
+    segment_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+    manifest = load_manifest_locked(observations_file)
+    name = f"{SEGMENT_PREFIX}{_next_segment_number(manifest):06d}{SEGMENT_SUFFIX}"
+    os.rename(observations_file, segment_dir / name)
+    manifest = manifest.with_segment(name, index, inode=(segment_dir / name).stat().st_ino)
+    _save_manifest(segment_dir, manifest)
+    reset_index(observations_file)
+    return manifest.segments[-1]
+
+
+def read_log_index(observations_file: Path) -> ObservationIndex:
+    """Read the index of a whole log: closed segments plus the active file.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+
+    Returns:
+        ObservationIndex whose line count and byte size cover every segment
+        and whose timestamps are the first and last of the whole log.
+
+    Raises:
+        OSError: If the active log exists but cannot be read for a rebuild.
+    """
+    manifest = load_manifest(observations_file)
+    active = read_index(observations_file)
+    segments = manifest.segments
+    if not segments:
+        return active
+
+    first_timestamp = next(
+        (segment.first_timestamp for segment in segments if segment.line_count),
+        active.first_timestamp,
+    )
+    last_timestamp = active.last_timestamp if active.line_count else None
+    if last_timestamp is None:
+        last_timestamp = next(
+            (segment.last_timestamp for segment in reversed(segments) if segment.line_count),
+            None,
+        )
+    return ObservationIndex(
+        line_count=manifest.line_count + active.line_count,
+        byte_size=manifest.byte_size + active.byte_size,
+        first_timestamp=first_timestamp,
+        last_timestamp=last_timestamp,
+    )
+
+
+def lzma_available() -> bool:
+    """Check whether this Python was built with lzma support."""
+    try:
+        import lzma  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def open_segment(path: Path, codec: str | None = None) -> BufferedIOBase:
+    """Open a segment for streaming binary reads, decompressing as needed.
+
+    Args:
+        path: Path to the segment file.
+        codec: Compression of the file (default: inferred from its name).
+
+    Returns:
+        A binary file object; compressed segments are decompressed lazily
+        as they are read.
+
+    Raises:
+        OSError: If the file cannot be opened, or it needs lzma and this
+            Python lacks lzma support.
+    """
+    codec = codec or segment_codec(path)
+    # Codec modules are imported on use: the observer hook imports this module
+    if codec == CODEC_GZIP:
+        import gzip
+
+        return gzip.open(path, "rb")
+    if codec == CODEC_LZMA:
+        try:
+            import lzma
+        except ImportError as e:
+            raise OSError(f"Cannot read {path.name}: lzma support not available") from e
+        return lzma.open(path, "rb")
+    return path.open("rb")
+
+
+def _parse_timestamp(timestamp: str | None) -> datetime | None:
+    """Parse an observation timestamp, treating naive times as UTC."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def choose_codec(segment: Segment, now: datetime) -> str:
+    """Choose how a closed segment should be stored.
+
+    Recent segments are what windowed and history readers touch most, so
+    they get gzip (fast to decompress); segments cold for longer than
+    SEGMENT_LZMA_AFTER_DAYS get lzma (smaller) when it is available.
+
+    Args:
+        segment: The closed segment.
+        now: Current time.
+
+    Returns:
+        CODEC_GZIP or CODEC_LZMA.
+    """
+    last = _parse_timestamp(segment.last_timestamp)
+    if (
+        last is not None
+        and now - last > timedelta(days=SEGMENT_LZMA_AFTER_DAYS)
+        and lzma_available()
+    ):
+        return CODEC_LZMA
+    return CODEC_GZIP
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    """Outcome of one compaction pass over the closed segments.
+
+    Attributes:
+        compressed: Number of segments (re)compressed.
+        removed: Number of segments deleted by retention.
+        bytes_before: Size of the closed segments on disk before the pass.
+        bytes_after: Size of the closed segments on disk after the pass.
+    """
+
+    compressed: int = 0
+    removed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def _apply_retention(
+    observations_file: Path, now: datetime, max_age_days: int, max_bytes: int
+) -> int:
+    """Delete the oldest segments beyond the age or total-size limit.
+
+    Returns:
+        Number of segments deleted.
+    """
+    segment_dir = get_segment_dir(observations_file)
+    cutoff = now - timedelta(days=max_age_days)
+    with append_lock(observations_file):
+        manifest = load_manifest_locked(observations_file)
+        segments = list(manifest.segments)
+        total = manifest.byte_size
+        removed: list[Segment] = []
+        while segments:
+            last = _parse_timestamp(segments[0].last_timestamp)
+            expired = last is not None and last < cutoff
+            if not expired and total <= max_bytes:
+                break
+            segment = segments.pop(0)
+            total -= segment.byte_size
+            removed.append(segment)
+
+        if not removed:
+            return 0
+        last_removed = removed[-1]
+        _save_manifest(
+            segment_dir,
+            SegmentManifest(
+                segments=tuple(segments),
+                base_line=last_removed.start_line + last_removed.line_count,
+            ),
+        )
+        for segment in removed:
+            (segment_dir / segment.name).unlink(missing_ok=True)
+    return len(removed)
+
+
+def _open_compressor(raw: BinaryIO, codec: str) -> BufferedIOBase:
+    """Wrap a binary file in a compressing writer for codec."""
+    if codec == CODEC_LZMA:
+        import lzma
+
+        return lzma.LZMAFile(raw, "wb")
+
+    import gzip
+
+    return gzip.GzipFile(fileobj=raw, mode="wb")
+
+
+def _compress_segment(segment_dir: Path, segment: Segment, codec: str) -> Path:
+    """Write a compressed copy of a segment to a temporary file.
+
+    Runs without the append lock; the copy is swapped in afterwards.
+
+    Returns:
+        Path to the temporary compressed file.
+    """
+    fd, temp_name = tempfile.mkstemp(dir=segment_dir, suffix=".tmp")
+    temp_path = Path(temp_name)
+    try:
+        with (
+            os.fdopen(fd, "wb") as raw,
+            _open_compressor(raw, codec) as compressor,
+            open_segment(segment_dir / segment.name, segment.codec) as source,
+        ):
+            shutil.copyfileobj(source, compressor, COMPRESS_BLOCK_SIZE)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return temp_path
+
+
+def _swap_in_compressed(
+    observations_file: Path, segment: Segment, codec: str, temp_path: Path
+) -> bool:
+    """Replace a segment with its compressed copy and record it in the manifest.
+
+    Returns:
+        True if swapped; False if the segment is gone (e.g. deleted meanwhile).
+    """
+    segment_dir = get_segment_dir(observations_file)
+    name = _base_name(segment.name) + CODEC_SUFFIXES[codec]
+    with append_lock(observations_file):
+        manifest = load_manifest_locked(observations_file)
+        if segment not in manifest.segments:
+            temp_path.unlink(missing_ok=True)
+            return False
+        os.replace(temp_path, segment_dir / name)
+        compacted = replace(
+            segment, name=name, codec=codec, byte_size=(segment_dir / name).stat().st_size
+        )
+        _save_manifest(
+            segment_dir,
+            replace(
+                manifest,
+                segments=tuple(
+                    compacted if s == segment else s for s in manifest.segments
+                ),
+            ),
+        )
+        if name != segment.name:
+            (segment_dir / segment.name).unlink(missing_ok=True)
+    return True
+
+
+def compact_segments(
+    observations_file: Path,
+    now: datetime | None = None,
+    max_age_days: int = SEGMENT_RETENTION_DAYS,
+    max_bytes: int = SEGMENT_RETENTION_MAX_BYTES,
+) -> CompactionResult:
+    """Apply retention to the closed segments, then compress the rest.
+
+    Meant for the background worker: compression runs outside the append
+    lock, which is only taken to swap a finished copy in. Failures are
+    logged and leave the affected segment as it was.
+
+    Args:
+        observations_file: Path to the active observations JSONL file.
+        now: Current time (default: now, UTC).
+        max_age_days: Delete segments whose last observation is older.
+        max_bytes: Delete the oldest segments while the total exceeds this.
+
+    Returns:
+        CompactionResult describing what was done.
+    """
+    now = now or datetime.now(timezone.utc)
+    segment_dir = get_segment_dir(observations_file)
+    bytes_before = load_manifest(observations_file).byte_size
+
+    try:
+        removed = _apply_retention(observations_file, now, max_age_days, max_bytes)
+    except OSError as e:
+        logger.warning("Failed to apply segment retention: %s", e)
+        removed = 0
+
+    compressed = 0
+    for segment in load_manifest(observations_file).segments:
+        codec = choose_codec(segment, now)
+        if segment.codec == codec:
+            continue
+        try:
+            temp_path = _compress_segment(segment_dir, segment, codec)
+            if _swap_in_compressed(observations_file, segment, codec, temp_path):
+                compressed += 1
+        except (OSError, EOFError) as e:
+            logger.warning("Failed to compress segment %s: %s", segment.name, e)
+
+    return CompactionResult(
+        compressed=compressed,
+        removed=removed,
+        bytes_before=bytes_before,
+        bytes_after=load_manifest(observations_file).byte_size,
+    )
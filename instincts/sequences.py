@@ -0,0 +1,229 @@
+"""Repeated tool-sequence mining for Instinct-Based Learning.
+
+Repeated workflows are contiguous tool sequences shared by several sessions.
+Enumerating every subsequence of every session is quadratic in session
+length, so this module builds a generalized suffix automaton over all
+session sequences instead. Each automaton state stands for a set of
+substrings with the same end positions, which lets session support be
+counted once per state and maximal repeats be read off the automaton
+directly, in time and memory linear in the total sequence length.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SequenceRepeat:
+    """A maximal tool sequence shared by several sessions.
+
+    Attributes:
+        sequence: The repeated tool names, in order.
+        sessions: IDs of the sessions containing the sequence, in input order.
+    """
+
+    sequence: tuple[str, ...]
+    sessions: tuple[str, ...]
+
+
+class _SuffixAutomaton:
+    """Generalized suffix automaton over several tool sequences.
+
+    States are stored in parallel lists indexed by state number; state 0 is
+    the root (the empty string).
+    """
+
+    def __init__(self) -> None:
+        self.length: list[int] = [0]
+        self.link: list[int] = [-1]
+        self.next: list[dict[str, int]] = [{}]
+        # (sequence index, end offset) of one occurrence of each state's strings
+        self.end: list[tuple[int, int]] = [(-1, -1)]
+
+    def _new_state(self, length: int, end: tuple[int, int]) -> int:
+        self.length.append(length)
+        self.link.append(-1)
+        self.next.append({})
+        self.end.append(end)
+        return len(self.length) - 1
+
+    def _clone(self, p: int, q: int, symbol: str) -> int:
+        """Split q so that the state reached from p via symbol has length len(p)+1."""
+        clone = self._new_state(self.length[p] + 1, self.end[q])
+        self.next[clone] = dict(self.next[q])
+        self.link[clone] = self.link[q]
+        while p != -1 and self.next[p].get(symbol) == q:
+            self.next[p][symbol] = clone
+            p = self.link[p]
+        self.link[q] = clone
+        return clone
+
+    def extend(self, last: int, symbol: str, end: tuple[int, int]) -> int:
+        """Append symbol after state last and return the new last state."""
+        existing = self.next[last].get(symbol)
+        if existing is not None:
+            # Prefix already present from an earlier sequence
+            if self.length[last] + 1 == self.length[existing]:
+                return existing
+            return self._clone(last, existing, symbol)
+
+        cur = self._new_state(self.length[last] + 1, end)
+        p = last
+        while p != -1 and symbol not in self.next[p]:
+            self.next[p][symbol] = cur
+            p = self.link[p]
+
+        if p == -1:
+            self.link[cur] = 0
+        else:
+            q = self.next[p][symbol]
+            if self.length[p] + 1 == self.length[q]:
+                self.link[cur] = q
+            else:
+                self.link[cur] = self._clone(p, q, symbol)
+        return cur
+
+    def add(self, index: int, sequence: list[str]) -> None:
+        """Add one sequence to the automaton."""
+        last = 0
+        for offset, symbol in enumerate(sequence):
+            last = self.extend(last, symbol, (index, offset))
+
+
+def find_maximal_repeats(
+    session_sequences: dict[str, list[str]],
+    min_sessions: int,
+    min_length: int,
+) -> list[SequenceRepeat]:
+    """Find maximal tool sequences shared by at least min_sessions sessions.
+
+    A sequence is reported when it has at least min_length tools, appears in
+    at least min_sessions sessions, and cannot be extended by one tool on
+    either side without dropping below min_sessions. Shorter sequences
+    contained in a reported one are therefore never reported on their own.
+
+    Args:
+        session_sequences: Mapping of session ID to its ordered tool names.
+        min_sessions: Minimum number of distinct sessions containing a sequence.
+        min_length: Minimum sequence length.
+
+    Returns:
+        Repeats ordered longest first, ties in order of first occurrence.
+    """
+    session_ids = list(session_sequences)
+    sequences = [session_sequences[session_id] for session_id in session_ids]
+
+    automaton = _SuffixAutomaton()
+    for index, sequence in enumerate(sequences):
+        automaton.add(index, sequence)
+
+    # Count distinct sessions per state: walk each prefix's suffix-link chain,
+    # stopping at states already credited to the current session
+    state_count = len(automaton.length)
+    marked_by = [-1] * state_count
+    support: list[list[int]] = [[] for _ in range(state_count)]
+    for index, sequence in enumerate(sequences):
+        state = 0
+        for symbol in sequence:
+            state = automaton.next[state][symbol]
+            chain = state
+            while chain > 0 and marked_by[chain] != index:
+                marked_by[chain] = index
+                support[chain].append(index)
+                chain = automaton.link[chain]
+
+    def is_frequent(state: int) -> bool:
+        return len(support[state]) >= min_sessions
+
+    # Suffix-link children of a state are the one-tool left extensions of its
+    # longest sequence and transitions are the right extensions; a maximal
+    # repeat is a frequent state with no frequent extension on either side
+    has_frequent_child = [False] * state_count
+    for state in range(1, state_count):
+        if is_frequent(state):
+            has_frequent_child[automaton.link[state]] = True
+
+    repeats: list[tuple[int, tuple[int, int], SequenceRepeat]] = []
+    for state in range(1, state_count):
+        length = automaton.length[state]
+        if length < min_length or not is_frequent(state):
+            continue
+        if has_frequent_child[state]:
+            continue
+        if any(is_frequent(target) for target in automaton.next[state].values()):
+            continue
+
+        index, offset = automaton.end[state]
+        repeat = SequenceRepeat(
+            sequence=tuple(sequences[index][offset - length + 1 : offset + 1]),
+            sessions=tuple(session_ids[i] for i in support[state]),
+        )
+        repeats.append((length, (index, offset), repeat))
+
+    repeats.sort(key=lambda item: (-item[0], item[1]))
+    return [repeat for _, _, repeat in repeats]
+
+
+def find_contained_sequences(sequences: list[tuple[str, ...]]) -> list[bool]:
+    """Flag sequences that occur contiguously inside a strictly longer one.
+
+    Builds an Aho-Corasick automaton over all sequences and scans each
+    sequence through it once. Every match found inside a longer sequence is
+    marked by walking the dictionary-suffix chain, stopping at the first node
+    already marked (everything further down that chain is marked too), so
+    the total work is linear in the combined sequence length.
+
+    Args:
+        sequences: Candidate tool sequences; duplicates are allowed.
+
+    Returns:
+        One flag per input sequence, True if it is contained in a longer one.
+        Equal-length duplicates do not contain each other.
+    """
+    # Trie over all sequences; node_of[i] is the node where sequence i ends
+    goto: list[dict[str, int]] = [{}]
+    depth: list[int] = [0]
+    terminal: list[bool] = [False]
+    node_of: list[int] = []
+    for sequence in sequences:
+        node = 0
+        for symbol in sequence:
+            child = goto[node].get(symbol)
+            if child is None:
+                child = len(goto)
+                goto[node][symbol] = child
+                goto.append({})
+                depth.append(depth[node] + 1)
+                terminal.append(False)
+            node = child
+        terminal[node] = True
+        node_of.append(node)
+
+    # Failure links and dictionary-suffix links (nearest terminal on the
+    # failure chain), computed breadth-first
+    fail = [0] * len(goto)
+    out = [-1] * len(goto)
+    queue = list(goto[0].values())
+    for node in queue:
+        for symbol, child in goto[node].items():
+            f = fail[node]
+            while f and symbol not in goto[f]:
+                f = fail[f]
+            fail[child] = goto[f].get(symbol, 0)
+            out[child] = fail[child] if terminal[fail[child]] else out[fail[child]]
+            queue.append(child)
+
+    contained = [False] * len(goto)
+    for sequence in sequences:
+        node = 0
+        for symbol in sequence:
+            while node and symbol not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(symbol, 0)
+
+            # The full sequence matches itself at its last symbol; skip it
+            match = node if terminal[node] and depth[node] < len(sequence) else out[node]
+            while match > 0 and not contained[match]:
+                contained[match] = True
+                match = out[match]
+
+    return [contained[node] for node in node_of]
@@ -0,0 +1,425 @@
+"""SQLite storage backend for observations and instincts.
+
+Selected with INSTINCT_STORAGE=sqlite. One database per project
+(docs/instincts/instincts.db) holds two tables:
+- observations: one row per observation, the observation itself as JSON,
+  with its session, tool, timestamp and event in indexed columns. Rows are
+  numbered by an autoincrement sequence, which is the checkpoint offset of
+  incremental analysis.
+- instincts: one row per instinct, keyed by ID, with its domain,
+  confidence and status indexed.
+
+The database runs in WAL mode: readers never block the writer, and
+concurrent writers (several sessions' hooks, the background worker) wait up
+to STORAGE_BUSY_TIMEOUT_SECONDS for each other. Every write is a single
+statement in its own transaction, so a crashed writer leaves nothing
+partial behind.
+
+open_shared_storage keeps one connection per database for the life of the
+process (per thread), so the hooks and the daemon connect and check the
+schema once rather than for every observation.
+
+Database errors (a lock held past the timeout, a corrupt file) are raised
+as OSError, like the file backend's I/O errors, so callers handle both the
+same way.
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from instincts.checkpoint import AnalysisCheckpoint
+from instincts.config import STORAGE_BUSY_TIMEOUT_SECONDS
+from instincts.models import Instinct
+
+if TYPE_CHECKING:
+    from instincts.patterns import FieldProjection, ObservationSlice
+
+# Bumped when the schema changes
+SCHEMA_VERSION: int = 1
+
+# Checkpoint "inode" of SQLite slices; never a real file's inode, so file
+# and database checkpoints are never confused
+SQLITE_CHECKPOINT_INODE: int = 0
+
+# Largest gap (in observations) resumed from a checkpoint; after a longer
+# gap the latest window is read instead, as for the file backend
+MAX_RESUME_OBSERVATIONS: int = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT,
+    tool TEXT,
+    timestamp TEXT,
+    event TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_session ON observations (session, seq);
+CREATE INDEX IF NOT EXISTS observations_tool ON observations (tool);
+CREATE INDEX IF NOT EXISTS observations_timestamp ON observations (timestamp);
+CREATE INDEX IF NOT EXISTS observations_event ON observations (event);
+CREATE TABLE IF NOT EXISTS instincts (
+    id TEXT PRIMARY KEY,
+    trigger TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    status TEXT NOT NULL,
+    source TEXT NOT NULL,
+    evidence_count INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    last_observed TEXT,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS instincts_domain ON instincts (domain);
+CREATE INDEX IF NOT EXISTS instincts_confidence ON instincts (confidence);
+CREATE INDEX IF NOT EXISTS instincts_status ON instincts (status);
+"""
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+_INSTINCT_COLUMNS = (
+    "id, trigger, domain, confidence, status, source, evidence_count,"
+    " created_at, updated_at, last_observed"
+)
+
+# Shared storages of the current thread, by database path:
+# ((pid, device, inode) they were opened for, storage)
+_shared = threading.local()
+
+
+def _os_errors(method: Callable[_P, _R]) -> Callable[_P, _R]:
+    """Re-raise sqlite3 errors of a storage method as OSError."""
+
+    @functools.wraps(method)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        try:
+            return method(*args, **kwargs)
+        except sqlite3.Error as e:
+            raise OSError(f"SQLite storage error: {e}") from e
+
+    return wrapper
+
+
+def _text(value: Any) -> str | None:
+    """Get an indexed column value: strings as-is, anything else as NULL."""
+    return value if isinstance(value, str) else None
+
+
+def _projection(fields: Iterable[str] | None) -> "FieldProjection | None":
+    """Get the projection of fields for decoding rows (None: decode in full)."""
+    if fields is None:
+        return None
+    # Imported here: the hook path only appends
+    from instincts.patterns import FieldProjection
+
+    return FieldProjection(fields)
+
+
+def _decode(
+    rows: Iterator[tuple[str]], projection: "FieldProjection | None" = None
+) -> list[dict[str, Any]]:
+    """Decode observation rows, skipping any that are not JSON objects."""
+    observations: list[dict[str, Any]] = []
+    for (data,) in rows:
+        try:
+            obs = projection.decode(data.encode()) if projection else json.loads(data)
+        except (json.JSONDecodeError, UnicodeEncodeError):
+            continue
+        if isinstance(obs, dict):
+            observations.append(obs)
+    return observations
+
+
+def _create_db_file(db_file: Path) -> tuple[int, int]:
+    """Create the database file owner-only, never through a symlink.
+
+    Returns:
+        Device and inode of the file.
+    """
+    fd = os.open(db_file, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    try:
+        stat = os.fstat(fd)
+    finally:
+        os.close(fd)
+    return stat.st_dev, stat.st_ino
+
+
+def _row_to_instinct(row: tuple[Any, ...], content: str = "") -> Instinct:
+    """Build an Instinct from a row of _INSTINCT_COLUMNS."""
+    (
+        instinct_id,
+        trigger,
+        domain,
+        confidence,
+        status,
+        source,
+        evidence_count,
+        created_at,
+        updated_at,
+        last_observed,
+    ) = row
+    return Instinct(
+        id=instinct_id,
+        trigger=trigger,
+        confidence=confidence,
+        domain=domain,
+        source=source,
+        evidence_count=evidence_count,
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(updated_at),
+        content=content,
+        status=status,
+        last_observed=datetime.fromisoformat(last_observed) if last_observed else None,
+    )
+
+
+class SQLiteStorage:
+    """Observation and instinct store in one SQLite database.
+
+    Implements both ObservationStore and InstinctStore.
+
+    Example:
+        storage = SQLiteStorage(get_storage_db_file(project_root))
+        try:
+            storage.append_observation(observation)
+        finally:
+            storage.close()
+    """
+
+    @_os_errors
+    def __init__(self, db_file: Path, timeout: float = STORAGE_BUSY_TIMEOUT_SECONDS) -> None:
+        """Open (and if needed create) the database.
+
+        Args:
+            db_file: Path to the database file; its directory must exist.
+            timeout: Seconds a write waits for a concurrent writer.
+
+        Raises:
+            OSError: If the database file is a symlink, or cannot be created,
+                opened or migrated.
+        """
+        _create_db_file(db_file)
+        self.db_file = db_file
+        self._shared = False
+        self._conn = sqlite3.connect(db_file, timeout=timeout, isolation_level=None)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+        except BaseException:
+            self._conn.close()
+            raise
+
+    def _migrate(self) -> None:
+        """Create the schema once, under the write lock."""
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                for statement in _SCHEMA.split(";"):
+                    if statement.strip():
+                        self._conn.execute(statement)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            # Nothing to roll back if the failure ended the transaction
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Close the connection, unless it is shared (see open_shared_storage)."""
+        if not self._shared:
+            self._conn.close()
+
+    @_os_errors
+    def append_observation(self, observation: dict[str, Any]) -> None:
+        """Insert an observation, waiting for concurrent writers if needed."""
+        self._conn.execute(
+            "INSERT INTO observations (session, tool, timestamp, event, data)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                _text(observation.get("session")),
+                _text(observation.get("tool")),
+                _text(observation.get("timestamp")),
+                _text(observation.get("event")),
+                json.dumps(observation),
+            ),
+        )
+
+    @_os_errors
+    def count_observations(self) -> int:
+        """Count the stored observations."""
+        (count,) = self._conn.execute("SELECT count(*) FROM observations").fetchone()
+        return int(count)
+
+    def _last_seq(self) -> int:
+        (seq,) = self._conn.execute("SELECT coalesce(max(seq), 0) FROM observations").fetchone()
+        return int(seq)
+
+    def _window(
+        self, end: int, limit: int, projection: "FieldProjection | None"
+    ) -> list[dict[str, Any]]:
+        """The latest observations up to seq end, oldest first."""
+        if limit <= 0:
+            return []
+        rows = self._conn.execute(
+            "SELECT data FROM (SELECT seq, data FROM observations WHERE seq <= ?"
+            " ORDER BY seq DESC LIMIT ?) ORDER BY seq",
+            (end, limit),
+        )
+        return _decode(rows, projection)
+
+    @_os_errors
+    def recent_observations(
+        self, limit: int, fields: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Get the latest observations, up to limit, oldest first."""
+        return self._window(self._last_seq(), limit, _projection(fields))
+
+    @_os_errors
+    def observations_since(
+        self,
+        checkpoint: AnalysisCheckpoint | None,
+        limit: int,
+        fields: Iterable[str] | None = None,
+    ) -> "ObservationSlice":
+        """Get the observations after a checkpoint's sequence number.
+
+        Falls back to the latest `limit` observations (resumed=False) if there
+        is no checkpoint, it is a file checkpoint, it is ahead of the table,
+        or more than MAX_RESUME_OBSERVATIONS rows were added since.
+
+        Args:
+            checkpoint: Where the previous analysis stopped, if any.
+            limit: Window size used when the checkpoint cannot be resumed.
+            fields: Fields the caller reads; all if None.
+
+        Returns:
+            ObservationSlice whose offset is the last sequence number read.
+        """
+        from instincts.patterns import ObservationSlice
+
+        projection = _projection(fields)
+        last = self._last_seq()
+        if (
+            checkpoint is not None
+            and checkpoint.inode == SQLITE_CHECKPOINT_INODE
+            and checkpoint.offset <= last
+            and last - checkpoint.offset <= MAX_RESUME_OBSERVATIONS
+        ):
+            rows = self._conn.execute(
+                "SELECT data FROM observations WHERE seq > ? AND seq <= ? ORDER BY seq",
+                (checkpoint.offset, last),
+            )
+            return ObservationSlice(
+                observations=_decode(rows, projection),
+                inode=SQLITE_CHECKPOINT_INODE,
+                offset=last,
+                resumed=True,
+            )
+        return ObservationSlice(
+            observations=self._window(last, limit, projection),
+            inode=SQLITE_CHECKPOINT_INODE,
+            offset=last,
+            resumed=False,
+        )
+
+    def iter_observations(self, fields: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+        """Stream every observation, oldest first.
+
+        Raises:
+            OSError: If reading fails part way.
+        """
+        projection = _projection(fields)
+        try:
+            for row in self._conn.execute("SELECT data FROM observations ORDER BY seq"):
+                yield from _decode(iter([row]), projection)
+        except sqlite3.Error as e:
+            raise OSError(f"SQLite storage error: {e}") from e
+
+    @_os_errors
+    def load_instincts(self, with_content: bool = False) -> list[Instinct]:
+        """Get every instinct; bodies are only read if with_content is set."""
+        columns = _INSTINCT_COLUMNS + (", content" if with_content else "")
+        rows = self._conn.execute(f"SELECT {columns} FROM instincts ORDER BY id")
+        if with_content:
+            return [_row_to_instinct(row[:-1], row[-1]) for row in rows]
+        return [_row_to_instinct(row) for row in rows]
+
+    @_os_errors
+    def get_instinct(self, instinct_id: str) -> Instinct | None:
+        """Get one instinct with its body."""
+        row = self._conn.execute(
+            f"SELECT {_INSTINCT_COLUMNS}, content FROM instincts WHERE id = ?", (instinct_id,)
+        ).fetchone()
+        return _row_to_instinct(row[:-1], row[-1]) if row else None
+
+    @_os_errors
+    def write_instinct(self, instinct: Instinct) -> None:
+        """Insert an instinct or replace the one with the same ID."""
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO instincts ({_INSTINCT_COLUMNS}, content)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                instinct.id,
+                instinct.trigger,
+                instinct.domain,
+                instinct.confidence,
+                instinct.status,
+                instinct.source,
+                instinct.evidence_count,
+                instinct.created_at.isoformat(),
+                instinct.updated_at.isoformat(),
+                instinct.last_observed.isoformat() if instinct.last_observed else None,
+                instinct.content,
+            ),
+        )
+
+
+@_os_errors
+def open_shared_storage(db_file: Path) -> SQLiteStorage:
+    """Get the storage of a database shared by the current thread.
+
+    The first call connects and migrates the database; later calls return
+    the same storage, whose close() leaves the connection open. A new one is
+    opened in a forked child or once the database file has been replaced.
+
+    Args:
+        db_file: Path to the database file; its directory must exist.
+
+    Returns:
+        The shared storage.
+
+    Raises:
+        OSError: If the database file is a symlink, or cannot be created,
+            opened or migrated.
+    """
+    key = (os.getpid(), *_create_db_file(db_file))
+    stores: dict[Path, tuple[tuple[int, ...], SQLiteStorage]] = _shared.__dict__.setdefault(
+        "stores", {}
+    )
+    cached = stores.get(db_file)
+    if cached is not None:
+        opened_for, storage = cached
+        if opened_for == key:
+            return storage
+        # A connection inherited over fork is left to the parent
+        if opened_for[0] == key[0]:
+            storage._conn.close()
+    storage = SQLiteStorage(db_file)
+    storage._shared = True
+    stores[db_file] = (key, storage)
+    return storage
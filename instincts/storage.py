@@ -0,0 +1,343 @@
+"""Pluggable storage for observations and instincts.
+
+Two interfaces separate what the observer, the agent and the CLI need from
+where the data lives:
+- ObservationStore: append observations, count them, and read the latest
+  window, the slice since a checkpoint, or the whole history.
+- InstinctStore: list instinct metadata, read one instinct with its body,
+  and write an instinct.
+
+The file backend is the default: observations go to the flock-guarded
+observations.jsonl and its closed segments, instincts to one Markdown file
+each in learned/ (with its metadata index). Setting $INSTINCT_STORAGE to
+"sqlite" selects the SQLite backend in instincts.sqlite_storage instead,
+with indexed tables for both. export_markdown() writes the instincts of any
+store back to the Markdown layout, for version control:
+
+    python -m instincts.storage export [--output DIR]
+
+This module is imported on the hook path: it imports the file backend's
+implementation modules, and the SQLite backend, only when they are used.
+"""
+
+import logging
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from instincts.config import (
+    STORAGE_BACKEND_ENV,
+    detect_project_root,
+    get_learned_dir,
+    get_observations_file,
+    get_project_instincts_dir,
+    get_storage_db_file,
+)
+
+if TYPE_CHECKING:
+    from instincts.checkpoint import AnalysisCheckpoint
+    from instincts.models import Instinct
+    from instincts.observation_log import ObservationHandles
+    from instincts.patterns import ObservationSlice
+
+logger = logging.getLogger(__name__)
+
+# Storage backend names accepted in $INSTINCT_STORAGE
+STORAGE_FILE: str = "file"
+STORAGE_SQLITE: str = "sqlite"
+
+
+class ObservationStore(Protocol):
+    """Where the observer writes observations and the agent reads them."""
+
+    def append_observation(self, observation: dict[str, Any]) -> None:
+        """Append one observation; safe with concurrent writers."""
+        ...
+
+    def count_observations(self) -> int:
+        """Number of observations stored; raises OSError if it can't be read."""
+        ...
+
+    def recent_observations(
+        self, limit: int, fields: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """The latest observations, up to limit, oldest first.
+
+        With fields (e.g. patterns.required_fields()), large fields outside
+        them may be left out; all are kept if None. The same holds for the
+        other readers.
+        """
+        ...
+
+    def observations_since(
+        self,
+        checkpoint: "AnalysisCheckpoint | None",
+        limit: int,
+        fields: Iterable[str] | None = None,
+    ) -> "ObservationSlice | None":
+        """The observations after a checkpoint, or the latest window."""
+        ...
+
+    def iter_observations(self, fields: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+        """Stream every stored observation, oldest first."""
+        ...
+
+    def close(self) -> None:
+        """Release the store's resources."""
+        ...
+
+
+class InstinctStore(Protocol):
+    """Where the agent keeps the instincts it learns."""
+
+    def load_instincts(self, with_content: bool = False) -> "list[Instinct]":
+        """Every stored instinct; bodies are empty unless with_content."""
+        ...
+
+    def get_instinct(self, instinct_id: str) -> "Instinct | None":
+        """One instinct with its body, or None if it is not stored."""
+        ...
+
+    def write_instinct(self, instinct: "Instinct") -> None:
+        """Create or replace an instinct."""
+        ...
+
+    def close(self) -> None:
+        """Release the store's resources."""
+        ...
+
+
+class FileObservationStore:
+    """Observations in observations.jsonl and its closed segments (default)."""
+
+    def __init__(
+        self, observations_file: Path, handles: "ObservationHandles | None" = None
+    ) -> None:
+        """Open the log; nothing is read or created until it is used.
+
+        Args:
+            observations_file: Path to the active observations JSONL file.
+            handles: Optional handle cache shared across calls (daemon mode).
+        """
+        self.observations_file = observations_file
+        self.handles = handles
+
+    def append_observation(self, observation: dict[str, Any]) -> None:
+        """Append an observation under the log's append lock."""
+        from instincts.observation_log import append_observation
+
+        self.observations_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        append_observation(observation, self.observations_file, self.handles)
+
+    def count_observations(self) -> int:
+        """Count observations from the sidecar index and segment manifest."""
+        from instincts.segments import read_log_index
+
+        return read_log_index(self.observations_file).line_count
+
+    def recent_observations(
+        self, limit: int, fields: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Read the latest observations backwards from the end of the log."""
+        from instincts.patterns import load_recent_observations
+
+        return load_recent_observations(self.observations_file, limit=limit, fields=fields)
+
+    def observations_since(
+        self,
+        checkpoint: "AnalysisCheckpoint | None",
+        limit: int,
+        fields: Iterable[str] | None = None,
+    ) -> "ObservationSlice | None":
+        """Read the lines appended after a checkpoint's inode and offset."""
+        from instincts.patterns import load_observations_since
+
+        return load_observations_since(
+            self.observations_file, checkpoint, limit=limit, fields=fields
+        )
+
+    def iter_observations(self, fields: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+        """Stream the log, closed segments first."""
+        from instincts.patterns import iter_log_observations
+
+        return iter_log_observations(self.observations_file, fields)
+
+    def close(self) -> None:
+        """Nothing to release; cached handles belong to the caller."""
+
+
+class FileInstinctStore:
+    """Instincts as Markdown files in a learned/ directory (default)."""
+
+    def __init__(self, learned_dir: Path) -> None:
+        """Open the directory; it is created by the first write.
+
+        Args:
+            learned_dir: Directory holding one Markdown file per instinct.
+        """
+        self.learned_dir = learned_dir
+
+    def load_instincts(self, with_content: bool = False) -> "list[Instinct]":
+        """List instincts from the metadata index, or parse every file for bodies."""
+        # Imported here: the observer imports this module on the hook path
+        from instincts.instinct_files import (
+            load_existing_instincts,
+            load_instinct_entries,
+        )
+
+        if with_content:
+            return load_existing_instincts(self.learned_dir)
+        entries = load_instinct_entries(self.learned_dir)
+        return [entry.to_instinct(self.learned_dir) for entry in entries]
+
+    def get_instinct(self, instinct_id: str) -> "Instinct | None":
+        """Parse the instinct's file, found by its ID or through the index."""
+        from instincts.frontmatter import parse_instinct
+        from instincts.instinct_files import (
+            load_instinct_entries,
+            read_instinct,
+            sanitize_instinct_id,
+        )
+
+        # Files written by the agent are named after the instinct ID
+        file_path = self.learned_dir / f"{sanitize_instinct_id(instinct_id)}.md"
+        if not file_path.is_symlink():
+            try:
+                instinct = parse_instinct(file_path.read_text(), str(file_path))
+            except (OSError, ValueError, UnicodeDecodeError):
+                instinct = None
+            if instinct is not None and instinct.id == instinct_id:
+                return instinct
+
+        for entry in load_instinct_entries(self.learned_dir):
+            # That file was read above and holds another instinct (stale entry)
+            if entry.id == instinct_id and entry.file != file_path.name:
+                return read_instinct(self.learned_dir, entry)
+        return None
+
+    def write_instinct(self, instinct: "Instinct") -> None:
+        """Write the instinct's Markdown file atomically."""
+        from instincts.instinct_files import write_instinct_file
+
+        write_instinct_file(instinct, self.learned_dir)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def storage_backend() -> str:
+    """Get the storage backend selected by $INSTINCT_STORAGE.
+
+    Returns:
+        STORAGE_FILE or STORAGE_SQLITE; an unknown value falls back to the
+        file backend with a warning.
+    """
+    backend = os.environ.get(STORAGE_BACKEND_ENV, "").strip().lower() or STORAGE_FILE
+    if backend not in (STORAGE_FILE, STORAGE_SQLITE):
+        logger.warning("Unknown storage backend %r, using %r", backend, STORAGE_FILE)
+        return STORAGE_FILE
+    return backend
+
+
+def open_observation_store(
+    project_root: Path, handles: "ObservationHandles | None" = None
+) -> ObservationStore:
+    """Open the selected backend's observation store for a project.
+
+    Args:
+        project_root: Project root for project-scoped storage.
+        handles: Optional handle cache for the file backend (daemon mode).
+
+    Returns:
+        The store; close() it when done.
+
+    Raises:
+        OSError: If the SQLite database cannot be opened.
+    """
+    if storage_backend() == STORAGE_SQLITE:
+        # Imported here so sqlite3 is only loaded when it is used
+        from instincts.sqlite_storage import open_shared_storage
+
+        get_project_instincts_dir(project_root).mkdir(parents=True, exist_ok=True, mode=0o700)
+        return open_shared_storage(get_storage_db_file(project_root))
+    return FileObservationStore(get_observations_file(project_root), handles)
+
+
+def open_instinct_store(project_root: Path) -> InstinctStore:
+    """Open the selected backend's instinct store for a project.
+
+    Args:
+        project_root: Project root for project-scoped storage.
+
+    Returns:
+        The store; close() it when done.
+
+    Raises:
+        OSError: If the SQLite database cannot be opened.
+    """
+    if storage_backend() == STORAGE_SQLITE:
+        from instincts.sqlite_storage import open_shared_storage
+
+        get_project_instincts_dir(project_root).mkdir(parents=True, exist_ok=True, mode=0o700)
+        return open_shared_storage(get_storage_db_file(project_root))
+    return FileInstinctStore(get_learned_dir(project_root))
+
+
+def export_markdown(store: InstinctStore, directory: Path) -> list[Path]:
+    """Write every instinct of a store as a Markdown file, one per instinct.
+
+    The files have the learned/ layout, so an exported directory can be
+    committed or read by the file backend. Existing files of the same
+    instincts are replaced; other files are left alone.
+
+    Args:
+        store: Store to export from.
+        directory: Directory to write the files to.
+
+    Returns:
+        Paths of the written files.
+
+    Raises:
+        OSError: If a file cannot be written.
+        ValueError: If an instinct ID would escape the directory.
+    """
+    from instincts.instinct_files import write_instinct_file
+
+    instincts = store.load_instincts(with_content=True)
+    return [write_instinct_file(instinct, directory) for instinct in instincts]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Instinct storage")
+    parser.add_argument("command", choices=("export",))
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Directory to export to (default: the project's learned/ directory)",
+    )
+    args = parser.parse_args(argv)
+    project_root = detect_project_root(Path.cwd())
+    output = args.output or get_learned_dir(project_root)
+
+    try:
+        store = open_instinct_store(project_root)
+        try:
+            written = export_markdown(store, output)
+        finally:
+            store.close()
+    except (OSError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Exported {len(written)} instincts to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
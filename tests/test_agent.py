@@ -9,7 +9,7 @@ Tests cover:
 """
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -17,11 +17,11 @@ import pytest
 
 from instincts.agent import (
     AnalysisResult,
-    _write_instinct_file,
     analyze_observations,
     apply_confidence_decay,
     format_analysis_summary,
 )
+from instincts.instinct_files import write_instinct_file
 from instincts.models import Instinct
 
 
@@ -212,6 +212,36 @@ status: "active"
         assert len(decayed) >= 1
 
 
+class TestConfirmationEntry:
+    """Tests for the ledger entries of re-detected patterns."""
+
+    def test_entry_references_pattern_evidence(self):
+        """The entry should carry the latest evidence time, sessions and occurrences."""
+        from instincts.agent import _confirmation_entry
+        from instincts.confidence import CONFIRM_DELTA
+        from instincts.models import Evidence, Pattern, PatternType
+
+        observed = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        pattern = Pattern(
+            pattern_type=PatternType.REPEATED_WORKFLOW,
+            trigger="when testing",
+            description="Test workflow",
+            evidence=(
+                Evidence(timestamp=observed, session_id="s2", description="seen"),
+                Evidence(timestamp=observed + timedelta(hours=1), session_id="s1", description="seen"),
+            ),
+            metadata=(("occurrences", 5),),
+        )
+
+        entry = _confirmation_entry("test", pattern)
+
+        assert entry.instinct_id == "test"
+        assert entry.delta == CONFIRM_DELTA
+        assert entry.evidence == "repeated_workflow:s1,s2"
+        assert entry.timestamp == observed + timedelta(hours=1)
+        assert entry.evidence_count == 5
+
+
 class TestFormatAnalysisSummary:
     """Tests for format_analysis_summary function."""
 
@@ -279,7 +309,7 @@ class TestPathTraversalPrevention:
         )
 
         # Should not raise for valid path
-        _write_instinct_file(instinct, tmp_path)
+        write_instinct_file(instinct, tmp_path)
 
     def test_sanitizes_instinct_id_with_path_traversal(self, tmp_path: Path):
         """Should sanitize instinct ID containing path traversal sequences."""
@@ -296,7 +326,7 @@ class TestPathTraversalPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
 
         # File should be created within tmp_path
         assert result_path.parent == tmp_path
@@ -317,7 +347,7 @@ class TestPathTraversalPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
 
         # File should be created within tmp_path
         assert result_path.parent == tmp_path
@@ -344,7 +374,7 @@ class TestPathTraversalPrevention:
         symlink.symlink_to(target)
 
         with pytest.raises(ValueError, match="symlink"):
-            _write_instinct_file(instinct, tmp_path)
+            write_instinct_file(instinct, tmp_path)
 
 
 class TestSymlinkSkippingOnRead:
@@ -352,7 +382,7 @@ class TestSymlinkSkippingOnRead:
 
     def test_load_existing_instincts_skips_symlinks(self, tmp_path: Path):
         """Should skip symlinks when loading existing instincts."""
-        from instincts.agent import _load_existing_instincts
+        from instincts.instinct_files import load_existing_instincts
 
         # Create a real instinct file
         (tmp_path / "real.md").write_text("""---
@@ -373,7 +403,7 @@ Content""")
         symlink = tmp_path / "link.md"
         symlink.symlink_to(target)
 
-        instincts = _load_existing_instincts(tmp_path)
+        instincts = load_existing_instincts(tmp_path)
 
         # Should only load the real file, not the symlink
         ids = [i.id for i in instincts]
@@ -399,7 +429,7 @@ class TestYamlInjectionPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
         content = result_path.read_text()
 
         # Should have escaped quotes
@@ -420,7 +450,7 @@ class TestYamlInjectionPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
         content = result_path.read_text()
 
         # Newlines should be escaped in the trigger value
@@ -442,7 +472,7 @@ class TestYamlInjectionPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
         content = result_path.read_text()
 
         # Backslashes should be escaped
@@ -463,7 +493,7 @@ class TestYamlInjectionPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
         content = result_path.read_text()
 
         # Carriage returns should be escaped
@@ -484,7 +514,7 @@ class TestYamlInjectionPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
         content = result_path.read_text()
 
         # ID should be escaped
@@ -505,7 +535,7 @@ class TestYamlInjectionPrevention:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
         content = result_path.read_text()
 
         # ID should be quoted
@@ -693,13 +723,31 @@ class TestDualApproachAnalysis:
         ]
         obs_file.write_text("\n".join(json.dumps(obs) for obs in observations))
 
-        with patch("instincts.agent.load_recent_observations") as mock_load:
+        with patch("instincts.patterns.load_recent_observations") as mock_load:
             mock_load.return_value = observations
             analyze_observations(project_root)
 
         # Should call load_recent_observations with a limit
         mock_load.assert_called()
 
+    def test_algorithm_analyzes_same_window_as_llm(self, tmp_path: Path):
+        """AC-R2.3: Algorithm detectors should use the loaded window, not reread the file."""
+        project_root, instincts_dir, _learned_dir = create_project_structure(tmp_path)
+        obs_file = instincts_dir / "observations.jsonl"
+        obs_file.write_text(
+            json.dumps({"event": "tool_start", "tool": "Read", "session": "s1", "timestamp": "2026-02-09T10:00:00Z"})
+        )
+
+        window = [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/main.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/main.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:30Z"},
+        ]
+
+        with patch("instincts.patterns.load_recent_observations", return_value=window):
+            result = analyze_observations(project_root, dry_run=True, skip_llm=True)
+
+        assert [p.pattern_type.value for p in result.patterns] == ["user_correction"]
+
     def test_skip_llm_flag(self, tmp_path: Path):
         """Should skip LLM when skip_llm=True."""
         project_root, instincts_dir, learned_dir = create_project_structure(tmp_path)
@@ -717,6 +765,144 @@ class TestDualApproachAnalysis:
         assert "llm" not in result.detection_sources
 
 
+class TestAggregatedPatternsToInstincts:
+    """Tests for instincts created from aggregated patterns."""
+
+    def test_evidence_count_uses_occurrences(self):
+        """Instinct evidence_count should reflect all occurrences, not the capped sample."""
+        from instincts.agent import _generate_instinct_content, _pattern_to_instinct
+        from instincts.models import Evidence, Pattern, PatternType
+
+        pattern = Pattern(
+            pattern_type=PatternType.ERROR_RESOLUTION,
+            trigger="when encountering errors",
+            description="Error resolution: ImportError was resolved",
+            evidence=tuple(
+                Evidence(
+                    timestamp=datetime(2026, 2, 9, 10, i, tzinfo=timezone.utc),
+                    session_id=f"s{i}",
+                    description="resolved",
+                )
+                for i in range(10)
+            ),
+            metadata=(("error_type", "ImportError"), ("occurrences", 40)),
+        )
+
+        instinct = _pattern_to_instinct(pattern)
+
+        assert instinct.evidence_count == 40
+        assert "... and 35 more observations" in _generate_instinct_content(pattern)
+
+
+class TestIncrementalAnalysis:
+    """Tests for checkpoint-based incremental analysis."""
+
+    def _append(self, obs_file: Path, observations: list[dict]) -> None:
+        with obs_file.open("a") as f:
+            for obs in observations:
+                f.write(json.dumps(obs) + "\n")
+
+    def test_second_run_only_sees_new_observations(self, tmp_path: Path):
+        """Observations analyzed once should not be analyzed again."""
+        project_root, instincts_dir, _learned_dir = create_project_structure(tmp_path)
+        obs_file = instincts_dir / "observations.jsonl"
+        self._append(obs_file, [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:01:00Z"},
+        ])
+
+        first = analyze_observations(project_root, skip_llm=True, incremental=True)
+        second = analyze_observations(project_root, skip_llm=True, incremental=True)
+
+        assert first.patterns_detected == 1
+        assert second.patterns_detected == 0
+
+    def test_merges_new_evidence_into_existing_instinct(self, tmp_path: Path):
+        """Re-detected patterns should add evidence and last_observed once the ledger is folded."""
+        from instincts.confidence_ledger import fold_ledger
+        from instincts.config import get_confidence_ledger_file
+        from instincts.instinct_files import load_existing_instincts
+        from instincts.storage import FileInstinctStore
+
+        project_root, instincts_dir, learned_dir = create_project_structure(tmp_path)
+        obs_file = instincts_dir / "observations.jsonl"
+        self._append(obs_file, [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:01:00Z"},
+        ])
+        analyze_observations(project_root, skip_llm=True, incremental=True)
+
+        # Write before the checkpoint is matched by an Edit after it
+        self._append(obs_file, [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/b.py"}', "session": "s1", "timestamp": "2026-02-10T09:00:00Z"},
+        ])
+        analyze_observations(project_root, skip_llm=True, incremental=True)
+        self._append(obs_file, [
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/b.py"}', "session": "s1", "timestamp": "2026-02-10T09:05:00Z"},
+        ])
+        result = analyze_observations(project_root, skip_llm=True, incremental=True)
+        fold_ledger(get_confidence_ledger_file(project_root), FileInstinctStore(learned_dir), force=True)
+
+        instincts = load_existing_instincts(learned_dir)
+        assert result.instincts_updated == 1
+        assert len(instincts) == 1
+        assert instincts[0].evidence_count == 2
+        assert instincts[0].last_observed == datetime(2026, 2, 10, 9, 5, tzinfo=timezone.utc)
+
+    def test_window_runs_do_not_confirm(self, tmp_path: Path):
+        """Runs that did not resume from a checkpoint should leave the ledger empty."""
+        from instincts.config import get_confidence_ledger_file
+
+        project_root, instincts_dir, _learned_dir = create_project_structure(tmp_path)
+        self._append(instincts_dir / "observations.jsonl", [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:01:00Z"},
+        ])
+        analyze_observations(project_root, skip_llm=True)
+
+        full = analyze_observations(project_root, skip_llm=True)
+        first = analyze_observations(project_root, skip_llm=True, incremental=True)
+
+        assert (full.patterns_detected, full.instincts_updated) == (1, 0)
+        assert (first.patterns_detected, first.instincts_updated) == (1, 0)
+        assert not get_confidence_ledger_file(project_root).exists()
+
+    def test_dry_run_does_not_advance_checkpoint(self, tmp_path: Path):
+        """Dry runs should leave the checkpoint untouched."""
+        from instincts.config import get_analysis_checkpoint_file
+
+        project_root, instincts_dir, _learned_dir = create_project_structure(tmp_path)
+        self._append(instincts_dir / "observations.jsonl", [
+            {"event": "tool_start", "tool": "Read", "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+        ])
+
+        analyze_observations(project_root, dry_run=True, skip_llm=True, incremental=True)
+
+        assert not get_analysis_checkpoint_file(project_root).exists()
+
+    def test_last_observed_round_trips_through_frontmatter(self, tmp_path: Path):
+        """last_observed should be written to and parsed from instinct files."""
+        from instincts.instinct_files import load_existing_instincts
+
+        observed = datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc)
+        instinct = Instinct(
+            id="observed",
+            trigger="when testing",
+            confidence=0.5,
+            domain="testing",
+            source="test",
+            evidence_count=1,
+            created_at=observed,
+            updated_at=observed,
+            content="# Observed",
+            last_observed=observed,
+        )
+
+        write_instinct_file(instinct, tmp_path)
+
+        assert load_existing_instincts(tmp_path)[0].last_observed == observed
+
+
 class TestAtomicFileWrites:
     """Tests for atomic file write functionality."""
 
@@ -735,7 +921,7 @@ class TestAtomicFileWrites:
             content="test",
         )
 
-        result_path = _write_instinct_file(instinct, tmp_path)
+        result_path = write_instinct_file(instinct, tmp_path)
 
         assert result_path.exists()
         content = result_path.read_text()
@@ -743,14 +929,109 @@ class TestAtomicFileWrites:
 
     def test_atomic_write_cleans_up_on_failure(self, tmp_path: Path):
         """Should clean up temp file on write failure."""
-        from instincts.agent import _atomic_write_text
+        from instincts.instinct_files import atomic_write_text
 
         # Try to write to a non-existent parent directory
         bad_path = tmp_path / "nonexistent" / "file.txt"
 
         with pytest.raises(OSError):
-            _atomic_write_text(bad_path, "content")
+            atomic_write_text(bad_path, "content")
 
         # No temp files should remain
         temp_files = list(tmp_path.glob("*.tmp"))
         assert len(temp_files) == 0
+
+
+class TestBackgroundWorker:
+    """Tests for the `python -m instincts.agent` background worker."""
+
+    def _write_observations(self, instincts_dir: Path) -> None:
+        observations = [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:01:00Z"},
+        ]
+        (instincts_dir / "observations.jsonl").write_text(
+            "".join(json.dumps(obs) + "\n" for obs in observations)
+        )
+
+    def test_runs_analysis_records_state_and_releases_lock(self, tmp_path: Path):
+        """A pass should create instincts, record the run and drop the lease."""
+        from instincts.agent import main
+        from instincts.auto_learn import load_state
+        from instincts.checkpoint import load_checkpoint
+        from instincts.config import get_analysis_checkpoint_file
+
+        project_root, instincts_dir, learned_dir = create_project_structure(tmp_path)
+        self._write_observations(instincts_dir)
+
+        exit_code = main(["--project-root", str(project_root), "--skip-llm", "--max-memory-mb", "0"])
+
+        state = load_state(project_root)
+        assert exit_code == 0
+        assert list(learned_dir.glob("*.md"))
+        assert state.last_analysis_time is not None
+        assert load_checkpoint(get_analysis_checkpoint_file(project_root)) is not None
+        assert not (instincts_dir / ".auto_learn.lock").exists()
+
+    def test_exits_without_work_when_lease_held(self, tmp_path: Path):
+        """A second worker should exit cleanly while another holds the lease."""
+        from instincts.agent import main
+
+        project_root, instincts_dir, learned_dir = create_project_structure(tmp_path)
+        self._write_observations(instincts_dir)
+        lock_file = instincts_dir / ".auto_learn.lock"
+        lock_file.write_text(json.dumps({"pid": 99999, "timestamp": datetime.now(timezone.utc).isoformat()}))
+
+        exit_code = main(["--project-root", str(project_root), "--skip-llm", "--max-memory-mb", "0"])
+
+        assert exit_code == 0
+        assert not list(learned_dir.glob("*.md"))
+        assert lock_file.exists()
+
+    def test_time_budget_stops_run_and_releases_lock(self, tmp_path: Path):
+        """A run that exceeds its wall-clock budget should fail and release the lease."""
+        import time
+
+        from instincts.agent import run_background_analysis
+        from instincts.auto_learn import load_state
+
+        project_root, instincts_dir, _ = create_project_structure(tmp_path)
+
+        def slow_analysis(*args: object, **kwargs: object) -> None:
+            time.sleep(5)
+
+        with patch("instincts.agent.analyze_observations", side_effect=slow_analysis):
+            exit_code = run_background_analysis(project_root, skip_llm=True, max_seconds=0.05, max_memory_mb=0)
+
+        assert exit_code == 1
+        assert load_state(project_root).last_analysis_time is None
+        assert not (instincts_dir / ".auto_learn.lock").exists()
+
+    def test_memory_budget_is_restored(self):
+        """The address-space cap should apply only inside the budget block."""
+        import resource
+
+        from instincts.agent import _memory_budget
+
+        before = resource.getrlimit(resource.RLIMIT_AS)
+        with _memory_budget(64 * 1024):
+            soft, _ = resource.getrlimit(resource.RLIMIT_AS)
+            assert soft <= 64 * 1024 * 1024 * 1024
+
+        assert resource.getrlimit(resource.RLIMIT_AS) == before
+
+    def test_worker_compacts_closed_segments(self, tmp_path: Path):
+        """A pass should compress closed log segments after recording the run."""
+        from instincts.agent import run_background_analysis
+        from instincts.segments import CODEC_NONE, append_lock, load_manifest, roll_over
+
+        project_root, instincts_dir, _ = create_project_structure(tmp_path)
+        self._write_observations(instincts_dir)
+        observations_file = instincts_dir / "observations.jsonl"
+        with append_lock(observations_file):
+            roll_over(observations_file)
+
+        exit_code = run_background_analysis(project_root, skip_llm=True, max_memory_mb=0)
+
+        assert exit_code == 0
+        assert [s.codec != CODEC_NONE for s in load_manifest(observations_file).segments] == [True]
@@ -48,6 +48,56 @@ class TestAutoLearnState:
             state.observation_count_at_analysis = 200  # type: ignore[misc]
 
 
+class TestCheckpointPersistence:
+    """Tests for the incremental analysis checkpoint file."""
+
+    def test_checkpoint_round_trips(self, tmp_path: Path):
+        """A saved checkpoint should load back with its carry-over state."""
+        from instincts.checkpoint import (
+            AnalysisCheckpoint,
+            SessionCarryOver,
+            load_checkpoint,
+            save_checkpoint,
+        )
+
+        checkpoint_file = tmp_path / ".analysis_checkpoint.json"
+        carried = SessionCarryOver(
+            open_writes=("/app/main.py",),
+            error_output="ImportError: no module",
+            recent=({"event": "tool_complete", "tool": "Bash"},),
+            last_timestamp="2026-02-09T10:00:00Z",
+        )
+        checkpoint = AnalysisCheckpoint(inode=42, offset=1024, carry_over={"s1": carried})
+
+        assert load_checkpoint(checkpoint_file) is None
+        save_checkpoint(checkpoint_file, checkpoint)
+
+        assert load_checkpoint(checkpoint_file) == checkpoint
+        assert [p.name for p in tmp_path.iterdir()] == [".analysis_checkpoint.json"]
+
+    def test_state_with_legacy_checkpoint_loads(self, tmp_path: Path):
+        """State files that still hold a checkpoint should load without it."""
+        from instincts.auto_learn import load_state
+
+        project_root = tmp_path / "project"
+        instincts_dir = project_root / "docs" / "instincts"
+        instincts_dir.mkdir(parents=True)
+        (instincts_dir / ".auto_learn_state.json").write_text(
+            json.dumps({"observation_count_at_analysis": 7, "checkpoint": {"inode": 1, "offset": 2}})
+        )
+
+        assert load_state(project_root).observation_count_at_analysis == 7
+
+    def test_malformed_checkpoint_is_ignored(self, tmp_path: Path):
+        """A corrupt checkpoint should not raise."""
+        from instincts.checkpoint import load_checkpoint
+
+        checkpoint_file = tmp_path / ".analysis_checkpoint.json"
+        checkpoint_file.write_text(json.dumps({"inode": "x"}))
+
+        assert load_checkpoint(checkpoint_file) is None
+
+
 class TestLoadState:
     """Tests for load_state function."""
 
@@ -224,6 +274,19 @@ class TestShouldTriggerLearning:
 
         assert result is False
 
+    def test_uses_count_given_by_caller(self, tmp_path: Path):
+        """A count from the hooks' counter should be used without opening the store."""
+        from instincts.auto_learn import should_trigger_learning
+
+        project_root = tmp_path / "project"
+        (project_root / "docs" / "instincts").mkdir(parents=True)
+
+        with patch("instincts.storage.open_observation_store") as mock_open:
+            assert should_trigger_learning(project_root, observation_count=50) is True
+            assert should_trigger_learning(project_root, observation_count=30) is False
+
+        mock_open.assert_not_called()
+
     def test_does_not_trigger_during_cooldown(self, tmp_path: Path):
         """Should not trigger if cooldown has not elapsed."""
         from instincts.auto_learn import should_trigger_learning, AutoLearnState, save_state
@@ -300,6 +363,143 @@ class TestAcquireReleaseLock:
         assert not lock_file.exists()
 
 
+class TestLeaseLock:
+    """Tests for lease expiry, takeover and renewal of the auto-learn lock."""
+
+    def _instincts_dir(self, tmp_path: Path) -> tuple[Path, Path]:
+        project_root = tmp_path / "project"
+        instincts_dir = project_root / "docs" / "instincts"
+        instincts_dir.mkdir(parents=True)
+        return project_root, instincts_dir
+
+    def test_acquire_writes_lease(self, tmp_path: Path):
+        """The lock file should record the owner pid and lease expiry."""
+        import os
+
+        from instincts.auto_learn import acquire_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+
+        assert acquire_lock(project_root) is True
+
+        lease = json.loads((instincts_dir / ".auto_learn.lock").read_text())
+        assert lease["pid"] == os.getpid()
+        expires_at = datetime.fromisoformat(lease["expires_at"])
+        assert expires_at > datetime.fromisoformat(lease["heartbeat"])
+
+    def test_live_lease_blocks_second_acquire(self, tmp_path: Path):
+        """A second acquire should fail while the lease is held."""
+        from instincts.auto_learn import acquire_lock
+
+        project_root, _ = self._instincts_dir(tmp_path)
+
+        assert acquire_lock(project_root) is True
+        assert acquire_lock(project_root) is False
+
+    def test_expired_lease_is_taken_over(self, tmp_path: Path):
+        """A lease that was not renewed in time should be taken over."""
+        import os
+
+        from instincts.auto_learn import acquire_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        lock_file = instincts_dir / ".auto_learn.lock"
+        past = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+        lock_file.write_text(json.dumps({"pid": 99999, "timestamp": past, "heartbeat": past, "expires_at": past}))
+
+        assert acquire_lock(project_root) is True
+        assert json.loads(lock_file.read_text())["pid"] == os.getpid()
+
+    def test_legacy_lock_expires_after_lease_period(self, tmp_path: Path):
+        """A pre-lease lock (pid + timestamp only) should go stale with age."""
+        from instincts.auto_learn import acquire_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        old = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+        (instincts_dir / ".auto_learn.lock").write_text(json.dumps({"pid": 99999, "timestamp": old}))
+
+        assert acquire_lock(project_root) is True
+
+    def test_corrupt_lock_does_not_wedge(self, tmp_path: Path):
+        """An unreadable lock file should not block acquisition forever."""
+        from instincts.auto_learn import acquire_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        (instincts_dir / ".auto_learn.lock").write_text("{not json")
+
+        assert acquire_lock(project_root) is True
+
+    def test_renew_extends_lease(self, tmp_path: Path):
+        """Renewing should push the expiry forward for the owner."""
+        from instincts.auto_learn import acquire_lock, renew_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        lock_file = instincts_dir / ".auto_learn.lock"
+        acquire_lock(project_root)
+        before = json.loads(lock_file.read_text())
+
+        assert renew_lock(project_root) is True
+
+        after = json.loads(lock_file.read_text())
+        assert after["timestamp"] == before["timestamp"]
+        assert after["expires_at"] >= before["expires_at"]
+
+    def test_renew_fails_for_other_owner(self, tmp_path: Path):
+        """A worker whose lease was taken over should not renew it."""
+        from instincts.auto_learn import renew_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        now = datetime.now(timezone.utc).isoformat()
+        (instincts_dir / ".auto_learn.lock").write_text(json.dumps({"pid": 99999, "timestamp": now}))
+
+        assert renew_lock(project_root) is False
+
+    def test_release_keeps_other_owners_lease(self, tmp_path: Path):
+        """Releasing should not remove a lease held by another process."""
+        from instincts.auto_learn import release_lock
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        lock_file = instincts_dir / ".auto_learn.lock"
+        now = datetime.now(timezone.utc).isoformat()
+        lock_file.write_text(json.dumps({"pid": 99999, "timestamp": now}))
+
+        release_lock(project_root)
+
+        assert lock_file.exists()
+
+    def test_heartbeat_renews_until_stopped(self, tmp_path: Path):
+        """The heartbeat thread should keep the lease fresh."""
+        import time
+
+        from instincts.auto_learn import acquire_lock, lease_heartbeat
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        lock_file = instincts_dir / ".auto_learn.lock"
+        acquire_lock(project_root)
+        before = json.loads(lock_file.read_text())["heartbeat"]
+
+        with lease_heartbeat(project_root, interval=0.01) as lost:
+            time.sleep(0.1)
+
+        assert not lost.is_set()
+        assert json.loads(lock_file.read_text())["heartbeat"] > before
+
+    def test_heartbeat_reports_lost_lease(self, tmp_path: Path):
+        """The heartbeat should flag a lease taken over by another process."""
+        import time
+
+        from instincts.auto_learn import lease_heartbeat
+
+        project_root, instincts_dir = self._instincts_dir(tmp_path)
+        now = datetime.now(timezone.utc).isoformat()
+        (instincts_dir / ".auto_learn.lock").write_text(json.dumps({"pid": 99999, "timestamp": now}))
+
+        with lease_heartbeat(project_root, interval=0.01) as lost:
+            time.sleep(0.1)
+
+        assert lost.is_set()
+
+
 class TestTriggerBackgroundAnalysis:
     """Tests for trigger_background_analysis function (AC-4.3)."""
 
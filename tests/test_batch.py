@@ -0,0 +1,227 @@
+"""Tests for instincts.batch module.
+
+Tests cover:
+- Building the columns (interning, epoch timestamps, extracted flags)
+- Large text fields dropped except for error output
+- DetectionPipeline running the detectors over the columns
+"""
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+TOOLS = ("Read", "Edit", "Write", "Bash", "Grep")
+
+
+def random_log(seed: int, length: int = 300) -> list[dict]:
+    """A random interleaving of a few sessions, with some malformed rows."""
+    rng = random.Random(seed)
+    log = []
+    for second in range(length):
+        obs = {
+            "session": rng.choice(("s1", "s2", "s3", "s4")),
+            "timestamp": f"2026-02-09T10:{second // 60:02d}:{second % 60:02d}+00:00",
+            "tool": rng.choice(TOOLS),
+        }
+        kind = rng.random()
+        if kind < 0.45:
+            obs["event"] = "tool_start"
+            obs["input"] = json.dumps({"file_path": rng.choice(("/a.py", "/b.py"))})
+        elif kind < 0.8:
+            obs["event"] = "tool_complete"
+            obs["output"] = rng.choice(("ok", "ok", "Error: failed", "TypeError: bad"))
+        elif kind < 0.95:
+            obs["event"] = "user_message"
+            obs["content"] = rng.choice(("thanks", "no, wrong", "actually stop"))
+            del obs["tool"]
+        else:
+            obs["event"] = "something_else"
+        log.append(obs)
+    return log
+
+
+def signature(patterns) -> list[tuple]:
+    """Comparable view of patterns; workflow and preference evidence is stamped now."""
+    return [
+        (
+            p.pattern_type.value,
+            p.trigger,
+            p.occurrences,
+            json.dumps(sorted(dict(p.metadata).items()), sort_keys=True, default=sorted),
+            [(e.timestamp, e.session_id) for e in p.evidence] if p.pattern_type.value in ("user_correction", "error_resolution") else None,
+        )
+        for p in patterns
+    ]
+
+
+class TestObservationBatch:
+    """Tests for building the columnar representation."""
+
+    def test_interns_tools_and_sessions(self):
+        """Repeated tool names and sessions should share one code."""
+        from instincts.batch import ObservationBatch
+
+        batch = ObservationBatch.from_observations(
+            [
+                {"event": "tool_start", "tool": "Read", "session": "a"},
+                {"event": "tool_start", "tool": "Read", "session": "b"},
+                {"event": "tool_start", "tool": "Bash", "session": "a"},
+            ]
+        )
+
+        assert len(batch) == 3
+        assert list(batch.tools) == [1, 1, 2]
+        assert batch.tool_names == ["", "Read", "Bash"]
+        assert list(batch.sessions) == [0, 1, 0]
+        assert batch.session_ids == ["a", "b"]
+
+    def test_timestamps_are_epoch_micros(self):
+        """Timestamps should be parsed once; missing or invalid ones sort first."""
+        from instincts.batch import MISSING_TIMESTAMP, ObservationBatch
+
+        batch = ObservationBatch.from_observations(
+            [
+                {"timestamp": "1970-01-01T00:00:01+00:00"},
+                {"timestamp": "1970-01-01T01:00:00+01:00"},
+                {"timestamp": "not a time"},
+                {},
+            ]
+        )
+
+        assert list(batch.timestamps) == [1_000_000, 0, MISSING_TIMESTAMP, MISSING_TIMESTAMP]
+
+    def test_keeps_only_extracted_facts_from_text(self):
+        """Only error output should be kept; other text becomes codes and flags."""
+        from instincts.batch import FLAG_CORRECTION, FLAG_ERROR, ObservationBatch
+
+        batch = ObservationBatch.from_observations(
+            [
+                {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/a.py"}'},
+                {"event": "tool_start", "tool": "Read", "input": '{"file_path": "/b.py"}'},
+                {"event": "tool_complete", "tool": "Bash", "output": "x" * 5000},
+                {"event": "tool_complete", "tool": "Bash", "output": "Error: boom"},
+                {"event": "user_message", "content": "no, not that"},
+            ]
+        )
+
+        assert list(batch.file_paths) == [0, -1, -1, -1, -1]
+        assert batch.path_names == ["/a.py"]
+        assert list(batch.flags) == [0, 0, 0, FLAG_ERROR, FLAG_CORRECTION]
+        assert batch.error_outputs == {3: "Error: boom"}
+
+    def test_observation_rebuilds_row(self):
+        """A row should read back as a light observation dict."""
+        from instincts.batch import ObservationBatch
+
+        batch = ObservationBatch.from_observations(
+            [{"event": "tool_complete", "tool": "Bash", "session": "s", "timestamp": "2026-02-09T10:00:00+00:00"}]
+        )
+
+        assert batch.observation(0) == {
+            "event": "tool_complete",
+            "tool": "Bash",
+            "session": "s",
+            "timestamp": "2026-02-09T10:00:00+00:00",
+        }
+
+    def test_session_rows_are_sorted_by_timestamp(self):
+        """Each session's rows should be in time order, sessions in first-seen order."""
+        from instincts.batch import ObservationBatch
+
+        batch = ObservationBatch.from_observations(
+            [
+                {"session": "b", "timestamp": "2026-02-09T10:02:00Z"},
+                {"session": "a", "timestamp": "2026-02-09T10:01:00Z"},
+                {"session": "b", "timestamp": "2026-02-09T10:00:00Z"},
+            ]
+        )
+
+        assert {s: list(rows) for s, rows in batch.session_rows().items()} == {"b": [2, 0], "a": [1]}
+
+
+class TestColumnarDetection:
+    """Tests for DetectionPipeline over the batch."""
+
+    def test_pipeline_keeps_only_columns(self):
+        """A streamed input should leave only the batch, with error output as its only text."""
+        from instincts.patterns import DetectionPipeline
+
+        log = random_log(3)
+        pipeline = DetectionPipeline(iter(log))
+
+        assert len(pipeline.batch) == len(log)
+        assert not hasattr(pipeline, "_by_session")
+        assert all(
+            log[row]["event"] == "tool_complete" and "rror" in output
+            for row, output in pipeline.batch.error_outputs.items()
+        )
+
+    def test_enriched_observations_match_legacy_lines(self):
+        """Keys recorded at write time should give the same patterns as scanning text."""
+        from instincts.enrichment import describe_input, describe_output
+        from instincts.patterns import DetectionPipeline
+
+        legacy = random_log(11)
+        enriched = []
+        for obs in legacy:
+            if obs["event"] == "tool_start":
+                obs = {**obs, **describe_input(obs["tool"], json.loads(obs["input"]))}
+            elif obs["event"] == "tool_complete":
+                obs = {**obs, **describe_output(obs["output"], len(obs["output"]))}
+            enriched.append(obs)
+
+        expected = DetectionPipeline(legacy).detect_all()
+        actual = DetectionPipeline(enriched).detect_all()
+
+        assert expected
+        assert signature(actual) == signature(expected)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_carry_over_matches_single_window(self, seed: int):
+        """Resuming from a checkpoint's carry-over should match one window over the log."""
+        from instincts.patterns import DetectionPipeline
+
+        log = random_log(seed)
+        cut = random.Random(seed).randrange(1, len(log))
+        earlier = DetectionPipeline(log[:cut])
+        resumed = DetectionPipeline(log[cut:], earlier.carry_over())
+
+        def totals(patterns) -> Counter:
+            counts: Counter = Counter()
+            for p in patterns:
+                metadata = dict(p.metadata)
+                key = tuple(metadata.get(field) for field in ("file_path", "tool", "error_type"))
+                counts[(p.trigger, key)] += p.occurrences
+            return counts
+
+        detectors = ["user_corrections", "error_resolutions"]
+        whole = DetectionPipeline(log).detect_all(detectors)
+        split = totals(earlier.detect_all(detectors)) + totals(resumed.detect_all(detectors))
+
+        assert whole
+        assert split == totals(whole)
+
+    def test_sorts_sessions_by_timestamp(self):
+        """Rows out of order within a session should be detected in time order."""
+        from instincts.patterns import DetectionPipeline
+
+        log = [
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/a.py"}', "session": "s", "timestamp": "2026-02-09T10:02:00Z"},
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/a.py"}', "session": "s", "timestamp": "2026-02-09T10:01:00Z"},
+        ]
+
+        patterns = DetectionPipeline(log).detect_user_corrections()
+
+        assert [dict(p.metadata)["file_path"] for p in patterns] == ["/a.py"]
+
+    def test_empty_input_has_no_patterns(self):
+        """No observations should yield no patterns and no carry-over."""
+        from instincts.patterns import DetectionPipeline
+
+        pipeline = DetectionPipeline([])
+
+        assert pipeline.detect_all() == []
+        assert pipeline.carry_over() == {}
+
@@ -0,0 +1,199 @@
+"""Tests for instincts.blobs module.
+
+Tests cover:
+- Write-once, content-addressed blobs and reference validation
+- The observer moving large fields to the store when enabled
+- Detectors reading blob-stored error output back lazily
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+
+def create_project(tmp_path: Path) -> tuple[Path, Path]:
+    """Create a project root; returns (project_root, observations_file)."""
+    project_root = tmp_path / "project"
+    instincts_dir = project_root / "docs" / "instincts"
+    instincts_dir.mkdir(parents=True)
+    return project_root, instincts_dir / "observations.jsonl"
+
+
+class TestBlobStore:
+    """Tests for BlobStore."""
+
+    def test_put_and_get_round_trip(self, tmp_path: Path):
+        """A stored blob should read back under its SHA-256 reference."""
+        import hashlib
+
+        from instincts.blobs import BlobStore
+
+        store = BlobStore(tmp_path / "blobs")
+        text = "Traceback: ✓ \ud800" * 100
+
+        ref = store.put(text)
+
+        assert ref == hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        assert store.path(ref) == tmp_path / "blobs" / ref[:2] / ref[2:]
+        assert BlobStore(tmp_path / "blobs").get(ref) == text
+
+    def test_identical_content_is_written_once(self, tmp_path: Path):
+        """Putting the same text again should not rewrite the blob."""
+        from instincts.blobs import BlobStore
+
+        store = BlobStore(tmp_path / "blobs")
+        ref = store.put("same output")
+        mtime = store.path(ref).stat().st_mtime_ns
+
+        assert store.put("same output") == ref
+        assert store.path(ref).stat().st_mtime_ns == mtime
+        assert [p.name for p in store.path(ref).parent.iterdir()] == [ref[2:]]
+
+    def test_get_missing_or_invalid_ref(self, tmp_path: Path):
+        """Missing blobs and malformed references should read as None."""
+        from instincts.blobs import BlobStore
+
+        store = BlobStore(tmp_path / "blobs")
+
+        assert store.get("0" * 64) is None
+        assert store.get("../../etc/passwd") is None
+        with pytest.raises(ValueError):
+            store.path("ABC")
+
+    def test_get_is_memoized(self, tmp_path: Path):
+        """A blob should be read from disk once per store."""
+        from instincts.blobs import BlobStore
+
+        store = BlobStore(tmp_path / "blobs")
+        ref = store.put("error output")
+        assert store.get(ref) == "error output"
+
+        store.path(ref).unlink()
+
+        assert store.get(ref) == "error output"
+
+    def test_enabled_by_environment(self, monkeypatch: pytest.MonkeyPatch):
+        """The store should be enabled only when the variable is set and not 0."""
+        from instincts.blobs import blob_store_enabled
+        from instincts.config import BLOB_STORE_ENV
+
+        monkeypatch.delenv(BLOB_STORE_ENV, raising=False)
+        assert not blob_store_enabled()
+        monkeypatch.setenv(BLOB_STORE_ENV, "0")
+        assert not blob_store_enabled()
+        monkeypatch.setenv(BLOB_STORE_ENV, "1")
+        assert blob_store_enabled()
+
+
+class TestObserverBlobs:
+    """Tests for the observer writing large fields to the store."""
+
+    def test_large_output_stored_once_by_reference(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Repeated large outputs should share one blob; lines keep only the reference."""
+        from instincts.blobs import BlobStore
+        from instincts.config import BLOB_MIN_LENGTH, BLOB_STORE_ENV, get_blobs_dir
+        from instincts.observer import observe_post
+
+        monkeypatch.setenv(BLOB_STORE_ENV, "1")
+        project_root, observations_file = create_project(tmp_path)
+        output = "FAILED tests/test_a.py::test_x - AssertionError\n" * (BLOB_MIN_LENGTH // 10)
+
+        for _ in range(3):
+            observe_post({"tool_name": "Bash", "tool_output": output, "session_id": "s1"}, project_root)
+        observe_post({"tool_name": "Bash", "tool_output": "ok", "session_id": "s1"}, project_root)
+
+        lines = [json.loads(line) for line in observations_file.read_text().splitlines()]
+        assert all("output" not in obs for obs in lines[:3])
+        assert len({obs["output_ref"] for obs in lines[:3]}) == 1
+        assert lines[0]["output_length"] == len(output)
+        assert lines[3]["output"] == "ok"
+        assert "output_ref" not in lines[3]
+        assert BlobStore(get_blobs_dir(project_root)).get(lines[0]["output_ref"]) == output[:5000]
+        assert len(list(get_blobs_dir(project_root).rglob("*"))) == 2
+
+    def test_disabled_store_keeps_fields_inline(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Without the variable, large fields should stay in the log."""
+        from instincts.config import BLOB_STORE_ENV, get_blobs_dir
+        from instincts.observer import observe_pre
+
+        monkeypatch.delenv(BLOB_STORE_ENV, raising=False)
+        project_root, observations_file = create_project(tmp_path)
+
+        observe_pre({"tool_name": "Write", "tool_input": {"content": "x" * 4000}, "session_id": "s1"}, project_root)
+
+        obs = json.loads(observations_file.read_text())
+        assert "input_ref" not in obs
+        assert len(obs["input"]) == 4000 + len('{"content": ""}')
+        assert not get_blobs_dir(project_root).exists()
+
+    def test_unwritable_store_falls_back_inline(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """A blob that cannot be written should be kept inline."""
+        from instincts.config import BLOB_STORE_ENV, get_blobs_dir
+        from instincts.observer import observe_post
+
+        monkeypatch.setenv(BLOB_STORE_ENV, "1")
+        project_root, observations_file = create_project(tmp_path)
+        get_blobs_dir(project_root).write_text("not a directory")
+
+        observe_post({"tool_name": "Bash", "tool_output": "y" * 2000, "session_id": "s1"}, project_root)
+
+        assert json.loads(observations_file.read_text())["output"] == "y" * 2000
+
+
+class TestResolveBlobFields:
+    """Tests for reading blob-stored fields back for the detectors."""
+
+    def test_resolves_only_needed_fields(self, tmp_path: Path):
+        """Error outputs should be read back; superseded fields should not."""
+        from instincts.blobs import BlobStore
+        from instincts.patterns import resolve_blob_fields
+
+        store = BlobStore(tmp_path / "blobs")
+        error_ref = store.put("TypeError: boom")
+        ok_ref = store.put("all passed")
+        input_ref = store.put('{"file_path": "/a.py"}')
+        observations = [
+            {"event": "tool_complete", "is_error": True, "output_ref": error_ref},
+            {"event": "tool_complete", "is_error": False, "output_ref": ok_ref},
+            {"event": "tool_start", "file_path": "/a.py", "input_ref": input_ref},
+            {"event": "tool_complete", "output_ref": "0" * 64},
+        ]
+
+        resolved = list(resolve_blob_fields(observations, store))
+
+        assert resolved[0]["output"] == "TypeError: boom"
+        assert "output" not in resolved[1]
+        assert "input" not in resolved[2]
+        assert "output" not in resolved[3]
+
+    def test_skips_fields_outside_projection(self, tmp_path: Path):
+        """Fields the caller does not read should not be resolved."""
+        from instincts.blobs import BlobStore
+        from instincts.patterns import resolve_blob_fields
+
+        store = BlobStore(tmp_path / "blobs")
+        obs = {"event": "tool_complete", "is_error": True, "output_ref": store.put("Error")}
+
+        assert "output" not in next(resolve_blob_fields([obs], store, fields={"event"}))
+
+    def test_detection_matches_inline_log(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """detect_all_patterns should find the same patterns with the store on or off."""
+        from instincts.config import BLOB_STORE_ENV
+        from instincts.observer import observe_post
+        from instincts.patterns import detect_all_patterns
+
+        error = "ImportError: cannot import name 'x'\n" + "context line\n" * 200
+        results = []
+        for enabled in ("0", "1"):
+            monkeypatch.setenv(BLOB_STORE_ENV, enabled)
+            project_root, observations_file = create_project(tmp_path / enabled)
+            for session in ("s1", "s2", "s3"):
+                observe_post({"tool_name": "Bash", "tool_output": error, "session_id": session}, project_root)
+                observe_post({"tool_name": "Bash", "tool_output": "ok", "session_id": session}, project_root)
+            patterns = detect_all_patterns(observations_file, detectors=["error_resolutions"])
+            results.append([(p.trigger, dict(p.metadata)) for p in patterns])
+
+        assert results[0] == results[1]
+        assert results[1][0][1]["error_type"] == "ImportError"
+        assert results[1][0][1]["error_output"].startswith("ImportError")
@@ -6,6 +6,7 @@ Tests cover:
 - AC-6.3: Confidence decrease on contradicting observation
 - AC-6.4: Confidence decay over time without observations
 - AC-6.5: Dormant threshold at 0.2
+- Effective confidence decayed at read time from a stored anchor
 - EC-5: Confidence clamping to [0.1, 0.95] range
 """
 
@@ -267,6 +268,66 @@ class TestApplyDecayToInstinct:
         assert original.confidence == 0.7  # Unchanged
 
 
+class TestEffectiveConfidence:
+    """Tests for read-time decay (effective_confidence, effective_status)."""
+
+    def make_instinct(self, confidence: float, anchor: datetime, last_observed: bool = True):
+        from instincts.models import Instinct
+
+        return Instinct(
+            id="test",
+            trigger="test",
+            confidence=confidence,
+            domain="general",
+            source="test",
+            evidence_count=5,
+            created_at=anchor,
+            updated_at=anchor,
+            content="test",
+            last_observed=anchor if last_observed else None,
+        )
+
+    def test_decays_from_anchor_to_as_of(self):
+        """Effective confidence should decay from the anchor to the given time."""
+        from instincts.confidence import effective_confidence
+
+        anchor = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        instinct = self.make_instinct(0.7, anchor)
+
+        assert effective_confidence(instinct, anchor + timedelta(days=6)) == 0.7
+        assert effective_confidence(instinct, anchor + timedelta(weeks=3)) == pytest.approx(0.64)
+        assert effective_confidence(instinct, anchor + timedelta(weeks=100)) == 0.1
+
+    def test_anchor_falls_back_to_updated_at(self):
+        """Without last_observed, decay should run from updated_at."""
+        from instincts.confidence import decay_anchor
+
+        anchor = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        assert decay_anchor(self.make_instinct(0.7, anchor, last_observed=False)) == anchor
+
+    def test_evaluating_does_not_compound(self):
+        """Evaluating repeatedly at the same time should give the same value."""
+        from instincts.confidence import effective_confidence
+
+        anchor = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        instinct = self.make_instinct(0.7, anchor)
+        as_of = anchor + timedelta(weeks=5)
+
+        assert effective_confidence(instinct, as_of) == effective_confidence(instinct, as_of)
+        assert instinct.confidence == 0.7
+
+    def test_effective_status(self):
+        """Status should follow the effective confidence across the dormant threshold."""
+        from instincts.confidence import effective_status
+
+        anchor = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        instinct = self.make_instinct(0.3, anchor)
+
+        assert effective_status(instinct, anchor + timedelta(weeks=4)) == "active"
+        assert effective_status(instinct, anchor + timedelta(weeks=6)) == "dormant"
+
+
 class TestDormantThreshold:
     """Tests for dormant threshold behavior (AC-6.5)."""
 
@@ -0,0 +1,339 @@
+"""Tests for instincts.confidence_ledger module.
+
+Tests cover:
+- Ledger entries: serialization, appends and malformed lines
+- Recording confirmations and contradictions for a project
+- Applying entries: decay anchor, deltas and evidence counts
+- Folding: when it is due, one write per instinct, interrupted folds
+"""
+
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+ANCHOR = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_instinct(instinct_id: str = "test", confidence: float = 0.7):
+    from instincts.models import Instinct
+
+    return Instinct(
+        id=instinct_id,
+        trigger=f"when {instinct_id}",
+        confidence=confidence,
+        domain="testing",
+        source="test",
+        evidence_count=3,
+        created_at=ANCHOR,
+        updated_at=ANCHOR,
+        content=f"# {instinct_id}\n\nBody.",
+        last_observed=ANCHOR,
+    )
+
+
+def make_entry(instinct_id: str = "test", delta: float = 0.05, weeks: float = 0, count: int = 1):
+    from instincts.confidence_ledger import LedgerEntry
+
+    return LedgerEntry(
+        instinct_id=instinct_id,
+        delta=delta,
+        evidence="repeated_workflow:s1",
+        timestamp=ANCHOR + timedelta(weeks=weeks),
+        evidence_count=count,
+    )
+
+
+class CountingStore:
+    """In-memory instinct store recording its writes."""
+
+    def __init__(self, *instincts) -> None:
+        self.instincts = {inst.id: inst for inst in instincts}
+        self.writes: list[str] = []
+        self.fail_writes = False
+
+    def load_instincts(self, with_content: bool = False):
+        return list(self.instincts.values())
+
+    def get_instinct(self, instinct_id: str):
+        return self.instincts.get(instinct_id)
+
+    def write_instinct(self, instinct) -> None:
+        if self.fail_writes:
+            raise OSError("disk full")
+        self.writes.append(instinct.id)
+        self.instincts[instinct.id] = instinct
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def ledger_file(tmp_path: Path) -> Path:
+    return tmp_path / "docs" / "instincts" / "confidence-ledger.jsonl"
+
+
+class TestLedgerEntries:
+    """Tests for appending and reading entries."""
+
+    def test_round_trip(self, ledger_file: Path):
+        """Appended entries should read back in order."""
+        from instincts.confidence_ledger import append_entries, read_entries
+
+        entries = [make_entry("a"), make_entry("b", delta=-0.1, weeks=1, count=0)]
+
+        before = datetime.now(timezone.utc)
+        assert append_entries(ledger_file, entries) == 2
+        assert append_entries(ledger_file, []) == 0
+        read = read_entries(ledger_file)
+
+        assert [replace(entry, recorded_at=None) for entry in read] == entries
+        assert all(entry.recorded_at and entry.recorded_at >= before for entry in read)
+
+    def test_malformed_lines_are_skipped(self, ledger_file: Path):
+        """Lines that are not complete entries should be ignored."""
+        from instincts.confidence_ledger import append_entries, read_entries
+
+        append_entries(ledger_file, [make_entry("a")])
+        with ledger_file.open("a") as f:
+            f.write('{"instinct_id": "b"}\n{not json\n')
+            f.write('{"instinct_id": "c", "delta": 0.05, "timestamp": "2026-01-01T00:00:00"}\n')
+
+        entries = read_entries(ledger_file)
+
+        assert [e.instinct_id for e in entries] == ["a", "c"]
+        assert entries[1].timestamp == ANCHOR
+        assert read_entries(ledger_file.with_name("missing.jsonl")) == []
+
+    def test_record_confirmation_and_contradiction(self, tmp_path: Path):
+        """Project-level records should use the configured deltas and ledger."""
+        from instincts.confidence import CONFIRM_DELTA, CONTRADICT_DELTA
+        from instincts.confidence_ledger import (
+            read_entries,
+            record_confirmation,
+            record_contradiction,
+        )
+        from instincts.config import get_confidence_ledger_file
+
+        record_confirmation(tmp_path, "a", "seen again", timestamp=ANCHOR, evidence_count=4)
+        record_contradiction(tmp_path, "a", "user undid it")
+
+        confirmed, contradicted = read_entries(get_confidence_ledger_file(tmp_path))
+        assert (confirmed.delta, confirmed.evidence_count, confirmed.timestamp) == (
+            CONFIRM_DELTA,
+            4,
+            ANCHOR,
+        )
+        assert (contradicted.delta, contradicted.evidence_count) == (CONTRADICT_DELTA, 0)
+        assert contradicted.evidence == "user undid it"
+
+
+class TestApplyEntries:
+    """Tests for applying entries to one instinct."""
+
+    def test_newer_confirmation_folds_decay_and_moves_anchor(self):
+        """Decay up to the new evidence should be kept, and restart from it."""
+        from instincts.confidence_ledger import apply_entries
+
+        applied = apply_entries(make_instinct(), [make_entry(weeks=5, count=2)])
+
+        assert applied.confidence == pytest.approx(0.65)
+        assert applied.last_observed == ANCHOR + timedelta(weeks=5)
+        assert applied.evidence_count == 5
+
+    def test_older_confirmation_keeps_anchor(self):
+        """Evidence older than the anchor should only add its delta."""
+        from instincts.confidence_ledger import apply_entries
+
+        instinct = replace(make_instinct(), last_observed=None)
+
+        applied = apply_entries(instinct, [make_entry(weeks=-5)])
+
+        assert applied.confidence == pytest.approx(0.75)
+        assert applied.last_observed == ANCHOR
+
+    def test_contradiction_keeps_anchor(self):
+        """A contradiction should lower the confidence without restarting decay."""
+        from instincts.confidence import effective_confidence
+        from instincts.confidence_ledger import apply_entries
+
+        as_of = ANCHOR + timedelta(weeks=6)
+        instinct = make_instinct()
+
+        applied = apply_entries(instinct, [make_entry(delta=-0.1, weeks=5, count=0)])
+
+        assert applied.last_observed == ANCHOR
+        assert effective_confidence(applied, as_of) == pytest.approx(
+            effective_confidence(instinct, as_of) - 0.1
+        )
+
+    def test_deltas_are_clamped(self):
+        """Confidence should stay within its bounds."""
+        from instincts.confidence import MAX_CONFIDENCE, MIN_CONFIDENCE
+        from instincts.confidence_ledger import apply_entries
+
+        confirmed = apply_entries(make_instinct(confidence=0.9), [make_entry()] * 3)
+        contradicted = apply_entries(make_instinct(confidence=0.2), [make_entry(delta=-0.1)] * 3)
+
+        assert confirmed.confidence == MAX_CONFIDENCE
+        assert contradicted.confidence == MIN_CONFIDENCE
+
+
+class TestFoldLedger:
+    """Tests for folding the ledger into a store."""
+
+    def test_not_due_leaves_ledger(self, ledger_file: Path):
+        """A few recent entries should wait for a later fold."""
+        from instincts.confidence_ledger import append_entries, fold_ledger
+
+        store = CountingStore(make_instinct())
+        append_entries(ledger_file, [make_entry(weeks=1)])
+
+        assert fold_ledger(ledger_file, store, as_of=ANCHOR + timedelta(weeks=1)) == []
+        assert store.writes == []
+        assert ledger_file.exists()
+
+    def test_due_by_count_or_age(self, ledger_file: Path, monkeypatch: pytest.MonkeyPatch):
+        """Enough entries, or one appended long enough ago, should trigger the fold."""
+        import instincts.confidence_ledger
+        from instincts.confidence_ledger import append_entries, fold_ledger
+
+        store = CountingStore(make_instinct())
+        monkeypatch.setattr(instincts.confidence_ledger, "LEDGER_FOLD_MIN_ENTRIES", 2)
+        append_entries(ledger_file, [make_entry(weeks=1), make_entry(weeks=1)])
+        assert len(fold_ledger(ledger_file, store, as_of=ANCHOR + timedelta(weeks=1))) == 1
+
+        append_entries(ledger_file, [make_entry(weeks=1)])
+        now = datetime.now(timezone.utc)
+        assert fold_ledger(ledger_file, store, as_of=now) == []
+        assert len(fold_ledger(ledger_file, store, as_of=now + timedelta(days=2))) == 1
+        assert store.writes == ["test", "test"]
+
+    def test_age_falls_back_to_evidence_time(self, ledger_file: Path):
+        """Entries appended without recorded_at should be aged by their evidence."""
+        from instincts.confidence_ledger import fold_ledger
+
+        store = CountingStore(make_instinct())
+        ledger_file.parent.mkdir(parents=True)
+        ledger_file.write_text(json.dumps(make_entry().to_dict()) + "\n")
+
+        assert len(fold_ledger(ledger_file, store, as_of=ANCHOR + timedelta(days=2))) == 1
+
+    def test_each_instinct_written_once(self, ledger_file: Path):
+        """All entries of an instinct should be applied in a single write."""
+        from instincts.confidence_ledger import (
+            append_entries,
+            fold_ledger,
+            get_journal_path,
+        )
+
+        store = CountingStore(make_instinct("a"), make_instinct("b", confidence=0.5))
+        as_of = ANCHOR + timedelta(weeks=1)
+        append_entries(
+            ledger_file,
+            [make_entry("a"), make_entry("b", delta=-0.1, count=0), make_entry("a"), make_entry("gone")],
+        )
+
+        written = {inst.id: inst for inst in fold_ledger(ledger_file, store, as_of=as_of, force=True)}
+
+        assert sorted(store.writes) == ["a", "b"]
+        assert written["a"].confidence == pytest.approx(0.8)
+        assert written["a"].evidence_count == 5
+        assert written["a"].updated_at == as_of
+        assert written["a"].content == "# a\n\nBody."
+        assert written["b"].confidence == pytest.approx(0.4)
+        assert not ledger_file.exists()
+        assert not get_journal_path(ledger_file).exists()
+        assert fold_ledger(ledger_file, store, force=True) == []
+
+    def test_mixed_entries_fold_in_evidence_order(self, tmp_path: Path):
+        """Confirmations and contradictions recorded out of order should apply by evidence time."""
+        from instincts.confidence import decayed_confidence
+        from instincts.confidence_ledger import (
+            fold_ledger,
+            record_confirmation,
+            record_contradiction,
+        )
+        from instincts.config import get_confidence_ledger_file
+
+        store = CountingStore(make_instinct())
+        week = timedelta(weeks=1)
+        record_contradiction(tmp_path, "test", "undone", timestamp=ANCHOR + 3 * week)
+        record_confirmation(
+            tmp_path, "test", "seen again", timestamp=ANCHOR + 2 * week, evidence_count=2
+        )
+        record_contradiction(tmp_path, "test", "undone", timestamp=ANCHOR + week)
+
+        [written] = fold_ledger(
+            get_confidence_ledger_file(tmp_path), store, as_of=ANCHOR + 4 * week, force=True
+        )
+
+        # -0.1 at the old anchor, decay to the confirmation, +0.05, then -0.1
+        expected = decayed_confidence(0.6, ANCHOR, ANCHOR + 2 * week) + 0.05 - 0.1
+        assert written.confidence == pytest.approx(expected)
+        assert written.last_observed == ANCHOR + 2 * week
+        assert written.evidence_count == 5
+        assert store.writes == ["test"]
+
+    def test_fold_updates_status(self, ledger_file: Path):
+        """Contradictions pushing an instinct below the threshold should make it dormant."""
+        from instincts.confidence_ledger import append_entries, fold_ledger
+
+        store = CountingStore(make_instinct(confidence=0.25))
+        append_entries(ledger_file, [make_entry(delta=-0.1, count=0)])
+
+        [written] = fold_ledger(ledger_file, store, as_of=ANCHOR, force=True)
+
+        assert written.status == "dormant"
+
+    def test_interrupted_fold_is_finished_once(self, ledger_file: Path):
+        """A fold failing after its journal should be completed, not repeated."""
+        from instincts.confidence_ledger import (
+            append_entries,
+            fold_ledger,
+            get_folding_path,
+            get_journal_path,
+        )
+
+        store = CountingStore(make_instinct())
+        append_entries(ledger_file, [make_entry()])
+        store.fail_writes = True
+        with pytest.raises(OSError):
+            fold_ledger(ledger_file, store, as_of=ANCHOR, force=True)
+        assert get_journal_path(ledger_file).exists()
+        assert get_folding_path(ledger_file).exists()
+
+        store.fail_writes = False
+        append_entries(ledger_file, [make_entry(weeks=1)])
+        [written] = fold_ledger(ledger_file, store, as_of=ANCHOR + timedelta(weeks=1))
+
+        assert written.confidence == pytest.approx(0.75)
+        assert not get_journal_path(ledger_file).exists()
+        assert not get_folding_path(ledger_file).exists()
+        assert ledger_file.exists()
+
+    def test_folding_file_without_journal_is_folded(self, ledger_file: Path):
+        """Entries left by a fold interrupted before its journal should be folded first."""
+        from instincts.confidence_ledger import (
+            append_entries,
+            fold_ledger,
+            get_folding_path,
+        )
+
+        store = CountingStore(make_instinct())
+        append_entries(get_folding_path(ledger_file), [make_entry()])
+        append_entries(ledger_file, [make_entry(weeks=1)])
+
+        [written] = fold_ledger(ledger_file, store, as_of=ANCHOR + timedelta(weeks=1))
+
+        assert written.confidence == pytest.approx(0.75)
+        assert not get_folding_path(ledger_file).exists()
+        assert ledger_file.exists()
+
+    def test_missing_directory(self, tmp_path: Path):
+        """Projects without an instincts directory should have nothing to fold."""
+        from instincts.confidence_ledger import fold_ledger
+
+        assert fold_ledger(tmp_path / "none" / "ledger.jsonl", CountingStore(), force=True) == []
@@ -0,0 +1,225 @@
+"""Tests for instincts.daemon and instincts.hook_client modules.
+
+Tests cover:
+- Forwarding hook payloads to a running daemon
+- Handle reuse across requests for the same project
+- In-process fallback when the daemon is not running
+- Idle-timeout and shutdown handling
+"""
+
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    """Short socket path (AF_UNIX paths are limited to ~100 bytes)."""
+    socket_dir = tempfile.mkdtemp(prefix="inst-", dir="/tmp")
+    yield str(Path(socket_dir) / "observer.sock")
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def create_project(tmp_path: Path) -> tuple[Path, Path]:
+    """Create a project with a .git marker.
+
+    Returns:
+        Tuple of (project_root, observations_file)
+    """
+    project_root = tmp_path / "project"
+    (project_root / ".git").mkdir(parents=True)
+    return project_root, project_root / "docs" / "instincts" / "observations.jsonl"
+
+
+def start_daemon_thread(socket_path: str, idle_timeout: float = 30.0):
+    """Start an ObserverDaemon in a background thread and wait until ready."""
+    from instincts.daemon import ObserverDaemon, is_daemon_running
+
+    daemon = ObserverDaemon(socket_path, idle_timeout=idle_timeout, poll_interval=0.05)
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while not is_daemon_running(socket_path):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    return daemon, thread
+
+
+def wait_for_lines(path: Path, count: int) -> list[str]:
+    """Wait until the file contains at least count lines."""
+    deadline = time.monotonic() + 5
+    while True:
+        if path.exists():
+            lines = path.read_text().splitlines()
+            if len(lines) >= count:
+                return lines
+        assert time.monotonic() < deadline, f"expected {count} lines in {path}"
+        time.sleep(0.01)
+
+
+class TestDaemonForwarding:
+    """Tests for hook forwarding through the daemon."""
+
+    def test_forwarded_hooks_are_written(self, tmp_path: Path, socket_path: str):
+        """Hooks sent by the client should be recorded by the daemon."""
+        from instincts.daemon import stop_daemon
+        from instincts.hook_client import forward_to_daemon
+
+        project_root, observations_file = create_project(tmp_path)
+        _, thread = start_daemon_thread(socket_path)
+
+        pre = {"tool_name": "Read", "tool_input": {"file_path": "a.py"}, "session_id": "s1"}
+        post = {"tool_name": "Read", "tool_output": "contents", "session_id": "s1"}
+        assert forward_to_daemon("pre", json.dumps(pre).encode(), str(project_root), socket_path)
+        assert forward_to_daemon("post", json.dumps(post).encode(), str(project_root), socket_path)
+
+        lines = wait_for_lines(observations_file, 2)
+        events = [json.loads(line) for line in lines]
+        assert [e["event"] for e in events] == ["tool_start", "tool_complete"]
+        assert events[0]["tool"] == "Read"
+
+        assert stop_daemon(socket_path)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    def test_subdirectory_cwd_resolves_to_project_root(self, tmp_path: Path, socket_path: str):
+        """The daemon should detect the project root from the hook's cwd."""
+        from instincts.daemon import stop_daemon
+        from instincts.hook_client import forward_to_daemon
+
+        project_root, observations_file = create_project(tmp_path)
+        subdir = project_root / "src" / "pkg"
+        subdir.mkdir(parents=True)
+        _, thread = start_daemon_thread(socket_path)
+
+        forward_to_daemon("pre", b'{"tool_name": "Bash", "session_id": "s1"}', str(subdir), socket_path)
+
+        wait_for_lines(observations_file, 1)
+        stop_daemon(socket_path)
+        thread.join(timeout=5)
+
+    def test_invalid_payload_does_not_stop_daemon(self, tmp_path: Path, socket_path: str):
+        """Malformed requests should be discarded without stopping the daemon."""
+        from instincts.daemon import is_daemon_running, stop_daemon
+        from instincts.hook_client import forward_to_daemon
+
+        project_root, observations_file = create_project(tmp_path)
+        _, thread = start_daemon_thread(socket_path)
+
+        forward_to_daemon("pre", b"not json", str(project_root), socket_path)
+        forward_to_daemon("bogus", b"{}", str(project_root), socket_path)
+        forward_to_daemon("pre", b'{"tool_name": "Grep", "session_id": "s1"}', str(project_root), socket_path)
+
+        lines = wait_for_lines(observations_file, 1)
+        assert len(lines) == 1
+        assert is_daemon_running(socket_path)
+
+        stop_daemon(socket_path)
+        thread.join(timeout=5)
+
+
+class TestObservationHandles:
+    """Tests for the observer handle cache used by the daemon."""
+
+    def test_reuses_handle_for_same_file(self, tmp_path: Path):
+        """Should return the same open handle for repeated writes."""
+        from instincts.observation_log import ObservationHandles
+
+        observations_file = tmp_path / "observations.jsonl"
+        handles = ObservationHandles()
+
+        first = handles.get(observations_file)
+        second = handles.get(observations_file)
+
+        assert first is second
+        handles.close_all()
+
+    def test_reopens_after_file_replaced(self, tmp_path: Path):
+        """Should reopen when the file was renamed away (e.g. archived)."""
+        from instincts.observation_log import ObservationHandles, append_observation
+
+        observations_file = tmp_path / "observations.jsonl"
+        handles = ObservationHandles()
+
+        append_observation({"n": 1}, observations_file, handles)
+        observations_file.rename(tmp_path / "archived.jsonl")
+        append_observation({"n": 2}, observations_file, handles)
+
+        assert json.loads(observations_file.read_text()) == {"n": 2}
+        handles.close_all()
+
+
+class TestDaemonLifecycle:
+    """Tests for idle shutdown and status checks."""
+
+    def test_shuts_down_after_idle_timeout(self, socket_path: str):
+        """Daemon should exit and remove its socket after the idle timeout."""
+        _, thread = start_daemon_thread(socket_path, idle_timeout=0.2)
+
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert not Path(socket_path).exists()
+
+    def test_is_daemon_running_false_without_daemon(self, socket_path: str):
+        """Should report not running when nothing listens on the socket."""
+        from instincts.daemon import is_daemon_running
+
+        assert is_daemon_running(socket_path) is False
+
+    def test_replaces_stale_socket_file(self, socket_path: str):
+        """A leftover socket file from a dead daemon should not block startup."""
+        from instincts.daemon import stop_daemon
+
+        Path(socket_path).touch()
+        _, thread = start_daemon_thread(socket_path)
+
+        stop_daemon(socket_path)
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+class TestHookClientFallback:
+    """Tests for the in-process fallback path."""
+
+    def test_falls_back_to_in_process_when_daemon_absent(
+        self, tmp_path: Path, socket_path: str, monkeypatch
+    ):
+        """Client should write the observation itself when no daemon listens."""
+        from instincts.hook_client import DAEMON_SOCKET_ENV, main
+
+        project_root, observations_file = create_project(tmp_path)
+        monkeypatch.setenv(DAEMON_SOCKET_ENV, socket_path)
+        monkeypatch.chdir(project_root)
+        payload = json.dumps({"tool_name": "Write", "session_id": "s1"}).encode()
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(payload)))
+
+        exit_code = main(["pre"])
+
+        assert exit_code == 0
+        event = json.loads(observations_file.read_text())
+        assert event["event"] == "tool_start"
+        assert event["tool"] == "Write"
+
+    def test_rejects_unknown_event(self, capsys):
+        """Client should print usage for unknown events."""
+        from instincts.hook_client import main
+
+        assert main(["during"]) == 2
+        assert "usage" in capsys.readouterr().err
+
+    def test_socket_path_honours_override(self, monkeypatch):
+        """INSTINCT_DAEMON_SOCKET should override the default socket path."""
+        from instincts.hook_client import DAEMON_SOCKET_ENV, get_socket_path
+
+        monkeypatch.setenv(DAEMON_SOCKET_ENV, "/tmp/custom.sock")
+
+        assert get_socket_path() == "/tmp/custom.sock"
@@ -0,0 +1,88 @@
+"""Tests for instincts.enrichment module.
+
+Tests cover:
+- File path and Bash command head extraction from tool input
+- Error detection and error type extraction from tool output
+- Enriched keys for tool_start and tool_complete observations
+"""
+
+
+class TestExtractFilePath:
+    """Tests for extract_file_path."""
+
+    def test_reads_dict_and_json_string(self):
+        """Hook dicts and logged JSON strings should both yield the path."""
+        from instincts.enrichment import extract_file_path
+
+        assert extract_file_path({"file_path": "/a.py"}) == "/a.py"
+        assert extract_file_path('{"file_path": "/a.py"}') == "/a.py"
+
+    def test_returns_none_without_path(self):
+        """Inputs without a string file_path should yield None."""
+        from instincts.enrichment import extract_file_path
+
+        assert extract_file_path({"command": "ls"}) is None
+        assert extract_file_path({"file_path": 3}) is None
+        assert extract_file_path("not json") is None
+        assert extract_file_path("[1, 2]") is None
+
+
+class TestExtractCommandHead:
+    """Tests for extract_command_head."""
+
+    def test_keeps_first_line_capped(self):
+        """Only the first line of the command should be kept, capped in length."""
+        from instincts.enrichment import COMMAND_HEAD_LENGTH, extract_command_head
+
+        assert extract_command_head({"command": "  git status\ngit diff"}) == "git status"
+        assert len(extract_command_head({"command": "x" * 1000}) or "") == COMMAND_HEAD_LENGTH
+
+    def test_returns_none_without_command(self):
+        """Inputs without a string command should yield None."""
+        from instincts.enrichment import extract_command_head
+
+        assert extract_command_head({}) is None
+        assert extract_command_head("ls") is None
+
+
+class TestDescribeOutput:
+    """Tests for the enriched keys of tool_complete observations."""
+
+    def test_error_output(self):
+        """Errors should be flagged with their type."""
+        from instincts.enrichment import describe_output
+
+        assert describe_output("TypeError: bad operand", 5000) == {
+            "is_error": True,
+            "error_type": "TypeError",
+            "output_length": 5000,
+        }
+
+    def test_error_keyword_without_type(self):
+        """An error keyword without an exception name should be the type."""
+        from instincts.enrichment import describe_output
+
+        assert describe_output("Build FAILED", 12)["error_type"] == "failed"
+
+    def test_successful_output(self):
+        """Successful output should not be flagged."""
+        from instincts.enrichment import describe_output
+
+        assert describe_output("all good", 8) == {"is_error": False, "error_type": None, "output_length": 8}
+
+
+class TestDescribeInput:
+    """Tests for the enriched keys of tool_start observations."""
+
+    def test_file_path_always_present(self):
+        """file_path should mark every enriched tool_start, even without a path."""
+        from instincts.enrichment import describe_input
+
+        assert describe_input("Read", {"file_path": "/a.py"}) == {"file_path": "/a.py"}
+        assert describe_input("Grep", {"pattern": "x"}) == {"file_path": None}
+
+    def test_bash_command_head(self):
+        """Bash observations should also record the command head."""
+        from instincts.enrichment import describe_input
+
+        assert describe_input("Bash", {"command": "make test"}) == {"file_path": None, "command": "make test"}
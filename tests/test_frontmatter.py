@@ -0,0 +1,242 @@
+"""Tests for instincts.frontmatter module.
+
+Tests cover:
+- The shared key/value line parser
+- Agent-written single-instinct files and frontmatter-only reads
+- Multi-section instinct collections
+- CLI listings through the instinct index shared with the agent
+"""
+
+from pathlib import Path
+
+import pytest
+
+MULTI_SECTION = """---
+id: first
+trigger: "when first"
+confidence: 0.8
+domain: testing
+---
+First body.
+---
+id: second
+trigger: "when second"
+confidence: 0.6
+domain: testing
+---
+Second body.
+"""
+
+
+@pytest.fixture
+def learned_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "docs" / "instincts" / "learned"
+    directory.mkdir(parents=True)
+    return directory
+
+
+@pytest.fixture
+def count_parses(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record every section parse done to index an instinct file."""
+    import instincts.instinct_files
+
+    parsed: list[str] = []
+    parse = instincts.instinct_files.parse_instinct_sections
+
+    def counting_parse(content: str):
+        sections = parse(content)
+        parsed.extend(section["id"] for section in sections)
+        return sections
+
+    monkeypatch.setattr(instincts.instinct_files, "parse_instinct_sections", counting_parse)
+    return parsed
+
+
+class TestParsers:
+    """Tests for parsing file content."""
+
+    def test_parse_frontmatter_unquotes_values(self):
+        """Values should be stripped of whitespace and quotes."""
+        from instincts.frontmatter import parse_frontmatter
+
+        data = parse_frontmatter("id: \"a\"\ntrigger: 'when: x'\nno colon here\n")
+
+        assert data == {"id": "a", "trigger": "when: x"}
+
+    def test_parse_instinct_keeps_delimiters_inside_values(self):
+        """Only whole "---" lines should delimit the frontmatter."""
+        from instincts.frontmatter import parse_instinct
+
+        content = '---\nid: "a"\ntrigger: "before --- after"\nconfidence: 0.7\n---\n\n# A\n\n---\nMore.\n'
+
+        instinct = parse_instinct(content, "a.md")
+
+        assert instinct is not None
+        assert instinct.trigger == "before --- after"
+        assert instinct.confidence == 0.7
+        assert instinct.content == "# A\n\n---\nMore."
+
+    def test_parse_instinct_requires_id_and_block(self):
+        """Files without an id or a closed block should not parse."""
+        from instincts.frontmatter import parse_instinct
+
+        assert parse_instinct("---\ntrigger: x\n---\nbody", "a.md") is None
+        assert parse_instinct("---\nid: x\n", "a.md") is None
+        assert parse_instinct("", "a.md") is None
+
+    def test_sections_keep_their_own_bodies(self):
+        """Each section of a collection should get the body that follows it."""
+        from instincts.frontmatter import parse_instinct_sections
+
+        sections = parse_instinct_sections(MULTI_SECTION)
+
+        assert [(s["id"], s["confidence"], s["content"]) for s in sections] == [
+            ("first", 0.8, "First body."),
+            ("second", 0.6, "Second body."),
+        ]
+
+
+class TestInstinctHeader:
+    """Tests for frontmatter-only reads."""
+
+    def test_header_matches_full_parse(self, learned_dir: Path):
+        """The header's metadata and lazily read body should match parse_instinct."""
+        from instincts.frontmatter import parse_instinct, read_instinct_header
+
+        path = learned_dir / "a.md"
+        path.write_text(
+            '---\nid: "a"\ntrigger: "when a"\nconfidence: 0.7\n'
+            'created_at: "2026-02-09T10:00:00+00:00"\nupdated_at: "2026-02-09T10:00:00+00:00"\n'
+            "---\n\n# A\n\n---\nMore.\n"
+        )
+        full = parse_instinct(path.read_text(), str(path))
+
+        header = read_instinct_header(path)
+
+        assert header is not None
+        assert header.instinct.content == ""
+        assert header.load() == full
+        assert header.body == "# A\n\n---\nMore."
+
+    def test_body_is_not_read_until_accessed(self, learned_dir: Path):
+        """Reading the header should not touch the body."""
+        from instincts.frontmatter import FRONTMATTER_READ_SIZE, read_instinct_header
+
+        path = learned_dir / "a.md"
+        path.write_bytes(b'---\nid: "a"\n---\n' + b"x" * FRONTMATTER_READ_SIZE * 4 + b"\xff\xfe")
+
+        header = read_instinct_header(path)
+
+        assert header is not None
+        assert header.instinct.id == "a"
+        assert "body" not in vars(header)
+        with pytest.raises(UnicodeDecodeError):
+            header.load()
+
+    def test_frontmatter_spanning_chunks(self, learned_dir: Path):
+        """A frontmatter block longer than one read should be found."""
+        from instincts.frontmatter import FRONTMATTER_READ_SIZE, read_instinct_header
+
+        path = learned_dir / "a.md"
+        trigger = "t" * FRONTMATTER_READ_SIZE
+        path.write_text(f'---\nid: "a"\ntrigger: "{trigger}"\n---\nBody.')
+
+        header = read_instinct_header(path)
+
+        assert header is not None
+        assert header.instinct.trigger == trigger
+        assert header.body == "Body."
+
+    def test_unclosed_or_oversized_frontmatter(self, learned_dir: Path):
+        """Blocks that never close within the limit should not be read as instincts."""
+        from instincts.frontmatter import MAX_FRONTMATTER_BYTES, read_instinct_header
+
+        unclosed = learned_dir / "unclosed.md"
+        unclosed.write_text('---\nid: "a"\n')
+        oversized = learned_dir / "oversized.md"
+        oversized.write_text('---\nid: "a"\n' + "x: y\n" * MAX_FRONTMATTER_BYTES + "---\nBody.")
+
+        assert read_instinct_header(unclosed) is None
+        assert read_instinct_header(oversized) is None
+
+
+class TestCLIUsesIndex:
+    """Tests for the CLI loading metadata through the instinct index."""
+
+    def test_status_skips_unchanged_files(
+        self, learned_dir: Path, count_parses: list[str], capsys: pytest.CaptureFixture[str]
+    ):
+        """Repeated status runs should not re-parse unchanged instincts."""
+        from instincts.cli import cmd_status
+
+        project_root = learned_dir.parent.parent.parent
+        (learned_dir / "collection.md").write_text(MULTI_SECTION)
+
+        cmd_status(project_root)
+        count_parses.clear()
+        cmd_status(project_root)
+
+        assert count_parses == []
+        assert "INSTINCT STATUS - 2 total" in capsys.readouterr().out
+
+    def test_changed_file_is_parsed_again(self, learned_dir: Path, count_parses: list[str]):
+        """Only a file whose stat changed should be re-parsed."""
+        from instincts.cli import load_all_instincts
+
+        project_root = learned_dir.parent.parent.parent
+        changed = learned_dir / "changed.md"
+        changed.write_text(MULTI_SECTION)
+        (learned_dir / "unchanged.yaml").write_text(
+            MULTI_SECTION.replace("first", "other").replace("second", "more")
+        )
+        load_all_instincts(project_root, with_content=False)
+        changed.write_text(MULTI_SECTION.replace("confidence: 0.8", "confidence: 0.95"))
+        count_parses.clear()
+
+        loaded = {inst["id"]: inst for inst in load_all_instincts(project_root, with_content=False)}
+
+        assert count_parses == ["first", "second"]
+        assert set(loaded) == {"first", "second", "other", "more"}
+        assert loaded["first"]["_section"] == 0
+        assert loaded["second"]["_section"] == 1
+        assert "content" not in loaded["second"]
+
+    def test_shares_the_agent_index(self, learned_dir: Path, count_parses: list[str]):
+        """The CLI and the agent should read one sidecar and agree after an in-place edit."""
+        from instincts.cli import load_all_instincts
+        from instincts.instinct_files import load_instinct_entries
+        from instincts.instinct_index import get_instinct_index_path
+
+        project_root = learned_dir.parent.parent.parent
+        path = learned_dir / "collection.md"
+        path.write_text(MULTI_SECTION)
+        load_all_instincts(project_root, with_content=False)
+        count_parses.clear()
+
+        [entry] = load_instinct_entries(learned_dir)
+        assert (entry.id, entry.confidence) == ("first", 0.8)
+        assert count_parses == []
+
+        path.write_text(MULTI_SECTION.replace("confidence: 0.8", "confidence: 0.2"))
+        [entry] = load_instinct_entries(learned_dir)
+        listed = {inst["id"]: inst for inst in load_all_instincts(project_root, with_content=False)}
+
+        assert entry.confidence == 0.2
+        assert listed["first"]["confidence"] == pytest.approx(0.2)
+        assert get_instinct_index_path(learned_dir).exists()
+        assert sorted(p.name for p in learned_dir.parent.glob(".learned.*")) == [
+            ".learned.index.json",
+            ".learned.index.lock",
+        ]
+
+    def test_body_is_read_for_conversion(self, learned_dir: Path):
+        """Instincts loaded without content should get their body on conversion."""
+        from instincts.cli import _convert_dict_to_instinct, load_all_instincts
+
+        project_root = learned_dir.parent.parent.parent
+        (learned_dir / "collection.md").write_text(MULTI_SECTION)
+
+        instincts = {inst["id"]: inst for inst in load_all_instincts(project_root, with_content=False)}
+
+        assert "content" not in instincts["second"]
+        assert _convert_dict_to_instinct(instincts["second"]).content == "Second body."
@@ -0,0 +1,270 @@
+"""Tests for instincts.history module and segment summaries.
+
+Tests cover:
+- Merged segment summaries matching detection over the whole log
+- Sessions spanning segments (Write->Edit, error->success, correction lookback)
+- Whole-history detection inline and in a process pool
+- History mode of the agent
+"""
+
+import itertools
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+TOOLS = ("Read", "Edit", "Write", "Bash", "Grep")
+
+
+def event(session: str, minute: int, **fields) -> dict:
+    """Build an observation at a given minute of the session."""
+    return {"session": session, "timestamp": f"2026-02-09T{10 + minute // 60:02d}:{minute % 60:02d}:00+00:00", **fields}
+
+
+def start(session: str, minute: int, tool: str, file_path: str = "/app/a.py") -> dict:
+    return event(session, minute, event="tool_start", tool=tool, input=json.dumps({"file_path": file_path}))
+
+
+def complete(session: str, minute: int, tool: str, output: str = "ok") -> dict:
+    return event(session, minute, event="tool_complete", tool=tool, output=output)
+
+
+def message(session: str, minute: int, content: str) -> dict:
+    return event(session, minute, event="user_message", content=content)
+
+
+def spanning_log() -> list[dict]:
+    """A log whose sessions exercise every sequential detector."""
+    return [
+        start("s1", 0, "Write"),
+        complete("s1", 1, "Write"),
+        start("s1", 2, "Edit"),
+        complete("s1", 3, "Bash", output="ImportError: no module named x"),
+        start("s2", 4, "Read"),
+        complete("s1", 5, "Bash", output="ok"),
+        message("s1", 6, "no, that's wrong"),
+        start("s2", 7, "Write", "/app/b.py"),
+        complete("s2", 8, "Write"),
+        message("s2", 9, "Actually use the other one"),
+        start("s2", 10, "Edit", "/app/b.py"),
+        start("s1", 11, "Read"),
+        start("s1", 12, "Grep"),
+        start("s1", 13, "Edit"),
+        start("s2", 14, "Read"),
+        start("s2", 15, "Grep"),
+        start("s2", 16, "Edit"),
+        complete("s2", 17, "Bash", output="TypeError: bad"),
+        start("s3", 18, "Read"),
+        start("s3", 19, "Grep"),
+        start("s3", 20, "Edit"),
+        complete("s2", 21, "Bash", output="done"),
+    ]
+
+
+def random_log(seed: int, length: int = 200) -> list[dict]:
+    """A random interleaving of a few sessions."""
+    rng = random.Random(seed)
+    log = []
+    for minute in range(length):
+        session = rng.choice(("s1", "s2", "s3", "s4"))
+        kind = rng.random()
+        tool = rng.choice(TOOLS)
+        if kind < 0.5:
+            log.append(start(session, minute, tool, rng.choice(("/a.py", "/b.py"))))
+        elif kind < 0.85:
+            output = rng.choice(("ok", "ok", "Error: failed"))
+            log.append(complete(session, minute, tool, output))
+        else:
+            log.append(message(session, minute, rng.choice(("thanks", "no, wrong", "fix it"))))
+    return log
+
+
+def signature(patterns) -> list[tuple]:
+    """Comparable view of patterns, ignoring evidence and generation time."""
+    return sorted(
+        (
+            p.pattern_type.value,
+            p.trigger,
+            p.occurrences,
+            json.dumps(sorted(dict(p.metadata).items()), sort_keys=True, default=sorted),
+        )
+        for p in patterns
+    )
+
+
+def split(observations: list[dict], cuts: list[int]) -> list[list[dict]]:
+    bounds = [0, *cuts, len(observations)]
+    return [observations[a:b] for a, b in itertools.pairwise(bounds)]
+
+
+class TestMergeSummaries:
+    """Tests for summarizing segments and merging the summaries."""
+
+    def test_single_segment_matches_pipeline(self):
+        """One summary should give the same patterns as the pipeline."""
+        from instincts.patterns import (
+            DetectionPipeline,
+            merge_summaries,
+            summarize_observations,
+        )
+
+        log = spanning_log()
+
+        merged = merge_summaries([summarize_observations(log)])
+
+        assert merged
+        assert signature(merged) == signature(DetectionPipeline(log).detect_all())
+
+    @pytest.mark.parametrize("cut", range(1, len(spanning_log())))
+    def test_every_split_point_matches_pipeline(self, cut: int):
+        """Sessions cut at any point should be stitched back together."""
+        from instincts.patterns import (
+            DetectionPipeline,
+            merge_summaries,
+            summarize_observations,
+        )
+
+        log = spanning_log()
+
+        merged = merge_summaries(summarize_observations(part) for part in split(log, [cut]))
+
+        assert signature(merged) == signature(DetectionPipeline(log).detect_all())
+
+    def test_write_and_edit_in_different_segments(self):
+        """An Edit in a later segment should match a Write in an earlier one."""
+        from instincts.models import PatternType
+        from instincts.patterns import merge_summaries, summarize_observations
+
+        log = [start("s1", 0, "Write"), start("s1", 1, "Read"), start("s1", 2, "Edit")]
+
+        merged = merge_summaries(summarize_observations(part) for part in split(log, [1, 2]))
+
+        corrections = [p for p in merged if p.pattern_type == PatternType.USER_CORRECTION]
+        assert [dict(p.metadata)["file_path"] for p in corrections] == ["/app/a.py"]
+
+    def test_correction_lookback_across_segments(self):
+        """A correction right after a segment starts should see earlier completions."""
+        from instincts.patterns import merge_summaries, summarize_observations
+
+        log = [complete("s1", 0, "Bash"), message("s1", 1, "no, wrong")]
+
+        merged = merge_summaries(summarize_observations(part) for part in split(log, [1]))
+
+        assert [dict(p.metadata).get("tool") for p in merged] == ["Bash"]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_logs_match_pipeline(self, seed: int):
+        """Random logs cut into several segments should merge exactly."""
+        from instincts.patterns import (
+            DetectionPipeline,
+            merge_summaries,
+            summarize_observations,
+        )
+
+        log = random_log(seed)
+        cuts = sorted(random.Random(seed).sample(range(1, len(log)), 6))
+
+        merged = merge_summaries(summarize_observations(part) for part in split(log, cuts))
+
+        assert signature(merged) == signature(DetectionPipeline(log).detect_all())
+
+
+def write_segmented_log(observations_file: Path, parts: list[list[dict]]) -> None:
+    """Write each part through the observer and roll all but the last over."""
+    from instincts.observation_log import append_observation
+    from instincts.segments import append_lock, roll_over
+
+    for i, part in enumerate(parts):
+        for obs in part:
+            append_observation(obs, observations_file)
+        if i < len(parts) - 1:
+            with append_lock(observations_file):
+                roll_over(observations_file)
+
+
+class TestDetectHistoryPatterns:
+    """Tests for whole-history detection over a segmented log."""
+
+    def test_inline_matches_pipeline(self, tmp_path: Path):
+        """Detection over segments should match detection over the whole log."""
+        from instincts.history import detect_history_patterns
+        from instincts.patterns import DetectionPipeline
+
+        observations_file = tmp_path / "observations.jsonl"
+        log = random_log(7)
+        write_segmented_log(observations_file, split(log, [50, 120, 170]))
+
+        patterns = detect_history_patterns(observations_file, max_workers=1)
+
+        assert signature(patterns) == signature(DetectionPipeline(log).detect_all())
+
+    def test_process_pool_matches_inline(self, tmp_path: Path):
+        """Fanning segments out to worker processes should not change the result."""
+        from instincts.history import detect_history_patterns
+
+        observations_file = tmp_path / "observations.jsonl"
+        write_segmented_log(observations_file, split(random_log(3), [60, 140]))
+
+        pooled = detect_history_patterns(observations_file, max_workers=2)
+
+        assert signature(pooled) == signature(detect_history_patterns(observations_file, max_workers=1))
+
+    def test_reads_blob_stored_output(self, tmp_path: Path):
+        """Error outputs kept in the blob store should be read back per segment."""
+        from instincts.blobs import BlobStore, log_blobs_dir
+        from instincts.history import detect_history_patterns
+        from instincts.patterns import DetectionPipeline
+
+        observations_file = tmp_path / "observations.jsonl"
+        log = random_log(5)
+        store = BlobStore(log_blobs_dir(observations_file))
+        stored = [
+            {k: v for k, v in obs.items() if k != "output"} | {"output_ref": store.put(obs["output"])}
+            if "output" in obs
+            else obs
+            for obs in log
+        ]
+        write_segmented_log(observations_file, split(stored, [80, 150]))
+
+        patterns = detect_history_patterns(observations_file, max_workers=1)
+
+        assert signature(patterns) == signature(DetectionPipeline(log).detect_all())
+
+    def test_missing_log_has_no_patterns(self, tmp_path: Path):
+        """A project without observations should yield nothing."""
+        from instincts.history import detect_history_patterns
+
+        assert detect_history_patterns(tmp_path / "observations.jsonl") == []
+
+
+class TestHistoryAnalysis:
+    """Tests for the agent's history mode."""
+
+    def test_history_mode_sees_closed_segments(self, tmp_path: Path, monkeypatch):
+        """Patterns in segments outside the analysis window should be detected."""
+        from instincts.agent import analyze_observations
+        from instincts.config import get_observations_file
+
+        project_root = tmp_path / "project"
+        (project_root / ".git").mkdir(parents=True)
+        observations_file = get_observations_file(project_root)
+        observations_file.parent.mkdir(parents=True)
+        old = [start(f"old{i}", i * 3 + k, tool) for i in range(3) for k, tool in enumerate(("Read", "Grep", "Edit"))]
+        write_segmented_log(observations_file, [old, [start("new", 100, "Bash")]])
+
+        monkeypatch.setattr("instincts.agent.MAX_OBSERVATIONS_FOR_ANALYSIS", 1)
+
+        windowed = analyze_observations(project_root, dry_run=True, skip_llm=True)
+        result = analyze_observations(project_root, dry_run=True, skip_llm=True, history=True)
+
+        sequences = [dict(p.metadata).get("sequence") for p in result.patterns]
+        assert ["Read", "Grep", "Edit"] in sequences
+        assert not windowed.patterns
+
+    def test_history_and_incremental_are_exclusive(self, tmp_path: Path):
+        """Combining history with incremental analysis should be rejected."""
+        from instincts.agent import analyze_observations
+
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            analyze_observations(tmp_path, incremental=True, history=True)
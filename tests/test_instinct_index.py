@@ -0,0 +1,332 @@
+"""Tests for instincts.instinct_index module and its use by the agent.
+
+Tests cover:
+- Index writes by write_instinct_file, outside the learned/ directory
+- Validation against the directory mtime and each file's stat, and
+  refreshes of stale indexes
+- Loading metadata without reading instinct bodies
+- Bodies read only for merged and decayed instincts
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+
+def make_instinct(instinct_id: str, confidence: float = 0.5, updated_at: datetime | None = None):
+    """Build an instinct with a recognizable body."""
+    from instincts.models import Instinct
+
+    ts = updated_at or datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc)
+    return Instinct(
+        id=instinct_id,
+        trigger=f"when {instinct_id}",
+        confidence=confidence,
+        domain="testing",
+        source="test",
+        evidence_count=2,
+        created_at=ts,
+        updated_at=ts,
+        content=f"# {instinct_id}\n\nBody of {instinct_id}.",
+    )
+
+
+@pytest.fixture
+def learned_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "learned"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def count_parses(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the source file of every instinct file the agent parses or reads a header of."""
+    import instincts.frontmatter
+    import instincts.instinct_files
+
+    parsed: list[str] = []
+    parse = instincts.instinct_files.parse_instinct
+
+    def counting_parse(content: str, source_file: str):
+        parsed.append(Path(source_file).name)
+        return parse(content, source_file)
+
+    read_header = instincts.instinct_files.read_instinct_header
+
+    def counting_read_header(file_path: Path):
+        parsed.append(file_path.name)
+        return read_header(file_path)
+
+    monkeypatch.setattr(instincts.instinct_files, "parse_instinct", counting_parse)
+    monkeypatch.setattr(instincts.frontmatter, "parse_instinct", counting_parse)
+    monkeypatch.setattr(instincts.instinct_files, "read_instinct_header", counting_read_header)
+    return parsed
+
+
+class TestInstinctIndex:
+    """Tests for writing and validating the index."""
+
+    def test_write_updates_current_index(self, learned_dir: Path):
+        """Writing an instinct should add its entry to a current index."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+        from instincts.instinct_index import (
+            get_instinct_index_path,
+            load_instinct_index,
+        )
+
+        assert load_instinct_entries(learned_dir) == []
+        write_instinct_file(make_instinct("a"), learned_dir)
+        write_instinct_file(make_instinct("b", confidence=0.7), learned_dir)
+
+        entries = load_instinct_index(learned_dir)
+
+        assert entries is not None
+        assert {(e.id, e.file, e.confidence) for e in entries} == {("a", "a.md", 0.5), ("b", "b.md", 0.7)}
+        assert get_instinct_index_path(learned_dir) == learned_dir.parent / ".learned.index.json"
+        assert sorted(p.name for p in learned_dir.iterdir()) == ["a.md", "b.md"]
+
+    def test_entry_matches_file(self, learned_dir: Path):
+        """Entries should hold the parsed frontmatter and the file's stat."""
+        from instincts.instinct_files import (
+            load_existing_instincts,
+            load_instinct_entries,
+            write_instinct_file,
+        )
+        from instincts.instinct_index import read_instinct_index
+
+        instinct = make_instinct("a")
+        path = write_instinct_file(instinct, learned_dir)
+        [entry] = load_instinct_entries(learned_dir)
+        [loaded] = load_existing_instincts(learned_dir)
+        index = read_instinct_index(learned_dir)
+
+        assert entry.to_instinct(learned_dir, loaded.content) == loaded
+        assert index is not None
+        [record] = index.files
+        assert record.describes(path.stat())
+        assert record.complete
+
+    def test_current_index_skips_parsing(self, learned_dir: Path, count_parses: list[str]):
+        """Loading metadata from a current index should not read any file."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+
+        load_instinct_entries(learned_dir)
+        for name in ("a", "b", "c"):
+            write_instinct_file(make_instinct(name), learned_dir)
+        count_parses.clear()
+
+        assert len(load_instinct_entries(learned_dir)) == 3
+        assert count_parses == []
+
+    def test_stale_index_reparses_only_changed_files(self, learned_dir: Path, count_parses: list[str]):
+        """After outside changes only new and modified files should be parsed."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+
+        load_instinct_entries(learned_dir)
+        for name in ("a", "b", "c"):
+            write_instinct_file(make_instinct(name), learned_dir)
+        (learned_dir / "a.md").unlink()
+        changed = learned_dir / "b.md"
+        changed.write_text(changed.read_text().replace("confidence: 0.5", "confidence: 0.9"))
+        write_instinct_file(make_instinct("d"), learned_dir.parent / "elsewhere")
+        os.rename(learned_dir.parent / "elsewhere" / "d.md", learned_dir / "d.md")
+        count_parses.clear()
+
+        entries = load_instinct_entries(learned_dir)
+
+        assert sorted(count_parses) == ["b.md", "d.md"]
+        assert {e.id: e.confidence for e in entries} == {"b": 0.9, "c": 0.5, "d": 0.5}
+        count_parses.clear()
+        assert len(load_instinct_entries(learned_dir)) == 3
+        assert count_parses == []
+
+    def test_in_place_edit_is_seen(self, learned_dir: Path, count_parses: list[str]):
+        """A file edited in place, leaving the directory mtime, should be re-parsed alone."""
+        from instincts.instinct_files import write_instinct_file
+        from instincts.storage import FileInstinctStore
+
+        store = FileInstinctStore(learned_dir)
+        store.load_instincts()
+        path = write_instinct_file(make_instinct("a", confidence=0.7), learned_dir)
+        write_instinct_file(make_instinct("b"), learned_dir)
+        mtime = learned_dir.stat().st_mtime_ns
+        content = path.read_text().replace("confidence: 0.7", "confidence: 0.2")
+        path.write_text(content.replace('status: "active"', 'status: "dormant"'))
+        count_parses.clear()
+
+        loaded = {inst.id: (inst.confidence, inst.status) for inst in store.load_instincts()}
+
+        assert learned_dir.stat().st_mtime_ns == mtime
+        assert loaded == {"a": (0.2, "dormant"), "b": (0.5, "active")}
+        assert count_parses == ["a.md"]
+
+    def test_rewrite_with_same_mtime_and_size_is_seen(self, learned_dir: Path):
+        """A rewrite within the mtime granularity at the same size should still be re-parsed."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+
+        path = write_instinct_file(make_instinct("a", confidence=0.7), learned_dir)
+        load_instinct_entries(learned_dir)
+        stat = path.stat()
+        path.write_text(path.read_text().replace("confidence: 0.7", "confidence: 0.2"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        [entry] = load_instinct_entries(learned_dir)
+
+        assert entry.confidence == 0.2
+
+    def test_index_is_stale_when_directory_changes(self, learned_dir: Path):
+        """A change to the directory should invalidate the index."""
+        from instincts.instinct_files import write_instinct_file
+        from instincts.instinct_index import load_instinct_index
+
+        write_instinct_file(make_instinct("a"), learned_dir)
+        (learned_dir / "notes.txt").write_text("unrelated")
+
+        assert load_instinct_index(learned_dir) is None
+
+    def test_corrupt_index_is_rebuilt(self, learned_dir: Path):
+        """A corrupt or foreign-version index should be rebuilt from the files."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+        from instincts.instinct_index import (
+            get_instinct_index_path,
+            load_instinct_index,
+        )
+
+        write_instinct_file(make_instinct("a"), learned_dir)
+        index_path = get_instinct_index_path(learned_dir)
+
+        index_path.write_text("{not json")
+        assert [e.id for e in load_instinct_entries(learned_dir)] == ["a"]
+
+        data = json.loads(index_path.read_text())
+        index_path.write_text(json.dumps(data | {"version": 0}))
+        assert load_instinct_index(learned_dir) is None
+        assert [e.id for e in load_instinct_entries(learned_dir)] == ["a"]
+
+    def test_saving_leaves_directory_mtime(self, learned_dir: Path):
+        """Writing the index should not itself make the index stale."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+
+        write_instinct_file(make_instinct("a"), learned_dir)
+        mtime = learned_dir.stat().st_mtime_ns
+
+        load_instinct_entries(learned_dir)
+
+        assert learned_dir.stat().st_mtime_ns == mtime
+
+    def test_skips_symlinks(self, learned_dir: Path, tmp_path: Path):
+        """Symlinked instinct files should not be indexed."""
+        from instincts.instinct_files import load_instinct_entries, write_instinct_file
+
+        target = write_instinct_file(make_instinct("outside"), tmp_path / "other")
+        (learned_dir / "outside.md").symlink_to(target)
+
+        assert load_instinct_entries(learned_dir) == []
+
+
+class TestAgentUsesIndex:
+    """Tests for the agent reading bodies only when needed."""
+
+    def test_decay_rewrites_only_status_changes(self, learned_dir: Path, count_parses: list[str]):
+        """Only instincts that turn dormant should be read and rewritten."""
+        from instincts.agent import apply_confidence_decay
+        from instincts.instinct_files import (
+            load_existing_instincts,
+            load_instinct_entries,
+            write_instinct_file,
+        )
+
+        load_instinct_entries(learned_dir)
+        now = datetime.now(timezone.utc)
+        write_instinct_file(make_instinct("fresh", 0.8, updated_at=now), learned_dir)
+        write_instinct_file(make_instinct("stale", 0.8, updated_at=now - timedelta(weeks=10)), learned_dir)
+        write_instinct_file(make_instinct("fading", 0.3, updated_at=now - timedelta(weeks=10)), learned_dir)
+        mtimes = {name: (learned_dir / f"{name}.md").stat().st_mtime_ns for name in ("fresh", "stale")}
+        count_parses.clear()
+
+        decayed = {inst.id: inst for inst in apply_confidence_decay(learned_dir)}
+
+        assert count_parses == ["fading.md"]
+        assert decayed["fresh"].confidence == 0.8
+        assert decayed["stale"].confidence == pytest.approx(0.6)
+        assert decayed["fading"].status == "dormant"
+        for name, mtime in mtimes.items():
+            assert (learned_dir / f"{name}.md").stat().st_mtime_ns == mtime
+        stored = {i.id: i for i in load_existing_instincts(learned_dir)}
+        assert stored["stale"].confidence == 0.8
+        assert stored["fading"].content == "# fading\n\nBody of fading."
+        assert (stored["fading"].confidence, stored["fading"].status) == (0.3, "dormant")
+
+    def test_repeated_decay_is_idempotent(self, learned_dir: Path):
+        """Running decay again should neither rewrite files nor decay further."""
+        from instincts.agent import apply_confidence_decay
+        from instincts.instinct_files import write_instinct_file
+
+        old = datetime.now(timezone.utc) - timedelta(weeks=10)
+        write_instinct_file(make_instinct("stale", 0.8, updated_at=old), learned_dir)
+        write_instinct_file(make_instinct("fading", 0.3, updated_at=old), learned_dir)
+
+        first = {inst.id: inst.confidence for inst in apply_confidence_decay(learned_dir)}
+        mtimes = {path.name: path.stat().st_mtime_ns for path in learned_dir.iterdir()}
+        second = {inst.id: inst.confidence for inst in apply_confidence_decay(learned_dir)}
+
+        assert second == first
+        assert {path.name: path.stat().st_mtime_ns for path in learned_dir.iterdir()} == mtimes
+
+    def test_incremental_confirmations_fold_into_files(self, tmp_path: Path, count_parses: list[str]):
+        """Re-detected patterns should leave files alone until the ledger is folded."""
+        from instincts.agent import analyze_observations
+        from instincts.confidence_ledger import fold_ledger
+        from instincts.config import (
+            get_confidence_ledger_file,
+            get_learned_dir,
+            get_observations_file,
+        )
+        from instincts.instinct_files import (
+            load_existing_instincts,
+            write_instinct_file,
+        )
+        from instincts.storage import FileInstinctStore
+
+        project_root = tmp_path / "project"
+        (project_root / ".git").mkdir(parents=True)
+        observations_file = get_observations_file(project_root)
+        observations_file.parent.mkdir(parents=True)
+
+        def record(minute: int) -> None:
+            with observations_file.open("a") as f:
+                for k, tool in enumerate(("Read", "Grep", "Edit")):
+                    obs = {
+                        "event": "tool_start",
+                        "tool": tool,
+                        "session": f"s{minute}",
+                        "timestamp": f"2026-02-09T10:{minute + k:02d}:00+00:00",
+                    }
+                    f.write(json.dumps(obs) + "\n")
+
+        for minute in (0, 10, 20):
+            record(minute)
+        analyze_observations(project_root, skip_llm=True, incremental=True)
+        learned_dir = get_learned_dir(project_root)
+        write_instinct_file(make_instinct("unrelated"), learned_dir)
+        before = {inst.id: inst for inst in load_existing_instincts(learned_dir)}
+        for minute in (30, 40, 50):
+            record(minute)
+        count_parses.clear()
+
+        result = analyze_observations(project_root, skip_llm=True, incremental=True)
+
+        assert "unrelated.md" not in count_parses
+        assert result.instincts_updated >= len(before) - 1
+        assert {inst.id: inst for inst in load_existing_instincts(learned_dir)} == before
+
+        fold_ledger(get_confidence_ledger_file(project_root), FileInstinctStore(learned_dir), force=True)
+
+        after = {inst.id: inst for inst in load_existing_instincts(learned_dir)}
+        assert after["unrelated"] == before["unrelated"]
+        for instinct_id in set(before) - {"unrelated"}:
+            assert after[instinct_id].evidence_count > before[instinct_id].evidence_count
+            assert after[instinct_id].content == before[instinct_id].content
@@ -0,0 +1,157 @@
+"""Tests for instincts.matchers module.
+
+Tests cover:
+- Substring and whole-word keyword matching, case-insensitively
+- Keyword priority order for first()
+- Word-suffix matching equivalent to the (\\w+Error|\\w+Exception) regex
+- Error and correction detection unchanged from the per-keyword scans
+"""
+
+import random
+import re
+
+ERROR_KEYWORDS = ("error", "failed", "exception", "failure", "traceback")
+CORRECTION_KEYWORDS = ("no", "instead", "actually", "don't", "dont")
+FRAGMENTS = (
+    "Error", "error", "ERROR", "failed", "FAILURE", "exception", "Exception", "Traceback",
+    "ImportError", "ValueErrorException", "_Error", "Error_", "xErrorx", "é", "NoError",
+    "no", "No", "note", "instead", "Actually", "don't", "DONT", "don", "'t", "know",
+    " ", "\n", ":", "(", "'", "-", "_", "1", "ok", "passed", "İ",
+)
+
+
+def random_text(seed: int) -> str:
+    """Random text assembled from keyword fragments, separators and noise."""
+    rng = random.Random(seed)
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randrange(1, 40)))
+
+
+def reference_correction(text: str) -> bool:
+    """The previous per-keyword correction scan."""
+    text_lower = text.lower()
+    return any(re.search(rf"\b{re.escape(k)}\b", text_lower) for k in CORRECTION_KEYWORDS)
+
+
+def reference_error_type(error_output: str) -> str:
+    """The previous error type extraction."""
+    for keyword in ERROR_KEYWORDS:
+        if keyword not in error_output.lower():
+            continue
+        match = re.search(r"(\w+Error|\w+Exception)", error_output)
+        return match.group(1) if match else keyword
+    return "unknown"
+
+
+class TestKeywordMatcher:
+    """Tests for KeywordMatcher."""
+
+    def test_substring_matching_ignores_case(self):
+        """Substring keywords should match anywhere, in any case."""
+        from instincts.matchers import KeywordMatcher
+
+        matcher = KeywordMatcher(("error", "failed"))
+
+        assert matcher.search("Build FAILED")
+        assert matcher.search("TypeErrors")
+        assert not matcher.search("all passed")
+
+    def test_first_uses_priority_order(self):
+        """first() should return the earliest keyword in priority order, not text order."""
+        from instincts.matchers import KeywordMatcher
+
+        matcher = KeywordMatcher(("error", "failed"))
+
+        assert matcher.first("FAILED with 1 error") == "error"
+        assert matcher.first("FAILED") == "failed"
+        assert matcher.first("ok") is None
+
+    def test_whole_words(self):
+        """Whole-word keywords should not match inside other words."""
+        from instincts.matchers import KeywordMatcher
+
+        matcher = KeywordMatcher(("no", "don't"), whole_words=True)
+
+        assert matcher.search("No, use pytest")
+        assert matcher.search("please DON'T")
+        assert not matcher.search("a note about knowing")
+        assert matcher.first("don't, no") == "no"
+        assert matcher.first("notes") is None
+
+    def test_whole_word_first_sees_overlapping_keywords(self):
+        """A keyword inside a longer whole-word match should still be found."""
+        from instincts.matchers import KeywordMatcher
+
+        matcher = KeywordMatcher(("b", "a-b"), whole_words=True)
+
+        assert matcher.first("x a-b y") == "b"
+
+    def test_correction_matches_per_keyword_scan(self):
+        """The combined regex should agree with one regex per keyword."""
+        from instincts.matchers import KeywordMatcher
+
+        matcher = KeywordMatcher(CORRECTION_KEYWORDS, whole_words=True)
+
+        for seed in range(300):
+            text = random_text(seed)
+            assert matcher.search(text) == reference_correction(text), text
+
+
+class TestWordSuffixMatcher:
+    """Tests for WordSuffixMatcher."""
+
+    def test_finds_first_error_type(self):
+        """The first word ending in a suffix should be returned."""
+        from instincts.matchers import WordSuffixMatcher
+
+        matcher = WordSuffixMatcher(("Error", "Exception"))
+
+        assert matcher.search("Traceback: ImportError: no module") == "ImportError"
+        assert matcher.search("Error: a MyException then a KeyError") == "MyException"
+        assert matcher.search("Error: plain") is None
+
+    def test_long_words(self):
+        """Words longer than the search-back window should be matched whole."""
+        from instincts.matchers import WordSuffixMatcher
+
+        matcher = WordSuffixMatcher(("Error", "Exception"))
+        long_word = "x" * 1000 + "Error"
+
+        assert matcher.search(long_word) == long_word
+        assert matcher.search("log: " + long_word + "Exception") == long_word
+        assert matcher.search("Error " * 500 + "a_KeyError") == "a_KeyError"
+
+    def test_matches_alternation_regex(self):
+        """Results should equal the plain (\\w+Error|\\w+Exception) search."""
+        from instincts.matchers import WordSuffixMatcher
+
+        matcher = WordSuffixMatcher(("Error", "Exception"))
+
+        for seed in range(300):
+            text = random_text(seed)
+            match = re.search(r"(\w+Error|\w+Exception)", text)
+            assert matcher.search(text) == (match.group(1) if match else None), text
+
+
+class TestErrorExtraction:
+    """Tests for the enrichment helpers built on the matchers."""
+
+    def test_error_type_unchanged(self):
+        """extract_error_type and describe_output should keep their results."""
+        from instincts.enrichment import (
+            describe_output,
+            extract_error_type,
+            has_error_keywords,
+        )
+
+        for seed in range(300):
+            text = random_text(seed)
+            expected = reference_error_type(text)
+            is_error = any(k in text.lower() for k in ERROR_KEYWORDS)
+
+            assert extract_error_type(text) == expected, text
+            assert has_error_keywords(text) == is_error, text
+            assert describe_output(text, len(text)) == {
+                "is_error": is_error,
+                "error_type": expected if is_error else None,
+                "output_length": len(text),
+            }
@@ -226,6 +226,37 @@ class TestPattern:
         assert isinstance(pattern.metadata, tuple)
 
 
+    def test_occurrences_defaults_to_evidence_count(self):
+        """Without occurrences metadata, occurrences equals the evidence count."""
+        evidence = Evidence(
+            timestamp=datetime.now(timezone.utc), session_id="s1", description="e1"
+        )
+        pattern = Pattern(
+            pattern_type=PatternType.ERROR_RESOLUTION,
+            trigger="when build fails",
+            description="Fix imports",
+            evidence=(evidence, evidence),
+        )
+
+        assert pattern.occurrences == 2
+
+    def test_occurrences_uses_metadata_when_present(self):
+        """Aggregated patterns report the counted occurrences, not the sample size."""
+        pattern = Pattern(
+            pattern_type=PatternType.ERROR_RESOLUTION,
+            trigger="when build fails",
+            description="Fix imports",
+            evidence=(
+                Evidence(
+                    timestamp=datetime.now(timezone.utc), session_id="s1", description="e1"
+                ),
+            ),
+            metadata=(("occurrences", 40),),
+        )
+
+        assert pattern.occurrences == 40
+
+
 class TestInstinct:
     """Tests for Instinct dataclass (extended from existing cli.Instinct)."""
 
@@ -0,0 +1,156 @@
+"""Tests for instincts.observation_index module.
+
+Tests cover:
+- Sidecar maintained by observation appends
+- Self-healing rebuild when the sidecar disagrees with the file size
+- Reset on rollover
+- Counters and oldest-timestamp lookup reading from the sidecar
+"""
+
+import json
+from pathlib import Path
+
+
+def create_project_structure(tmp_path: Path) -> tuple[Path, Path]:
+    """Create a project with an instincts directory.
+
+    Returns:
+        Tuple of (project_root, observations_file)
+    """
+    project_root = tmp_path / "project"
+    instincts_dir = project_root / "docs" / "instincts"
+    instincts_dir.mkdir(parents=True)
+    return project_root, instincts_dir / "observations.jsonl"
+
+
+class TestIndexMaintenance:
+    """Tests for sidecar updates on append."""
+
+    def test_append_creates_and_updates_sidecar(self, tmp_path: Path):
+        """Each append should update line count, size and timestamps."""
+        from instincts.observation_index import get_index_path
+        from instincts.observer import observe_pre
+
+        project_root, observations_file = create_project_structure(tmp_path)
+
+        for i in range(3):
+            observe_pre({"tool_name": "Read", "session_id": f"s{i}"}, project_root)
+
+        sidecar = json.loads(get_index_path(observations_file).read_text())
+        lines = observations_file.read_text().splitlines()
+        assert sidecar["line_count"] == 3
+        assert sidecar["byte_size"] == observations_file.stat().st_size
+        assert sidecar["first_timestamp"] == json.loads(lines[0])["timestamp"]
+        assert sidecar["last_timestamp"] == json.loads(lines[-1])["timestamp"]
+
+    def test_sidecar_is_hidden_next_to_log(self, tmp_path: Path):
+        """Sidecar should live next to the log as a dotfile."""
+        from instincts.observation_index import get_index_path
+
+        observations_file = tmp_path / "observations.jsonl"
+
+        assert get_index_path(observations_file) == tmp_path / ".observations.index.json"
+
+
+class TestReadIndex:
+    """Tests for read_index and self-healing rebuilds."""
+
+    def test_trusts_sidecar_when_size_matches(self, tmp_path: Path):
+        """A sidecar matching the file size should be returned without scanning."""
+        from instincts.observation_index import get_index_path, read_index
+
+        observations_file = tmp_path / "observations.jsonl"
+        observations_file.write_text('{"event": "a"}\n')
+        get_index_path(observations_file).write_text(
+            json.dumps({"line_count": 42, "byte_size": observations_file.stat().st_size})
+        )
+
+        assert read_index(observations_file).line_count == 42
+
+    def test_rebuilds_when_size_disagrees(self, tmp_path: Path):
+        """A stale sidecar should be replaced by a fresh scan."""
+        from instincts.observation_index import get_index_path, read_index
+
+        observations_file = tmp_path / "observations.jsonl"
+        observations_file.write_text(
+            '{"timestamp": "2026-01-01T00:00:00+00:00"}\n'
+            '{"timestamp": "2026-01-02T00:00:00+00:00"}\n'
+        )
+        get_index_path(observations_file).write_text(
+            json.dumps({"line_count": 99, "byte_size": 1})
+        )
+
+        index = read_index(observations_file)
+
+        assert index.line_count == 2
+        assert index.first_timestamp == "2026-01-01T00:00:00+00:00"
+        assert index.last_timestamp == "2026-01-02T00:00:00+00:00"
+        assert json.loads(get_index_path(observations_file).read_text())["line_count"] == 2
+
+    def test_rebuilds_corrupt_sidecar(self, tmp_path: Path):
+        """A corrupt sidecar should be rebuilt rather than raising."""
+        from instincts.observation_index import get_index_path, read_index
+
+        observations_file = tmp_path / "observations.jsonl"
+        observations_file.write_text("a\nb\nc")
+        get_index_path(observations_file).write_text("not json")
+
+        assert read_index(observations_file).line_count == 3
+
+    def test_returns_empty_index_for_missing_file(self, tmp_path: Path):
+        """Missing log should report zero lines."""
+        from instincts.observation_index import read_index
+
+        index = read_index(tmp_path / "missing.jsonl")
+
+        assert index.line_count == 0
+        assert index.first_timestamp is None
+
+    def test_append_after_external_write_heals_index(self, tmp_path: Path):
+        """Appending to a log modified outside the observer should rescan it."""
+        from instincts.observation_index import read_index
+        from instincts.observation_log import append_observation
+
+        observations_file = tmp_path / "observations.jsonl"
+        append_observation({"n": 1}, observations_file)
+        with observations_file.open("a") as f:
+            f.write('{"n": 2}\n{"n": 3}\n')
+        append_observation({"n": 4}, observations_file)
+
+        assert read_index(observations_file).line_count == 4
+
+
+class TestIndexReset:
+    """Tests for index reset on rollover."""
+
+    def test_rollover_resets_active_index(self, tmp_path: Path):
+        """Rollover should drop the active sidecar while counts span segments."""
+        from instincts.observation_index import get_index_path, read_index
+        from instincts.observation_log import MAX_FILE_SIZE_MB
+        from instincts.observer import count_observations, observe_pre
+
+        project_root, observations_file = create_project_structure(tmp_path)
+        observe_pre({"tool_name": "Read", "session_id": "s1"}, project_root)
+        with observations_file.open("a") as f:
+            f.write("x" * (MAX_FILE_SIZE_MB * 1024 * 1024) + "\n")
+
+        observe_pre({"tool_name": "Read", "session_id": "s1"}, project_root)
+
+        assert not get_index_path(observations_file).exists()
+        assert read_index(observations_file).line_count == 0
+        assert count_observations(observations_file) == 3
+
+
+class TestCountersUseIndex:
+    """Tests for counters reading the sidecar."""
+
+    def test_auto_learn_count_uses_index(self, tmp_path: Path):
+        """auto_learn.count_observations should report the indexed line count."""
+        from instincts.auto_learn import count_observations
+        from instincts.observer import observe_pre
+
+        project_root, _ = create_project_structure(tmp_path)
+        for _ in range(5):
+            observe_pre({"tool_name": "Read", "session_id": "s1"}, project_root)
+
+        assert count_observations(project_root) == 5
@@ -91,6 +91,38 @@ class TestObservePre:
         event = json.loads(observations_file.read_text().strip())
         assert len(event["input"]) <= MAX_CONTENT_LENGTH
 
+    def test_observe_pre_records_file_path_and_command(self, tmp_path: Path):
+        """observe_pre should extract the file path and Bash command head once."""
+        from instincts.observer import observe_pre
+
+        project_root, _instincts_dir, observations_file = create_project_structure(tmp_path)
+
+        observe_pre({"tool_name": "Edit", "tool_input": {"file_path": "/app/a.py"}, "session_id": "s1"}, project_root)
+        observe_pre({"tool_name": "Bash", "tool_input": {"command": "pytest -q\necho done"}, "session_id": "s1"}, project_root)
+
+        edit, bash = (json.loads(line) for line in observations_file.read_text().splitlines())
+        assert edit["file_path"] == "/app/a.py"
+        assert "command" not in edit
+        assert bash["file_path"] is None
+        assert bash["command"] == "pytest -q"
+        assert list(bash)[-1] == "input"
+
+    def test_observe_pre_records_full_input_size_and_digest(self, tmp_path: Path):
+        """observe_pre should keep a JSON prefix of a large input plus its size and digest."""
+        from instincts.observer import MAX_CONTENT_LENGTH, observe_pre
+        from instincts.payload import encode_bounded
+
+        project_root, _instincts_dir, observations_file = create_project_structure(tmp_path)
+        tool_input = {"file_path": "/app/big.txt", "content": "line\n" * 100_000}
+
+        observe_pre({"tool_name": "Write", "tool_input": tool_input, "session_id": "s1"}, project_root)
+
+        event = json.loads(observations_file.read_text().strip())
+        assert event["input"] == json.dumps(tool_input)[:MAX_CONTENT_LENGTH]
+        assert event["input_length"] > MAX_CONTENT_LENGTH
+        assert event["input_digest"] == encode_bounded(tool_input, 0).digest
+        assert event["file_path"] == "/app/big.txt"
+
 
 class TestObservePost:
     """Tests for observe_post function."""
@@ -137,6 +169,26 @@ class TestObservePost:
         event = json.loads(observations_file.read_text().strip())
         assert len(event["output"]) <= MAX_CONTENT_LENGTH
 
+    def test_observe_post_records_error_fields(self, tmp_path: Path):
+        """observe_post should record the error flag, type and full output length."""
+        from instincts.observer import MAX_CONTENT_LENGTH, observe_post
+
+        project_root, _instincts_dir, observations_file = create_project_structure(tmp_path)
+        output = "ImportError: no module named foo\n" + "x" * MAX_CONTENT_LENGTH
+
+        observe_post({"tool_name": "Bash", "tool_output": output, "session_id": "s1"}, project_root)
+        observe_post({"tool_name": "Bash", "tool_output": "ok", "session_id": "s1"}, project_root)
+
+        failed, passed = (json.loads(line) for line in observations_file.read_text().splitlines())
+        assert failed["is_error"] is True
+        assert failed["error_type"] == "ImportError"
+        assert failed["output_length"] == len(output)
+        assert len(failed["output_digest"]) == 32
+        assert failed["output_digest"] != passed["output_digest"]
+        assert passed["is_error"] is False
+        assert passed["error_type"] is None
+        assert passed["output_length"] == 2
+
 
 class TestObservationFileManagement:
     """Tests for observation file management."""
@@ -175,13 +227,26 @@ class TestObservationFileManagement:
         lines = observations_file.read_text().strip().split("\n")
         assert len(lines) == 2
 
+    def test_writes_large_fields_last(self, tmp_path: Path):
+        """Large fields should follow all others so projected loads can skip them."""
+        from instincts.observation_log import append_observation
+
+        observations_file = tmp_path / "observations.jsonl"
+
+        append_observation(
+            {"output": "x" * 100, "event": "tool_complete", "session": "s1"}, observations_file
+        )
+
+        assert list(json.loads(observations_file.read_text())) == ["event", "session", "output"]
+
 
 class TestFileArchiving:
     """Tests for file archiving when size exceeds threshold."""
 
     def test_archives_file_when_exceeds_max_size(self, tmp_path: Path):
         """Should archive observations file when it exceeds MAX_FILE_SIZE_MB."""
-        from instincts.observer import MAX_FILE_SIZE_MB, observe_pre
+        from instincts.observation_log import MAX_FILE_SIZE_MB
+        from instincts.observer import observe_pre
 
         project_root, instincts_dir, observations_file = create_project_structure(tmp_path)
         archive_dir = instincts_dir / "observations.archive"
@@ -203,7 +268,8 @@ class TestFileArchiving:
         """Archive directory should be created with mode 0o700."""
         import stat
 
-        from instincts.observer import MAX_FILE_SIZE_MB, observe_pre
+        from instincts.observation_log import MAX_FILE_SIZE_MB
+        from instincts.observer import observe_pre
 
         project_root, instincts_dir, observations_file = create_project_structure(tmp_path)
         archive_dir = instincts_dir / "observations.archive"
@@ -373,21 +439,32 @@ class TestAnalysisTriggerPerformance:
         """Should use modulo check to avoid checking on every observation."""
         from instincts.observer import (
             ANALYSIS_TRIGGER_CHECK_INTERVAL,
-            get_observation_counter,
             increment_observation_counter,
-            reset_observation_counter,
         )
 
-        reset_observation_counter()
+        project_root, _instincts_dir, _observations_file = create_project_structure(tmp_path)
 
         # Increment counter
         for i in range(ANALYSIS_TRIGGER_CHECK_INTERVAL - 1):
-            counter = increment_observation_counter()
+            counter = increment_observation_counter(project_root)
             assert counter == i + 1
 
         # At interval, counter should trigger check
-        counter = increment_observation_counter()
-        assert counter >= ANALYSIS_TRIGGER_CHECK_INTERVAL
+        counter = increment_observation_counter(project_root)
+        assert counter % ANALYSIS_TRIGGER_CHECK_INTERVAL == 0
+
+    def test_observe_post_checks_trigger_once_per_interval(self, tmp_path: Path):
+        """Trigger check should run on every Nth observe_post call, even across processes."""
+        from instincts.observer import ANALYSIS_TRIGGER_CHECK_INTERVAL, observe_post
+
+        project_root, _instincts_dir, _observations_file = create_project_structure(tmp_path)
+        hook_data = {"tool_name": "Read", "tool_output": "ok", "session_id": "s1"}
+
+        with patch("instincts.observer.should_trigger_learning", return_value=False) as mock_check:
+            for _ in range(ANALYSIS_TRIGGER_CHECK_INTERVAL * 2):
+                observe_post(hook_data, project_root)
+
+        assert mock_check.call_count == 2
 
 
 class TestAtomicMarkerCreation:
@@ -448,13 +525,13 @@ class TestFileLocking:
 
     def test_write_observation_releases_lock_on_exception(self, tmp_path: Path):
         """Should release lock even if write fails."""
-        from instincts.observer import _append_observation_with_lock
+        from instincts.observation_log import append_observation
 
         project_root, instincts_dir, observations_file = create_project_structure(tmp_path)
         observations_file.write_text("")
 
         # Write should work
-        _append_observation_with_lock({"test": "data"}, observations_file)
+        append_observation({"test": "data"}, observations_file)
 
         # Should be able to read the file (lock released)
         content = observations_file.read_text()
@@ -525,22 +602,73 @@ class TestGetOldestObservationTimestamp:
         assert timestamp is None
 
 
-class TestThreadSafeCounter:
-    """Tests for thread-safe observation counter."""
+class TestSharedCounter:
+    """Tests for the cross-process observation counter."""
 
-    def test_counter_is_thread_local(self):
-        """Counter should be thread-local."""
+    def test_counter_persists_in_project_file(self, tmp_path: Path):
+        """Counter should be stored in the project and survive new processes."""
+        from instincts.config import get_observation_counter_file
         from instincts.observer import (
             get_observation_counter,
             increment_observation_counter,
-            reset_observation_counter,
         )
 
-        reset_observation_counter()
-        assert get_observation_counter() == 0
+        project_root, _instincts_dir, _observations_file = create_project_structure(tmp_path)
+        assert get_observation_counter(project_root) == 0
+
+        increment_observation_counter(project_root)
+        increment_observation_counter(project_root)
+
+        assert get_observation_counter(project_root) == 2
+        assert get_observation_counter_file(project_root).exists()
+
+    def test_counter_is_atomic_across_processes(self, tmp_path: Path):
+        """Concurrent processes should never lose increments."""
+        import multiprocessing
+
+        from instincts.observer import get_observation_counter
+
+        project_root, _instincts_dir, _observations_file = create_project_structure(tmp_path)
+        ctx = multiprocessing.get_context("fork")
+        processes = [
+            ctx.Process(target=_increment_many, args=(project_root, 50)) for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert get_observation_counter(project_root) == 200
+
+    def test_corrupt_counter_restarts_from_zero(self, tmp_path: Path):
+        """A corrupt counter file should not break the hook."""
+        from instincts.config import get_observation_counter_file
+        from instincts.observer import increment_observation_counter
+
+        project_root, _instincts_dir, _observations_file = create_project_structure(tmp_path)
+        get_observation_counter_file(project_root).write_text("garbage")
+
+        assert increment_observation_counter(project_root) == 1
+
+    def test_refuses_symlinked_counter(self, tmp_path: Path):
+        """Counter file should not follow symlinks."""
+        import pytest
+
+        from instincts.config import get_observation_counter_file
+        from instincts.observer import increment_observation_counter
+
+        project_root, _instincts_dir, _observations_file = create_project_structure(tmp_path)
+        target = tmp_path / "elsewhere"
+        target.write_text("")
+        get_observation_counter_file(project_root).symlink_to(target)
+
+        with pytest.raises(OSError):
+            increment_observation_counter(project_root)
+
 
-        increment_observation_counter()
-        assert get_observation_counter() == 1
+def _increment_many(project_root: Path, count: int) -> None:
+    """Increment the shared counter count times (multiprocessing target)."""
+    from instincts.observer import increment_observation_counter
 
-        reset_observation_counter()
-        assert get_observation_counter() == 0
+    for _ in range(count):
+        increment_observation_counter(project_root)
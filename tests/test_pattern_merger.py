@@ -157,6 +157,28 @@ class TestMergePatterns:
             assert metadata_dict["source"] in ("algorithm", "llm", "merged")
 
 
+class TestMergeAggregatedPatterns:
+    """Tests for merging aggregated algorithm patterns."""
+
+    def test_matched_merge_adds_llm_evidence_to_occurrences(self):
+        """Merged occurrences should include the LLM evidence on top of the count."""
+        from dataclasses import replace
+
+        from instincts.pattern_merger import merge_patterns
+
+        algo = _create_pattern(
+            PatternType.ERROR_RESOLUTION, "when encountering errors", "Fix errors"
+        )
+        algo = replace(algo, metadata=algo.metadata + (("occurrences", 25),))
+        llm = _create_pattern(
+            PatternType.ERROR_RESOLUTION, "when encountering errors", "Fix errors", source="llm"
+        )
+
+        merged = merge_patterns([algo], [llm])
+
+        assert merged[0].occurrences == 26
+
+
 class TestPatternSimilarity:
     """Tests for pattern similarity calculation."""
 
@@ -278,3 +300,27 @@ class TestCalculateConfidenceBoost:
         from instincts.pattern_merger import LLM_ONLY_CONFIDENCE_MULTIPLIER
 
         assert LLM_ONLY_CONFIDENCE_MULTIPLIER == 0.9
+
+
+class TestMergeSubsumedWorkflows:
+    """Tests for dropping workflows contained in a workflow from the other approach."""
+
+    def test_llm_workflow_contained_in_algorithm_workflow_is_dropped(self):
+        """A shorter workflow should be dropped; ones without a sequence are kept."""
+        from dataclasses import replace
+
+        from instincts.pattern_merger import merge_patterns
+
+        def workflow(trigger: str, *tools: str, source: str = "algorithm") -> Pattern:
+            pattern = _create_pattern(PatternType.REPEATED_WORKFLOW, trigger, "Workflow", source=source)
+            return replace(pattern, metadata=pattern.metadata + (("sequence", list(tools)),))
+
+        algo = workflow("when searching code", "Grep", "Read", "Edit", "Bash")
+        contained = workflow("when running tests", "Read", "Edit", "Bash", source="llm")
+        unsequenced = _create_pattern(
+            PatternType.REPEATED_WORKFLOW, "when releasing", "Release workflow", source="llm"
+        )
+
+        merged = merge_patterns([algo], [contained, unsequenced])
+
+        assert [p.trigger for p in merged] == ["when searching code", "when releasing"]
@@ -256,6 +256,55 @@ class TestDetectErrorResolutions:
         assert all(p.pattern_type == PatternType.ERROR_RESOLUTION for p in patterns)
 
 
+class TestPatternAggregation:
+    """Tests for aggregating repeated occurrences into one pattern."""
+
+    def test_repeated_error_type_is_one_pattern(self):
+        """Resolutions of the same error type should be counted on one pattern."""
+        from instincts.patterns import (
+            MAX_EVIDENCE_PER_PATTERN,
+            detect_error_resolutions,
+        )
+
+        observations = []
+        for i in range(30):
+            observations += [
+                {"event": "tool_complete", "tool": "Bash", "output": "ImportError: x", "session": f"s{i}", "timestamp": f"2026-02-09T10:{i:02d}:00Z"},
+                {"event": "tool_complete", "tool": "Bash", "output": "ok", "session": f"s{i}", "timestamp": f"2026-02-09T10:{i:02d}:30Z"},
+            ]
+        observations += [
+            {"event": "tool_complete", "tool": "Bash", "output": "TypeError: y", "session": "t", "timestamp": "2026-02-09T11:00:00Z"},
+            {"event": "tool_complete", "tool": "Bash", "output": "ok", "session": "t", "timestamp": "2026-02-09T11:00:30Z"},
+        ]
+
+        patterns = detect_error_resolutions(observations)
+
+        by_type = {dict(p.metadata)["error_type"]: p for p in patterns}
+        assert set(by_type) == {"ImportError", "TypeError"}
+        assert by_type["ImportError"].occurrences == 30
+        assert len(by_type["ImportError"].evidence) == MAX_EVIDENCE_PER_PATTERN
+        assert by_type["ImportError"].evidence[-1].session_id == "s29"
+        assert by_type["TypeError"].occurrences == 1
+
+    def test_corrections_aggregate_per_file(self):
+        """Write->Edit corrections should be aggregated per file path."""
+        from instincts.patterns import detect_user_corrections
+
+        observations = []
+        for i, path in enumerate(["/a.py", "/a.py", "/b.py"]):
+            observations += [
+                {"event": "tool_start", "tool": "Write", "input": json.dumps({"file_path": path}), "session": f"s{i}", "timestamp": "2026-02-09T10:00:00Z"},
+                {"event": "tool_start", "tool": "Edit", "input": json.dumps({"file_path": path}), "session": f"s{i}", "timestamp": "2026-02-09T10:01:00Z"},
+            ]
+
+        patterns = detect_user_corrections(observations)
+
+        assert [(dict(p.metadata)["file_path"], p.occurrences) for p in patterns] == [
+            ("/a.py", 2),
+            ("/b.py", 1),
+        ]
+
+
 class TestDetectRepeatedWorkflows:
     """Tests for detect_repeated_workflows function (AC-4.1, AC-4.2, AC-4.3)."""
 
@@ -361,6 +410,49 @@ class TestDetectRepeatedWorkflows:
         assert len(patterns) >= 1
 
 
+class TestRemoveSubsumedWorkflows:
+    """Tests for remove_subsumed_workflows pruning stage."""
+
+    def test_drops_workflows_contained_in_longer_ones(self):
+        """Workflow contained in a longer workflow should be removed; others kept."""
+        from datetime import datetime, timezone
+
+        from instincts.models import Evidence, Pattern, PatternType
+        from instincts.patterns import remove_subsumed_workflows
+
+        def workflow(*tools: str) -> Pattern:
+            return Pattern(
+                pattern_type=PatternType.REPEATED_WORKFLOW,
+                trigger=f"when performing {tools[0].lower()} operations",
+                description=f"Repeated workflow: {' -> '.join(tools)}",
+                evidence=(),
+                domain="workflow",
+                metadata=(("sequence", list(tools)),),
+            )
+
+        preference = Pattern(
+            pattern_type=PatternType.TOOL_PREFERENCE,
+            trigger="when using Read tool",
+            description="Consistent use of Read tool",
+            evidence=(
+                Evidence(
+                    timestamp=datetime.now(timezone.utc),
+                    session_id="s1",
+                    description="Tool Read used in session",
+                ),
+            ),
+            domain="tool-usage",
+            metadata=(("tool", "Read"),),
+        )
+        short = workflow("Read", "Edit", "Bash")
+        long = workflow("Grep", "Read", "Edit", "Bash")
+        other = workflow("Write", "Bash", "Read")
+
+        result = remove_subsumed_workflows([short, preference, long, other])
+
+        assert result == [preference, long, other]
+
+
 class TestDetectToolPreferences:
     """Tests for detect_tool_preferences function (AC-5.1, AC-5.2, AC-5.3)."""
 
@@ -486,6 +578,82 @@ class TestDetectAllPatterns:
         assert len(pattern_types) >= 1  # At least one type detected
 
 
+class TestDetectionPipeline:
+    """Tests for DetectionPipeline shared session view."""
+
+    def _observations(self) -> list[dict]:
+        return [
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/main.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:30Z"},
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/main.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_complete", "tool": "Bash", "output": "error: something failed", "session": "s2", "timestamp": "2026-02-09T11:00:00Z"},
+            {"event": "tool_complete", "tool": "Bash", "output": "Success", "session": "s2", "timestamp": "2026-02-09T11:01:00Z"},
+            {"event": "tool_start", "tool": "Read", "session": "s1", "timestamp": "2026-02-09T10:01:00Z"},
+            {"event": "tool_start", "tool": "Read", "session": "s2", "timestamp": "2026-02-09T11:02:00Z"},
+            {"event": "tool_start", "tool": "Read", "session": "s2", "timestamp": "2026-02-09T11:03:00Z"},
+        ]
+
+    def test_sessions_are_grouped_and_sorted_once(self):
+        """Sessions should be grouped and sorted by timestamp at construction."""
+        from unittest.mock import patch
+
+        from instincts.batch import ObservationBatch
+        from instincts.patterns import DetectionPipeline
+
+        with patch.object(
+            ObservationBatch, "session_rows", autospec=True, side_effect=ObservationBatch.session_rows
+        ) as group_spy:
+            pipeline = DetectionPipeline(self._observations())
+            pipeline.detect_all()
+
+        batch = pipeline.batch
+        assert group_spy.call_count == 1
+        assert [batch.tool_name(row) for row in pipeline.session_rows["s1"]] == [
+            "Write",
+            "Edit",
+            "Read",
+        ]
+
+    def test_detect_all_matches_individual_detectors(self):
+        """Pipeline output should equal running each public detector separately."""
+        from instincts.patterns import (
+            DetectionPipeline,
+            detect_error_resolutions,
+            detect_repeated_workflows,
+            detect_tool_preferences,
+            detect_user_corrections,
+        )
+
+        observations = self._observations()
+        expected = (
+            detect_user_corrections(observations)
+            + detect_error_resolutions(observations)
+            + detect_repeated_workflows(observations)
+            + detect_tool_preferences(observations)
+        )
+
+        result = DetectionPipeline(observations).detect_all()
+
+        assert [(p.pattern_type, p.trigger, p.metadata) for p in result] == [
+            (p.pattern_type, p.trigger, p.metadata) for p in expected
+        ]
+        assert {p.pattern_type.value for p in result} == {
+            "user_correction",
+            "error_resolution",
+            "tool_preference",
+        }
+
+    def test_does_not_mutate_input_order(self):
+        """Building the view should not reorder the caller's list."""
+        from instincts.patterns import DetectionPipeline
+
+        observations = self._observations()
+        before = list(observations)
+
+        DetectionPipeline(observations).detect_all()
+
+        assert observations == before
+
+
 class TestLoadRecentObservations:
     """Tests for load_recent_observations function (AC-R2.3)."""
 
@@ -572,3 +740,371 @@ class TestLoadRecentObservations:
         assert len(result) == 2
         assert result[0]["idx"] == 1
         assert result[1]["idx"] == 2
+
+    def test_skips_partially_written_final_line(self, tmp_path: Path):
+        """Should ignore a torn final line that has no trailing newline."""
+        from instincts.patterns import load_recent_observations
+
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(
+            '{"event": "tool_start", "idx": 0}\n'
+            '{"event": "tool_start", "idx": 1}\n'
+            '{"event": "tool_sta'
+        )
+
+        result = load_recent_observations(obs_file, limit=2)
+
+        assert [obs["idx"] for obs in result] == [0, 1]
+
+    def test_reads_lines_spanning_block_boundaries(self, tmp_path: Path, monkeypatch):
+        """Lines split across backward-read blocks should be reassembled."""
+        from instincts import patterns
+        from instincts.patterns import load_recent_observations
+
+        monkeypatch.setattr(patterns, "TAIL_READ_BLOCK_SIZE", 7)
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(
+            "".join(f'{{"event": "tool_start", "idx": {i}}}\n' for i in range(50))
+        )
+
+        result = load_recent_observations(obs_file, limit=20)
+
+        assert [obs["idx"] for obs in result] == list(range(30, 50))
+
+    def test_does_not_read_whole_file(self, tmp_path: Path):
+        """Should only read blocks near the end of a large file."""
+        from unittest.mock import patch
+
+        from instincts import patterns
+        from instincts.patterns import load_recent_observations
+
+        obs_file = tmp_path / "observations.jsonl"
+        line = '{"event": "tool_start", "payload": "' + "x" * 200 + '"}\n'
+        obs_file.write_text(line * 20000)
+
+        read_sizes: list[int] = []
+        original_iter = patterns._iter_lines_reversed
+
+        def tracking_iter(f):
+            original_read = f.read
+
+            def tracking_read(size=-1):
+                data = original_read(size)
+                read_sizes.append(len(data))
+                return data
+
+            f.read = tracking_read
+            return original_iter(f)
+
+        with patch("instincts.patterns._iter_lines_reversed", tracking_iter):
+            result = load_recent_observations(obs_file, limit=10)
+
+        assert len(result) == 10
+        assert sum(read_sizes) < obs_file.stat().st_size // 10
+
+
+class TestLoadObservationsSince:
+    """Tests for load_observations_since checkpoint reader."""
+
+    def test_reads_only_lines_after_checkpoint(self, tmp_path: Path):
+        """Should return lines appended after the checkpoint offset."""
+        from instincts.checkpoint import AnalysisCheckpoint
+        from instincts.patterns import load_observations_since
+
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text('{"n": 1}\n{"n": 2}\n')
+        first = load_observations_since(obs_file, None)
+        with obs_file.open("a") as f:
+            f.write('{"n": 3}\n{"n": 4}\n')
+
+        checkpoint = AnalysisCheckpoint(inode=first.inode, offset=first.offset, carry_over={})
+        second = load_observations_since(obs_file, checkpoint)
+
+        assert [obs["n"] for obs in first.observations] == [1, 2]
+        assert first.resumed is False
+        assert [obs["n"] for obs in second.observations] == [3, 4]
+        assert second.resumed is True
+        assert second.offset == obs_file.stat().st_size
+
+    def test_leaves_unterminated_line_for_next_read(self, tmp_path: Path):
+        """A line without a trailing newline should be read once it is complete."""
+        from instincts.checkpoint import AnalysisCheckpoint
+        from instincts.patterns import load_observations_since
+
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text('{"n": 1}\n{"n": ')
+        first = load_observations_since(obs_file, None)
+        with obs_file.open("a") as f:
+            f.write("2}\n")
+
+        second = load_observations_since(
+            obs_file, AnalysisCheckpoint(inode=first.inode, offset=first.offset, carry_over={})
+        )
+
+        assert [obs["n"] for obs in first.observations] == [1]
+        assert [obs["n"] for obs in second.observations] == [2]
+
+    def test_replaced_file_falls_back_to_latest_window(self, tmp_path: Path):
+        """A checkpoint for a different inode should not be resumed."""
+        from instincts.checkpoint import AnalysisCheckpoint
+        from instincts.patterns import load_observations_since
+
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text("".join(f'{{"n": {i}}}\n' for i in range(10)))
+        stale = AnalysisCheckpoint(
+            inode=obs_file.stat().st_ino + 1, offset=5, carry_over={}
+        )
+
+        result = load_observations_since(obs_file, stale, limit=3)
+
+        assert result.resumed is False
+        assert [obs["n"] for obs in result.observations] == [7, 8, 9]
+
+    def test_truncated_file_is_not_resumed(self, tmp_path: Path):
+        """An offset beyond the end of the file should trigger a fresh read."""
+        from instincts.checkpoint import AnalysisCheckpoint
+        from instincts.patterns import load_observations_since
+
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text('{"n": 1}\n')
+        checkpoint = AnalysisCheckpoint(
+            inode=obs_file.stat().st_ino, offset=10_000, carry_over={}
+        )
+
+        result = load_observations_since(obs_file, checkpoint)
+
+        assert result.resumed is False
+        assert [obs["n"] for obs in result.observations] == [1]
+
+    def test_returns_none_for_missing_file(self, tmp_path: Path):
+        """Missing file should return None."""
+        from instincts.patterns import load_observations_since
+
+        assert load_observations_since(tmp_path / "missing.jsonl", None) is None
+
+
+class TestDetectionCarryOver:
+    """Tests for detector state carried across an analysis checkpoint."""
+
+    def _split_run(self, first: list[dict], second: list[dict]) -> list:
+        from instincts.patterns import DetectionPipeline
+
+        earlier = DetectionPipeline(first)
+        earlier.detect_all()
+        return DetectionPipeline(second, earlier.carry_over()).detect_all()
+
+    def test_write_then_edit_across_checkpoint(self):
+        """An Edit after the checkpoint should match a Write before it."""
+        patterns = self._split_run(
+            [{"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"}],
+            [{"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:01:00Z"}],
+        )
+
+        assert [p.pattern_type.value for p in patterns] == ["user_correction"]
+        assert dict(patterns[0].metadata)["file_path"] == "/app/a.py"
+
+    def test_error_then_success_across_checkpoint(self):
+        """A success after the checkpoint should resolve an error before it."""
+        patterns = self._split_run(
+            [{"event": "tool_complete", "tool": "Bash", "output": "ImportError: boom", "session": "s1", "timestamp": "2026-02-09T10:00:00Z"}],
+            [{"event": "tool_complete", "tool": "Bash", "output": "ok", "session": "s1", "timestamp": "2026-02-09T10:01:00Z"}],
+        )
+
+        assert [p.pattern_type.value for p in patterns] == ["error_resolution"]
+        assert dict(patterns[0].metadata)["error_type"] == "ImportError"
+
+    def test_correction_lookback_across_checkpoint(self):
+        """A correction message should see the tool completion before the checkpoint."""
+        patterns = self._split_run(
+            [{"event": "tool_complete", "tool": "Write", "session": "s1", "timestamp": "2026-02-09T10:00:00Z"}],
+            [{"event": "user_message", "content": "no, use tabs instead", "session": "s1", "timestamp": "2026-02-09T10:01:00Z"}],
+        )
+
+        assert [dict(p.metadata).get("tool") for p in patterns] == ["Write"]
+
+    def test_carried_completion_without_tool_is_unknown(self):
+        """A carried completion without a tool should be reported as in one window."""
+        from instincts.patterns import (
+            DetectionPipeline,
+            merge_summaries,
+            summarize_observations,
+        )
+
+        first = [{"event": "tool_complete", "session": "s1", "timestamp": "2026-02-09T10:00:00Z"}]
+        second = [{"event": "user_message", "content": "no, use tabs instead", "session": "s1", "timestamp": "2026-02-09T10:01:00Z"}]
+
+        whole = DetectionPipeline(first + second).detect_all()
+        split = self._split_run(first, second)
+        merged = merge_summaries([summarize_observations(first), summarize_observations(second)])
+
+        assert [dict(p.metadata).get("tool") for p in whole] == ["unknown"]
+        assert [dict(p.metadata).get("tool") for p in split] == ["unknown"]
+        assert [dict(p.metadata).get("tool") for p in merged] == ["unknown"]
+
+    def test_carried_context_is_not_redetected(self):
+        """Patterns found before the checkpoint should not be reported again."""
+        from instincts.patterns import DetectionPipeline
+
+        first = [
+            {"event": "tool_start", "tool": "Write", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:00:00Z"},
+            {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/app/a.py"}', "session": "s1", "timestamp": "2026-02-09T10:01:00Z"},
+        ]
+        pipeline = DetectionPipeline(first)
+
+        assert len(pipeline.detect_user_corrections()) == 1
+        assert DetectionPipeline([], pipeline.carry_over()).detect_all() == []
+
+    def test_carry_over_keeps_most_recent_sessions(self, monkeypatch):
+        """Only the most recently active sessions should be carried."""
+        from instincts import patterns
+        from instincts.patterns import DetectionPipeline
+
+        monkeypatch.setattr(patterns, "MAX_CARRY_OVER_SESSIONS", 2)
+        observations = [
+            {"event": "tool_start", "tool": "Read", "session": f"s{i}", "timestamp": f"2026-02-09T10:0{i}:00Z"}
+            for i in range(4)
+        ]
+
+        carry_over = DetectionPipeline(observations).carry_over()
+
+        assert set(carry_over) == {"s2", "s3"}
+
+
+class TestFieldProjection:
+    """Tests for loading only the fields the enabled detectors read."""
+
+    def test_skips_unneeded_large_fields(self, tmp_path: Path):
+        """Large fields outside the projection should not be decoded."""
+        from instincts.patterns import load_observations, required_fields
+
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(
+            json.dumps({"event": "tool_complete", "tool": "Bash", "session": "s1", "timestamp": "t", "output": "x" * 5000}) + "\n"
+        )
+
+        observations = load_observations(obs_file, required_fields(["repeated_workflows"]))
+
+        assert observations == [{"event": "tool_complete", "tool": "Bash", "session": "s1", "timestamp": "t"}]
+
+    def test_keeps_projected_large_fields(self, tmp_path: Path):
+        """Large fields in the projection should be returned in full."""
+        from instincts.patterns import load_observations, required_fields
+
+        obs = {"event": "tool_complete", "tool": "Bash", "session": "s1", "timestamp": "t", "output": "Error: x"}
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(json.dumps(obs) + "\n")
+
+        assert load_observations(obs_file, required_fields(["error_resolutions"])) == [obs]
+
+    def test_falls_back_when_needed_field_follows_large_one(self, tmp_path: Path):
+        """Lines not written large-fields-last should still return every projected field."""
+        from instincts.patterns import load_observations
+
+        obs = {"event": "tool_start", "input": '{"file_path": "/a.py"}', "tool": "Read", "session": "s1"}
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(json.dumps(obs) + "\n")
+
+        observations = load_observations(obs_file, ["event", "tool", "session"])
+
+        assert observations == [obs]
+
+    def test_marker_text_inside_values_is_ignored(self, tmp_path: Path):
+        """Field names quoted inside string values should not cut the line."""
+        from instincts.patterns import load_observations
+
+        obs = {"event": "tool_start", "tool": 'a, "input": b', "session": "s1", "input": "x"}
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(json.dumps(obs) + "\n")
+
+        assert load_observations(obs_file, ["event", "tool", "session"]) == [
+            {"event": "tool_start", "tool": 'a, "input": b', "session": "s1"}
+        ]
+
+    def test_required_fields_is_union_of_detectors(self):
+        """The projection should cover every enabled detector."""
+        from instincts.patterns import required_fields
+
+        assert "output" not in required_fields(["repeated_workflows", "tool_preferences"])
+        assert {"input", "output", "content"} <= required_fields()
+
+    def test_unknown_detector_is_rejected(self):
+        """A misspelled detector name should raise."""
+        import pytest
+
+        from instincts.patterns import required_fields
+
+        with pytest.raises(ValueError, match="Unknown detector"):
+            required_fields(["tool_preference"])
+
+    def test_detect_all_patterns_runs_selected_detectors(self, tmp_path: Path):
+        """Only the selected detectors should run, over projected observations."""
+        from instincts.models import PatternType
+        from instincts.patterns import detect_all_patterns
+
+        observations = [
+            {"event": "tool_start", "tool": tool, "session": f"s{i}", "timestamp": f"2026-02-09T10:0{i}:0{j}Z", "input": "x" * 100}
+            for i in range(2)
+            for j, tool in enumerate(("Read", "Grep", "Edit", "Write"))
+        ]
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text("".join(json.dumps(obs) + "\n" for obs in observations))
+
+        patterns = detect_all_patterns(obs_file, detectors=["repeated_workflows"])
+
+        assert [p.pattern_type for p in patterns] == [PatternType.REPEATED_WORKFLOW]
+
+
+class TestEnrichedObservations:
+    """Tests for detectors reading the keys recorded at write time."""
+
+    def test_write_edit_uses_recorded_file_path(self):
+        """The recorded file path should be used without parsing the input."""
+        from instincts.patterns import detect_user_corrections
+
+        observations = [
+            {"event": "tool_start", "tool": "Write", "session": "s1", "timestamp": "2026-02-09T10:00:00Z", "file_path": "/app/a.py", "input": "truncated {"},
+            {"event": "tool_start", "tool": "Edit", "session": "s1", "timestamp": "2026-02-09T10:01:00Z", "file_path": "/app/a.py", "input": "truncated {"},
+        ]
+
+        patterns = detect_user_corrections(observations)
+
+        assert [dict(p.metadata)["file_path"] for p in patterns] == ["/app/a.py"]
+
+    def test_error_resolution_uses_recorded_flag_and_type(self):
+        """The recorded error flag and type should win over scanning the output."""
+        from instincts.patterns import detect_error_resolutions
+
+        observations = [
+            {"event": "tool_complete", "tool": "Bash", "session": "s1", "timestamp": "2026-02-09T10:00:00Z", "is_error": True, "error_type": "CustomError", "output": "oops"},
+            {"event": "tool_complete", "tool": "Bash", "session": "s1", "timestamp": "2026-02-09T10:01:00Z", "is_error": False, "output": "0 errors"},
+        ]
+
+        patterns = detect_error_resolutions(observations)
+
+        assert [dict(p.metadata)["error_type"] for p in patterns] == ["CustomError"]
+
+    def test_projection_skips_superseded_output(self, tmp_path: Path):
+        """Non-error output should not be decoded when is_error was recorded."""
+        from instincts.patterns import load_observations, required_fields
+
+        ok = {"event": "tool_complete", "session": "s1", "is_error": False, "error_type": None, "output": "x" * 100}
+        failed = {"event": "tool_complete", "session": "s1", "is_error": True, "error_type": "TypeError", "output": "TypeError"}
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(json.dumps(ok) + "\n" + json.dumps(failed) + "\n")
+
+        observations = load_observations(obs_file, required_fields(["error_resolutions"]))
+
+        assert observations == [{k: v for k, v in ok.items() if k != "output"}, failed]
+
+    def test_projection_keeps_input_of_legacy_lines(self, tmp_path: Path):
+        """Lines without a recorded file path should keep their input."""
+        from instincts.patterns import load_observations, required_fields
+
+        enriched = {"event": "tool_start", "tool": "Edit", "file_path": "/a.py", "input": '{"file_path": "/a.py"}'}
+        legacy = {"event": "tool_start", "tool": "Edit", "input": '{"file_path": "/a.py"}'}
+        obs_file = tmp_path / "observations.jsonl"
+        obs_file.write_text(json.dumps(enriched) + "\n" + json.dumps(legacy) + "\n")
+
+        observations = load_observations(obs_file, required_fields(["user_corrections"]))
+
+        assert observations == [{"event": "tool_start", "tool": "Edit", "file_path": "/a.py"}, legacy]
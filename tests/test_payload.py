@@ -0,0 +1,111 @@
+"""Tests for instincts.payload module.
+
+Tests cover:
+- Kept text matching json.dumps()/str() cut to the limit
+- Size and digest of the whole payload
+- Values json.dumps() rejects
+"""
+
+import hashlib
+import json
+import random
+
+import pytest
+
+SAMPLES = [
+    {},
+    {"file_path": "/a.py", "content": "print('hi')\n"},
+    {"command": 'echo "quoted" \\ back\tslash', "timeout": 30, "background": False},
+    {"nested": {"list": [1, 2.5, None, True, [], {}], "tuple": (1, "two")}, "empty": ""},
+    {"unicode": "héllo wörld ✓ 😀", "control": "\x00\x1f\x7f", "lone": "\ud800"},
+    {1: "int key", 2.5: "float key", False: "bool key", None: "none key"},
+    {"floats": [0.1, -0.0, 1e300, float("nan"), float("inf"), float("-inf")]},
+    {"big": 10**40, "neg": -7},
+]
+
+
+def random_payload(rng: random.Random, depth: int = 0):
+    """A random JSON-compatible value with escapes and non-ASCII text."""
+    kind = rng.randrange(7 if depth < 3 else 4)
+    if kind == 0:
+        return "".join(rng.choice('ab"\\\n\té😀') for _ in range(rng.randrange(30)))
+    if kind == 1:
+        return rng.randrange(-1000, 1000)
+    if kind == 2:
+        return rng.random() * 100
+    if kind == 3:
+        return rng.choice((None, True, False))
+    if kind == 4:
+        return [random_payload(rng, depth + 1) for _ in range(rng.randrange(5))]
+    return {f"k{i}\"é": random_payload(rng, depth + 1) for i in range(rng.randrange(5))}
+
+
+class TestEncodeBounded:
+    """Tests for encode_bounded."""
+
+    @pytest.mark.parametrize("value", SAMPLES)
+    def test_text_is_json_prefix(self, value):
+        """Kept text should equal json.dumps() cut at every limit."""
+        from instincts.payload import encode_bounded
+
+        full = json.dumps(value)
+        for limit in range(len(full) + 2):
+            assert encode_bounded(value, limit).text == full[:limit]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_payloads_match_json(self, seed: int):
+        """Random nested payloads should be cut exactly like json.dumps()."""
+        from instincts.payload import encode_bounded
+
+        rng = random.Random(seed)
+        value = {"root": random_payload(rng), "tail": random_payload(rng)}
+        full = json.dumps(value)
+        for limit in (0, 1, len(full) // 3, len(full) // 2, len(full) - 1, len(full), len(full) + 5):
+            assert encode_bounded(value, limit).text == full[:limit]
+
+    def test_non_dict_values_use_str(self):
+        """Strings and other non-dict values should be rendered with str()."""
+        from instincts.payload import encode_bounded
+
+        assert encode_bounded("abcdef", 3).text == "abc"
+        assert encode_bounded(["a", 1], 100).text == "['a', 1]"
+        assert encode_bounded(None, 100).text == "None"
+
+    def test_size_and_digest_cover_whole_text_payload(self):
+        """A text payload's size and digest should describe all of it."""
+        from instincts.payload import PAYLOAD_DIGEST_SIZE, encode_bounded
+
+        value = "é" * 10_000
+        bounded = encode_bounded(value, 100)
+
+        assert bounded.size == 10_000
+        assert bounded.truncated
+        assert bounded.digest == hashlib.blake2b(value.encode(), digest_size=PAYLOAD_DIGEST_SIZE).hexdigest()
+
+    def test_size_counts_dict_strings_unescaped(self):
+        """Dict sizes should count strings as raw characters plus quotes."""
+        from instincts.payload import encode_bounded
+
+        assert encode_bounded({"a": "x\ny"}, 100).size == len('{"a": "x\ny"}')
+        assert encode_bounded({"a": [1, None]}, 100).size == len(json.dumps({"a": [1, None]}))
+        assert not encode_bounded({"a": 1}, 100).truncated
+
+    def test_digest_ignores_limit_and_tracks_content(self):
+        """The digest should depend on the whole payload, not the kept prefix."""
+        from instincts.payload import encode_bounded
+
+        base = {"content": "x" * 1000 + "a"}
+        changed = {"content": "x" * 1000 + "b"}
+
+        assert encode_bounded(base, 10).digest == encode_bounded(base, 5000).digest
+        assert encode_bounded(base, 10).text == encode_bounded(changed, 10).text
+        assert encode_bounded(base, 10).digest != encode_bounded(changed, 10).digest
+
+    def test_rejects_unserializable_values(self):
+        """Values json.dumps() rejects should raise TypeError."""
+        from instincts.payload import encode_bounded
+
+        with pytest.raises(TypeError):
+            encode_bounded({"a": object()}, 100)
+        with pytest.raises(TypeError):
+            encode_bounded({(1, 2): "tuple key"}, 100)
@@ -0,0 +1,474 @@
+"""Tests for instincts.segments module.
+
+Tests cover:
+- Rollover of the active log into numbered segments with a manifest
+- Whole-log counts and time bounds spanning segments
+- Windowed readers continuing into closed segments
+- Manifest rebuild (missing, corrupt, pre-segment archives)
+- Compression, streaming reads and retention of closed segments
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+
+def append(observations_file: Path, observations: list[dict]) -> None:
+    """Append observations through the observer's locked writer."""
+    from instincts.observation_log import append_observation
+
+    for obs in observations:
+        append_observation(obs, observations_file)
+
+
+def obs(n: int) -> dict:
+    """Build a numbered observation."""
+    return {"n": n, "session": "s1", "timestamp": f"2026-02-09T10:{n:02d}:00+00:00"}
+
+
+def roll(observations_file: Path):
+    """Roll the active log over under its append lock."""
+    from instincts.segments import append_lock, roll_over
+
+    with append_lock(observations_file):
+        return roll_over(observations_file)
+
+
+class TestRollOver:
+    """Tests for closing the active log as a segment."""
+
+    def test_moves_log_into_numbered_segment(self, tmp_path: Path):
+        """The active log should become segment-000001 with a manifest entry."""
+        from instincts.segments import get_segment_dir, load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+
+        segment = roll(observations_file)
+
+        segment_dir = get_segment_dir(observations_file)
+        assert segment is not None
+        assert segment.name == "segment-000001.jsonl"
+        assert (segment_dir / segment.name).exists()
+        assert not observations_file.exists()
+        assert load_manifest(observations_file).segments == (segment,)
+        assert segment.line_count == 2
+        assert segment.first_timestamp == obs(1)["timestamp"]
+        assert segment.last_timestamp == obs(2)["timestamp"]
+
+    def test_segments_record_consecutive_line_ranges(self, tmp_path: Path):
+        """Each segment should start where the previous one ended."""
+        from instincts.segments import load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+        append(observations_file, [obs(3), obs(4), obs(5)])
+        roll(observations_file)
+
+        segments = load_manifest(observations_file).segments
+
+        assert [s.name for s in segments] == ["segment-000001.jsonl", "segment-000002.jsonl"]
+        assert [(s.start_line, s.line_count) for s in segments] == [(0, 2), (2, 3)]
+
+    def test_empty_log_is_not_rolled(self, tmp_path: Path):
+        """Rolling an empty or missing log should do nothing."""
+        from instincts.segments import get_segment_dir
+
+        observations_file = tmp_path / "observations.jsonl"
+
+        assert roll(observations_file) is None
+        assert not get_segment_dir(observations_file).exists()
+
+    def test_observer_rolls_over_at_max_size(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Appends past the size limit should roll over and continue in a new file."""
+        from instincts.segments import load_manifest
+
+        monkeypatch.setattr("instincts.observation_log.MAX_FILE_SIZE_MB", 200 / (1024 * 1024))
+        observations_file = tmp_path / "observations.jsonl"
+
+        append(observations_file, [obs(n) for n in range(10)])
+
+        manifest = load_manifest(observations_file)
+        active_lines = observations_file.read_text().splitlines() if observations_file.exists() else []
+        assert len(manifest.segments) >= 2
+        assert manifest.line_count + len(active_lines) == 10
+
+    def test_concurrent_appends_lose_nothing(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Writers racing with rollover should never append to a closed segment."""
+        from instincts.observer import count_observations
+        from instincts.segments import get_segment_dir, segment_paths
+
+        monkeypatch.setattr("instincts.observation_log.MAX_FILE_SIZE_MB", 500 / (1024 * 1024))
+        observations_file = tmp_path / "observations.jsonl"
+
+        def writer(worker: int) -> None:
+            append(observations_file, [obs(worker * 100 + n) for n in range(25)])
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        on_disk = sum(len(p.read_text().splitlines()) for p in segment_paths(observations_file))
+        if observations_file.exists():
+            on_disk += len(observations_file.read_text().splitlines())
+        assert on_disk == 100
+        assert count_observations(observations_file) == 100
+        assert len(list(get_segment_dir(observations_file).glob("*.jsonl"))) == len(segment_paths(observations_file))
+
+
+class TestReadLogIndex:
+    """Tests for whole-log counts and time bounds."""
+
+    def test_spans_segments_and_active_log(self, tmp_path: Path):
+        """Counts and timestamps should cover closed segments and the active log."""
+        from instincts.segments import read_log_index
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+        append(observations_file, [obs(3)])
+
+        index = read_log_index(observations_file)
+
+        assert index.line_count == 3
+        assert index.first_timestamp == obs(1)["timestamp"]
+        assert index.last_timestamp == obs(3)["timestamp"]
+
+    def test_last_timestamp_from_segment_after_rollover(self, tmp_path: Path):
+        """Right after rollover the last timestamp should come from the segment."""
+        from instincts.segments import read_log_index
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+
+        index = read_log_index(observations_file)
+
+        assert index.line_count == 2
+        assert index.last_timestamp == obs(2)["timestamp"]
+
+    def test_oldest_timestamp_spans_segments(self, tmp_path: Path):
+        """The oldest-timestamp lookup should see closed segments."""
+        from datetime import datetime
+
+        from instincts.observer import get_oldest_observation_timestamp
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1)])
+        roll(observations_file)
+        append(observations_file, [obs(2)])
+
+        oldest = get_oldest_observation_timestamp(observations_file)
+
+        assert oldest == datetime.fromisoformat(obs(1)["timestamp"])
+
+
+class TestReadersSpanSegments:
+    """Tests for windowed readers continuing into closed segments."""
+
+    def test_recent_window_is_filled_from_segments(self, tmp_path: Path):
+        """A short active log should be topped up from the newest segments."""
+        from instincts.patterns import load_recent_observations
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+        append(observations_file, [obs(3), obs(4)])
+        roll(observations_file)
+        append(observations_file, [obs(5)])
+
+        recent = load_recent_observations(observations_file, limit=4)
+
+        assert [o["n"] for o in recent] == [2, 3, 4, 5]
+
+    def test_recent_window_right_after_rollover(self, tmp_path: Path):
+        """With no active log the window should come from segments alone."""
+        from instincts.patterns import load_recent_observations
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+
+        assert [o["n"] for o in load_recent_observations(observations_file)] == [1, 2]
+
+    def test_since_resumes_in_rolled_over_segment(self, tmp_path: Path):
+        """A checkpoint into a rolled-over log should resume in its segment."""
+        from instincts.patterns import load_observations_since
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        checkpoint = load_observations_since(observations_file, None)
+        append(observations_file, [obs(3)])
+        roll(observations_file)
+        append(observations_file, [obs(4)])
+        roll(observations_file)
+        append(observations_file, [obs(5)])
+
+        result = load_observations_since(observations_file, checkpoint)
+
+        assert result is not None
+        assert result.resumed is True
+        assert [o["n"] for o in result.observations] == [3, 4, 5]
+        assert result.inode == observations_file.stat().st_ino
+        assert result.offset == observations_file.stat().st_size
+
+    def test_since_resumes_in_compressed_segment(self, tmp_path: Path):
+        """The segment's inode should survive compression."""
+        from instincts.patterns import load_observations_since
+        from instincts.segments import compact_segments
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        checkpoint = load_observations_since(observations_file, None)
+        append(observations_file, [obs(3)])
+        roll(observations_file)
+        compact_segments(observations_file, now=datetime(2026, 2, 10, tzinfo=timezone.utc))
+        append(observations_file, [obs(4)])
+
+        result = load_observations_since(observations_file, checkpoint)
+
+        assert result is not None
+        assert result.resumed is True
+        assert [o["n"] for o in result.observations] == [3, 4]
+
+    def test_since_fallback_window_spans_segments(self, tmp_path: Path):
+        """A checkpoint into an unknown file should fall back to a full window."""
+        from instincts.checkpoint import AnalysisCheckpoint
+        from instincts.patterns import load_observations_since
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        unknown = observations_file.stat().st_ino + 1
+        checkpoint = AnalysisCheckpoint(inode=unknown, offset=0, carry_over={})
+        roll(observations_file)
+        append(observations_file, [obs(3)])
+
+        result = load_observations_since(observations_file, checkpoint, limit=3)
+
+        assert result is not None
+        assert result.resumed is False
+        assert [o["n"] for o in result.observations] == [1, 2, 3]
+
+
+class TestManifestRebuild:
+    """Tests for recovering the manifest from segment files."""
+
+    def test_missing_manifest_adopts_legacy_archives(self, tmp_path: Path):
+        """Pre-segment archives should be adopted, oldest first, before segments."""
+        from instincts.segments import MANIFEST_FILE, get_segment_dir, load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        segment_dir = get_segment_dir(observations_file)
+        segment_dir.mkdir()
+        (segment_dir / "observations-20260101-000000-1.jsonl").write_text(json.dumps(obs(1)) + "\n")
+        (segment_dir / "observations-20260102-000000-1.jsonl").write_text(json.dumps(obs(2)) + "\n")
+
+        manifest = load_manifest(observations_file)
+
+        assert [s.name for s in manifest.segments] == [
+            "observations-20260101-000000-1.jsonl",
+            "observations-20260102-000000-1.jsonl",
+        ]
+        assert manifest.line_count == 2
+        assert (segment_dir / MANIFEST_FILE).exists()
+
+    def test_corrupt_manifest_is_rebuilt(self, tmp_path: Path):
+        """A corrupt manifest should be rebuilt from the segment files."""
+        from instincts.segments import MANIFEST_FILE, get_segment_dir, load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+        (get_segment_dir(observations_file) / MANIFEST_FILE).write_text("{not json")
+
+        manifest = load_manifest(observations_file)
+
+        assert [s.line_count for s in manifest.segments] == [2]
+
+    def test_rollover_repairs_manifest_missing_a_segment(self, tmp_path: Path):
+        """A segment renamed without its manifest write should be picked up."""
+        from instincts.segments import MANIFEST_FILE, get_segment_dir, load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1)])
+        roll(observations_file)
+        segment_dir = get_segment_dir(observations_file)
+        (segment_dir / MANIFEST_FILE).write_text(json.dumps({"segments": []}))
+        append(observations_file, [obs(2)])
+
+        roll(observations_file)
+
+        segments = load_manifest(observations_file).segments
+        assert [s.name for s in segments] == ["segment-000001.jsonl", "segment-000002.jsonl"]
+        assert [s.start_line for s in segments] == [0, 1]
+
+
+# Fixed "now" for compaction, shortly after the obs() timestamps
+NOW = datetime(2026, 2, 10, tzinfo=timezone.utc)
+
+
+def old_obs(n: int) -> dict:
+    """Build a numbered observation from long ago."""
+    return {"n": n, "session": "s1", "timestamp": f"2020-01-01T10:{n:02d}:00+00:00"}
+
+
+class TestCompaction:
+    """Tests for compressing closed segments and applying retention."""
+
+    def test_recent_segment_is_gzipped(self, tmp_path: Path):
+        """A recent raw segment should be replaced by a gzip copy."""
+        from instincts.segments import (
+            CODEC_GZIP,
+            compact_segments,
+            get_segment_dir,
+            load_manifest,
+        )
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(n) for n in range(50)])
+        raw_size = roll(observations_file).byte_size
+
+        result = compact_segments(observations_file, now=NOW)
+
+        (segment,) = load_manifest(observations_file).segments
+        segment_dir = get_segment_dir(observations_file)
+        assert result.compressed == 1
+        assert segment.name == "segment-000001.jsonl.gz"
+        assert segment.codec == CODEC_GZIP
+        assert segment.line_count == 50
+        assert segment.byte_size < raw_size
+        assert not (segment_dir / "segment-000001.jsonl").exists()
+        assert result.bytes_after < result.bytes_before
+
+    def test_cold_segment_uses_lzma(self, tmp_path: Path):
+        """Segments older than SEGMENT_LZMA_AFTER_DAYS should be stored with lzma."""
+        from instincts.segments import (
+            CODEC_LZMA,
+            compact_segments,
+            load_manifest,
+            lzma_available,
+        )
+
+        if not lzma_available():
+            pytest.skip("lzma not available")
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [old_obs(1), old_obs(2)])
+        roll(observations_file)
+
+        compact_segments(observations_file, now=NOW, max_age_days=100000)
+
+        (segment,) = load_manifest(observations_file).segments
+        assert segment.codec == CODEC_LZMA
+        assert segment.name.endswith(".jsonl.xz")
+
+    def test_compaction_is_idempotent(self, tmp_path: Path):
+        """A second pass should leave already compressed segments alone."""
+        from instincts.segments import compact_segments
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1)])
+        roll(observations_file)
+        compact_segments(observations_file, now=NOW)
+
+        assert compact_segments(observations_file, now=NOW).compressed == 0
+
+    def test_readers_stream_compressed_segments(self, tmp_path: Path):
+        """Windowed and streaming readers should decode compressed segments."""
+        from instincts.patterns import iter_log_observations, load_recent_observations
+        from instincts.segments import compact_segments, read_log_index
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2), obs(3)])
+        roll(observations_file)
+        append(observations_file, [obs(4), obs(5)])
+        roll(observations_file)
+        compact_segments(observations_file, now=NOW)
+        append(observations_file, [obs(6)])
+
+        assert [o["n"] for o in load_recent_observations(observations_file, limit=4)] == [3, 4, 5, 6]
+        assert [o["n"] for o in iter_log_observations(observations_file)] == [1, 2, 3, 4, 5, 6]
+        assert read_log_index(observations_file).line_count == 6
+
+    def test_pipeline_consumes_stream(self, tmp_path: Path):
+        """DetectionPipeline should accept the lazy stream directly."""
+        from instincts.patterns import DetectionPipeline, iter_log_observations
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+        append(observations_file, [obs(3)])
+
+        pipeline = DetectionPipeline(iter_log_observations(observations_file))
+
+        assert len(pipeline.batch) == 3
+        assert list(pipeline.session_rows["s1"]) == [0, 1, 2]
+
+    def test_retention_by_age_keeps_line_numbering(self, tmp_path: Path):
+        """Expired segments should be deleted without renumbering later lines."""
+        from instincts.segments import compact_segments, load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [old_obs(1), old_obs(2)])
+        roll(observations_file)
+        append(observations_file, [obs(3)])
+        roll(observations_file)
+
+        result = compact_segments(observations_file, now=NOW, max_age_days=30)
+        append(observations_file, [obs(4)])
+        roll(observations_file)
+
+        segments = load_manifest(observations_file).segments
+        assert result.removed == 1
+        assert [(s.name.split(".")[0], s.start_line) for s in segments] == [
+            ("segment-000002", 2),
+            ("segment-000003", 3),
+        ]
+
+    def test_retention_by_total_size(self, tmp_path: Path):
+        """The oldest segments should go once the total exceeds the size limit."""
+        from instincts.segments import compact_segments, load_manifest
+
+        observations_file = tmp_path / "observations.jsonl"
+        for n in range(3):
+            append(observations_file, [obs(n)])
+            roll(observations_file)
+        newest = load_manifest(observations_file).segments[-1]
+
+        result = compact_segments(observations_file, now=NOW, max_bytes=newest.byte_size)
+
+        assert result.removed == 2
+        assert [s.start_line for s in load_manifest(observations_file).segments] == [2]
+
+    def test_crash_leftover_raw_copy_is_dropped(self, tmp_path: Path):
+        """A raw segment shadowed by its compressed copy should be cleaned up."""
+        import gzip
+
+        from instincts.segments import (
+            CODEC_GZIP,
+            get_segment_dir,
+            load_manifest,
+            read_log_index,
+        )
+
+        observations_file = tmp_path / "observations.jsonl"
+        append(observations_file, [obs(1), obs(2)])
+        roll(observations_file)
+        segment_dir = get_segment_dir(observations_file)
+        raw = segment_dir / "segment-000001.jsonl"
+        # Crash after the compressed copy was renamed in, before the manifest write
+        (segment_dir / "segment-000001.jsonl.gz").write_bytes(gzip.compress(raw.read_bytes()))
+        append(observations_file, [obs(3)])
+
+        roll(observations_file)
+
+        segments = load_manifest(observations_file).segments
+        assert segments[0].codec == CODEC_GZIP
+        assert segments[0].line_count == 2
+        assert not raw.exists()
+        assert read_log_index(observations_file).line_count == 3
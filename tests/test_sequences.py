@@ -0,0 +1,164 @@
+"""Tests for instincts.sequences module.
+
+Tests cover:
+- Maximal repeat reporting across sessions
+- Minimum length and session support thresholds
+- Agreement with brute-force subsequence enumeration
+"""
+
+import random
+
+
+def _brute_force(
+    session_sequences: dict[str, list[str]], min_sessions: int, min_length: int
+) -> set[tuple[tuple[str, ...], frozenset[str]]]:
+    """Enumerate all subsequences and keep those not contained in a longer repeat."""
+    occurrences: dict[tuple[str, ...], set[str]] = {}
+    for session_id, tools in session_sequences.items():
+        for length in range(min_length, len(tools) + 1):
+            for start in range(len(tools) - length + 1):
+                occurrences.setdefault(tuple(tools[start : start + length]), set()).add(
+                    session_id
+                )
+    frequent = {seq: s for seq, s in occurrences.items() if len(s) >= min_sessions}
+
+    def contained(shorter: tuple[str, ...], longer: tuple[str, ...]) -> bool:
+        return any(
+            longer[i : i + len(shorter)] == shorter
+            for i in range(len(longer) - len(shorter) + 1)
+        )
+
+    return {
+        (seq, frozenset(sessions))
+        for seq, sessions in frequent.items()
+        if not any(len(seq) < len(other) and contained(seq, other) for other in frequent)
+    }
+
+
+class TestFindMaximalRepeats:
+    """Tests for find_maximal_repeats."""
+
+    def test_reports_shared_sequence(self):
+        """A sequence shared by two sessions should be reported with both sessions."""
+        from instincts.sequences import find_maximal_repeats
+
+        repeats = find_maximal_repeats(
+            {"s1": ["Read", "Edit", "Bash"], "s2": ["Grep", "Read", "Edit", "Bash"]},
+            min_sessions=2,
+            min_length=3,
+        )
+
+        assert [(r.sequence, r.sessions) for r in repeats] == [
+            (("Read", "Edit", "Bash"), ("s1", "s2"))
+        ]
+
+    def test_folds_contained_sequences_into_longest(self):
+        """Sub-sequences of a reported repeat should not be reported separately."""
+        from instincts.sequences import find_maximal_repeats
+
+        tools = ["Read", "Edit", "Bash", "Read", "Write"]
+        repeats = find_maximal_repeats(
+            {"s1": tools, "s2": list(tools)}, min_sessions=2, min_length=3
+        )
+
+        assert [r.sequence for r in repeats] == [tuple(tools)]
+
+    def test_respects_thresholds(self):
+        """Short or single-session sequences should not be reported."""
+        from instincts.sequences import find_maximal_repeats
+
+        sessions = {"s1": ["Read", "Edit", "Bash"], "s2": ["Read", "Edit", "Grep"]}
+
+        assert find_maximal_repeats(sessions, min_sessions=2, min_length=3) == []
+        assert find_maximal_repeats(sessions, min_sessions=3, min_length=2) == []
+
+    def test_counts_sessions_not_occurrences(self):
+        """Repeats inside a single session should not count as multiple sessions."""
+        from instincts.sequences import find_maximal_repeats
+
+        repeats = find_maximal_repeats(
+            {"s1": ["Read", "Edit", "Bash"] * 4, "s2": ["Grep"] * 3},
+            min_sessions=2,
+            min_length=3,
+        )
+
+        assert repeats == []
+
+    def test_orders_longest_first(self):
+        """Repeats should be ordered by length, longest first."""
+        from instincts.sequences import find_maximal_repeats
+
+        repeats = find_maximal_repeats(
+            {
+                "s1": ["A", "B", "C", "X", "D", "E", "F", "G"],
+                "s2": ["A", "B", "C", "Y", "D", "E", "F", "G"],
+            },
+            min_sessions=2,
+            min_length=3,
+        )
+
+        assert [r.sequence for r in repeats] == [("D", "E", "F", "G"), ("A", "B", "C")]
+
+    def test_matches_brute_force_enumeration(self):
+        """Results should equal brute-force enumeration on random sessions."""
+        from instincts.sequences import find_maximal_repeats
+
+        rng = random.Random(1234)
+        for _ in range(500):
+            alphabet = "ABCD"[: rng.randint(1, 4)]
+            sessions = {
+                f"s{i}": [rng.choice(alphabet) for _ in range(rng.randint(3, 12))]
+                for i in range(rng.randint(1, 5))
+            }
+            min_sessions = rng.randint(2, 3)
+
+            repeats = find_maximal_repeats(sessions, min_sessions, min_length=3)
+
+            assert {(r.sequence, frozenset(r.sessions)) for r in repeats} == _brute_force(
+                sessions, min_sessions, 3
+            )
+
+
+class TestFindContainedSequences:
+    """Tests for find_contained_sequences."""
+
+    def test_flags_sequence_inside_longer_one(self):
+        """A sequence occurring inside a longer candidate should be flagged."""
+        from instincts.sequences import find_contained_sequences
+
+        flags = find_contained_sequences(
+            [("Read", "Edit", "Bash"), ("Grep", "Read", "Edit", "Bash"), ("Edit", "Read")]
+        )
+
+        assert flags == [True, False, False]
+
+    def test_equal_duplicates_are_not_contained(self):
+        """Identical sequences of equal length should not subsume each other."""
+        from instincts.sequences import find_contained_sequences
+
+        assert find_contained_sequences([("A", "B", "C"), ("A", "B", "C")]) == [
+            False,
+            False,
+        ]
+
+    def test_matches_pairwise_containment(self):
+        """Flags should equal a pairwise contiguous-subsequence check."""
+        from instincts.sequences import find_contained_sequences
+
+        def contained(shorter: tuple[str, ...], longer: tuple[str, ...]) -> bool:
+            return len(shorter) < len(longer) and any(
+                longer[i : i + len(shorter)] == shorter
+                for i in range(len(longer) - len(shorter) + 1)
+            )
+
+        rng = random.Random(99)
+        for _ in range(500):
+            alphabet = "ABC"[: rng.randint(1, 3)]
+            sequences = [
+                tuple(rng.choice(alphabet) for _ in range(rng.randint(1, 7)))
+                for _ in range(rng.randint(1, 8))
+            ]
+
+            assert find_contained_sequences(sequences) == [
+                any(contained(seq, other) for other in sequences) for seq in sequences
+            ]
@@ -0,0 +1,389 @@
+"""Tests for instincts.storage and instincts.sqlite_storage modules.
+
+Tests cover:
+- Backend selection from $INSTINCT_STORAGE
+- SQLite observations: append, count, windows and checkpoint resumes
+- SQLite instincts: write, load and get, with indexed columns
+- Concurrent writers sharing one database, and the per-process connection
+- Observer, analysis and CLI running on the SQLite backend
+- Export of stored instincts to the Markdown layout
+"""
+
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+
+def make_instinct(instinct_id: str, confidence: float = 0.5, domain: str = "testing"):
+    """Build an instinct with a recognizable body."""
+    from instincts.models import Instinct
+
+    ts = datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc)
+    return Instinct(
+        id=instinct_id,
+        trigger=f"when {instinct_id}",
+        confidence=confidence,
+        domain=domain,
+        source="test",
+        evidence_count=2,
+        created_at=ts,
+        updated_at=ts,
+        content=f"# {instinct_id}\n\nBody of {instinct_id}.",
+        last_observed=ts,
+    )
+
+
+def make_observation(i: int, session: str = "s1", tool: str = "Read") -> dict:
+    return {
+        "timestamp": f"2026-02-09T10:{i // 60:02d}:{i % 60:02d}+00:00",
+        "event": "tool_start",
+        "tool": tool,
+        "session": session,
+        "seq_marker": i,
+    }
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    root = tmp_path / "project"
+    (root / ".git").mkdir(parents=True)
+    return root
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    from instincts.config import STORAGE_BACKEND_ENV
+
+    monkeypatch.setenv(STORAGE_BACKEND_ENV, "sqlite")
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    from instincts.sqlite_storage import SQLiteStorage
+
+    store = SQLiteStorage(tmp_path / "instincts.db")
+    yield store
+    store.close()
+
+
+class TestStorageBackend:
+    """Tests for backend selection."""
+
+    def test_defaults_to_file(self, monkeypatch: pytest.MonkeyPatch, project_root: Path):
+        """Without $INSTINCT_STORAGE the file stores should be used."""
+        from instincts.config import STORAGE_BACKEND_ENV
+        from instincts.storage import (
+            STORAGE_FILE,
+            FileInstinctStore,
+            FileObservationStore,
+            open_instinct_store,
+            open_observation_store,
+            storage_backend,
+        )
+
+        monkeypatch.delenv(STORAGE_BACKEND_ENV, raising=False)
+
+        assert storage_backend() == STORAGE_FILE
+        assert isinstance(open_observation_store(project_root), FileObservationStore)
+        assert isinstance(open_instinct_store(project_root), FileInstinctStore)
+
+    def test_selects_sqlite(self, sqlite_backend: None, project_root: Path):
+        """INSTINCT_STORAGE=sqlite should open the project's database."""
+        from instincts.config import get_storage_db_file
+        from instincts.sqlite_storage import SQLiteStorage
+        from instincts.storage import open_observation_store
+
+        store = open_observation_store(project_root)
+        try:
+            assert isinstance(store, SQLiteStorage)
+            assert get_storage_db_file(project_root).exists()
+        finally:
+            store.close()
+
+    def test_unknown_backend_falls_back_to_file(self, monkeypatch: pytest.MonkeyPatch):
+        """An unknown backend name should fall back to the file backend."""
+        from instincts.config import STORAGE_BACKEND_ENV
+        from instincts.storage import STORAGE_FILE, STORAGE_SQLITE, storage_backend
+
+        monkeypatch.setenv(STORAGE_BACKEND_ENV, " SQLite ")
+        assert storage_backend() == STORAGE_SQLITE
+        monkeypatch.setenv(STORAGE_BACKEND_ENV, "postgres")
+        assert storage_backend() == STORAGE_FILE
+
+
+class TestSQLiteObservations:
+    """Tests for the SQLite observation table."""
+
+    def test_append_count_and_recent(self, storage):
+        """Appended observations should be counted and read back in order."""
+        for i in range(10):
+            storage.append_observation(make_observation(i))
+
+        assert storage.count_observations() == 10
+        assert [o["seq_marker"] for o in storage.recent_observations(3)] == [7, 8, 9]
+        assert [o["seq_marker"] for o in storage.iter_observations()] == list(range(10))
+
+    def test_observations_since_resumes_checkpoint(self, storage):
+        """A SQLite checkpoint should resume after its sequence number."""
+        from instincts.checkpoint import AnalysisCheckpoint
+
+        for i in range(5):
+            storage.append_observation(make_observation(i))
+        first = storage.observations_since(None, limit=3)
+        assert not first.resumed
+        assert [o["seq_marker"] for o in first.observations] == [2, 3, 4]
+
+        for i in range(5, 8):
+            storage.append_observation(make_observation(i))
+        checkpoint = AnalysisCheckpoint(inode=first.inode, offset=first.offset, carry_over={})
+        second = storage.observations_since(checkpoint, limit=3)
+
+        assert second.resumed
+        assert [o["seq_marker"] for o in second.observations] == [5, 6, 7]
+
+    def test_file_checkpoint_is_not_resumed(self, storage):
+        """A checkpoint of the file backend should fall back to the window."""
+        from instincts.checkpoint import AnalysisCheckpoint
+
+        for i in range(5):
+            storage.append_observation(make_observation(i))
+
+        result = storage.observations_since(AnalysisCheckpoint(inode=1234, offset=2, carry_over={}), limit=2)
+
+        assert not result.resumed
+        assert [o["seq_marker"] for o in result.observations] == [3, 4]
+
+    @pytest.mark.parametrize("backend", ["file", "sqlite"])
+    def test_projected_reads_skip_large_fields(
+        self, backend: str, monkeypatch: pytest.MonkeyPatch, project_root: Path
+    ):
+        """Readers given fields should leave out large fields the detectors don't read."""
+        from instincts.config import STORAGE_BACKEND_ENV
+        from instincts.observer import _write_observation_to_project
+        from instincts.patterns import required_fields
+        from instincts.storage import open_observation_store
+
+        monkeypatch.setenv(STORAGE_BACKEND_ENV, backend)
+        for i in range(3):
+            observation = {**make_observation(i), "event": "tool_complete", "output": "x" * 100}
+            _write_observation_to_project({"output": observation.pop("output"), **observation}, project_root)
+        fields = required_fields(["repeated_workflows"])
+
+        store = open_observation_store(project_root)
+        try:
+            recent = store.recent_observations(2, fields=fields)
+            since = store.observations_since(None, limit=2, fields=fields)
+            streamed = list(store.iter_observations(fields))
+            full = store.recent_observations(2)
+        finally:
+            store.close()
+
+        assert [o["seq_marker"] for o in recent] == [1, 2]
+        assert since is not None
+        assert not any("output" in o for o in [*recent, *since.observations, *streamed])
+        assert all(o["output"] == "x" * 100 for o in full)
+
+    def test_observation_columns_are_indexed(self, storage):
+        """Session, tool, timestamp and event should have indexes."""
+        indexed = {row[1] for row in storage._conn.execute("PRAGMA index_list(observations)")}
+
+        assert {
+            "observations_session",
+            "observations_tool",
+            "observations_timestamp",
+            "observations_event",
+        } <= indexed
+
+    def test_concurrent_writers(self, tmp_path: Path):
+        """Writers on separate connections should not lose observations."""
+        from instincts.sqlite_storage import SQLiteStorage
+
+        db_file = tmp_path / "instincts.db"
+        SQLiteStorage(db_file).close()
+
+        def write(session: str) -> None:
+            store = SQLiteStorage(db_file)
+            try:
+                for i in range(50):
+                    store.append_observation(make_observation(i, session=session))
+            finally:
+                store.close()
+
+        threads = [threading.Thread(target=write, args=(f"s{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        store = SQLiteStorage(db_file)
+        try:
+            assert store.count_observations() == 200
+        finally:
+            store.close()
+
+    def test_refuses_symlinked_database(self, tmp_path: Path):
+        """A symlinked database file should raise OSError."""
+        from instincts.sqlite_storage import SQLiteStorage
+
+        target = tmp_path / "elsewhere.db"
+        target.touch()
+        (tmp_path / "instincts.db").symlink_to(target)
+
+        with pytest.raises(OSError):
+            SQLiteStorage(tmp_path / "instincts.db")
+
+    def test_shared_storage_is_opened_once(self, tmp_path: Path):
+        """The shared storage should stay open until its database is replaced."""
+        from instincts.sqlite_storage import open_shared_storage
+
+        db_file = tmp_path / "instincts.db"
+        first = open_shared_storage(db_file)
+        first.append_observation(make_observation(0))
+        first.close()
+
+        assert open_shared_storage(db_file) is first
+        assert first.count_observations() == 1
+
+        db_file.unlink()
+        replaced = open_shared_storage(db_file)
+
+        assert replaced is not first
+        assert replaced.count_observations() == 0
+
+    def test_database_errors_are_oserror(self, storage):
+        """Database errors should surface as OSError."""
+        storage._conn.execute("DROP TABLE observations")
+
+        with pytest.raises(OSError, match="SQLite storage error"):
+            storage.count_observations()
+
+
+class TestSQLiteInstincts:
+    """Tests for the SQLite instinct table."""
+
+    def test_write_load_and_get(self, storage):
+        """Written instincts should round-trip, bodies only when requested."""
+        storage.write_instinct(make_instinct("a"))
+        storage.write_instinct(make_instinct("b", confidence=0.7))
+        storage.write_instinct(make_instinct("a", confidence=0.9))
+
+        listed = {inst.id: inst for inst in storage.load_instincts()}
+        assert {k: v.confidence for k, v in listed.items()} == {"a": 0.9, "b": 0.7}
+        assert listed["a"].content == ""
+        assert listed["a"].last_observed == make_instinct("a").last_observed
+
+        assert storage.get_instinct("b") == make_instinct("b", confidence=0.7)
+        assert storage.get_instinct("missing") is None
+        assert [i.content for i in storage.load_instincts(with_content=True)] == [
+            "# a\n\nBody of a.",
+            "# b\n\nBody of b.",
+        ]
+
+    def test_instinct_columns_are_indexed(self, storage):
+        """Domain, confidence and status should have indexes."""
+        indexed = {row[1] for row in storage._conn.execute("PRAGMA index_list(instincts)")}
+
+        assert {"instincts_domain", "instincts_confidence", "instincts_status"} <= indexed
+
+    def test_export_markdown(self, storage, tmp_path: Path):
+        """Exported files should parse back to the stored instincts."""
+        from instincts.instinct_files import load_existing_instincts
+        from instincts.storage import export_markdown
+
+        storage.write_instinct(make_instinct("a"))
+        storage.write_instinct(make_instinct("b", domain="workflow"))
+        export_dir = tmp_path / "export"
+
+        written = export_markdown(storage, export_dir)
+
+        assert sorted(p.name for p in written) == ["a.md", "b.md"]
+        exported = {inst.id: inst for inst in load_existing_instincts(export_dir)}
+        for instinct_id in ("a", "b"):
+            stored = storage.get_instinct(instinct_id)
+            assert exported[instinct_id].content == stored.content
+            assert exported[instinct_id].domain == stored.domain
+            assert exported[instinct_id].confidence == stored.confidence
+
+
+class TestSQLiteBackendIntegration:
+    """Tests for the observer, agent and CLI on the SQLite backend."""
+
+    def test_observer_writes_to_database(self, sqlite_backend: None, project_root: Path):
+        """Hooks should insert rows instead of appending to the JSONL log."""
+        from instincts.auto_learn import count_observations
+        from instincts.config import get_observations_file
+        from instincts.observer import observe_pre
+
+        for _ in range(3):
+            observe_pre({"tool_name": "Read", "tool_input": {}, "session_id": "s"}, project_root)
+
+        assert count_observations(project_root) == 3
+        assert not get_observations_file(project_root).exists()
+
+    def test_analysis_stores_instincts_in_database(self, sqlite_backend: None, project_root: Path):
+        """Analysis should read observations from and write instincts to the database."""
+        from instincts.agent import analyze_observations
+        from instincts.config import get_learned_dir
+        from instincts.storage import open_instinct_store, open_observation_store
+
+        store = open_observation_store(project_root)
+        try:
+            for minute in (0, 10, 20):
+                for k, tool in enumerate(("Read", "Grep", "Edit")):
+                    obs = make_observation(0, session=f"s{minute}", tool=tool)
+                    obs["timestamp"] = f"2026-02-09T10:{minute + k:02d}:00+00:00"
+                    store.append_observation(obs)
+        finally:
+            store.close()
+
+        result = analyze_observations(project_root, skip_llm=True, incremental=True)
+
+        assert result.instincts_created > 0
+        assert not get_learned_dir(project_root).exists()
+        instinct_store = open_instinct_store(project_root)
+        try:
+            assert len(instinct_store.load_instincts()) == result.instincts_created
+        finally:
+            instinct_store.close()
+
+    def test_cli_lists_stored_instincts(self, sqlite_backend: None, project_root: Path):
+        """load_all_instincts should read the database on the SQLite backend."""
+        from instincts.cli import load_all_instincts
+        from instincts.storage import open_instinct_store
+
+        store = open_instinct_store(project_root)
+        try:
+            store.write_instinct(make_instinct("a", confidence=0.6))
+        finally:
+            store.close()
+
+        [loaded] = load_all_instincts(project_root, as_of=make_instinct("a").last_observed)
+
+        assert loaded["id"] == "a"
+        assert loaded["confidence"] == 0.6
+        assert loaded["content"] == "# a\n\nBody of a."
+
+    def test_export_command(
+        self,
+        sqlite_backend: None,
+        project_root: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """The export command should write the learned/ layout by default."""
+        from instincts.config import get_learned_dir
+        from instincts.storage import main, open_instinct_store
+
+        store = open_instinct_store(project_root)
+        try:
+            store.write_instinct(make_instinct("a"))
+        finally:
+            store.close()
+        monkeypatch.chdir(project_root)
+
+        assert main(["export"]) == 0
+
+        assert (get_learned_dir(project_root) / "a.md").exists()
+        assert "Exported 1 instincts" in capsys.readouterr().out